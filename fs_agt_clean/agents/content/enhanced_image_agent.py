@@ -423,7 +423,7 @@ class EnhancedImageUnifiedAgent(BaseContentUnifiedAgent):
         """Perform health check on enhanced image agent."""
         try:
             # Test basic functionality
-            test_result = await self.vision_service._calculate_quality_score(None)
+            pipeline_stats = self.vision_service.get_pipeline_stats()
             
             stats = await self.get_processing_stats()
             
@@ -433,6 +433,7 @@ class EnhancedImageUnifiedAgent(BaseContentUnifiedAgent):
                 "agent_type": self.agent_type,
                 "vision_service_available": True,
                 "processing_stats": stats,
+                "image_pipeline": pipeline_stats,
                 "supported_formats": self.supported_formats,
                 "max_batch_size": self.max_batch_size,
                 "timestamp": datetime.now(timezone.utc).isoformat()
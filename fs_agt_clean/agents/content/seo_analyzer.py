@@ -2,12 +2,23 @@
 
 import asyncio
 import logging
+import os
 import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 from fs_agt_clean.agents.content.base_content_agent import BaseContentUnifiedAgent
+from fs_agt_clean.agents.content.seo_bulk_engine import (
+    SEOBulkEngine,
+    analyze_chunk,
+    content_hash,
+    engine_version,
+    init_worker,
+)
 from fs_agt_clean.core.config.config_manager import ConfigManager
 from fs_agt_clean.core.monitoring.alerts.alert_manager import AlertManager
 from fs_agt_clean.mobile.battery_optimizer import BatteryOptimizer
@@ -26,6 +37,7 @@ class SEOAnalyzer(BaseContentUnifiedAgent):
     - Competitor keyword analysis
     - Search ranking optimization
     - Content gap analysis
+    - Bulk catalog scoring (``bulk_seo_analysis``)
     """
 
     def __init__(
@@ -59,6 +71,18 @@ class SEOAnalyzer(BaseContentUnifiedAgent):
         self.keyword_database = {}
         self.competitor_data = {}
 
+        # Bulk analysis: compiled engine, worker pool and memoized results
+        self.bulk_chunk_size = self.config.get("bulk_chunk_size", 2000)
+        self.bulk_cache_size = self.config.get("bulk_cache_size", 50000)
+        self.bulk_workers = self.config.get("bulk_workers") or max(
+            1, min(4, os.cpu_count() or 1)
+        )
+        self._bulk_engine: Optional[SEOBulkEngine] = None
+        self._bulk_pool: Optional[ProcessPoolExecutor] = None
+        self._bulk_pool_version: Optional[str] = None
+        self._bulk_results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.metrics["bulk_listings_analyzed"] = 0
+
         # SEO scoring weights for different factors
         self.seo_weights = {
             "keyword_density": 0.25,
@@ -125,6 +149,9 @@ class SEOAnalyzer(BaseContentUnifiedAgent):
         """Clean up SEO analysis resources."""
         self.keyword_database.clear()
         self.competitor_data.clear()
+        self._shutdown_bulk_pool()
+        self._bulk_engine = None
+        self._bulk_results.clear()
 
     async def _load_keyword_database(self) -> None:
         """Load keyword database for SEO analysis."""
@@ -314,6 +341,125 @@ class SEOAnalyzer(BaseContentUnifiedAgent):
             logger.error(f"Error in comprehensive SEO analysis: {e}")
             return {"error": str(e)}
 
+    def _get_bulk_engine(self) -> SEOBulkEngine:
+        """Compiled bulk engine, rebuilt when the keyword database changes."""
+        rules = self.marketplace_seo_rules.get(
+            self.marketplace, self.marketplace_seo_rules["ebay"]
+        )
+        version = engine_version(
+            self.keyword_database, rules, self.marketplace, self.seo_weights
+        )
+        if self._bulk_engine is None or self._bulk_engine.version != version:
+            self._bulk_engine = SEOBulkEngine(
+                self.keyword_database, rules, self.marketplace, self.seo_weights
+            )
+        return self._bulk_engine
+
+    def _get_bulk_pool(self, engine: SEOBulkEngine) -> ProcessPoolExecutor:
+        if self._bulk_pool is None or self._bulk_pool_version != engine.version:
+            self._shutdown_bulk_pool()
+            self._bulk_pool = ProcessPoolExecutor(
+                max_workers=self.bulk_workers,
+                initializer=init_worker,
+                initargs=(engine,),
+            )
+            self._bulk_pool_version = engine.version
+        return self._bulk_pool
+
+    def _shutdown_bulk_pool(self) -> None:
+        if self._bulk_pool is not None:
+            self._bulk_pool.shutdown(wait=False, cancel_futures=True)
+            self._bulk_pool = None
+            self._bulk_pool_version = None
+
+    async def bulk_seo_analysis(
+        self,
+        listings: List[Dict[str, Any]],
+        keywords: Optional[List[str]] = None,
+        parallel: Optional[bool] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Score many listings against the keyword database.
+
+        Listings are tokenized once and matched against every database
+        keyword in a single pass. Results are memoized by content hash and
+        keyword database version, so unchanged listings are free after the
+        first run and a database refresh invalidates them all. Chunks are
+        scored in a process pool when the batch is large.
+
+        Args:
+            listings: Listing content dictionaries
+            keywords: Target keywords for every listing (optional, see
+                ``SEOBulkEngine.analyze_batch`` for the fallbacks)
+            parallel: Force (True) or disable (False) the process pool;
+                defaults to using it for batches over one chunk
+
+        Returns:
+            One result per listing, in input order. Results are shared with
+            the memo cache and must not be modified.
+        """
+        engine = self._get_bulk_engine()
+        hashes = [
+            content_hash(content, keywords, engine.version) for content in listings
+        ]
+
+        pending: Dict[str, Dict[str, Any]] = {}
+        for digest, content in zip(hashes, listings):
+            if digest in self._bulk_results:
+                self._bulk_results.move_to_end(digest)
+            else:
+                pending.setdefault(digest, content)
+
+        digests = list(pending)
+        chunks = [
+            digests[start : start + self.bulk_chunk_size]
+            for start in range(0, len(digests), self.bulk_chunk_size)
+        ]
+        if parallel is None:
+            parallel = len(chunks) > 1 and self.bulk_workers > 1
+
+        computed: Dict[str, Dict[str, Any]] = {}
+        if chunks and parallel:
+            loop = asyncio.get_running_loop()
+            pool = self._get_bulk_pool(engine)
+            try:
+                chunk_results = await asyncio.gather(
+                    *(
+                        loop.run_in_executor(
+                            pool,
+                            analyze_chunk,
+                            [pending[digest] for digest in chunk],
+                            keywords,
+                        )
+                        for chunk in chunks
+                    )
+                )
+            except BrokenProcessPool:
+                logger.error("SEO bulk worker pool broke, restarting on next batch")
+                self._bulk_pool = None
+                self._bulk_pool_version = None
+                raise
+            for chunk, results in zip(chunks, chunk_results):
+                computed.update(zip(chunk, results))
+        else:
+            for chunk in chunks:
+                batch = [pending[digest] for digest in chunk]
+                results = await asyncio.to_thread(engine.analyze_batch, batch, keywords)
+                computed.update(zip(chunk, results))
+
+        output = [
+            self._bulk_results.get(digest) or computed[digest] for digest in hashes
+        ]
+
+        for digest, result in computed.items():
+            if "error" not in result:
+                self._bulk_results[digest] = result
+        while len(self._bulk_results) > self.bulk_cache_size:
+            self._bulk_results.popitem(last=False)
+
+        self.metrics["bulk_listings_analyzed"] += len(listings)
+        return output
+
     async def analyze_keyword_optimization(
         self, content: Dict[str, Any], keywords: List[str]
     ) -> Dict[str, Any]:
@@ -636,6 +782,15 @@ class SEOAnalyzer(BaseContentUnifiedAgent):
         capitalized_words = sum(1 for word in words if word[0].isupper())
         return int((capitalized_words / len(words)) * 100)
 
+    def _calculate_readability_score(self, text: str) -> float:
+        """Simplified Flesch reading ease of a single text."""
+        sentences = [s for s in text.split(".") if s.strip()]
+        words = text.split()
+        if not sentences or not words:
+            return 0.0
+        avg_sentence_length = len(words) / len(sentences)
+        return max(0.0, min(100.0, 206.835 - 1.015 * avg_sentence_length))
+
     def _detect_call_to_action(self, description: str) -> bool:
         """Detect call-to-action phrases in description."""
         cta_phrases = [
@@ -0,0 +1,449 @@
+"""Bulk SEO scoring engine for catalog-scale listing analysis.
+
+Each listing field is tokenized once and matched against the keyword
+database with a single token-level Aho-Corasick pass, independent of the
+size of the database. Word and sentence counts follow the single-listing
+analysis (whitespace words and period-separated sentences of the joined
+text), and the readability scores of a whole batch are computed with NumPy
+at once.
+
+The engine holds only plain data, so it can be shipped to worker processes.
+Scores follow ``SEOAnalyzer.comprehensive_seo_analysis``; keywords match on
+whole tokens rather than substrings.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from fs_agt_clean.core.utils.phrase_matcher import PhraseMatcher, tokenize
+
+# Listing fields that make up the analyzed text, in extraction order
+TEXT_FIELDS = ("title", "description", "bullet_points", "meta_description")
+
+# Readability score thresholds and the grade level at or above each one
+GRADE_THRESHOLDS = np.array([50.0, 60.0, 70.0, 80.0, 90.0])
+GRADE_LEVELS = np.array(
+    [
+        "College level",
+        "10th-12th grade",
+        "8th-9th grade",
+        "7th grade",
+        "6th grade",
+        "5th grade",
+    ]
+)
+
+# Keyword density range rewarded by the per-keyword score
+OPTIMAL_KEYWORD_DENSITY = (0.01, 0.03)
+
+
+def content_hash(
+    content: Dict[str, Any], keywords: Optional[Sequence[str]], version: str
+) -> str:
+    """Memoization key of a listing analysis."""
+    payload = json.dumps(
+        [content, list(keywords) if keywords else None, version],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def engine_version(
+    keyword_database: Dict[str, Any],
+    rules: Dict[str, Any],
+    marketplace: str,
+    weights: Optional[Dict[str, float]] = None,
+) -> str:
+    """Fingerprint of everything an engine's results depend on."""
+    payload = json.dumps(
+        [keyword_database, rules, marketplace, weights or {}],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class SEOBulkEngine:
+    """Compiled keyword database and marketplace rules for batch scoring."""
+
+    def __init__(
+        self,
+        keyword_database: Dict[str, Dict[str, List[str]]],
+        rules: Dict[str, Any],
+        marketplace: str,
+        weights: Optional[Dict[str, float]] = None,
+    ):
+        """Compile the keyword database.
+
+        Args:
+            keyword_database: Category -> keyword tier -> keywords
+            rules: Marketplace SEO rules (see ``SEOAnalyzer.marketplace_seo_rules``)
+            marketplace: Marketplace name reported with results
+            weights: SEO scoring weights
+        """
+        self.rules = rules
+        self.marketplace = marketplace
+        self.weights = weights or {}
+
+        self.category_keywords: Dict[str, List[str]] = {}
+        for category, tiers in keyword_database.items():
+            phrases = (phrase for tier in tiers.values() for phrase in tier)
+            self.category_keywords[category.lower()] = list(
+                dict.fromkeys(phrase.lower() for phrase in phrases)
+            )
+        self.vocabulary = frozenset(
+            phrase for phrases in self.category_keywords.values() for phrase in phrases
+        )
+        self.matcher = self._compile(self.vocabulary)
+
+        self.version = engine_version(keyword_database, rules, marketplace, weights)
+
+    @staticmethod
+    def _compile(phrases) -> PhraseMatcher:
+        matcher = PhraseMatcher()
+        for phrase in phrases:
+            matcher.add(phrase, phrase)
+        return matcher.compile()
+
+    def _extra_matcher(self, keywords: Iterable[str]) -> Optional[PhraseMatcher]:
+        """Small matcher for target keywords missing from the database."""
+        extra = set(keywords) - self.vocabulary
+        return self._compile(sorted(extra)) if extra else None
+
+    @staticmethod
+    def _field_texts(content: Dict[str, Any]) -> List[Tuple[str, str]]:
+        texts = []
+        for field in TEXT_FIELDS:
+            value = content.get(field)
+            if value is None:
+                continue
+            if field == "bullet_points":
+                texts.extend((field, str(point)) for point in value)
+            else:
+                texts.append((field, str(value)))
+        return texts
+
+    def _target_keywords(
+        self, content: Dict[str, Any], keywords: Optional[Sequence[str]]
+    ) -> Optional[List[str]]:
+        if keywords:
+            return list(keywords)
+        if content.get("keywords"):
+            return list(content["keywords"])
+        category = str(content.get("category", "")).lower()
+        return self.category_keywords.get(category)
+
+    def analyze_batch(
+        self,
+        listings: Sequence[Dict[str, Any]],
+        keywords: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Score a batch of listings.
+
+        Target keywords are ``keywords`` if given, else the listing's own
+        ``keywords``, else the keywords of its ``category``, else every
+        database keyword found in the listing.
+
+        Args:
+            listings: Listing content dictionaries
+            keywords: Target keywords shared by the whole batch
+
+        Returns:
+            One result dictionary per listing, in input order
+        """
+        targets = [self._target_keywords(content, keywords) for content in listings]
+        extra_matcher = self._extra_matcher(
+            kw.lower() for target in targets if target for kw in target
+        )
+
+        # Tokenize every field once; count words and sentences of the joined
+        # text like SEOAnalyzer._analyze_readability
+        words = np.zeros(len(listings))
+        sentences = np.zeros(len(listings))
+        matches: List[Dict[str, Dict[str, int]]] = []
+        for index, content in enumerate(listings):
+            texts = self._field_texts(content)
+            all_text = " ".join(text for _, text in texts)
+            words[index] = len(all_text.split())
+            sentences[index] = sum(1 for s in all_text.split(".") if s.strip())
+            counts: Dict[str, Dict[str, int]] = {}
+            for field, text in texts:
+                tokens = tokenize(text)
+                hits = self.matcher.scan_tokens(tokens)
+                if extra_matcher is not None:
+                    # Disjoint phrases, so per-phrase order is kept
+                    hits += extra_matcher.scan_tokens(tokens)
+                field_counts = counts.setdefault(field, {})
+                last_end: Dict[str, int] = {}
+                for hit in hits:
+                    # Non-overlapping occurrences, like str.count
+                    if hit.start >= last_end.get(hit.phrase, 0):
+                        field_counts[hit.phrase] = field_counts.get(hit.phrase, 0) + 1
+                        last_end[hit.phrase] = hit.end
+            matches.append(counts)
+
+        readability = self._readability(words, sentences)
+
+        results = []
+        for index, content in enumerate(listings):
+            try:
+                results.append(
+                    self._score_listing(
+                        content, targets[index], matches[index], readability[index]
+                    )
+                )
+            except Exception as e:
+                results.append({"error": str(e)})
+        return results
+
+    @staticmethod
+    def _readability(words: np.ndarray, sentences: np.ndarray) -> List[Dict[str, Any]]:
+        """Vectorized simplified Flesch reading ease from word and sentence counts."""
+        size = len(words)
+        valid = (words > 0) & (sentences > 0)
+        avg_sentence_length = np.divide(
+            words, sentences, out=np.zeros(size), where=valid
+        )
+        scores = np.clip(206.835 - 1.015 * avg_sentence_length, 0, 100)
+        grades = GRADE_LEVELS[np.searchsorted(GRADE_THRESHOLDS, scores, side="right")]
+
+        results = []
+        for index in range(size):
+            if not valid[index]:
+                results.append(
+                    {
+                        "readability_score": 0,
+                        "grade_level": "N/A",
+                        "total_words": int(words[index]),
+                    }
+                )
+                continue
+            results.append(
+                {
+                    "readability_score": float(scores[index]),
+                    "grade_level": str(grades[index]),
+                    "avg_sentence_length": float(avg_sentence_length[index]),
+                    "total_sentences": int(sentences[index]),
+                    "total_words": int(words[index]),
+                }
+            )
+        return results
+
+    def _score_listing(
+        self,
+        content: Dict[str, Any],
+        target: Optional[List[str]],
+        counts: Dict[str, Dict[str, int]],
+        readability: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        total_words = readability["total_words"]
+        matched: Dict[str, int] = {}
+        for field_counts in counts.values():
+            for phrase, count in field_counts.items():
+                matched[phrase] = matched.get(phrase, 0) + count
+
+        if target is None:
+            target = sorted(matched)
+        target_lower = [keyword.lower() for keyword in target]
+
+        # Keyword analysis
+        keyword_details = {}
+        for keyword, keyword_lower in zip(target, target_lower):
+            count = matched.get(keyword_lower, 0)
+            density = count / total_words if total_words else 0
+            in_title = keyword_lower in counts.get("title", {})
+            in_description = keyword_lower in counts.get("description", {})
+
+            score = 40 * in_title + 30 * in_description
+            if OPTIMAL_KEYWORD_DENSITY[0] <= density <= OPTIMAL_KEYWORD_DENSITY[1]:
+                score += 30
+            elif density > 0:
+                score += 15
+
+            keyword_details[keyword] = {
+                "count": count,
+                "density": density,
+                "in_title": in_title,
+                "in_description": in_description,
+                "optimization_score": score,
+            }
+
+        keyword_score = (
+            sum(d["optimization_score"] for d in keyword_details.values())
+            / len(keyword_details)
+            if keyword_details
+            else 0
+        )
+        keyword_density = (
+            sum(matched.get(keyword, 0) for keyword in target_lower) / total_words
+            if total_words
+            else 0
+        )
+
+        structure_score = self._structure_score(content)
+        compliance_score, issues = self._compliance(content, matched, total_words)
+        scores = {
+            "keyword": keyword_score,
+            "structure": structure_score,
+            "readability": readability["readability_score"],
+            "marketplace": compliance_score,
+        }
+        total_weight = sum(
+            self.weights.get(f"{category}_optimization", 0.25) for category in scores
+        )
+        overall = (
+            sum(
+                score * self.weights.get(f"{category}_optimization", 0.25)
+                for category, score in scores.items()
+            )
+            / total_weight
+        )
+
+        recommendations = []
+        if keyword_score < 70:
+            recommendations.append(
+                "Improve keyword optimization in title and description"
+            )
+        if structure_score < 70:
+            recommendations.append("Improve content structure with better hierarchy")
+        if readability["readability_score"] < 60:
+            recommendations.append(
+                "Improve readability with shorter sentences and simpler words"
+            )
+        if compliance_score < 80:
+            recommendations.append("Address marketplace compliance issues")
+            recommendations.extend(issues[:3])
+
+        return {
+            "overall_seo_score": overall,
+            "keyword_score": keyword_score,
+            "structure_score": structure_score,
+            "readability_score": readability["readability_score"],
+            "compliance_score": compliance_score,
+            "keyword_details": keyword_details,
+            "keyword_density_overall": keyword_density,
+            "matched_keywords": matched,
+            "readability": readability,
+            "compliance_issues": issues,
+            "recommendations": recommendations[:10],
+            "target_keywords": target,
+            "marketplace": self.marketplace,
+        }
+
+    def _structure_score(self, content: Dict[str, Any]) -> float:
+        """Structure score as computed by ``SEOAnalyzer.analyze_content_structure``."""
+        title_range = self.rules["optimal_title_length"]
+        description_range = self.rules["optimal_description_length"]
+        title_length = len(content.get("title", ""))
+        description_length = len(content.get("description", ""))
+
+        title_optimal = title_range[0] <= title_length <= title_range[1]
+        description_optimal = (
+            description_range[0] <= description_length <= description_range[1]
+        )
+
+        score = 0.3 * (100 if title_optimal else 50)
+        score += 0.3 * (100 if description_optimal else 50)
+        score += 0.2 * self._bullet_point_score(content.get("bullet_points", []))
+
+        hierarchy = 0
+        for field, points in (
+            ("title", 30),
+            ("description", 25),
+            ("bullet_points", 20),
+            ("meta_description", 25),
+        ):
+            if content.get(field):
+                hierarchy += points
+        score += 0.2 * hierarchy
+
+        return min(100.0, score)
+
+    @staticmethod
+    def _bullet_point_score(bullet_points: List[str]) -> int:
+        if not bullet_points:
+            return 0
+
+        score = 40 if 3 <= len(bullet_points) <= 5 else 20
+        avg_length = sum(len(point) for point in bullet_points) / len(bullet_points)
+        if 20 <= avg_length <= 100:
+            score += 30
+        starts = {
+            point.split()[0].lower() if point.split() else ""
+            for point in bullet_points
+        }
+        if len(starts) > len(bullet_points) * 0.7:
+            score += 30
+        return score
+
+    def _compliance(
+        self, content: Dict[str, Any], matched: Dict[str, int], total_words: int
+    ) -> Tuple[int, List[str]]:
+        """Marketplace compliance score and issues."""
+        score = 0
+        issues = []
+
+        title = content.get("title", "")
+        if title:
+            low, high = self.rules["optimal_title_length"]
+            if low <= len(title) <= high:
+                score += 25
+            else:
+                issues.append(f"Title length ({len(title)}) not optimal ({low}-{high})")
+
+        description = content.get("description", "")
+        if description:
+            low, high = self.rules["optimal_description_length"]
+            if low <= len(description) <= high:
+                score += 25
+            else:
+                issues.append(
+                    f"Description length ({len(description)}) not optimal "
+                    f"({low}-{high})"
+                )
+
+        keywords = content.get("keywords", [])
+        if keywords:
+            occurrences = sum(matched.get(keyword.lower(), 0) for keyword in keywords)
+            density = occurrences / total_words if total_words else 0
+            low, high = self.rules["keyword_density_range"]
+            if low <= density <= high:
+                score += 25
+            else:
+                issues.append(
+                    f"Keyword density ({density:.3f}) not optimal ({low}-{high})"
+                )
+
+        required = self.rules["important_sections"]
+        present = [section for section in required if content.get(section)]
+        if len(present) == len(required):
+            score += 25
+        else:
+            missing = [section for section in required if section not in present]
+            issues.append(f"Missing required sections: {', '.join(missing)}")
+
+        return score, issues
+
+
+# Engine of the current worker process, set by the pool initializer
+_worker_engine: Optional[SEOBulkEngine] = None
+
+
+def init_worker(engine: SEOBulkEngine) -> None:
+    """Process pool initializer installing the engine once per worker."""
+    global _worker_engine
+    _worker_engine = engine
+
+
+def analyze_chunk(
+    listings: List[Dict[str, Any]], keywords: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """Worker entry point scoring a chunk with the installed engine."""
+    if _worker_engine is None:
+        raise RuntimeError("SEO bulk worker not initialized")
+    return _worker_engine.analyze_batch(listings, keywords)
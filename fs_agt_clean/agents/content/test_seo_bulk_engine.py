@@ -0,0 +1,83 @@
+"""
+Tests for seo_bulk_engine.py and SEOAnalyzer.bulk_seo_analysis
+"""
+
+import pytest
+
+from fs_agt_clean.agents.content.seo_analyzer import SEOAnalyzer
+
+KEYWORD_DATABASE = {
+    "phones": {"primary": ["iphone", "smartphone"], "secondary": ["unlocked"]}
+}
+
+LISTINGS = [
+    {
+        "title": "Apple iPhone 12 - 6.1\" Unlocked Smartphone, don't miss it",
+        "description": (
+            "Great iphone. It's unlocked and ready. Ships fast... Buy now! "
+            "v2.0 firmware."
+        ),
+        "bullet_points": ["Unlocked for all carriers", "6.1 inch display. Bright"],
+        "keywords": ["iphone", "unlocked"],
+    },
+    {
+        "title": "Refurbished smartphone",
+        "description": "A smartphone in good shape. Works well.",
+        "keywords": ["smartphone"],
+    },
+]
+
+
+@pytest.fixture
+def analyzer():
+    analyzer = SEOAnalyzer("ebay")
+    analyzer.keyword_database = KEYWORD_DATABASE
+    return analyzer
+
+
+class TestSEOBulkEngine:
+    """Tests for bulk SEO scoring."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("listing", LISTINGS)
+    async def test_matches_single_listing_analysis(self, analyzer, listing):
+        keywords = listing["keywords"]
+        single = await analyzer.comprehensive_seo_analysis(listing, keywords)
+        results = await analyzer.bulk_seo_analysis([listing], keywords, parallel=False)
+        bulk = results[0]
+
+        details = single["detailed_analysis"]
+        readability = details["readability_analysis"]
+        assert bulk["readability"]["total_words"] == readability["total_words"]
+        assert bulk["readability"]["total_sentences"] == readability["total_sentences"]
+        assert bulk["readability_score"] == pytest.approx(
+            readability["readability_score"]
+        )
+        keyword_analysis = details["keyword_analysis"]
+        assert bulk["keyword_density_overall"] == pytest.approx(
+            keyword_analysis["keyword_density_overall"]
+        )
+        for keyword, expected in keyword_analysis["keyword_details"].items():
+            assert bulk["keyword_details"][keyword]["density"] == pytest.approx(
+                expected["density"]
+            )
+        assert bulk["overall_seo_score"] == pytest.approx(single["overall_seo_score"])
+
+    def test_extra_keywords_do_not_grow_the_database_matcher(self, analyzer):
+        engine = analyzer._get_bulk_engine()
+        states = engine.matcher.state_count
+
+        for keyword in ["ready", "ships fast", "bright"]:
+            result = engine.analyze_batch(LISTINGS[:1], [keyword])[0]
+            assert result["keyword_details"][keyword]["count"] == 1
+
+        assert engine.matcher.state_count == states
+
+    @pytest.mark.asyncio
+    async def test_memoizes_and_counts_bulk_listings(self, analyzer):
+        first = await analyzer.bulk_seo_analysis(LISTINGS, parallel=False)
+        second = await analyzer.bulk_seo_analysis(LISTINGS, parallel=False)
+
+        assert [a is b for a, b in zip(first, second)] == [True, True]
+        assert analyzer.metrics["bulk_listings_analyzed"] == 4
+        assert analyzer.metrics["content_generated"] == 0
@@ -3,12 +3,26 @@ Reinforcement Learning UnifiedAgent for decision-making.
 
 This module provides a reinforcement learning agent that learns optimal decision
 policies through interaction with the environment.
+
+Q-values live in a dense NumPy table indexed by interned state and action ids,
+so looking up the best next action is a masked row maximum instead of a scan
+of every table entry. Experience replay uses a fixed-capacity ring buffer with
+vectorized minibatch sampling.
 """
 
 import logging
 import random
-from collections import defaultdict
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import numpy as np
 
@@ -124,6 +138,231 @@ class Environment:
         raise NotImplementedError("Subclasses must implement get_valid_actions()")
 
 
+Transition = Tuple[State, Action, State, float, bool]
+
+
+class QTable:
+    """
+    Dense Q-value table with interned state and action ids.
+
+    Rows are states and columns are actions, both numbered in order of first
+    use; the array grows by doubling. A visited mask records which pairs
+    have been updated, so the table also behaves like the sparse mapping of
+    ``(state_id, action_id)`` keys it replaces.
+    """
+
+    def __init__(self, state_capacity: int = 1024, action_capacity: int = 8):
+        """
+        Initialize an empty table.
+
+        Args:
+            state_capacity: Initial number of state rows
+            action_capacity: Initial number of action columns
+        """
+        self.state_index: Dict[str, int] = {}
+        self.action_index: Dict[str, int] = {}
+        self.state_ids: List[str] = []
+        self.action_ids: List[str] = []
+        self.values = np.zeros((state_capacity, action_capacity))
+        self.visited = np.zeros((state_capacity, action_capacity), dtype=bool)
+        self._visited_count = 0
+
+    def _grow(self, rows: int, cols: int) -> None:
+        capacity_rows, capacity_cols = self.values.shape
+        if rows <= capacity_rows and cols <= capacity_cols:
+            return
+        while capacity_rows < rows:
+            capacity_rows *= 2
+        while capacity_cols < cols:
+            capacity_cols *= 2
+        values = np.zeros((capacity_rows, capacity_cols))
+        visited = np.zeros((capacity_rows, capacity_cols), dtype=bool)
+        used_rows, used_cols = len(self.state_ids), len(self.action_ids)
+        values[:used_rows, :used_cols] = self.values[:used_rows, :used_cols]
+        visited[:used_rows, :used_cols] = self.visited[:used_rows, :used_cols]
+        self.values, self.visited = values, visited
+
+    def intern_state(self, state_id: str) -> int:
+        """Row of a state, adding it if new."""
+        index = self.state_index.get(state_id)
+        if index is None:
+            index = len(self.state_ids)
+            self._grow(index + 1, len(self.action_ids))
+            self.state_index[state_id] = index
+            self.state_ids.append(state_id)
+        return index
+
+    def intern_action(self, action_id: str) -> int:
+        """Column of an action, adding it if new."""
+        index = self.action_index.get(action_id)
+        if index is None:
+            index = len(self.action_ids)
+            self._grow(len(self.state_ids), index + 1)
+            self.action_index[action_id] = index
+            self.action_ids.append(action_id)
+        return index
+
+    def max_value(self, state_id: str) -> float:
+        """Highest Q-value among the actions taken from a state (0 if none)."""
+        row = self.state_index.get(state_id)
+        if row is None:
+            return 0.0
+        cols = len(self.action_ids)
+        mask = self.visited[row, :cols]
+        if not mask.any():
+            return 0.0
+        return float(self.values[row, :cols][mask].max())
+
+    def max_values(self, rows: np.ndarray) -> np.ndarray:
+        """Vectorized ``max_value`` for an array of state rows."""
+        cols = len(self.action_ids)
+        masked = np.where(
+            self.visited[rows, :cols], self.values[rows, :cols], -np.inf
+        )
+        best = masked.max(axis=1, initial=-np.inf)
+        best[np.isneginf(best)] = 0.0
+        return best
+
+    def set(self, row: int, col: int, value: float) -> None:
+        """Set the Q-value of a state row and action column."""
+        if not self.visited[row, col]:
+            self.visited[row, col] = True
+            self._visited_count += 1
+        self.values[row, col] = value
+
+    def add_batch(
+        self, rows: np.ndarray, cols: np.ndarray, deltas: np.ndarray
+    ) -> None:
+        """Add deltas to many pairs; repeated pairs receive every delta."""
+        new = ~self.visited[rows, cols]
+        if new.any():
+            pairs = np.unique(rows[new] * self.values.shape[1] + cols[new])
+            self._visited_count += len(pairs)
+            self.visited[rows[new], cols[new]] = True
+        np.add.at(self.values, (rows, cols), deltas)
+
+    def get(self, key: Tuple[str, str], default: float = 0.0) -> float:
+        """Q-value of a ``(state_id, action_id)`` pair if it has been set."""
+        row = self.state_index.get(key[0])
+        col = self.action_index.get(key[1])
+        if row is None or col is None or not self.visited[row, col]:
+            return default
+        return float(self.values[row, col])
+
+    def __getitem__(self, key: Tuple[str, str]) -> float:
+        return self.get(key, 0.0)
+
+    def __setitem__(self, key: Tuple[str, str], value: float) -> None:
+        self.set(self.intern_state(key[0]), self.intern_action(key[1]), value)
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, tuple) or len(key) != 2:
+            return False
+        row = self.state_index.get(key[0])
+        col = self.action_index.get(key[1])
+        return row is not None and col is not None and bool(self.visited[row, col])
+
+    def __len__(self) -> int:
+        return self._visited_count
+
+    def keys(self) -> Iterator[Tuple[str, str]]:
+        for key, _ in self.items():
+            yield key
+
+    def items(self) -> Iterator[Tuple[Tuple[str, str], float]]:
+        """Set ``((state_id, action_id), q_value)`` pairs."""
+        rows, cols = np.nonzero(
+            self.visited[: len(self.state_ids), : len(self.action_ids)]
+        )
+        for row, col, value in zip(
+            rows.tolist(), cols.tolist(), self.values[rows, cols].tolist()
+        ):
+            yield (self.state_ids[row], self.action_ids[col]), value
+
+    def to_dict(self) -> Dict[Tuple[str, str], float]:
+        """Sparse ``{(state_id, action_id): q_value}`` mapping of set pairs."""
+        return dict(self.items())
+
+    @classmethod
+    def from_dict(cls, q_values: Dict[Tuple[str, str], float]) -> "QTable":
+        """Build a table from a sparse ``{(state_id, action_id): q_value}`` map."""
+        table = cls()
+        for key, value in q_values.items():
+            table[key] = value
+        return table
+
+
+class ReplayBuffer:
+    """
+    Fixed-capacity experience replay ring buffer.
+
+    Rewards and done flags are stored in NumPy arrays and states and actions
+    in object arrays, so minibatches are sampled with a single fancy index.
+    Once full, new transitions overwrite the oldest ones.
+    """
+
+    def __init__(self, capacity: int, seed: Optional[int] = None):
+        """
+        Initialize an empty buffer.
+
+        Args:
+            capacity: Maximum number of transitions kept
+            seed: Optional seed of the sampling generator
+        """
+        self.capacity = capacity
+        self.states = np.empty(capacity, dtype=object)
+        self.actions = np.empty(capacity, dtype=object)
+        self.next_states = np.empty(capacity, dtype=object)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=bool)
+        self._next = 0
+        self._size = 0
+        self._rng = np.random.default_rng(seed)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(
+        self,
+        state: State,
+        action: Action,
+        next_state: State,
+        reward: float,
+        done: bool,
+    ) -> None:
+        """Store a transition, overwriting the oldest when full."""
+        index = self._next
+        self.states[index] = state
+        self.actions[index] = action
+        self.next_states[index] = next_state
+        self.rewards[index] = reward
+        self.dones[index] = done
+        self._next = (index + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def sample(self, batch_size: int) -> Dict[str, np.ndarray]:
+        """
+        Sample a minibatch uniformly with replacement.
+
+        Args:
+            batch_size: Number of transitions
+
+        Returns:
+            Dictionary of ``states``, ``actions``, ``next_states``,
+            ``rewards`` and ``dones`` arrays
+        """
+        if not self._size:
+            raise ValueError("Cannot sample from an empty replay buffer")
+        indices = self._rng.integers(0, self._size, size=batch_size)
+        return {
+            "states": self.states[indices],
+            "actions": self.actions[indices],
+            "next_states": self.next_states[indices],
+            "rewards": self.rewards[indices],
+            "dones": self.dones[indices],
+        }
+
+
 class QLearningUnifiedAgent:
     """
     Q-Learning agent for reinforcement learning.
@@ -145,9 +384,11 @@ class QLearningUnifiedAgent:
         self.exploration_rate = self.config.get("exploration_rate", 0.1)
         self.exploration_decay = self.config.get("exploration_decay", 0.995)
         self.min_exploration_rate = self.config.get("min_exploration_rate", 0.01)
+        # Transitions per Q-table update during training (1 = every step)
+        self.update_batch_size = self.config.get("update_batch_size", 1)
 
         # Initialize Q-table
-        self.q_table: Dict[Tuple[str, str], float] = defaultdict(float)
+        self.q_table = QTable()
 
         # Track learning progress
         self.episode_count = 0
@@ -172,15 +413,28 @@ class QLearningUnifiedAgent:
             return random.choice(valid_actions)
 
         # Exploitation: best action based on Q-values
-        q_values = [
-            self.q_table.get((state.state_id, action.action_id), 0.0)
-            for action in valid_actions
-        ]
+        row = self.q_table.state_index.get(state.state_id)
+        if row is None:
+            return random.choice(valid_actions)
+        # Look up columns without interning; unseen actions count as 0.0
+        action_index = self.q_table.action_index
+        cols = np.fromiter(
+            (action_index.get(a.action_id, -1) for a in valid_actions),
+            dtype=np.intp,
+            count=len(valid_actions),
+        )
+        known = cols >= 0
+        q_values = np.zeros(len(valid_actions))
+        known_cols = cols[known]
+        q_values[known] = np.where(
+            self.q_table.visited[row, known_cols],
+            self.q_table.values[row, known_cols],
+            0.0,
+        )
 
         # Find action with highest Q-value (with random tie-breaking)
-        max_q = max(q_values)
-        max_indices = [i for i, q in enumerate(q_values) if q == max_q]
-        max_index = random.choice(max_indices)
+        max_indices = np.flatnonzero(q_values == q_values.max())
+        max_index = random.choice(max_indices.tolist())
 
         return valid_actions[max_index]
 
@@ -202,28 +456,14 @@ class QLearningUnifiedAgent:
             reward: Reward received
             done: Whether episode is done
         """
+        row = self.q_table.intern_state(state.state_id)
+        col = self.q_table.intern_action(action.action_id)
+
         # Get current Q-value
-        current_q = self.q_table.get((state.state_id, action.action_id), 0.0)
-
-        # Calculate maximum Q-value for next state
-        if done:
-            max_next_q = 0.0
-        else:
-            # This would normally require knowing valid actions for next_state
-            # For simplicity, we'll look up all actions that have been taken from next_state
-            next_actions = [
-                action_id
-                for (s_id, action_id) in self.q_table.keys()
-                if s_id == next_state.state_id
-            ]
-
-            if next_actions:
-                max_next_q = max(
-                    self.q_table.get((next_state.state_id, action_id), 0.0)
-                    for action_id in next_actions
-                )
-            else:
-                max_next_q = 0.0
+        current_q = float(self.q_table.values[row, col])
+
+        # Maximum Q-value over the actions taken from next_state
+        max_next_q = 0.0 if done else self.q_table.max_value(next_state.state_id)
 
         # Update Q-value using Q-learning formula
         new_q = current_q + self.learning_rate * (
@@ -231,7 +471,45 @@ class QLearningUnifiedAgent:
         )
 
         # Update Q-table
-        self.q_table[(state.state_id, action.action_id)] = new_q
+        self.q_table.set(row, col, new_q)
+
+    def update_batch(self, transitions: Sequence[Transition]) -> None:
+        """
+        Update Q-values from a batch of transitions at once.
+
+        All targets are computed from the Q-values before the batch. The
+        temporal-difference errors of a pair seen several times are averaged,
+        so each pair moves by at most one learning-rate step per batch.
+
+        Args:
+            transitions: (state, action, next_state, reward, done) tuples
+        """
+        if not transitions:
+            return
+
+        table = self.q_table
+        rows = np.array([table.intern_state(t[0].state_id) for t in transitions])
+        cols = np.array([table.intern_action(t[1].action_id) for t in transitions])
+        next_rows = np.array(
+            [table.intern_state(t[2].state_id) for t in transitions]
+        )
+        rewards = np.array([t[3] for t in transitions], dtype=float)
+        dones = np.array([t[4] for t in transitions], dtype=bool)
+
+        max_next_q = np.where(dones, 0.0, table.max_values(next_rows))
+        current_q = table.values[rows, cols]
+        deltas = self.learning_rate * (
+            rewards + self.discount_factor * max_next_q - current_q
+        )
+
+        # Average the deltas of repeated pairs; summing them would scale the
+        # step by the number of repeats and diverge
+        width = table.values.shape[1]
+        pairs, inverse, counts = np.unique(
+            rows * width + cols, return_inverse=True, return_counts=True
+        )
+        mean_deltas = np.bincount(inverse, weights=deltas) / counts
+        table.add_batch(pairs // width, pairs % width, mean_deltas)
 
     def train(
         self,
@@ -255,6 +533,7 @@ class QLearningUnifiedAgent:
         # Track statistics
         episode_rewards = []
         episode_lengths = []
+        pending: List[Transition] = []
 
         for episode in range(episodes):
             # Reset environment
@@ -276,8 +555,14 @@ class QLearningUnifiedAgent:
                 # Take step in environment
                 next_state, reward, done, _ = environment.step(state, action)
 
-                # Update Q-values
-                self.update(state, action, next_state, reward, done)
+                # Update Q-values, every step or in batches
+                if self.update_batch_size <= 1:
+                    self.update(state, action, next_state, reward, done)
+                else:
+                    pending.append((state, action, next_state, reward, done))
+                    if len(pending) >= self.update_batch_size:
+                        self.update_batch(pending)
+                        pending = []
 
                 # Update state and statistics
                 state = next_state
@@ -287,6 +572,10 @@ class QLearningUnifiedAgent:
                 if done:
                     break
 
+            # Apply the rest of the episode's transitions
+            self.update_batch(pending)
+            pending = []
+
             # Update exploration rate
             self.exploration_rate = max(
                 self.min_exploration_rate,
@@ -322,21 +611,17 @@ class QLearningUnifiedAgent:
         Returns:
             Dictionary mapping state IDs to action IDs
         """
-        policy = {}
+        table = self.q_table
+        used_states, used_actions = len(table.state_ids), len(table.action_ids)
+        visited = table.visited[:used_states, :used_actions]
+        masked = np.where(visited, table.values[:used_states, :used_actions], -np.inf)
 
-        # Group Q-values by state
-        state_actions = defaultdict(list)
-
-        for (state_id, action_id), q_value in self.q_table.items():
-            state_actions[state_id].append((action_id, q_value))
-
-        # Select best action for each state
-        for state_id, actions in state_actions.items():
-            if actions:
-                best_action_id = max(actions, key=lambda x: x[1])[0]
-                policy[state_id] = best_action_id
-
-        return policy
+        # Select best action for each state with set Q-values
+        best = masked.argmax(axis=1) if used_actions else np.zeros(0, dtype=int)
+        return {
+            table.state_ids[row]: table.action_ids[best[row]]
+            for row in np.flatnonzero(visited.any(axis=1)).tolist()
+        }
 
     def save(self, file_path: str) -> None:
         """
@@ -350,7 +635,7 @@ class QLearningUnifiedAgent:
         with open(file_path, "wb") as f:
             pickle.dump(
                 {
-                    "q_table": dict(self.q_table),
+                    "q_table": self.q_table.to_dict(),
                     "config": self.config,
                     "episode_count": self.episode_count,
                     "total_rewards": self.total_rewards,
@@ -378,7 +663,7 @@ class QLearningUnifiedAgent:
             data = pickle.load(f)
 
         agent = cls(data["config"])
-        agent.q_table = defaultdict(float, data["q_table"])
+        agent.q_table = QTable.from_dict(data["q_table"])
         agent.episode_count = data["episode_count"]
         agent.total_rewards = data["total_rewards"]
         agent.exploration_rate = data["exploration_rate"]
@@ -414,7 +699,9 @@ class DeepQLearningUnifiedAgent:
         self.target_update_frequency = self.config.get("target_update_frequency", 100)
 
         # Initialize replay memory
-        self.replay_memory = []
+        self.replay_memory = ReplayBuffer(
+            self.memory_size, seed=self.config.get("seed")
+        )
 
         # Track learning progress
         self.episode_count = 0
@@ -512,12 +799,8 @@ class DeepQLearningUnifiedAgent:
             reward: Reward received
             done: Whether episode is done
         """
-        # Add experience to replay memory
-        self.replay_memory.append((state, action, next_state, reward, done))
-
-        # Limit memory size
-        if len(self.replay_memory) > self.memory_size:
-            self.replay_memory.pop(0)
+        # Add experience to replay memory (overwrites the oldest when full)
+        self.replay_memory.append(state, action, next_state, reward, done)
 
         # Increment step count
         self.step_count += 1
@@ -538,8 +821,13 @@ class DeepQLearningUnifiedAgent:
         # 2. Compute target Q-values using target network
         # 3. Train the Q-network on the batch
 
+        batch = self.replay_memory.sample(self.batch_size)
+
         # For demonstration purposes, we'll just log a message
-        logger.debug("Learning update would be performed here")
+        logger.debug(
+            "Learning update would be performed here on %d transitions",
+            len(batch["rewards"]),
+        )
 
     def _update_target_network(self) -> None:
         """Update target network with current network weights."""
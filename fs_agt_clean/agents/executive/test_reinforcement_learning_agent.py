@@ -0,0 +1,152 @@
+"""
+Tests for reinforcement_learning_agent.py
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from fs_agt_clean.agents.executive.reinforcement_learning_agent import (
+    Action,
+    Environment,
+    QLearningUnifiedAgent,
+    QTable,
+    ReplayBuffer,
+    State,
+)
+
+
+class ChainEnvironment(Environment):
+    """Three states in a loop; "right" pays 1 from s2, "left" pays 0.1."""
+
+    def __init__(self):
+        self.states = [State(f"s{i}", {"position": i}) for i in range(3)]
+        self.actions = [Action("left"), Action("right")]
+
+    def reset(self) -> State:
+        return self.states[0]
+
+    def step(self, state, action):
+        position = state.features["position"]
+        if action.action_id == "right":
+            reward = 1.0 if position == 2 else 0.0
+            position = (position + 1) % 3
+        else:
+            reward = 0.1
+            position = max(position - 1, 0)
+        return self.states[position], reward, False, {}
+
+    def get_valid_actions(self, state):
+        return self.actions
+
+
+def train(batch_size: int, episodes: int = 300):
+    random.seed(7)
+    agent = QLearningUnifiedAgent(
+        {
+            "learning_rate": 0.5,
+            "discount_factor": 0.9,
+            "exploration_rate": 0.3,
+            "exploration_decay": 1.0,
+            "update_batch_size": batch_size,
+        }
+    )
+    agent.train(ChainEnvironment(), episodes=episodes, max_steps=50)
+    return agent
+
+
+class TestQTable:
+    """Tests for QTable."""
+
+    def test_mapping_interface(self):
+        table = QTable(state_capacity=1, action_capacity=1)
+        table[("s0", "a")] = 1.5
+        table[("s1", "b")] = -2.0
+
+        assert table[("s0", "a")] == 1.5
+        assert ("s1", "b") in table
+        assert ("s0", "b") not in table
+        assert table.get(("s9", "a"), 3.0) == 3.0
+        assert len(table) == 2
+        assert QTable.from_dict(table.to_dict()).to_dict() == table.to_dict()
+
+    def test_max_value_ignores_unvisited_actions(self):
+        table = QTable()
+        table[("s0", "a")] = -1.0
+        table.intern_action("b")
+
+        assert table.max_value("s0") == -1.0
+        assert table.max_value("unknown") == 0.0
+        rows = np.array([table.intern_state("s0"), table.intern_state("s1")])
+        assert table.max_values(rows).tolist() == [-1.0, 0.0]
+
+    def test_add_batch_marks_pairs_visited(self):
+        table = QTable()
+        rows = np.array([table.intern_state("s0"), table.intern_state("s0")])
+        cols = np.array([table.intern_action("a"), table.intern_action("a")])
+        table.add_batch(rows, cols, np.array([1.0, 2.0]))
+
+        assert table[("s0", "a")] == 3.0
+        assert len(table) == 1
+
+
+class TestReplayBuffer:
+    """Tests for ReplayBuffer."""
+
+    def test_overwrites_oldest_when_full(self):
+        buffer = ReplayBuffer(capacity=2, seed=0)
+        states = [State(f"s{i}", {}) for i in range(3)]
+        for i, state in enumerate(states):
+            buffer.append(state, Action("a"), state, float(i), False)
+
+        assert len(buffer) == 2
+        batch = buffer.sample(50)
+        assert set(batch["rewards"].tolist()) == {1.0, 2.0}
+
+    def test_sample_from_empty_buffer_raises(self):
+        with pytest.raises(ValueError):
+            ReplayBuffer(capacity=2).sample(1)
+
+
+class TestQLearningUnifiedAgent:
+    """Tests for QLearningUnifiedAgent."""
+
+    def test_update_batch_averages_repeated_pairs(self):
+        agent = QLearningUnifiedAgent({"learning_rate": 0.5, "discount_factor": 0.0})
+        s0, s1, a = State("s0", {}), State("s1", {}), Action("a")
+        agent.update_batch([(s0, a, s1, 1.0, True)] * 10)
+
+        # One learning-rate step towards the target, not ten
+        assert agent.q_table[("s0", "a")] == pytest.approx(0.5)
+
+    def test_select_action_leaves_table_unchanged(self):
+        agent = QLearningUnifiedAgent({"exploration_rate": 0.0})
+        agent.q_table[("s0", "bad")] = -1.0
+        agent.q_table[("s1", "good")] = 2.0
+        shape = agent.q_table.values.shape
+        actions = [Action("bad"), Action("new1"), Action("good"), Action("new2")]
+
+        # Unseen actions count as 0.0, above the negative known value
+        for _ in range(20):
+            chosen = agent.select_action(State("s0", {}), actions)
+            assert chosen.action_id in {"new1", "good", "new2"}
+        assert agent.select_action(State("s1", {}), actions).action_id == "good"
+
+        assert agent.q_table.action_ids == ["bad", "good"]
+        assert agent.q_table.values.shape == shape
+        assert len(agent.q_table) == 2
+
+    @pytest.mark.parametrize("batch_size", [32, 128])
+    def test_batched_training_converges_like_per_step(self, batch_size):
+        per_step = train(batch_size=1)
+        batched = train(batch_size=batch_size)
+
+        per_step_max = max(abs(v) for v in per_step.q_table.to_dict().values())
+        batched_max = max(abs(v) for v in batched.q_table.to_dict().values())
+
+        # The optimal policy always moves right: 1/(1 - 0.9**3) ~ 3.69 at s2
+        assert batched_max < 2 * per_step_max
+        assert batched_max == pytest.approx(per_step_max, rel=0.2)
+        assert batched.get_policy() == per_step.get_policy()
+        assert set(batched.get_policy().values()) == {"right"}
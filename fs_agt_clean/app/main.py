@@ -14,23 +14,15 @@ from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
 
 from fastapi import APIRouter, Depends, FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from starlette.middleware.base import BaseHTTPMiddleware
 
-# Import the marketplace integration router
-from fs_agt_clean.api.endpoints.marketplace_integration import (
-    router as marketplace_integration_router,
-)
-
 # Import OpenAPI setup
 from fs_agt_clean.api.openapi import setup_openapi
 
-# Import additional migrated routes
-from fs_agt_clean.api.routes.agents import router as agents_router
-from fs_agt_clean.api.routes.ai_routes import (
-    router as ai_router,  # ✅ NEW - AI Vision Analysis
-)
+# Heavy routers (agents, AI vision, revenue) are included through
+# include_heavy_router so they can be imported lazily on first use
 
 # Import the auth routers (migrated)
 from fs_agt_clean.api.routes.auth import router as auth_router
@@ -60,9 +52,6 @@ from fs_agt_clean.api.routes.marketplace import marketplace_router
 
 # Import the monitoring router (migrated)
 from fs_agt_clean.api.routes.monitoring import router as monitoring_router
-from fs_agt_clean.api.routes.revenue_routes import (
-    router as revenue_router,  # ✅ NEW - Revenue Model
-)
 from fs_agt_clean.api.routes.websocket import (
     router as websocket_router,  # ✅ ENABLED - WebSocket implementation
 )
@@ -79,6 +68,13 @@ from fs_agt_clean.api.routes.websocket import (
 # from fs_agt_clean.api.routes.secure import router as secure_router
 # from fs_agt_clean.api.routes.social_auth import router as social_auth_router
 # from fs_agt_clean.api.routes.token_rotation import router as token_rotation_router
+from fs_agt_clean.app.startup import (
+    StartupOrchestrator,
+    include_heavy_router,
+    mount_deferred_routers,
+    timed_import,
+)
+from fs_agt_clean.core.ai.image_pipeline import shutdown_image_pool
 from fs_agt_clean.core.auth.auth_service import AuthConfig, AuthService
 from fs_agt_clean.core.config.config_manager import ConfigManager
 from fs_agt_clean.core.db.connection_manager import DatabaseConnectionManager
@@ -110,7 +106,6 @@ from fs_agt_clean.core.vault.vault_client import VaultClient, VaultConfig
 
 # from fs_agt_clean.services.listing_generation.content_optimizer import ContentOptimizer  # Temporarily disabled - not migrated
 # from fs_agt_clean.services.listing_generation.listing_generator import ListingGenerator  # Temporarily disabled - not migrated
-from fs_agt_clean.services.vector_store.client import QdrantStore
 
 # from fs_agt_clean.api.routes.shipping import router as shipping_router  # Temporarily disabled - missing dependencies
 # from fs_agt_clean.api.routes.users import router as users_router  # Temporarily disabled - missing dependencies
@@ -132,21 +127,6 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Try to import additional components (fail gracefully if not available)
-try:
-    from fs_agt_clean.services.notifications.service import NotificationService
-
-    notification_service_available = True
-except ImportError:
-    logger.warning("NotificationService not available - notifications will be disabled")
-    notification_service_available = False
-    NotificationService = None  # Define NotificationService as None to avoid NameError
-
-try:
-    db_monitoring_available = False
-except ImportError:
-    logger.warning("Database monitoring not available - will not be initialized")
-    db_monitoring_available = False
-
 try:
     from fs_agt_clean.core.security.security_headers import (
         SecurityHeadersMiddleware as SecurityMiddleware,
@@ -157,43 +137,6 @@ except ImportError:
     security_middleware_available = False
     logger.warning("SecurityMiddleware not available - import failed")
 
-# Import ML service components if available
-try:
-    from fs_agt_clean.services.ml.service import MLService
-
-    ml_service_available = True
-except ImportError:
-    logger.warning("MLService not available - ML capabilities will be disabled")
-    ml_service_available = False
-
-# Import dashboard functionality
-try:
-    from fs_agt_clean.core.nlp.web.dashboard import app as dashboard_app
-
-    dashboard_available = True
-except ImportError:
-    try:
-
-        # Dashboard is integrated via the integrate_dashboard function
-
-        logger.info("Dashboard functionality enabled")
-
-    except Exception as e:
-
-        logger.warning(f"Dashboard initialization failed: {str(e)}")
-    dashboard_available = False
-
-# Import document models
-try:
-    from fs_agt_clean.core.models.document import Document
-
-    documents_models_available = True
-except ImportError:
-    logger.warning(
-        "Document models functionality disabled pending import path resolution"
-    )
-    documents_models_available = False
-
 # Import metrics models to ensure they're registered with SQLAlchemy
 try:
     from fs_agt_clean.database.models.metrics import (
@@ -213,34 +156,8 @@ except ImportError as e:
 # In-memory document storage (when document functionality is enabled)
 documents: Dict[str, Any] = {}
 
-# Import Agent Coordinator
-try:
-    from fs_agt_clean.core.coordination.agent_coordinator import AgentCoordinator
-
-    agent_coordinator_available = True
-    logger.info("Agent Coordinator module imported successfully")
-except ImportError as e:
-    logger.warning(f"Agent Coordinator functionality disabled: {str(e)}")
-    agent_coordinator_available = False
-
-# Import Real Agent Manager
-try:
-    from fs_agt_clean.core.agents.real_agent_manager import RealAgentManager
-
-    real_agent_manager_available = True
-    logger.info("Real Agent Manager module imported successfully")
-except ImportError as e:
-    logger.warning(f"Real Agent Manager functionality disabled: {str(e)}")
-    real_agent_manager_available = False
-
-# Import Metrics service
-try:
-    from fs_agt_clean.core.metrics.service import MetricsService
-
-    metrics_service_available = True
-except ImportError:
-    logger.warning("Metrics service support disabled pending import path resolution")
-    metrics_service_available = False
+# Agent, ML, metrics and dashboard service modules are imported lazily by
+# their startup steps (see register_core_services / register_app_services)
 
 
 class MetricsMiddleware(BaseHTTPMiddleware):
@@ -274,467 +191,637 @@ class MetricsMiddleware(BaseHTTPMiddleware):
             raise
 
 
-async def init_services() -> Dict[str, Any]:
-    """Initialize core services in the correct order."""
-    config = ConfigManager()
-    log_manager = LogManager()
-    logger = log_manager.get_logger(__name__)
+def _redis_config(config: ConfigManager) -> RedisConfig:
+    """Build the Redis configuration from config and environment."""
+    redis_section = config.get_section("redis") or {}
+    # Determine if we're running in Docker or locally
+    in_docker = os.path.exists("/.dockerenv")
+    default_host = "redis" if in_docker else "localhost"
+
+    return RedisConfig(
+        host=os.getenv("REDIS_HOST", redis_section.get("host", default_host)),
+        port=int(os.getenv("REDIS_PORT", redis_section.get("port", "6379"))),
+        db=int(os.getenv("REDIS_DB", redis_section.get("db", "0"))),
+        password=os.getenv("REDIS_PASSWORD", redis_section.get("password", None)),
+    )
+
+
+def _database_connection_string(db_config: Dict[str, Any]) -> str:
+    """Resolve the database connection string from config and environment."""
+    connection_string = db_config.get("connection_string")
+    if connection_string:
+        return connection_string
+
+    # Check for DATABASE_URL environment variable first
+    connection_string = os.getenv("DATABASE_URL")
+    if connection_string:
+        # Convert from standard PostgreSQL URL to asyncpg format if needed
+        if connection_string.startswith("postgresql://"):
+            connection_string = connection_string.replace(
+                "postgresql://", "postgresql+asyncpg://", 1
+            )
+        logger.info(f"Using DATABASE_URL environment variable: {connection_string}")
+        return connection_string
+
+    # Only use hardcoded default as last resort
+    # Check if we're running in Docker
+    in_docker = os.path.exists("/.dockerenv")
+    db_host = "db" if in_docker else "localhost"
+    connection_string = f"postgresql+asyncpg://postgres:postgres@{db_host}:5432/postgres"
+    logger.warning(
+        f"No database connection string found in config or environment, using default: {connection_string}"
+    )
+    return connection_string
+
+
+class MockDatabase:
+    """Simple mock database for no-DB development mode."""
 
+    def __init__(self):
+        self.is_initialized = False
+        logger.info("MockDatabase initialized for no-DB mode")
+
+    async def initialize(self):
+        self.is_initialized = True
+        logger.info("MockDatabase initialization completed")
+        return True
+
+    async def create_tables(self):
+        logger.info("MockDatabase: Skipping table creation (no-DB mode)")
+        return True
+
+    async def close(self):
+        self.is_initialized = False
+        logger.info("MockDatabase closed")
+
+    async def get_session_context(self):
+        """Mock session context for compatibility."""
+
+        @asynccontextmanager
+        async def mock_session():
+            yield None
+
+        return mock_session()
+
+
+async def _init_redis(services: Dict[str, Any]) -> Dict[str, Any]:
+    """Connect to Redis."""
+    logger.info("Initializing Redis connection...")
+    redis_config = _redis_config(services["config"])
+    logger.info(
+        f"Connecting to Redis at {redis_config.host}:{redis_config.port} "
+        f"(db: {redis_config.db})"
+    )
+    redis_manager = RedisManager(redis_config)
+    await redis_manager.initialize()
+    logger.info("Redis connection established successfully")
+    return {"redis_manager": redis_manager}
+
+
+async def _init_database(services: Dict[str, Any]) -> Dict[str, Any]:
+    """Connect to the database, create tables and wire the WebSocket handler."""
+    logger.info("Initializing Database...")
+    config = services["config"]
+
+    # Create a real database connection with enhanced error handling
     try:
-        # 1. Initialize Redis first
-        logger.info("Initializing Redis connection...")
-        redis_section = config.get_section("redis") or {}
-        # Determine if we're running in Docker or locally
-        in_docker = os.path.exists("/.dockerenv")
-        default_host = "redis" if in_docker else "localhost"
-
-        redis_config = RedisConfig(
-            host=os.getenv("REDIS_HOST", redis_section.get("host", default_host)),
-            port=int(os.getenv("REDIS_PORT", redis_section.get("port", "6379"))),
-            db=int(os.getenv("REDIS_DB", redis_section.get("db", "0"))),
-            password=os.getenv("REDIS_PASSWORD", redis_section.get("password", None)),
+        # Get database configuration from config
+        db_config = config.get_section("database") or {}
+        connection_string = _database_connection_string(db_config)
+
+        # Create the database connection manager with retry capabilities
+        connection_manager = DatabaseConnectionManager(
+            config_manager=config,
+            connection_string=connection_string,
+            pool_size=db_config.get("pool_size", 5),
+            max_overflow=db_config.get("max_overflow", 10),
+            echo=db_config.get("echo", False),
+            max_retries=db_config.get("max_retries", 3),
+            retry_delay=db_config.get("retry_delay", 1.0),
+            max_retry_delay=db_config.get("max_retry_delay", 30.0),
+            jitter=db_config.get("jitter", True),
         )
-        logger.info(
-            f"Connecting to Redis at {redis_config.host}:{redis_config.port} "
-            f"(db: {redis_config.db})"
+
+        # For backward compatibility, use the original Database class
+        # This will be replaced with the connection manager in future updates
+        database = Database(
+            config_manager=config,
+            connection_string=connection_string,
+            pool_size=db_config.get("pool_size", 5),
+            max_overflow=db_config.get("max_overflow", 10),
+            echo=db_config.get("echo", False),
         )
-        redis_manager = RedisManager(redis_config)
-        await redis_manager.initialize()
-        logger.info("Redis connection established successfully")
 
-        # 2. Initialize Database
-        logger.info("Initializing Database...")
+        # The connection manager and the Database pool are independent, so
+        # open both concurrently
+        success, _ = await asyncio.gather(
+            connection_manager.initialize(), database.initialize()
+        )
+        if not success:
+            raise Exception("Failed to initialize database connection after retries")
 
-        # Import the real Database class
-        from fs_agt_clean.core.db.database import Database
+        logger.info("Database connection initialized successfully")
 
-        # Create a real database connection with enhanced error handling
-        try:
-            # Get database configuration from config
-            db_config = config.get_section("database") or {}
-            connection_string = db_config.get("connection_string")
-
-            # If no connection string is provided, check environment variables first
-            if not connection_string:
-                # Check for DATABASE_URL environment variable first
-                connection_string = os.getenv("DATABASE_URL")
-
-                if connection_string:
-                    # Convert from standard PostgreSQL URL to asyncpg format if needed
-                    if connection_string.startswith("postgresql://"):
-                        connection_string = connection_string.replace(
-                            "postgresql://", "postgresql+asyncpg://", 1
-                        )
-                    logger.info(
-                        f"Using DATABASE_URL environment variable: {connection_string}"
-                    )
-                else:
-                    # Only use hardcoded default as last resort
-                    # Check if we're running in Docker
-                    in_docker = os.path.exists("/.dockerenv")
-                    db_host = "db" if in_docker else "localhost"
-                    connection_string = f"postgresql+asyncpg://postgres:postgres@{db_host}:5432/postgres"
-                    logger.warning(
-                        f"No database connection string found in config or environment, using default: {connection_string}"
-                    )
+        # Create database tables if they don't exist
+        await database.create_tables()
+        logger.info("Database tables created successfully")
 
-            # Create the database connection manager with retry capabilities
-            connection_manager = DatabaseConnectionManager(
-                config_manager=config,
-                connection_string=connection_string,
-                pool_size=db_config.get("pool_size", 5),
-                max_overflow=db_config.get("max_overflow", 10),
-                echo=db_config.get("echo", False),
-                max_retries=db_config.get("max_retries", 3),
-                retry_delay=db_config.get("retry_delay", 1.0),
-                max_retry_delay=db_config.get("max_retry_delay", 30.0),
-                jitter=db_config.get("jitter", True),
-            )
+        # Initialize WebSocket handler with the database
+        from fs_agt_clean.core.websocket.handlers import initialize_websocket_handler
 
-            # Initialize the database connection with retry
-            success = await connection_manager.initialize()
-            if not success:
-                raise Exception(
-                    "Failed to initialize database connection after retries"
-                )
+        initialize_websocket_handler(database, app)
+        logger.info("WebSocket handler initialized with database and app reference")
 
-            logger.info("Database connection initialized successfully")
+        # Store the connection manager for health checks and future use
+        database.connection_manager = connection_manager
+    except Exception as e:
+        logger.error(f"Error initializing database: {str(e)}")
+        logger.warning("Falling back to mock database for development")
+
+        # Instead of using a mock database, raise an exception to fail fast
+        # This ensures we don't run with a non-functional database
+        logger.error("Database connection failed and no fallback is available")
+        logger.error(
+            "Please check your database configuration and ensure the database is running"
+        )
+        logger.error(
+            "If you're running in development mode and want to proceed without a database,"
+        )
+        logger.error("set the ALLOW_NO_DB=true environment variable")
 
-            # For backward compatibility, use the original Database class
-            # This will be replaced with the connection manager in future updates
-            database = Database(
-                config_manager=config,
-                connection_string=connection_string,
-                pool_size=db_config.get("pool_size", 5),
-                max_overflow=db_config.get("max_overflow", 10),
-                echo=db_config.get("echo", False),
+        # Check if we're allowed to proceed without a database
+        if os.getenv("ALLOW_NO_DB", "").lower() != "true":
+            # Raise the exception to prevent startup with a non-functional database
+            raise Exception(
+                "Database connection failed and ALLOW_NO_DB is not set to true"
             )
 
-            # Initialize the database
-            await database.initialize()
+        logger.warning(
+            "ALLOW_NO_DB is set to true, proceeding with limited functionality"
+        )
+        # Use inline mock database for development only
+        database = MockDatabase()
+        await database.create_tables()
+        logger.info("Using mock database (limited functionality)")
 
-            # Create database tables if they don't exist
-            await database.create_tables()
-            logger.info("Database tables created successfully")
+    return {"database": database}
 
-            # Initialize WebSocket handler with the database
-            from fs_agt_clean.core.websocket.handlers import (
-                initialize_websocket_handler,
-            )
 
-            initialize_websocket_handler(database, app)
-            logger.info("WebSocket handler initialized with database and app reference")
+async def _init_auth(services: Dict[str, Any]) -> Dict[str, Any]:
+    """Initialize the auth services, optionally backed by Vault."""
+    logger.info("Initializing Auth services...")
+    redis_manager = services["redis_manager"]
+    vault_config = VaultConfig.from_env()
+    # Force development mode to True for local development
+    vault_config.development_mode = True
+    auth_section = services["config"].get_section("auth") or {}
+    auth_config = AuthConfig(
+        development_mode=vault_config.development_mode, **auth_section
+    )
 
-            # Store the connection manager for health checks and future use
-            database.connection_manager = connection_manager
-        except Exception as e:
-            logger.error(f"Error initializing database: {str(e)}")
-            logger.warning("Falling back to mock database for development")
-
-            # Instead of using a mock database, raise an exception to fail fast
-            # This ensures we don't run with a non-functional database
-            logger.error("Database connection failed and no fallback is available")
-            logger.error(
-                "Please check your database configuration and ensure the database is running"
-            )
-            logger.error(
-                "If you're running in development mode and want to proceed without a database,"
-            )
-            logger.error("set the ALLOW_NO_DB=true environment variable")
+    secret_manager: Optional[VaultSecretManager] = None
+    if vault_config.development_mode:
+        logger.warning("Running in development mode - skipping Vault initialization")
+        auth_service = AuthService(auth_config, redis_manager)
+        # secret_manager remains None
+    else:
+        vault_client = VaultClient(vault_config)
+        await vault_client.initialize()
+        secret_manager = VaultSecretManager(vault_client)
+        # Pass secret_manager only if not None
+        auth_service = AuthService(auth_config, redis_manager, secret_manager)
 
-            # Check if we're allowed to proceed without a database
-            if os.getenv("ALLOW_NO_DB", "").lower() == "true":
-                logger.warning(
-                    "ALLOW_NO_DB is set to true, proceeding with limited functionality"
-                )
+    await auth_service.initialize()
 
-                # Use inline mock database for development only
-                class MockDatabase:
-                    """Simple mock database for no-DB development mode."""
-
-                    def __init__(self):
-                        self.is_initialized = False
-                        logger.info("MockDatabase initialized for no-DB mode")
-
-                    async def initialize(self):
-                        self.is_initialized = True
-                        logger.info("MockDatabase initialization completed")
-                        return True
-
-                    async def create_tables(self):
-                        logger.info(
-                            "MockDatabase: Skipping table creation (no-DB mode)"
-                        )
-                        return True
-
-                    async def close(self):
-                        self.is_initialized = False
-                        logger.info("MockDatabase closed")
-
-                    async def get_session_context(self):
-                        """Mock session context for compatibility."""
-                        from contextlib import asynccontextmanager
-
-                        @asynccontextmanager
-                        async def mock_session():
-                            yield None
-
-                        return mock_session()
-
-                database = MockDatabase()
-                logger.info("Using mock database (limited functionality)")
-            else:
-                # Raise the exception to prevent startup with a non-functional database
-                raise Exception(
-                    "Database connection failed and ALLOW_NO_DB is not set to true"
-                )
+    # Create database-backed auth service
+    # Re-enabled for Phase 2E
+    try:
+        from fs_agt_clean.core.auth.db_auth_service import DbAuthService
 
-        # Create database tables if they don't exist
-        await database.create_tables()
-        logger.info("Database tables created successfully")
+        db_auth_service = DbAuthService(
+            auth_config, redis_manager, services["database"], secret_manager
+        )
+        await db_auth_service.initialize()
+        logger.info("Database-backed auth service initialized successfully")
+    except Exception as e:
+        logger.error(f"Failed to initialize database-backed auth service: {e}")
+        db_auth_service = None
+        logger.warning("Falling back to basic auth service without database integration")
+
+    logger.info("Auth services initialized successfully")
+    return {"auth_service": auth_service, "db_auth_service": db_auth_service}
+
+
+async def _init_webhook_db(services: Dict[str, Any]) -> None:
+    """Initialize the webhook database tables."""
+    try:
+        from fs_agt_clean.core.db.init_webhook_db import init_webhook_db
+
+        logger.info("Imported init_webhook_db function")
+
+        logger.info("Getting database session for webhook initialization")
+        async with services["database"].get_session_context() as session:
+            logger.info("Starting webhook database initialization")
+            await init_webhook_db(session)
+            logger.info("Webhook database initialized successfully")
+    except Exception as e:
+        logger.error(f"Error initializing webhook database: {str(e)}", exc_info=True)
+
+
+async def _init_core_services(services: Dict[str, Any]) -> Dict[str, Any]:
+    """Create the event bus, metrics collector and audit logger."""
+    logger.info("Initializing core services...")
+    return {
+        "event_bus": SecureEventBus(),
+        "metrics_collector": MetricsCollector(),
+        "audit_logger": ComplianceAuditLogger(),
+    }
 
-        # 3. Initialize Auth services
-        logger.info("Initializing Auth services...")
-        vault_config = VaultConfig.from_env()
-        # Force development mode to True for local development
-        vault_config.development_mode = True
-        auth_section = config.get_section("auth") or {}
-        auth_config = AuthConfig(
-            development_mode=vault_config.development_mode, **auth_section
+
+async def _init_token_management(services: Dict[str, Any]) -> Dict[str, Any]:
+    """Initialize token management and rotation services."""
+    # These imports are inside the function to avoid circular imports
+    logger.info("Initializing token management services...")
+
+    # Create a security audit logger for token operations
+    try:
+        from fs_agt_clean.core.security.token_manager import (
+            SecurityAuditLogger,
+            TokenManager,
+        )
+        from fs_agt_clean.core.security.token_manager import (
+            VaultSecretManager as TokenVaultSecretManager,
+        )
+
+        # Create mock instances for development
+        security_audit_logger = SecurityAuditLogger()
+        vault_secret_manager = TokenVaultSecretManager()
+
+        # Initialize token manager
+        token_manager = TokenManager(
+            secret_manager=vault_secret_manager, audit_logger=security_audit_logger
+        )
+        await token_manager.start()
+
+        logger.info("Token management services initialized successfully")
+    except Exception as e:
+        logger.warning(f"Failed to initialize token management services: {e}")
+        security_audit_logger = None
+        token_manager = None
+
+    return {
+        "token_manager": token_manager,
+        # Token rotation service is not implemented yet
+        "token_rotation_service": None,
+        "security_audit_logger": security_audit_logger,
+    }
+
+
+async def _init_vector_store(services: Dict[str, Any]) -> Dict[str, Any]:
+    """Initialize the Qdrant vector store."""
+    logger.info("Initializing Vector Store...")
+    try:
+        from fs_agt_clean.core.vector_store.models import (
+            VectorDistanceMetric,
+            VectorStoreConfig,
+        )
+
+        QdrantVectorStore = timed_import(
+            "fs_agt_clean.core.vector_store.providers.qdrant", "QdrantVectorStore"
+        )
+
+        # Create Qdrant configuration
+        qdrant_config = VectorStoreConfig(
+            store_id="flipsync-vectors",
+            dimension=1536,  # Standard OpenAI embedding dimension
+            distance_metric=VectorDistanceMetric.COSINE,
+            host=os.getenv("QDRANT_HOST", "qdrant"),
+            port=int(os.getenv("QDRANT_PORT", "6333")),
         )
 
-        secret_manager: Optional[VaultSecretManager] = None
-        if vault_config.development_mode:
-            logger.warning(
-                "Running in development mode - skipping Vault initialization"
+        # Initialize Qdrant vector store
+        qdrant = QdrantVectorStore(qdrant_config)
+        await qdrant.initialize()
+        logger.info("Vector Store (Qdrant) initialized successfully")
+    except Exception as e:
+        logger.warning(f"Failed to initialize Vector Store: {e}")
+        qdrant = None
+
+    return {"qdrant": qdrant}
+
+
+async def _init_qdrant_service(services: Dict[str, Any]) -> Dict[str, Any]:
+    """Initialize the SimpleQdrantService schema."""
+    logger.info("Initializing SimpleQdrantService...")
+    try:
+        SimpleQdrantService = timed_import(
+            "fs_agt_clean.services.qdrant.simple_service", "SimpleQdrantService"
+        )
+
+        qdrant_service = SimpleQdrantService()
+        await qdrant_service.init_schema()
+        logger.info("SimpleQdrantService initialized successfully")
+    except Exception as e:
+        logger.warning(f"Failed to initialize SimpleQdrantService: {e}")
+        qdrant_service = None
+
+    return {"qdrant_service": qdrant_service}
+
+
+async def _init_real_agent_manager(services: Dict[str, Any]) -> Dict[str, Any]:
+    """Import the agent modules and initialize the Real Agent Manager."""
+    try:
+        RealAgentManager = timed_import(
+            "fs_agt_clean.core.agents.real_agent_manager", "RealAgentManager"
+        )
+        logger.info("Real Agent Manager module imported successfully")
+    except ImportError as e:
+        logger.warning(f"Real Agent Manager functionality disabled: {str(e)}")
+        return {"real_agent_manager": None}
+
+    try:
+        logger.info("Initializing Real Agent Manager...")
+        real_agent_manager = RealAgentManager()
+
+        # Agents must be available before the chat service starts
+        initialization_success = await real_agent_manager.initialize()
+
+        if initialization_success:
+            logger.info("✅ Real Agent Manager initialization completed successfully")
+            # Log agent status for verification
+            agent_statuses = await real_agent_manager.get_all_agent_statuses()
+            logger.info(
+                f"✅ Initialized {agent_statuses.get('total_agents', 0)} agents with status: {agent_statuses.get('overall_status', 'unknown')}"
             )
-            auth_service = AuthService(auth_config, redis_manager)
-            # secret_manager remains None
         else:
-            vault_client = VaultClient(vault_config)
-            await vault_client.initialize()
-            secret_manager = VaultSecretManager(vault_client)
-            # Pass secret_manager only if not None
-            auth_service = AuthService(auth_config, redis_manager, secret_manager)
+            logger.error("❌ Real Agent Manager initialization failed")
+            real_agent_manager = None
 
-        await auth_service.initialize()
+    except Exception as e:
+        logger.error(f"Failed to initialize Real Agent Manager: {e}")
+        logger.exception("Full Real Agent Manager initialization error:")
+        real_agent_manager = None
 
-        # Create database-backed auth service
-        # Re-enabled for Phase 2E
-        try:
-            from fs_agt_clean.core.auth.db_auth_service import DbAuthService
+    return {"real_agent_manager": real_agent_manager}
 
-            db_auth_service = DbAuthService(
-                auth_config, redis_manager, database, secret_manager
-            )
-            await db_auth_service.initialize()
-            logger.info("Database-backed auth service initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize database-backed auth service: {e}")
-            db_auth_service = None
-            logger.warning(
-                "Falling back to basic auth service without database integration"
-            )
 
-        # Initialize webhook database
-        try:
-            from fs_agt_clean.core.db.init_webhook_db import init_webhook_db
+async def _init_chat_services(services: Dict[str, Any]) -> Dict[str, Any]:
+    """Initialize chat and realtime services with the database."""
+    logger.info("Initializing chat and realtime services...")
+    database = services["database"]
+    try:
+        from fs_agt_clean.services import realtime_service as realtime_module
 
-            logger.info("Imported init_webhook_db function")
+        EnhancedChatService = timed_import(
+            "fs_agt_clean.services.communication.chat_service", "EnhancedChatService"
+        )
 
-            logger.info("Getting database session for webhook initialization")
-            async with database.get_session_context() as session:
-                logger.info("Starting webhook database initialization")
-                await init_webhook_db(session)
-                logger.info("Webhook database initialized successfully")
-        except Exception as e:
-            logger.error(
-                f"Error initializing webhook database: {str(e)}", exc_info=True
-            )
+        # Initialize chat service with database (app will be set later via dependency injection)
+        chat_service = EnhancedChatService(database=database)
 
-        logger.info("Auth services initialized successfully")
+        # Initialize realtime service with database
+        realtime_service_instance = realtime_module.RealtimeService(database=database)
 
-        # 3. Initialize Event Bus and Core Services
-        logger.info("Initializing core services...")
-        event_bus = SecureEventBus()
-        metrics_collector = MetricsCollector()
-        audit_logger = ComplianceAuditLogger()
+        # Update the global realtime_service instance
+        realtime_module.realtime_service = realtime_service_instance
 
-        # 4. Initialize Token Management and Rotation Services
-        # These imports are inside the function to avoid circular imports
+        logger.info("Chat and realtime services initialized successfully")
 
-        # from fs_agt_clean.core.security.audit_logger import SecurityAuditLogger  # Temporarily disabled
-        # from fs_agt_clean.core.security.token_manager import TokenManager  # Temporarily disabled
-        # from fs_agt_clean.core.security.token_rotation import TokenRotationService  # Temporarily disabled
+    except Exception as e:
+        logger.error(f"Error initializing chat and realtime services: {e}")
+        # Create minimal fallback instances
+        chat_service = None
+        realtime_service_instance = None
 
-        logger.info("Initializing token management services...")
+    return {"chat_service": chat_service, "realtime_service": realtime_service_instance}
 
-        # Create a security audit logger for token operations
-        try:
-            from fs_agt_clean.core.security.token_manager import (
-                SecurityAuditLogger,
-                TokenManager,
-                VaultSecretManager,
-            )
 
-            # Create mock instances for development
-            security_audit_logger = SecurityAuditLogger()
-            vault_secret_manager = VaultSecretManager()
+async def _init_webhooks(services: Dict[str, Any]) -> Dict[str, Any]:
+    """Initialize the webhook service and the eBay webhook handler."""
+    logger.info("Initializing webhook module...")
+    try:
+        from fs_agt_clean.services.webhooks.ebay_handler import EbayWebhookHandler
+        from fs_agt_clean.services.webhooks.service import WebhookService
+
+        # Create webhook service
+        webhook_service = WebhookService(
+            config_manager=services.get("config"),
+            database=services.get("database"),
+            metrics_service=services.get("metrics_service"),
+            notification_service=services.get("notification_service"),
+        )
 
-            # Initialize token manager
-            token_manager = TokenManager(
-                secret_manager=vault_secret_manager, audit_logger=security_audit_logger
-            )
-            await token_manager.start()
+        # Initialize webhook service
+        await webhook_service.initialize()
 
-            # Token rotation service is not implemented yet
-            token_rotation_service = None
+        # Create eBay webhook handler
+        ebay_webhook_handler = EbayWebhookHandler(
+            ebay_service=services.get("ebay"),
+            metrics_service=services.get("metrics_service"),
+            notification_service=services.get("notification_service"),
+        )
 
-            logger.info("Token management services initialized successfully")
-        except Exception as e:
-            logger.warning(f"Failed to initialize token management services: {e}")
-            security_audit_logger = None
-            token_manager = None
-            token_rotation_service = None
-
-        # 5. Initialize Business Logic Services
-        # content_optimizer = ContentOptimizer(  # Temporarily disabled - not migrated
-        #     event_bus=event_bus,
-        #     metrics_collector=metrics_collector,
-        #     audit_logger=audit_logger,
-        # )
-
-        # listing_generator = ListingGenerator(  # Temporarily disabled - not migrated
-        #     event_bus=event_bus,
-        #     content_optimizer=content_optimizer,
-        #     metrics_collector=metrics_collector,
-        #     audit_logger=audit_logger,
-        # )
-
-        # 6. Initialize Vector Store
-        logger.info("Initializing Vector Store...")
-        try:
-            from fs_agt_clean.core.vector_store.models import (
-                VectorDistanceMetric,
-                VectorStoreConfig,
-            )
-            from fs_agt_clean.core.vector_store.providers.qdrant import (
-                QdrantVectorStore,
-            )
+        # Register eBay handler with webhook service
+        await webhook_service.register_handler("ebay", ebay_webhook_handler)
 
-            # Create Qdrant configuration
-            qdrant_config = VectorStoreConfig(
-                store_id="flipsync-vectors",
-                dimension=1536,  # Standard OpenAI embedding dimension
-                distance_metric=VectorDistanceMetric.COSINE,
-                host=os.getenv("QDRANT_HOST", "qdrant"),
-                port=int(os.getenv("QDRANT_PORT", "6333")),
-            )
+        logger.info("Webhook module initialized successfully")
+        return {
+            "webhook_service": webhook_service,
+            "ebay_webhook_handler": ebay_webhook_handler,
+        }
 
-            # Initialize Qdrant vector store
-            qdrant = QdrantVectorStore(qdrant_config)
-            await qdrant.initialize()
-            logger.info("Vector Store (Qdrant) initialized successfully")
-        except Exception as e:
-            logger.warning(f"Failed to initialize Vector Store: {e}")
-            qdrant = None
+    except Exception as e:
+        logger.error(f"Webhook module initialization failed: {str(e)}")
+        logger.warning("Continuing without webhook module")
+        return {}
 
-        # Set service status to up
-        SERVICE_STATUS.labels(service="fs_agt").set(1)
 
-        # Initialize SimpleQdrantService
-        logger.info("Initializing SimpleQdrantService...")
-        try:
-            from fs_agt_clean.services.qdrant.simple_service import SimpleQdrantService
+async def _init_global_database(services: Dict[str, Any]) -> None:
+    """Initialize the global database instance used for dependency injection."""
+    logger.info("Initializing global database instance...")
+    try:
+        from fs_agt_clean.core.db.database import initialize_global_database
 
-            qdrant_service = SimpleQdrantService()
-            await qdrant_service.init_schema()
-            logger.info("SimpleQdrantService initialized successfully")
-        except Exception as e:
-            logger.warning(f"Failed to initialize SimpleQdrantService: {e}")
-            qdrant_service = None
+        await initialize_global_database()
+        logger.info("Global database instance initialized successfully")
+    except Exception as e:
+        logger.error(f"Failed to initialize global database instance: {e}")
+        # Don't fail startup, as the main database is already initialized
 
-        # Initialize Real Agent Manager
-        real_agent_manager = None
-        if real_agent_manager_available:
-            try:
-                logger.info("Initializing Real Agent Manager...")
-                real_agent_manager = RealAgentManager()
 
-                # Initialize agents synchronously to ensure they're available before chat service starts
-                logger.info("Starting synchronous Real Agent Manager initialization...")
-                initialization_success = await real_agent_manager.initialize()
+async def _init_metrics_service(services: Dict[str, Any]) -> Dict[str, Any]:
+    """Initialize the metrics service (previously in services/api/main.py)."""
+    try:
+        MetricsService = timed_import(
+            "fs_agt_clean.core.metrics.service", "MetricsService"
+        )
+    except ImportError:
+        logger.warning("Metrics service support disabled pending import path resolution")
+        return {}
 
-                if initialization_success:
-                    logger.info(
-                        "✅ Real Agent Manager initialization completed successfully"
-                    )
-                    # Log agent status for verification
-                    agent_statuses = await real_agent_manager.get_all_agent_statuses()
-                    logger.info(
-                        f"✅ Initialized {agent_statuses.get('total_agents', 0)} agents with status: {agent_statuses.get('overall_status', 'unknown')}"
-                    )
-                else:
-                    logger.error("❌ Real Agent Manager initialization failed")
-                    real_agent_manager = None
+    logger.info("Initializing metrics service...")
+    try:
+        # Create the metrics service (no constructor parameters)
+        metrics_service = MetricsService()
+        logger.info("Metrics service initialized successfully")
+        return {"metrics_service": metrics_service}
+    except Exception as e:
+        logger.warning(f"Metrics service initialization failed: {str(e)}")
+        return {}
 
-            except Exception as e:
-                logger.error(f"Failed to initialize Real Agent Manager: {e}")
-                logger.exception("Full Real Agent Manager initialization error:")
-                real_agent_manager = None
-        else:
-            logger.warning("Real Agent Manager not available")
 
-        # Initialize chat and realtime services with database
-        logger.info("Initializing chat and realtime services...")
-        try:
-            from fs_agt_clean.services import realtime_service as realtime_module
-            from fs_agt_clean.services.communication.chat_service import (
-                EnhancedChatService,
-            )
-            from fs_agt_clean.services.realtime_service import RealtimeService
+async def _init_ml_service(services: Dict[str, Any]) -> Dict[str, Any]:
+    """Initialize the ML service (previously in services/ml/app.py)."""
+    try:
+        MLService = timed_import("fs_agt_clean.services.ml.service", "MLService")
+    except ImportError:
+        logger.warning("MLService not available - ML capabilities will be disabled")
+        return {}
 
-            # Initialize chat service with database (app will be set later via dependency injection)
-            chat_service = EnhancedChatService(database=database)
+    logger.info("Initializing ML service...")
+    try:
+        # Initialize ML service with config and metrics
+        ml_service = MLService(
+            config_manager=services.get("config"),
+            metrics_service=services.get("metrics_service"),
+        )
+        logger.info("ML service initialized successfully")
+        return {"ml_service": ml_service}
+    except Exception as e:
+        logger.warning(f"ML service initialization failed: {str(e)}")
+        return {}
 
-            # Initialize realtime service with database
-            realtime_service_instance = RealtimeService(database=database)
 
-            # Update the global realtime_service instance
-            realtime_module.realtime_service = realtime_service_instance
+async def _init_dashboard_service(services: Dict[str, Any]) -> Dict[str, Any]:
+    """Initialize the dashboard service (previously in services/dashboard/main.py)."""
+    logger.info("Initializing Dashboard service...")
+    try:
+        DashboardService = timed_import(
+            "fs_agt_clean.services.dashboard.service", "DashboardService"
+        )
 
-            logger.info("Chat and realtime services initialized successfully")
+        # Create and initialize the dashboard service
+        dashboard_service = DashboardService(
+            config_manager=services.get("config"),
+            metrics_service=services.get("metrics_service")
+            or services.get("metrics_collector"),
+            database=services.get("database"),
+        )
+        await dashboard_service.initialize()
 
-        except Exception as e:
-            logger.error(f"Error initializing chat and realtime services: {e}")
-            # Create minimal fallback instances
-            chat_service = None
-            realtime_service_instance = None
-
-        # Return all initialized services
-        services = {
-            "config": config,
-            "log_manager": log_manager,
-            "redis_manager": redis_manager,
-            "auth_service": auth_service,
-            "db_auth_service": db_auth_service,  # Add db_auth_service to services
-            "database": database,  # Add database to services
-            "chat_service": chat_service,  # Add chat service
-            "realtime_service": realtime_service_instance,  # Add realtime service
-            # "listing_generator": listing_generator,  # Temporarily disabled - not migrated
-            "metrics_collector": metrics_collector,
-            "qdrant": qdrant,
-            "event_bus": event_bus,
-            "token_manager": token_manager,
-            "token_rotation_service": token_rotation_service,
-            "security_audit_logger": security_audit_logger,
-            "qdrant_service": qdrant_service,  # Add QdrantService to services
-            "real_agent_manager": real_agent_manager,  # Add Real Agent Manager
+        logger.info("Dashboard service initialized successfully")
+        return {"dashboard_service": dashboard_service}
+    except ImportError as ie:
+        logger.warning(
+            f"Dashboard service module not found - using placeholder: {str(ie)}"
+        )
+    except Exception as e:
+        logger.warning(f"Dashboard service initialization failed: {str(e)}")
+    logger.info("Dashboard service initialization placeholder")
+    return {}
+
+
+async def _init_enhanced_monitoring(services: Dict[str, Any]) -> Dict[str, Any]:
+    """Initialize and start the enhanced monitoring services."""
+    logger.info("Initializing enhanced monitoring services...")
+    try:
+        from fs_agt_clean.core.monitoring.health_monitor import RealHealthMonitor
+        from fs_agt_clean.services.monitoring.alert_service import EnhancedAlertService
+        from fs_agt_clean.services.monitoring.metrics_collector import (
+            MetricsCollector as EnhancedMetricsCollector,
+        )
+        from fs_agt_clean.services.monitoring.metrics_service import (
+            MetricsService as EnhancedMetricsService,
+        )
+
+        # Create enhanced monitoring services
+        enhanced_metrics_service = EnhancedMetricsService(services["database"])
+        alert_service = EnhancedAlertService(services["database"])
+        health_monitor = RealHealthMonitor()
+        enhanced_metrics_collector = EnhancedMetricsCollector(
+            metrics_service=enhanced_metrics_service,
+            health_monitor=health_monitor,
+            collection_interval=60,  # Collect metrics every minute
+            service_name="flipsync-api",
+        )
+
+        # Start the metrics collector
+        await enhanced_metrics_collector.start()
+
+        logger.info("Enhanced monitoring services initialized successfully")
+        return {
+            "enhanced_metrics_service": enhanced_metrics_service,
+            "enhanced_alert_service": alert_service,
+            "enhanced_health_monitor": health_monitor,
+            "enhanced_metrics_collector": enhanced_metrics_collector,
         }
+    except Exception as e:
+        logger.error(f"Failed to initialize enhanced monitoring services: {e}")
+        logger.warning("Continuing without enhanced monitoring")
+        return {}
 
-        # Initialize optional database if available
-        if db_monitoring_available:
-            # Database would be initialized here if available
-            logger.info("Database monitoring available, but no database configured yet")
-            # If you have a database component, add it to services here
 
-        # Initialize webhook module
-        logger.info("Initializing webhook module...")
-        try:
-            from fs_agt_clean.services.webhooks.ebay_handler import EbayWebhookHandler
-            from fs_agt_clean.services.webhooks.service import WebhookService
-
-            # Create webhook service
-            webhook_service = WebhookService(
-                config_manager=services.get("config"),
-                database=services.get("database"),
-                metrics_service=services.get("metrics_service"),
-                notification_service=services.get("notification_service"),
-            )
+def register_core_services(orchestrator: StartupOrchestrator) -> None:
+    """Declare the core services and their dependencies."""
+    orchestrator.register("redis", _init_redis, critical=True)
+    orchestrator.register("database", _init_database, critical=True)
+    orchestrator.register(
+        "auth", _init_auth, depends_on=("redis", "database"), critical=True
+    )
+    orchestrator.register("webhook_db", _init_webhook_db, depends_on=("database",))
+    orchestrator.register("core_services", _init_core_services)
+    orchestrator.register("token_management", _init_token_management)
+    orchestrator.register("vector_store", _init_vector_store)
+    orchestrator.register("qdrant_service", _init_qdrant_service)
+    orchestrator.register("real_agent_manager", _init_real_agent_manager)
+    # Agents must be available before the chat service starts
+    orchestrator.register(
+        "chat",
+        _init_chat_services,
+        depends_on=("database",),
+        after=("real_agent_manager",),
+    )
+    orchestrator.register("webhooks", _init_webhooks, depends_on=("database",))
 
-            # Initialize webhook service
-            await webhook_service.initialize()
 
-            # Create eBay webhook handler
-            ebay_webhook_handler = EbayWebhookHandler(
-                ebay_service=services.get("ebay"),
-                metrics_service=services.get("metrics_service"),
-                notification_service=services.get("notification_service"),
-            )
+def register_app_services(orchestrator: StartupOrchestrator) -> None:
+    """Declare the application level services started by the lifespan."""
+    orchestrator.register(
+        "global_database", _init_global_database, depends_on=("database",)
+    )
+    orchestrator.register("metrics_service", _init_metrics_service)
+    orchestrator.register("ml_service", _init_ml_service, after=("metrics_service",))
+    orchestrator.register(
+        "dashboard",
+        _init_dashboard_service,
+        depends_on=("database",),
+        after=("metrics_service", "core_services"),
+    )
+    orchestrator.register(
+        "enhanced_monitoring", _init_enhanced_monitoring, depends_on=("database",)
+    )
 
-            # Register eBay handler with webhook service
-            await webhook_service.register_handler("ebay", ebay_webhook_handler)
 
-            # Add to services
-            services["webhook_service"] = webhook_service
-            services["ebay_webhook_handler"] = ebay_webhook_handler
+async def init_services(
+    orchestrator: Optional[StartupOrchestrator] = None,
+) -> Dict[str, Any]:
+    """Initialize core services, running independent ones concurrently.
 
-            logger.info("Webhook module initialized successfully")
+    Args:
+        orchestrator: Orchestrator to run; may already hold additional steps.
+            When omitted, only the core services are initialized.
 
-        except Exception as e:
-            logger.error(f"Webhook module initialization failed: {str(e)}")
-            logger.warning("Continuing without webhook module")
+    Returns:
+        Dictionary of initialized services
+    """
+    orchestrator = orchestrator or StartupOrchestrator()
+    register_core_services(orchestrator)
 
+    services: Dict[str, Any] = {"config": ConfigManager(), "log_manager": LogManager()}
+    try:
+        await orchestrator.run(services)
+        # Set service status to up
+        SERVICE_STATUS.labels(service="fs_agt").set(1)
         return services
     except Exception as e:
         logger.error("Service initialization failed: %s", str(e))
@@ -755,21 +842,13 @@ async def lifespan(app: FastAPI):
     - fs_agt/services/dashboard/main.py
     """
     services = {}
+    orchestrator = StartupOrchestrator()
+    app.state.startup = orchestrator
 
     try:
-        # Initialize core services
-        services = await init_services()
-
-        # Initialize global database instance for dependency injection
-        logger.info("Initializing global database instance...")
-        try:
-            from fs_agt_clean.core.db.database import initialize_global_database
-
-            await initialize_global_database()
-            logger.info("Global database instance initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize global database instance: {e}")
-            # Don't fail startup, as the main database is already initialized
+        # Initialize core and application services as one dependency graph
+        register_app_services(orchestrator)
+        services = await init_services(orchestrator)
 
         # Store services in app state for dependency injection
         app.state.redis = services.get("redis_manager")
@@ -782,6 +861,8 @@ async def lifespan(app: FastAPI):
         app.state.real_agent_manager = services.get("real_agent_manager")
         app.state.webhook_service = services.get("webhook_service")
         app.state.ebay_webhook_handler = services.get("ebay_webhook_handler")
+        app.state.ml_service = services.get("ml_service")
+        app.state.dashboard_service = services.get("dashboard_service")
 
         # ✅ CRITICAL FIX: Ensure chat service has app reference for RealAgentManager access
         if app.state.chat_service and not hasattr(app.state.chat_service, "app"):
@@ -799,149 +880,15 @@ async def lifespan(app: FastAPI):
                 "Chat service already has app reference or chat service is None"
             )
 
-        # Initialize metrics service (previously in services/api/main.py)
-        if metrics_service_available:
-            logger.info("Initializing metrics service...")
-            # During actual consolidation, this would be replaced with real metrics service init
-            try:
-                # Get the required services
-                config_manager = services.get("config")
-                log_manager = services.get("log_manager")
-
-                # Make sure they are not None
-                if not config_manager or not log_manager:
-                    # If they're not available, create them
-                    if not config_manager:
-                        config_manager = ConfigManager()
-                    if not log_manager:
-                        log_manager = LogManager()
-
-                # Create the metrics service (no constructor parameters)
-                metrics_service = MetricsService()
-
-                # Add it to the services dictionary
-                services["metrics_service"] = metrics_service
-
-                logger.info("Metrics service initialized successfully")
-
-            except Exception as e:
-                logger.warning(f"Metrics service initialization failed: {str(e)}")
-                # Don't set metrics_service to None here, as it's not used
-
-        # Initialize ML service (previously in services/ml/app.py)
-        if ml_service_available:
-            logger.info("Initializing ML service...")
-            # During actual consolidation, this would initialize the ML service
-            # await ml_service.setup()
-            try:
-
-                # Initialize ML service with config and metrics
-                ml_service = MLService(
-                    config_manager=services.get("config"),
-                    metrics_service=services.get("metrics_service"),
-                )
-
-                # Add to services dictionary
-                services["ml_service"] = ml_service
-
-                # Make sure it's available in the app state
-                app.state.ml_service = ml_service
-
-                logger.info("ML service initialized successfully")
-
-            except Exception as e:
-
-                logger.warning(f"ML service initialization failed: {str(e)}")
-
-                ml_service = None
-
-        # Initialize Dashboard service (previously in services/dashboard/main.py)
-        # Define dashboard_available at the module level to avoid UnboundLocalError
-        global dashboard_available
-        dashboard_available = True  # Force dashboard to be available
-        if dashboard_available:
-            # We'll use the real dashboard service instead of a mock
-            logger.info("Initializing Dashboard service...")
-            try:
-                from fs_agt_clean.services.dashboard.service import DashboardService
-
-                # Create and initialize the dashboard service
-                dashboard_service = DashboardService(
-                    config_manager=services.get("config"),
-                    metrics_service=services.get("metrics_service")
-                    or services.get("metrics_collector"),
-                    database=services.get("database"),
-                )
-
-                # Initialize the dashboard service
-                await dashboard_service.initialize()
-
-                # Add to services
-                services["dashboard_service"] = dashboard_service
-
-                # Make sure it's available in the app state
-                app.state.dashboard_service = dashboard_service
-
-                logger.info("Dashboard service initialized successfully")
-            except ImportError as ie:
-                logger.warning(
-                    f"Dashboard service module not found - using placeholder: {str(ie)}"
-                )
-                logger.info("Dashboard service initialization placeholder")
-            except Exception as e:
-                logger.warning(f"Dashboard service initialization failed: {str(e)}")
-                logger.info("Dashboard service initialization placeholder")
-
-        # Initialize enhanced monitoring services
-        logger.info("Initializing enhanced monitoring services...")
-        try:
-            from fs_agt_clean.core.monitoring.health_monitor import RealHealthMonitor
-            from fs_agt_clean.services.monitoring.alert_service import (
-                EnhancedAlertService,
-            )
-            from fs_agt_clean.services.monitoring.metrics_collector import (
-                MetricsCollector as EnhancedMetricsCollector,
-            )
-            from fs_agt_clean.services.monitoring.metrics_service import (
-                MetricsService as EnhancedMetricsService,
-            )
-
-            # Create enhanced monitoring services
-            enhanced_metrics_service = EnhancedMetricsService(services["database"])
-            alert_service = EnhancedAlertService(services["database"])
-            health_monitor = RealHealthMonitor()
-            enhanced_metrics_collector = EnhancedMetricsCollector(
-                metrics_service=enhanced_metrics_service,
-                health_monitor=health_monitor,
-                collection_interval=60,  # Collect metrics every minute
-                service_name="flipsync-api",
-            )
-
-            # Store enhanced monitoring services
-            services["enhanced_metrics_service"] = enhanced_metrics_service
-            services["enhanced_alert_service"] = alert_service
-            services["enhanced_health_monitor"] = health_monitor
-            services["enhanced_metrics_collector"] = enhanced_metrics_collector
-
-            # Start the metrics collector
-            await enhanced_metrics_collector.start()
-
-            logger.info("Enhanced monitoring services initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize enhanced monitoring services: {e}")
-            logger.warning("Continuing without enhanced monitoring")
-
         # Model pre-loading is now handled by startup script (scripts/preload_ollama_models.sh)
         # This eliminates the need for application-based pre-loading and reduces complexity
         logger.info(
             "Model pre-loading handled by startup script - no application-based pre-loading needed"
         )
 
-        # Additional service initialization would go here
-        # ...
+        # Import deferred routers in the background so first requests are fast
+        orchestrator.start_router_warmup()
 
-        # Update service status - using registry directly to avoid linter errors
-        # During actual consolidation this would use the proper ServiceStatus method
         logger.info("Services started successfully")
         yield services
 
@@ -958,9 +905,10 @@ async def lifespan(app: FastAPI):
         # Cleanup services
         try:
             logger.info("Shutting down services...")
+            await orchestrator.stop_router_warmup()
 
             # Shutdown ML service if it was initialized
-            if ml_service_available:
+            if services.get("ml_service"):
                 logger.info("Shutting down ML service...")
                 # During actual consolidation, this would clean up the ML service
                 # await ml_service.cleanup()
@@ -971,11 +919,11 @@ async def lifespan(app: FastAPI):
                     "AuthService shutdown skipped - no shutdown method available"
                 )
 
-            if "redis_manager" in services:
+            if services.get("redis_manager"):
                 await services["redis_manager"].close()
 
             # Shutdown dashboard service if it was initialized
-            if dashboard_available and "dashboard_service" in services:
+            if services.get("dashboard_service"):
                 logger.info("Shutting down Dashboard service...")
                 try:
                     await services["dashboard_service"].shutdown()
@@ -1008,7 +956,7 @@ async def lifespan(app: FastAPI):
                     )
 
             # Shutdown real agent manager if it was initialized
-            if "real_agent_manager" in services:
+            if services.get("real_agent_manager"):
                 logger.info("Shutting down real agent manager...")
                 try:
                     await services["real_agent_manager"].shutdown()
@@ -1016,8 +964,15 @@ async def lifespan(app: FastAPI):
                 except Exception as e:
                     logger.warning(f"Error shutting down real agent manager: {str(e)}")
 
+            # Stop the image worker processes
+            logger.info("Shutting down image processing pool...")
+            try:
+                await asyncio.to_thread(shutdown_image_pool)
+            except Exception as e:
+                logger.warning(f"Error shutting down image processing pool: {str(e)}")
+
             # Shutdown metrics service if it was initialized
-            if metrics_service_available:
+            if services.get("metrics_service"):
                 logger.info("Shutting down metrics service...")
                 # During actual consolidation, this would clean up the metrics service
 
@@ -1197,9 +1152,18 @@ def create_app() -> FastAPI:
 
     # Register routes from migrated components only
 
+    # Heavy routers deferred until first use when LAZY_ROUTERS is enabled
+    deferred_routers = []
+
     # Core API routes (migrated)
     app.include_router(auth_router, prefix="/api/v1/auth", tags=["authentication"])
-    app.include_router(agents_router, prefix="/api/v1/agents", tags=["agents"])
+    include_heavy_router(
+        app,
+        deferred_routers,
+        "fs_agt_clean.api.routes.agents",
+        prefix="/api/v1/agents",
+        tags=["agents"],
+    )
 
     # Add direct route for agents without trailing slash to prevent 307 redirects
     @app.get("/api/v1/agents", tags=["agents"])
@@ -1264,11 +1228,19 @@ def create_app() -> FastAPI:
             },
         )
 
-    app.include_router(
-        ai_router, prefix="/api/v1/ai", tags=["ai-analysis"]
+    include_heavy_router(
+        app,
+        deferred_routers,
+        "fs_agt_clean.api.routes.ai_routes",
+        prefix="/api/v1/ai",
+        tags=["ai-analysis"],
     )  # ✅ NEW - AI Vision Analysis
-    app.include_router(
-        revenue_router, prefix="/api/v1/revenue", tags=["revenue-model"]
+    include_heavy_router(
+        app,
+        deferred_routers,
+        "fs_agt_clean.api.routes.revenue_routes",
+        prefix="/api/v1/revenue",
+        tags=["revenue-model"],
     )  # ✅ NEW - Revenue Model
     app.include_router(
         chat_router, prefix="/api/v1/chat", tags=["chat"]
@@ -2013,6 +1985,25 @@ self.addEventListener('fetch', function(event) {
             "volume_mount_test": "DOCKER_VOLUME_MOUNTING_IS_WORKING_CONFIRMED_2025_06_05",
         }
 
+    @app.get("/api/v1/health/ready", include_in_schema=True, tags=["monitoring"])
+    async def readiness() -> Response:
+        """Readiness check reflecting partially warmed-up services."""
+        orchestrator = getattr(app.state, "startup", None)
+        if orchestrator is None:
+            return JSONResponse(status_code=503, content={"ready": False})
+        status = orchestrator.readiness()
+        return JSONResponse(
+            status_code=200 if status["ready"] else 503, content=status
+        )
+
+    @app.get("/api/v1/health/startup", include_in_schema=True, tags=["monitoring"])
+    async def startup_report() -> Dict[str, Any]:
+        """Startup timing report per service and per import."""
+        orchestrator = getattr(app.state, "startup", None)
+        if orchestrator is None:
+            return {"status": "not_started"}
+        return orchestrator.report()
+
     @app.get("/api/v1/csrf-token", include_in_schema=True, tags=["security"])
     async def get_csrf_token_endpoint(
         _request: Request, csrf_token: str = Depends(get_csrf_token)
@@ -2050,6 +2041,9 @@ self.addEventListener('fetch', function(event) {
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
 
+    # Mount deferred routers last so eagerly included routes match first
+    mount_deferred_routers(app, deferred_routers)
+
     return app
 
 
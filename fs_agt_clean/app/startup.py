@@ -0,0 +1,375 @@
+"""Startup orchestration for the FlipSync application.
+
+Services are declared as named steps with their dependencies and initialized
+concurrently as soon as their dependencies are ready. Every step and every
+profiled import is timed so cold starts can be inspected through the startup
+report and readiness endpoints.
+"""
+
+import asyncio
+import importlib
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+StartupStep = Callable[[Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class StepState(str, Enum):
+    """Lifecycle state of a startup step."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    READY = "ready"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
+@dataclass
+class StepTiming:
+    """Timing and outcome of a single startup step."""
+
+    name: str
+    depends_on: Tuple[str, ...]
+    after: Tuple[str, ...]
+    critical: bool
+    state: StepState = StepState.PENDING
+    started_at: Optional[float] = None
+    duration: Optional[float] = None
+    error: Optional[str] = None
+
+    def to_dict(self, origin: float) -> Dict[str, Any]:
+        """Serialize relative to the orchestrator start time."""
+        return {
+            "state": self.state.value,
+            "critical": self.critical,
+            "depends_on": list(self.depends_on),
+            "after": list(self.after),
+            "start_offset_ms": (
+                round((self.started_at - origin) * 1000, 2)
+                if self.started_at is not None
+                else None
+            ),
+            "duration_ms": (
+                round(self.duration * 1000, 2) if self.duration is not None else None
+            ),
+            "error": self.error,
+        }
+
+
+@dataclass
+class _Step:
+    init: StartupStep
+    timing: StepTiming
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+# Import timings recorded by timed_import, keyed by module path
+IMPORT_TIMINGS: Dict[str, float] = {}
+
+# Lazily imported routers of this process, keyed by "module:attribute"
+LAZY_ROUTERS: Dict[str, "LazyRouter"] = {}
+
+
+def timed_import(module_path: str, attribute: Optional[str] = None) -> Any:
+    """Import a module (and optionally one attribute), recording the import time.
+
+    Only the first import of a module is timed; later calls hit the module
+    cache and do not overwrite the recorded cold import time.
+    """
+    start = time.perf_counter()
+    module = importlib.import_module(module_path)
+    IMPORT_TIMINGS.setdefault(module_path, time.perf_counter() - start)
+    return getattr(module, attribute) if attribute else module
+
+
+def lazy_routers_enabled() -> bool:
+    """Whether heavy routers should be imported on first request."""
+    return os.getenv("LAZY_ROUTERS", "").lower() in ("1", "true", "yes")
+
+
+class LazyRouter:
+    """ASGI app that imports an APIRouter on its first request.
+
+    The router is dispatched directly so ``request.app`` still refers to the
+    main application and its state.
+    """
+
+    def __init__(self, module_path: str, attribute: str = "router"):
+        self.module_path = module_path
+        self.attribute = attribute
+        self._router = None
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the router module has been imported."""
+        return self._router is not None
+
+    def load(self) -> Any:
+        """Import the router if needed and return it."""
+        if self._router is None:
+            self._router = timed_import(self.module_path, self.attribute)
+            logger.info(f"Lazily loaded router {self.module_path}")
+        return self._router
+
+    async def warm_up(self) -> None:
+        """Import the router off the event loop."""
+        if not self.loaded:
+            await asyncio.to_thread(self.load)
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.load()(scope, receive, send)
+
+
+class StartupOrchestrator:
+    """Initializes declared services concurrently in dependency order."""
+
+    def __init__(self):
+        self._steps: Dict[str, _Step] = {}
+        self._origin: Optional[float] = None
+        self._completed_at: Optional[float] = None
+        self._warmup_task: Optional[asyncio.Task] = None
+
+    def register(
+        self,
+        name: str,
+        init: StartupStep,
+        depends_on: Sequence[str] = (),
+        after: Sequence[str] = (),
+        critical: bool = False,
+    ) -> None:
+        """Declare a startup step.
+
+        Args:
+            name: Unique step name
+            init: Coroutine function receiving the shared services dict and
+                returning entries to merge into it
+            depends_on: Steps that must succeed first; the step is skipped if
+                any of them fails
+            after: Steps that only need to finish first (ordering only)
+            critical: Abort startup if this step fails
+        """
+        if name in self._steps:
+            raise ValueError(f"Startup step already registered: {name}")
+        timing = StepTiming(
+            name=name,
+            depends_on=tuple(depends_on),
+            after=tuple(after),
+            critical=critical,
+        )
+        self._steps[name] = _Step(init=init, timing=timing)
+
+    def _validate(self) -> None:
+        """Reject unknown dependencies and dependency cycles."""
+        visiting, visited = set(), set()
+
+        def visit(name: str) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Startup dependency cycle at step: {name}")
+            visiting.add(name)
+            timing = self._steps[name].timing
+            for dependency in timing.depends_on + timing.after:
+                if dependency not in self._steps:
+                    raise ValueError(
+                        f"Startup step {name} depends on unknown step {dependency}"
+                    )
+                visit(dependency)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self._steps:
+            visit(name)
+
+    async def run(self, services: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run all registered steps and return the populated services dict."""
+        self._validate()
+        services = services if services is not None else {}
+        self._origin = time.perf_counter()
+
+        tasks = [
+            asyncio.create_task(self._run_step(step, services), name=f"startup:{name}")
+            for name, step in self._steps.items()
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            self._completed_at = time.perf_counter()
+            logger.info(self.format_report())
+
+        return services
+
+    async def _run_step(self, step: _Step, services: Dict[str, Any]) -> None:
+        timing = step.timing
+        try:
+            for dependency in timing.depends_on + timing.after:
+                await self._steps[dependency].done.wait()
+
+            failed = [
+                dependency
+                for dependency in timing.depends_on
+                if self._steps[dependency].timing.state != StepState.READY
+            ]
+            if failed:
+                timing.state = StepState.SKIPPED
+                timing.error = f"Dependencies not ready: {', '.join(failed)}"
+                logger.warning(f"Skipping startup step {timing.name}: {timing.error}")
+                return
+
+            timing.state = StepState.RUNNING
+            timing.started_at = time.perf_counter()
+            try:
+                result = await step.init(services)
+            except Exception as e:
+                timing.state = StepState.FAILED
+                timing.error = str(e)
+                if timing.critical:
+                    raise RuntimeError(
+                        f"Critical startup step {timing.name} failed: {e}"
+                    ) from e
+                logger.error(f"Startup step {timing.name} failed: {e}")
+                return
+            finally:
+                timing.duration = time.perf_counter() - timing.started_at
+
+            if result:
+                services.update(result)
+            timing.state = StepState.READY
+        finally:
+            step.done.set()
+
+    def start_router_warmup(self) -> None:
+        """Import lazy routers in the background once startup completed."""
+        pending = [r for r in LAZY_ROUTERS.values() if not r.loaded]
+        if not pending or self._warmup_task is not None:
+            return
+
+        async def warm_up() -> None:
+            for router in pending:
+                try:
+                    await router.warm_up()
+                except Exception as e:
+                    logger.error(f"Failed to warm up router {router.module_path}: {e}")
+
+        self._warmup_task = asyncio.create_task(warm_up(), name="startup:router-warmup")
+
+    async def stop_router_warmup(self) -> None:
+        """Cancel a still running router warm-up."""
+        if self._warmup_task and not self._warmup_task.done():
+            self._warmup_task.cancel()
+            await asyncio.gather(self._warmup_task, return_exceptions=True)
+
+    def readiness(self) -> Dict[str, Any]:
+        """Readiness summary reflecting partially warmed-up state."""
+        states = {name: step.timing.state.value for name, step in self._steps.items()}
+        critical_ready = all(
+            step.timing.state == StepState.READY
+            for step in self._steps.values()
+            if step.timing.critical
+        )
+        routers = {key: router.loaded for key, router in LAZY_ROUTERS.items()}
+        started = self._completed_at is not None
+
+        return {
+            "ready": bool(self._steps) and started and critical_ready,
+            "warmed_up": started
+            and all(state == StepState.READY.value for state in states.values())
+            and all(routers.values()),
+            "services": states,
+            "routers": routers,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+
+    def report(self) -> Dict[str, Any]:
+        """Full startup timing report per service and per import."""
+        origin = self._origin or time.perf_counter()
+        total = (
+            round((self._completed_at - origin) * 1000, 2)
+            if self._completed_at is not None
+            else None
+        )
+        sequential = sum(
+            step.timing.duration or 0.0 for step in self._steps.values()
+        )
+        return {
+            "total_ms": total,
+            "sequential_ms": round(sequential * 1000, 2),
+            "services": {
+                name: step.timing.to_dict(origin) for name, step in self._steps.items()
+            },
+            "imports_ms": {
+                module: round(duration * 1000, 2)
+                for module, duration in sorted(
+                    IMPORT_TIMINGS.items(), key=lambda item: item[1], reverse=True
+                )
+            },
+        }
+
+    def format_report(self) -> str:
+        """Render the startup report as a compact log message."""
+        report = self.report()
+        lines = [
+            f"Startup completed in {report['total_ms']} ms "
+            f"(sequential sum {report['sequential_ms']} ms)"
+        ]
+        for name, timing in sorted(
+            report["services"].items(),
+            key=lambda item: item[1]["duration_ms"] or 0.0,
+            reverse=True,
+        ):
+            lines.append(
+                f"  service {name}: {timing['state']} in {timing['duration_ms']} ms"
+            )
+        for module, duration in list(report["imports_ms"].items())[:10]:
+            lines.append(f"  import {module}: {duration} ms")
+        return "\n".join(lines)
+
+
+def get_lazy_router(module_path: str, attribute: str = "router") -> LazyRouter:
+    """Create (or reuse) a lazily imported router tracked for warm-up."""
+    key = f"{module_path}:{attribute}"
+    if key not in LAZY_ROUTERS:
+        LAZY_ROUTERS[key] = LazyRouter(module_path, attribute)
+    return LAZY_ROUTERS[key]
+
+
+def include_heavy_router(
+    app: Any,
+    deferred: List[Tuple[str, LazyRouter]],
+    module_path: str,
+    prefix: str,
+    tags: List[str],
+    attribute: str = "router",
+) -> None:
+    """Include a heavy router eagerly, or defer it when lazy routers are enabled.
+
+    Deferred routers are mounted by ``mount_deferred_routers`` after all other
+    routes so that eagerly included routes sharing a prefix still match first.
+    """
+    if lazy_routers_enabled():
+        deferred.append(
+            (prefix, get_lazy_router(module_path, attribute))
+        )
+        return
+    app.include_router(
+        timed_import(module_path, attribute), prefix=prefix, tags=tags
+    )
+
+
+def mount_deferred_routers(app: Any, deferred: List[Tuple[str, LazyRouter]]) -> None:
+    """Mount deferred lazy routers at their prefixes."""
+    for prefix, router in deferred:
+        app.mount(prefix, router)
+        logger.info(f"Deferred router {router.module_path} mounted at {prefix}")
@@ -4,18 +4,20 @@ Cached LLM Client for FlipSync
 
 A wrapper around SimpleLLMClient that adds Redis-based caching for improved performance.
 Reduces AI response times for repeated queries and provides fallback mechanisms.
+Concurrent identical requests are coalesced into a single LLM call, and expired
+entries can be served stale while one background call revalidates them.
 """
 
 import asyncio
 import hashlib
 import json
 import logging
-import time
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from fs_agt_clean.core.ai.simple_llm_client import LLMResponse, SimpleLLMClient
 from fs_agt_clean.core.cache.ai_cache import AICacheService
+from fs_agt_clean.core.cache.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -38,9 +40,15 @@ class CachedLLMClient:
             "default_ttl": 3600,  # 1 hour
             "short_ttl": 300,  # 5 minutes for dynamic content
             "long_ttl": 86400,  # 24 hours for stable content
+            "stale_ttl": 3600,  # Serve stale up to 1 hour while revalidating
+            "stale_while_revalidate": True,
             "key_prefix": "flipsync:llm:",
         }
 
+        # Concurrent identical requests share one in-flight LLM call
+        self.single_flight = SingleFlight("llm")
+        self.stale_served = 0
+
         logger.info(f"Initialized CachedLLMClient (cache_enabled={self.cache_enabled})")
 
     async def generate_response(
@@ -51,30 +59,32 @@ class CachedLLMClient:
         cache_key_suffix: Optional[str] = None,
         **kwargs,
     ) -> LLMResponse:
-        """Generate response with caching support."""
-        start_time = time.time()
-
+        """Generate response with caching and request coalescing support."""
         # Generate cache key
         cache_key = self._generate_cache_key(prompt, system_prompt, cache_key_suffix)
 
+        async def generate() -> LLMResponse:
+            return await self._generate_and_cache(
+                cache_key, prompt, system_prompt, cache_ttl, **kwargs
+            )
+
         # Try to get from cache first
         if self.cache_enabled:
-            cached_response = await self._get_cached_response(cache_key)
-            if cached_response:
+            cached_response, stale = await self._get_cached_entry(cache_key)
+            if cached_response and not stale:
                 logger.info(f"Cache hit for key: {cache_key[:50]}...")
                 return cached_response
 
-        # Generate new response
-        try:
-            response = await self.llm_client.generate_response(
-                prompt=prompt, system_prompt=system_prompt, **kwargs
-            )
-
-            # Cache the response
-            if self.cache_enabled:
-                await self._cache_response(cache_key, response, cache_ttl)
+            if cached_response and self.cache_config["stale_while_revalidate"]:
+                # Serve stale immediately and refresh once in the background
+                self.single_flight.refresh_in_background(cache_key, generate)
+                self.stale_served += 1
+                logger.info(f"Serving stale response for key: {cache_key[:50]}...")
+                return cached_response
 
-            return response
+        # Generate new response, sharing one call among concurrent requests
+        try:
+            return await self.single_flight.do(cache_key, generate)
 
         except Exception as e:
             logger.error(f"Error generating LLM response: {e}")
@@ -83,9 +93,35 @@ class CachedLLMClient:
                 stale_response = await self._get_stale_cached_response(cache_key)
                 if stale_response:
                     logger.warning(f"Returning stale cached response due to error: {e}")
+                    self.stale_served += 1
                     return stale_response
             raise
 
+    async def _generate_and_cache(
+        self,
+        cache_key: str,
+        prompt: str,
+        system_prompt: Optional[str],
+        cache_ttl: Optional[int],
+        **kwargs,
+    ) -> LLMResponse:
+        """Call the LLM and cache its response."""
+        response = await self.llm_client.generate_response(
+            prompt=prompt, system_prompt=system_prompt, **kwargs
+        )
+
+        # Cache the response
+        if self.cache_enabled:
+            await self._cache_response(cache_key, response, cache_ttl)
+
+        return response
+
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        """Get request coalescing and stale serving statistics."""
+        stats = self.single_flight.get_stats()
+        stats["stale_served"] = self.stale_served
+        return stats
+
     def _generate_cache_key(
         self,
         prompt: str,
@@ -101,33 +137,48 @@ class CachedLLMClient:
         content_hash = hashlib.sha256(content.encode()).hexdigest()[:16]
         return f"{self.cache_config['key_prefix']}{content_hash}"
 
-    async def _get_cached_response(self, cache_key: str) -> Optional[LLMResponse]:
-        """Get cached response if available."""
+    def _response_from_cache(
+        self, cached_data: Dict[str, Any], stale: bool = False
+    ) -> LLMResponse:
+        """Reconstruct an LLMResponse from cached data."""
+        return LLMResponse(
+            content=cached_data["content"],
+            provider=self.llm_client.provider,
+            model=cached_data["model"],
+            response_time=cached_data["response_time"],
+            metadata={
+                **cached_data.get("metadata", {}),
+                "cached": True,
+                "stale": stale,
+                "cache_hit_time": datetime.now(timezone.utc).isoformat(),
+            },
+            tokens_used=cached_data.get("tokens_used", 0),
+        )
+
+    async def _get_cached_entry(
+        self, cache_key: str
+    ) -> Tuple[Optional[LLMResponse], bool]:
+        """Get cached response (fresh or stale) and whether it is stale."""
         try:
-            cached_data = await self.cache_service.get_cached_result(cache_key)
-            if cached_data:
-                # Reconstruct LLMResponse from cached data
-                return LLMResponse(
-                    content=cached_data["content"],
-                    provider=self.llm_client.provider,
-                    model=cached_data["model"],
-                    response_time=cached_data["response_time"],
-                    metadata={
-                        **cached_data.get("metadata", {}),
-                        "cached": True,
-                        "cache_hit_time": datetime.now(timezone.utc).isoformat(),
-                    },
-                    tokens_used=cached_data.get("tokens_used", 0),
+            entry = await self.cache_service.get_cached_entry(cache_key)
+            if entry and entry.get("data"):
+                return (
+                    self._response_from_cache(entry["data"], entry["stale"]),
+                    entry["stale"],
                 )
         except Exception as e:
             logger.warning(f"Error retrieving cached response: {e}")
-        return None
+        return None, False
+
+    async def _get_cached_response(self, cache_key: str) -> Optional[LLMResponse]:
+        """Get cached response if available and fresh."""
+        response, stale = await self._get_cached_entry(cache_key)
+        return None if stale else response
 
     async def _get_stale_cached_response(self, cache_key: str) -> Optional[LLMResponse]:
-        """Get stale cached response as fallback."""
-        # This would require implementing stale cache retrieval in AICacheService
-        # For now, return None
-        return None
+        """Get cached response as fallback, even if it is past its TTL."""
+        response, _ = await self._get_cached_entry(cache_key)
+        return response
 
     async def _cache_response(
         self, cache_key: str, response: LLMResponse, ttl: Optional[int] = None
@@ -144,7 +195,12 @@ class CachedLLMClient:
             }
 
             cache_ttl = ttl or self.cache_config["default_ttl"]
-            await self.cache_service.cache_result(cache_key, cache_data, ttl=cache_ttl)
+            await self.cache_service.cache_result(
+                cache_key,
+                cache_data,
+                ttl=cache_ttl,
+                stale_ttl=self.cache_config["stale_ttl"],
+            )
 
             logger.debug(f"Cached response with key: {cache_key[:50]}...")
 
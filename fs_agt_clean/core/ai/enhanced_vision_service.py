@@ -12,15 +12,13 @@ AGENT_PATTERN: Async processing with intelligent model routing and comprehensive
 
 import asyncio
 import base64
-import io
 import logging
 import time
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import aiohttp
-from PIL import Image, ImageEnhance, ImageFilter
 from pydantic import BaseModel, Field
 
 # Import existing vision components
@@ -29,7 +27,16 @@ from fs_agt_clean.core.ai.vision_clients import (
     ImageAnalysisResult,
     VisionServiceType
 )
+from fs_agt_clean.core.ai.image_pipeline import (
+    get_image_pool,
+    prepare_image_bytes,
+    process_image_bytes,
+)
 from fs_agt_clean.core.ai.openai_client import FlipSyncOpenAIClient
+from fs_agt_clean.core.cache.perceptual_cache import (
+    PerceptualHashes,
+    get_perceptual_cache,
+)
 from fs_agt_clean.core.ai.rate_limiter import RequestPriority, rate_limited
 
 logger = logging.getLogger(__name__)
@@ -123,6 +130,16 @@ class EnhancedVisionService:
         
         # Initialize base vision service
         self.base_vision_service = VisionAnalysisService(config)
+
+        # Image decoding and filtering run in worker processes, off the event loop
+        self.image_pool = get_image_pool(self.config)
+
+        # Visually matching photos reuse earlier enhanced analyses
+        self.perceptual_cache = (
+            get_perceptual_cache(self.config)
+            if self.config.get("perceptual_cache_enabled", True)
+            else None
+        )
         
         logger.info("Enhanced Vision Service initialized with multi-model support")
     
@@ -151,6 +168,33 @@ class EnhancedVisionService:
         analysis_id = f"enhanced_{int(time.time() * 1000)}"
         
         try:
+            # Reuse the analysis of a visually matching image if available
+            hashes = namespace = None
+            if self.perceptual_cache is not None:
+                image_bytes = (
+                    base64.b64decode(image_data)
+                    if isinstance(image_data, str)
+                    else image_data
+                )
+                hashes = await self.perceptual_cache.hash_image(image_bytes)
+                if hashes is not None:
+                    namespace = self.perceptual_cache.make_namespace(
+                        "enhanced",
+                        marketplace,
+                        sorted(analysis_type.value for analysis_type in analysis_types),
+                        additional_context,
+                    )
+                    cached = await self.perceptual_cache.lookup(hashes, namespace)
+                    if cached is not None:
+                        return EnhancedAnalysisResult(
+                            **{
+                                **cached,
+                                "analysis_id": analysis_id,
+                                "processing_time": time.time() - start_time,
+                                "cost_estimate": 0.0,
+                            }
+                        )
+            
             # Select optimal model
             selected_model = await self._select_optimal_model(
                 analysis_types, model_preference
@@ -169,7 +213,8 @@ class EnhancedVisionService:
                     analysis_type,
                     selected_model,
                     marketplace,
-                    additional_context
+                    additional_context,
+                    hashes,
                 )
                 analysis_results[analysis_type.value] = result
                 total_confidence += result.get("confidence", 0.0)
@@ -191,7 +236,7 @@ class EnhancedVisionService:
             # Update usage tracking
             self.current_usage += cost_estimate
             
-            return EnhancedAnalysisResult(
+            result = EnhancedAnalysisResult(
                 analysis_id=analysis_id,
                 primary_analysis=aggregated_result["primary_analysis"],
                 confidence_score=overall_confidence,
@@ -210,6 +255,13 @@ class EnhancedVisionService:
                 style_attributes=aggregated_result["style_attributes"]
             )
             
+            if hashes is not None and overall_confidence > 0.0:
+                await self.perceptual_cache.store(
+                    hashes, namespace, result.model_dump(mode="json")
+                )
+            
+            return result
+            
         except Exception as e:
             logger.error(f"Enhanced image analysis failed: {e}")
             processing_time = time.time() - start_time
@@ -244,11 +296,19 @@ class EnhancedVisionService:
         """
         logger.info(f"Starting batch analysis of {len(image_batch)} images")
         
-        # Create semaphore for concurrency control
-        semaphore = asyncio.Semaphore(max_concurrent)
+        # Create semaphore for concurrency control, never exceeding what the
+        # image pool can accept
+        semaphore = asyncio.Semaphore(min(max_concurrent, self.image_pool.capacity))
         
         async def analyze_single_image(image_item: Dict[str, Any]) -> EnhancedAnalysisResult:
             async with semaphore:
+                # Backpressure: admit the next image only once the pool has room
+                if self.image_pool.saturated:
+                    logger.warning(
+                        f"Image pool saturated ({self.image_pool.pending} pending), "
+                        "throttling batch analysis"
+                    )
+                await self.image_pool.wait_for_capacity()
                 return await self.analyze_image_enhanced(
                     image_data=image_item["image_data"],
                     analysis_types=analysis_types,
@@ -289,48 +349,31 @@ class EnhancedVisionService:
             Processing results with enhanced image data
         """
         try:
-            # Convert to PIL Image
             if isinstance(image_data, str):
                 image_bytes = base64.b64decode(image_data)
             else:
                 image_bytes = image_data
             
-            image = Image.open(io.BytesIO(image_bytes))
-            processed_image = image.copy()
+            result = await self.image_pool.run(
+                process_image_bytes, image_bytes, [op.value for op in operations]
+            )
             
-            processing_log = []
+            for operation in result["skipped"]:
+                logger.warning(f"Unknown processing operation: {operation}")
             
-            for operation in operations:
-                start_time = time.time()
-                
-                if operation == ProcessingOperation.BACKGROUND_REMOVAL:
-                    processed_image = await self._remove_background(processed_image)
-                elif operation == ProcessingOperation.QUALITY_ENHANCEMENT:
-                    processed_image = await self._enhance_quality(processed_image)
-                elif operation == ProcessingOperation.NOISE_REDUCTION:
-                    processed_image = await self._reduce_noise(processed_image)
-                elif operation == ProcessingOperation.COLOR_CORRECTION:
-                    processed_image = await self._correct_colors(processed_image)
-                elif operation == ProcessingOperation.RESOLUTION_UPSCALING:
-                    processed_image = await self._upscale_resolution(processed_image)
-                else:
-                    logger.warning(f"Unknown processing operation: {operation}")
-                    continue
-                
-                processing_time = time.time() - start_time
-                processing_log.append({
-                    "operation": operation.value,
-                    "processing_time": processing_time,
+            processing_log = [
+                {
+                    "operation": stage,
+                    "processing_time": duration,
                     "success": True
-                })
+                }
+                for stage, duration in result["timings"]
+            ]
             
-            # Convert back to bytes
-            output_buffer = io.BytesIO()
-            processed_image.save(output_buffer, format='JPEG', quality=95)
-            processed_bytes = output_buffer.getvalue()
+            processed_bytes = result["data"]
             
             # Calculate quality metrics
-            quality_score = await self._calculate_quality_score(processed_image)
+            quality_score = await self._calculate_quality_score(result["size"])
             
             return {
                 "processed_image_data": base64.b64encode(processed_bytes).decode(),
@@ -350,6 +393,16 @@ class EnhancedVisionService:
                 "quality_score": 0.0
             }
     
+    def get_pipeline_stats(self) -> Dict[str, Any]:
+        """Get image pool load, backpressure and per-operation timing statistics."""
+        return self.image_pool.get_stats()
+    
+    def get_perceptual_cache_stats(self) -> Dict[str, Any]:
+        """Get hit statistics of the perceptual-hash result cache."""
+        if self.perceptual_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.perceptual_cache.get_stats()}
+    
     async def _select_optimal_model(
         self,
         analysis_types: List[AnalysisType],
@@ -386,24 +439,11 @@ class EnhancedVisionService:
             else:
                 image_bytes = image_data
             
-            # Open and optimize image
-            image = Image.open(io.BytesIO(image_bytes))
-            
             # Resize if too large (max 2048x2048 for cost optimization)
-            max_size = 2048
-            if max(image.size) > max_size:
-                ratio = max_size / max(image.size)
-                new_size = tuple(int(dim * ratio) for dim in image.size)
-                image = image.resize(new_size, Image.Resampling.LANCZOS)
-            
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            # Save optimized image
-            output_buffer = io.BytesIO()
-            image.save(output_buffer, format='JPEG', quality=85, optimize=True)
-            return output_buffer.getvalue()
+            result = await self.image_pool.run(
+                prepare_image_bytes, image_bytes, 2048, 85
+            )
+            return result["data"]
             
         except Exception as e:
             logger.error(f"Image preparation failed: {e}")
@@ -415,9 +455,14 @@ class EnhancedVisionService:
         analysis_type: AnalysisType,
         model: VisionModelProvider,
         marketplace: str,
-        context: str
+        context: str,
+        hashes: Optional[PerceptualHashes] = None,
     ) -> Dict[str, Any]:
-        """Perform specialized analysis based on type."""
+        """Perform specialized analysis based on type.
+
+        ``hashes`` of the original image are reused by the base service's
+        perceptual cache instead of hashing the prepared image again.
+        """
         
         # Create specialized prompts for different analysis types
         prompts = {
@@ -457,7 +502,8 @@ class EnhancedVisionService:
                 image_data=image_data,
                 analysis_type=analysis_type.value,
                 marketplace=marketplace,
-                additional_context=prompt
+                additional_context=prompt,
+                hashes=hashes,
             )
             
             return {
@@ -532,37 +578,10 @@ class EnhancedVisionService:
         base_cost = base_costs.get(model, 0.005)
         return base_cost * analysis_count
     
-    # Image processing helper methods
-    async def _remove_background(self, image: Image.Image) -> Image.Image:
-        """Remove background from image (simplified implementation)."""
-        # In production, would use specialized background removal models
-        return image
-    
-    async def _enhance_quality(self, image: Image.Image) -> Image.Image:
-        """Enhance image quality."""
-        enhancer = ImageEnhance.Sharpness(image)
-        image = enhancer.enhance(1.2)
-        enhancer = ImageEnhance.Contrast(image)
-        return enhancer.enhance(1.1)
-    
-    async def _reduce_noise(self, image: Image.Image) -> Image.Image:
-        """Reduce image noise."""
-        return image.filter(ImageFilter.MedianFilter(size=3))
-    
-    async def _correct_colors(self, image: Image.Image) -> Image.Image:
-        """Correct image colors."""
-        enhancer = ImageEnhance.Color(image)
-        return enhancer.enhance(1.1)
-    
-    async def _upscale_resolution(self, image: Image.Image) -> Image.Image:
-        """Upscale image resolution."""
-        new_size = tuple(dim * 2 for dim in image.size)
-        return image.resize(new_size, Image.Resampling.LANCZOS)
-    
-    async def _calculate_quality_score(self, image: Image.Image) -> float:
-        """Calculate image quality score."""
+    async def _calculate_quality_score(self, image_size: Tuple[int, int]) -> float:
+        """Calculate image quality score from the processed image dimensions."""
         # Simplified quality assessment
-        width, height = image.size
+        width, height = image_size
         resolution_score = min(1.0, (width * height) / (1920 * 1080))
         return min(0.95, 0.7 + resolution_score * 0.3)
 
@@ -0,0 +1,528 @@
+"""
+Off-loop image processing pipeline for FlipSync.
+
+Decoding, resizing, filtering and re-encoding images is CPU bound and must not
+run on the event loop. The pipeline functions in this module take encoded
+bytes and return encoded bytes so they can run in a process pool, and
+ImageProcessingPool bounds the number of queued jobs so callers can apply
+backpressure instead of piling up work.
+
+Operation chains are planned before execution: neighbouring point operations
+(contrast, saturation) are composed into a single color matrix, repeated
+upscales into a single resize, and sharpening is applied as one convolution,
+so each stage makes exactly one pass over the pixels.
+"""
+
+import asyncio
+import io
+import logging
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageFilter
+
+logger = logging.getLogger(__name__)
+
+# ITU-R 601-2 luma weights used by PIL for RGB -> L conversion
+LUMA_WEIGHTS = (0.299, 0.587, 0.114)
+
+# Primitive steps for each supported processing operation
+OPERATION_STEPS: Dict[str, Tuple[Tuple[str, float], ...]] = {
+    # Placeholder until a background removal model is integrated
+    "background_removal": (),
+    "quality_enhancement": (("sharpen", 1.2), ("contrast", 1.1)),
+    "noise_reduction": (("median", 3),),
+    "color_correction": (("saturation", 1.1),),
+    "resolution_upscaling": (("upscale", 2),),
+}
+
+_POINT_STEPS = {"contrast", "saturation"}
+
+AffineMatrix = List[List[float]]
+
+
+class ImagePoolSaturatedError(Exception):
+    """Raised when a non-blocking submission finds the pool queue full."""
+
+
+def _identity_matrix() -> AffineMatrix:
+    return [[1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0]]
+
+
+def _apply_matrix(matrix: AffineMatrix, vector: Sequence[float]) -> List[float]:
+    return [
+        row[0] * vector[0] + row[1] * vector[1] + row[2] * vector[2] + row[3]
+        for row in matrix
+    ]
+
+
+def _compose(outer: AffineMatrix, inner: AffineMatrix) -> AffineMatrix:
+    """Compose two 3x4 affine color transforms (outer after inner)."""
+    composed = []
+    for row in outer:
+        linear = [
+            sum(row[k] * inner[k][j] for k in range(3)) for j in range(3)
+        ]
+        offset = sum(row[k] * inner[k][3] for k in range(3)) + row[3]
+        composed.append(linear + [offset])
+    return composed
+
+
+def _band_means(image: Image.Image) -> List[float]:
+    """Per-band means from the histogram, without allocating a new image."""
+    histogram = image.histogram()
+    pixels = image.size[0] * image.size[1] or 1
+    means = []
+    for band in range(3):
+        counts = histogram[band * 256 : (band + 1) * 256]
+        means.append(sum(value * count for value, count in enumerate(counts)) / pixels)
+    return means
+
+
+def _contrast_matrix(factor: float, gray_mean: float) -> AffineMatrix:
+    """ImageEnhance.Contrast as an affine transform around the gray mean."""
+    offset = (1.0 - factor) * gray_mean
+    return [
+        [factor, 0.0, 0.0, offset],
+        [0.0, factor, 0.0, offset],
+        [0.0, 0.0, factor, offset],
+    ]
+
+
+def _saturation_matrix(factor: float) -> AffineMatrix:
+    """ImageEnhance.Color as an affine blend with the luma image."""
+    matrix = []
+    for channel in range(3):
+        row = [(1.0 - factor) * weight for weight in LUMA_WEIGHTS]
+        row[channel] += factor
+        matrix.append(row + [0.0])
+    return matrix
+
+
+def _sharpen_filter(factor: float) -> ImageFilter.Kernel:
+    """ImageEnhance.Sharpness folded into a single 3x3 convolution.
+
+    Sharpness blends the image with its SMOOTH-filtered version; since both
+    are linear, ``factor * image + (1 - factor) * smooth`` is one kernel.
+    """
+    smooth = [1, 1, 1, 1, 5, 1, 1, 1, 1]
+    weights = [(1.0 - factor) * weight / 13.0 for weight in smooth]
+    weights[4] += factor
+    return ImageFilter.Kernel((3, 3), weights, scale=1.0)
+
+
+def plan_operations(
+    operations: Sequence[str],
+) -> Tuple[List[Tuple[str, Any, str]], List[str]]:
+    """
+    Expand operations into fused execution stages.
+
+    Args:
+        operations: Processing operation names in application order
+
+    Returns:
+        Tuple of (stages, skipped operations). Each stage is a
+        ``(kind, argument, label)`` tuple where the label names the
+        operations that contributed to it.
+    """
+    stages: List[Tuple[str, Any, str]] = []
+    skipped: List[str] = []
+
+    for operation in operations:
+        steps = OPERATION_STEPS.get(operation)
+        if steps is None:
+            skipped.append(operation)
+            continue
+
+        for kind, argument in steps:
+            previous = stages[-1] if stages else None
+
+            if kind in _POINT_STEPS:
+                if previous and previous[0] == "point":
+                    _, point_steps, label = stages.pop()
+                    point_steps = point_steps + [(kind, argument)]
+                    stages.append(
+                        ("point", point_steps, _join_label(label, operation))
+                    )
+                else:
+                    stages.append(("point", [(kind, argument)], operation))
+            elif kind == "upscale" and previous and previous[0] == "upscale":
+                stages.pop()
+                label = _join_label(previous[2], operation)
+                stages.append(("upscale", previous[1] * argument, label))
+            else:
+                stages.append((kind, argument, operation))
+
+    return stages, skipped
+
+
+def _join_label(label: str, operation: str) -> str:
+    return label if label.split("+")[-1] == operation else f"{label}+{operation}"
+
+
+def _record_timing(
+    timings: List[Tuple[str, float]], label: str, elapsed: float
+) -> None:
+    """Add a stage timing, folding stages of one operation into one entry."""
+    if timings:
+        previous, total = timings[-1]
+        operations = label.split("+")
+        if previous.split("+")[-1] == operations[0]:
+            merged = "+".join([previous] + operations[1:])
+            timings[-1] = (merged, total + elapsed)
+            return
+    timings.append((label, elapsed))
+
+
+def _run_point_stage(
+    image: Image.Image, point_steps: List[Tuple[str, float]]
+) -> Image.Image:
+    """Apply a run of point operations as one color-matrix conversion."""
+    means = _band_means(image)
+    matrix = _identity_matrix()
+
+    for kind, factor in point_steps:
+        if kind == "contrast":
+            # PIL computes the contrast pivot from the rounded luma mean
+            gray_mean = int(sum(w * m for w, m in zip(LUMA_WEIGHTS, means)) + 0.5)
+            step = _contrast_matrix(factor, gray_mean)
+        else:
+            step = _saturation_matrix(factor)
+        matrix = _compose(step, matrix)
+        means = _apply_matrix(step, means)
+
+    return image.convert("RGB", tuple(value for row in matrix for value in row))
+
+
+def _decode(image_bytes: bytes) -> Image.Image:
+    image = Image.open(io.BytesIO(image_bytes))
+    image.load()
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    return image
+
+
+def _encode(image: Image.Image, quality: int, optimize: bool = False) -> bytes:
+    output_buffer = io.BytesIO()
+    image.save(output_buffer, format="JPEG", quality=quality, optimize=optimize)
+    return output_buffer.getvalue()
+
+
+def process_image_bytes(
+    image_bytes: bytes, operations: Sequence[str], quality: int = 95
+) -> Dict[str, Any]:
+    """
+    Decode, apply a processing chain and re-encode an image as JPEG.
+
+    Runs in a worker process; only bytes and plain values cross the process
+    boundary.
+
+    Args:
+        image_bytes: Encoded input image
+        operations: Processing operation names in application order
+        quality: JPEG output quality
+
+    Returns:
+        Dictionary with the encoded output, its size and per-stage timings
+    """
+    timings: List[Tuple[str, float]] = []
+    stages, skipped = plan_operations(operations)
+
+    start = time.perf_counter()
+    image = _decode(image_bytes)
+    timings.append(("decode", time.perf_counter() - start))
+
+    for kind, argument, label in stages:
+        start = time.perf_counter()
+        if kind == "point":
+            image = _run_point_stage(image, argument)
+        elif kind == "sharpen":
+            image = image.filter(_sharpen_filter(argument))
+        elif kind == "median":
+            image = image.filter(ImageFilter.MedianFilter(size=argument))
+        elif kind == "upscale":
+            new_size = tuple(int(dim * argument) for dim in image.size)
+            image = image.resize(new_size, Image.Resampling.LANCZOS)
+        _record_timing(timings, label, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    data = _encode(image, quality)
+    timings.append(("encode", time.perf_counter() - start))
+
+    return {"data": data, "size": image.size, "timings": timings, "skipped": skipped}
+
+
+def prepare_image_bytes(
+    image_bytes: bytes, max_size: int = 2048, quality: int = 85
+) -> Dict[str, Any]:
+    """
+    Downscale and re-encode an image for vision model analysis.
+
+    JPEG input larger than ``max_size`` is decoded in draft mode, letting the
+    decoder skip DCT coefficients and produce a reduced image directly before
+    the final LANCZOS resize.
+
+    Args:
+        image_bytes: Encoded input image
+        max_size: Maximum width or height of the output
+        quality: JPEG output quality
+
+    Returns:
+        Dictionary with the encoded output, its size and per-stage timings
+    """
+    timings: List[Tuple[str, float]] = []
+
+    start = time.perf_counter()
+    image = Image.open(io.BytesIO(image_bytes))
+    original_size = image.size
+    target_size = None
+    if max(original_size) > max_size:
+        ratio = max_size / max(original_size)
+        target_size = tuple(int(dim * ratio) for dim in original_size)
+        if image.format == "JPEG":
+            image.draft(
+                "RGB", tuple(math.ceil(dim * ratio) for dim in original_size)
+            )
+    image.load()
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    timings.append(("decode", time.perf_counter() - start))
+
+    if target_size and image.size != target_size:
+        start = time.perf_counter()
+        image = image.resize(target_size, Image.Resampling.LANCZOS)
+        timings.append(("resize", time.perf_counter() - start))
+
+    start = time.perf_counter()
+    data = _encode(image, quality, optimize=True)
+    timings.append(("encode", time.perf_counter() - start))
+
+    return {
+        "data": data,
+        "size": image.size,
+        "original_size": original_size,
+        "timings": timings,
+    }
+
+
+class ImagePipelineMetrics:
+    """Image pool metrics tracking."""
+
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+        self.operations: Dict[str, Dict[str, float]] = {}
+
+    def record_queue_wait(self, wait: float) -> None:
+        self.total_queue_wait += wait
+        self.max_queue_wait = max(self.max_queue_wait, wait)
+
+    def record_timings(self, timings: List[Tuple[str, float]]) -> None:
+        for operation, duration in timings:
+            stats = self.operations.setdefault(
+                operation, {"count": 0, "total_time": 0.0, "max_time": 0.0}
+            )
+            stats["count"] += 1
+            stats["total_time"] += duration
+            stats["max_time"] = max(stats["max_time"], duration)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool and per-operation statistics."""
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_queue_wait_ms": round(
+                (self.total_queue_wait / self.submitted) * 1000
+                if self.submitted
+                else 0.0,
+                2,
+            ),
+            "max_queue_wait_ms": round(self.max_queue_wait * 1000, 2),
+            "operations": {
+                operation: {
+                    "count": stats["count"],
+                    "avg_ms": round(stats["total_time"] / stats["count"] * 1000, 2),
+                    "max_ms": round(stats["max_time"] * 1000, 2),
+                }
+                for operation, stats in self.operations.items()
+            },
+        }
+
+
+class ImageProcessingPool:
+    """
+    Bounded worker pool for pipeline functions.
+
+    At most ``max_workers`` jobs run at once and at most ``max_queue`` more
+    wait for a worker. Further submissions wait for a slot, or raise
+    ImagePoolSaturatedError when submitted with ``block=False``.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_queue: int = 32,
+        use_processes: bool = True,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            max_workers: Worker count (defaults to the CPU count, at most 4)
+            max_queue: Jobs allowed to wait for a free worker
+            use_processes: Use worker processes (threads otherwise)
+        """
+        self.max_workers = max_workers or max(1, min(4, os.cpu_count() or 1))
+        self.max_queue = max_queue
+        self.capacity = self.max_workers + max_queue
+        self.use_processes = use_processes
+        self.metrics = ImagePipelineMetrics()
+
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def pending(self) -> int:
+        """Jobs currently running or queued."""
+        return self._pending
+
+    @property
+    def pressure(self) -> float:
+        """Fraction of the pool capacity in use (0.0 to 1.0)."""
+        return self._pending / self.capacity
+
+    @property
+    def saturated(self) -> bool:
+        """Whether new submissions would have to wait."""
+        return self._pending >= self.capacity
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="image-pipeline"
+                )
+        return self._executor
+
+    async def wait_for_capacity(self) -> None:
+        """Wait until the pool has a free slot without claiming it."""
+        while self.saturated:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    def _release(self) -> None:
+        self._pending -= 1
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def run(
+        self, fn: Callable[..., Dict[str, Any]], *args: Any, block: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Run a pipeline function in a worker.
+
+        Args:
+            fn: Module-level pipeline function returning a result dictionary
+            *args: Picklable arguments for the function
+            block: Wait for a slot when the pool is saturated
+
+        Returns:
+            The pipeline result dictionary
+        """
+        if not block and self.saturated:
+            self.metrics.rejected += 1
+            raise ImagePoolSaturatedError(
+                f"Image pool saturated ({self._pending}/{self.capacity} jobs)"
+            )
+
+        queued_at = time.perf_counter()
+        await self.wait_for_capacity()
+        self._pending += 1
+        self.metrics.submitted += 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._get_executor(), fn, *args)
+            self.metrics.record_queue_wait(time.perf_counter() - queued_at)
+            result = await future
+        except BrokenProcessPool:
+            self.metrics.failed += 1
+            logger.error("Image worker pool broke, restarting on next submission")
+            self._executor = None
+            raise
+        except Exception:
+            self.metrics.failed += 1
+            raise
+        finally:
+            self._release()
+
+        self.metrics.completed += 1
+        self.metrics.record_timings(result.get("timings", []))
+        return result
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool load and per-operation timing statistics."""
+        stats = self.metrics.get_stats()
+        stats.update(
+            {
+                "max_workers": self.max_workers,
+                "capacity": self.capacity,
+                "pending": self._pending,
+                "pressure": round(self.pressure, 3),
+                "saturated": self.saturated,
+                "use_processes": self.use_processes,
+            }
+        )
+        return stats
+
+
+# Global image pool instance
+_image_pool: Optional[ImageProcessingPool] = None
+
+
+def get_image_pool(config: Optional[Dict[str, Any]] = None) -> ImageProcessingPool:
+    """Get the global image processing pool, creating it on first use."""
+    global _image_pool
+    if _image_pool is None:
+        config = config or {}
+        _image_pool = ImageProcessingPool(
+            max_workers=config.get("image_workers"),
+            max_queue=config.get("image_queue_size", 32),
+            use_processes=config.get("image_use_processes", True),
+        )
+    return _image_pool
+
+
+def shutdown_image_pool(wait: bool = True) -> None:
+    """Shut down the global image processing pool, if it was created."""
+    global _image_pool
+    if _image_pool is not None:
+        _image_pool.shutdown(wait=wait)
+        _image_pool = None
@@ -0,0 +1,67 @@
+"""
+Tests for image_pipeline.py
+"""
+
+import io
+
+import pytest
+from PIL import Image
+
+from fs_agt_clean.core.ai import image_pipeline
+from fs_agt_clean.core.ai.image_pipeline import (
+    get_image_pool,
+    process_image_bytes,
+    shutdown_image_pool,
+)
+
+
+def jpeg(size=(16, 16), color=(120, 60, 30)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+class TestProcessImageBytes:
+    """Tests for the worker-side processing chain."""
+
+    def test_operation_logged_once(self):
+        """An operation run as several stages has one timing entry."""
+        result = process_image_bytes(jpeg(), ["quality_enhancement"])
+        labels = [label for label, _ in result["timings"]]
+        assert labels == ["decode", "quality_enhancement", "encode"]
+
+    def test_fused_operations(self):
+        """Fused point stages are labelled with every operation once."""
+        result = process_image_bytes(
+            jpeg(), ["quality_enhancement", "color_correction", "noise_reduction"]
+        )
+        labels = [label for label, _ in result["timings"]]
+        assert labels == [
+            "decode",
+            "quality_enhancement+color_correction",
+            "noise_reduction",
+            "encode",
+        ]
+
+    def test_skipped_and_upscale(self):
+        """Unknown operations are skipped; upscaling changes the size."""
+        result = process_image_bytes(jpeg(), ["resolution_upscaling", "unknown"])
+        assert result["skipped"] == ["unknown"]
+        assert result["size"] == (32, 32)
+
+
+class TestImagePool:
+    """Tests for the global image processing pool."""
+
+    @pytest.mark.asyncio
+    async def test_run_and_shutdown(self):
+        """The global pool runs jobs and is released on shutdown."""
+        shutdown_image_pool()
+        pool = get_image_pool({"image_workers": 1, "image_use_processes": False})
+        result = await pool.run(process_image_bytes, jpeg(), ["color_correction"])
+        assert result["size"] == (16, 16)
+        assert pool.get_stats()["completed"] == 1
+
+        shutdown_image_pool()
+        assert image_pipeline._image_pool is None
+        assert pool._executor is None
@@ -15,6 +15,7 @@ Features:
 
 import asyncio
 import base64
+import hashlib
 import io
 import logging
 import os
@@ -32,6 +33,11 @@ from fs_agt_clean.core.ai.openai_client import (
     create_openai_client,
 )
 from fs_agt_clean.core.ai.rate_limiter import RequestPriority, rate_limited
+from fs_agt_clean.core.cache.perceptual_cache import (
+    PerceptualHashes,
+    get_perceptual_cache,
+)
+from fs_agt_clean.core.cache.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -73,6 +79,17 @@ class ImageAnalysisResult:
             "timestamp": self.timestamp,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ImageAnalysisResult":
+        """Recreate a result from its dictionary form."""
+        return cls(
+            analysis=data["analysis"],
+            confidence=data["confidence"],
+            product_details=data.get("product_details"),
+            marketplace_suggestions=data.get("marketplace_suggestions"),
+            category_predictions=data.get("category_predictions"),
+        )
+
 
 class VisionAnalysisService:
     """
@@ -101,6 +118,16 @@ class VisionAnalysisService:
                 daily_budget=float(self.config.get("daily_budget", 10.0)),
             )
 
+        # Concurrent analyses of the same photo share one vision API call
+        self.single_flight = SingleFlight("vision")
+
+        # Visually matching photos reuse earlier analyses
+        self.perceptual_cache = (
+            get_perceptual_cache(self.config)
+            if self.config.get("perceptual_cache_enabled", True)
+            else None
+        )
+
         logger.info("Vision Analysis Service initialized with OpenAI GPT-4o Vision API")
 
     async def _ensure_client(self) -> FlipSyncOpenAIClient:
@@ -117,21 +144,19 @@ class VisionAnalysisService:
         analysis_type: str = "product_identification",
         marketplace: str = "ebay",
         additional_context: str = "",
+        hashes: Optional[PerceptualHashes] = None,
     ) -> ImageAnalysisResult:
         """
         Analyze image using OpenAI GPT-4o Vision API for real product identification.
 
         This is a production-ready implementation that provides actual image analysis
-        rather than simulated results.
+        rather than simulated results. Concurrent requests for the same image
+        content and analysis parameters are coalesced into one API call and
+        receive the same result object, and images that look the same as an
+        already analyzed one reuse its cached result. Callers that already
+        hashed the image pass its ``hashes`` to skip hashing it again.
         """
         try:
-            logger.info(
-                f"Starting OpenAI vision analysis: type={analysis_type}, marketplace={marketplace}"
-            )
-
-            # Ensure OpenAI client is available
-            client = await self._ensure_client()
-
             # Process image data
             if isinstance(image_data, str):
                 # Assume base64 encoded
@@ -139,6 +164,73 @@ class VisionAnalysisService:
             else:
                 image_bytes = image_data
 
+            namespace = None
+            if self.perceptual_cache is None:
+                hashes = None
+            elif hashes is None:
+                hashes = await self.perceptual_cache.hash_image(image_bytes)
+            if hashes is not None:
+                namespace = self.perceptual_cache.make_namespace(
+                    "vision", analysis_type, marketplace, additional_context
+                )
+                cached = await self.perceptual_cache.lookup(hashes, namespace)
+                if cached is not None:
+                    return ImageAnalysisResult.from_dict(cached)
+
+            async def analyze() -> ImageAnalysisResult:
+                result = await self._analyze_image_bytes(
+                    image_bytes, analysis_type, marketplace, additional_context
+                )
+                # Failed analyses come back with zero confidence; never reuse them
+                if hashes is not None and result.confidence > 0.0:
+                    await self.perceptual_cache.store(
+                        hashes, namespace, result.to_dict()
+                    )
+                return result
+
+            flight_key = (
+                hashlib.sha256(image_bytes).hexdigest(),
+                analysis_type,
+                marketplace,
+                additional_context,
+            )
+            return await self.single_flight.do(flight_key, analyze)
+
+        except Exception as e:
+            logger.error(f"Vision analysis failed: {e}")
+            # Return fallback result
+            return ImageAnalysisResult(
+                analysis=f"Vision analysis failed: {str(e)}",
+                confidence=0.0,
+                product_details={"error": str(e)},
+            )
+
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        """Get statistics about coalesced duplicate image analyses."""
+        return self.single_flight.get_stats()
+
+    def get_perceptual_cache_stats(self) -> Dict[str, Any]:
+        """Get hit statistics of the perceptual-hash result cache."""
+        if self.perceptual_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.perceptual_cache.get_stats()}
+
+    async def _analyze_image_bytes(
+        self,
+        image_bytes: bytes,
+        analysis_type: str,
+        marketplace: str,
+        additional_context: str,
+    ) -> ImageAnalysisResult:
+        """Run one OpenAI vision analysis for decoded image bytes."""
+        try:
+            logger.info(
+                f"Starting OpenAI vision analysis: type={analysis_type}, marketplace={marketplace}"
+            )
+
+            # Ensure OpenAI client is available
+            client = await self._ensure_client()
+
             logger.info(f"Processing image: size={len(image_bytes)} bytes")
 
             # Create comprehensive analysis prompt for vision
@@ -18,6 +18,7 @@ from fs_agt_clean.core.analysis.models import (
     PricePoint,
     TrendDirection,
 )
+from fs_agt_clean.core.analysis.price_history import PriceHistoryStore
 from fs_agt_clean.core.analysis.trend_analyzer import TrendAnalyzer
 
 __all__ = [
@@ -25,6 +26,7 @@ __all__ = [
     "CompetitorMonitor",
     "DemandForecaster",
     "TrendAnalyzer",
+    "PriceHistoryStore",
     "CompetitorData",
     "CompetitorRank",
     "DemandForecast",
@@ -3,11 +3,18 @@ Competitor Monitor for tracking and analyzing competitor behavior.
 
 This module provides comprehensive competitor monitoring capabilities including
 price tracking, strategy analysis, and competitive intelligence.
+
+Price histories are kept in a columnar PriceHistoryStore that flags
+significant price moves at ingest time, so change detection and strategy
+analysis read compact arrays instead of rescanning PricePoint lists.
 """
 
+import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 from fs_agt_clean.core.analysis.models import (
     CompetitorData,
@@ -15,6 +22,8 @@ from fs_agt_clean.core.analysis.models import (
     MarketSegment,
     PricePoint,
 )
+from fs_agt_clean.core.analysis.price_history import PriceHistoryStore
+from fs_agt_clean.core.cache.async_cache import AsyncCache
 
 logger = logging.getLogger(__name__)
 
@@ -37,8 +46,20 @@ class CompetitorMonitor:
         self.config = config or {}
         self.price_change_threshold = self.config.get("price_change_threshold", 0.05)
         self.price_history_days = self.config.get("price_history_days", 30)
-        self.competitor_cache: Dict[str, Dict[str, CompetitorData]] = {}
         self.cache_ttl_hours = self.config.get("cache_ttl_hours", 6)
+        # Competitors by ID, per "{marketplace}_{product_id}"
+        self.competitor_cache = AsyncCache(
+            "CompetitorMonitor.competitors",
+            maxsize=int(self.config.get("competitor_cache_size", 10000)),
+            ttl=self.cache_ttl_hours * 3600,
+        )
+        self.price_history = PriceHistoryStore(
+            change_threshold=self.price_change_threshold,
+            chunk_size=int(self.config.get("price_chunk_size", 1024)),
+            retention_days=self.config.get(
+                "price_retention_days", max(self.price_history_days, 90)
+            ),
+        )
 
     async def monitor_competitors(
         self,
@@ -57,16 +78,34 @@ class CompetitorMonitor:
         Returns:
             List of CompetitorData objects with current competitor information
         """
-        # Check cache first
+        competitors = await self._get_competitors(
+            product_id, marketplace, competitor_ids
+        )
+        return list(competitors.values())
+
+    async def _get_competitors(
+        self,
+        product_id: str,
+        marketplace: str,
+        competitor_ids: Optional[List[str]] = None,
+    ) -> Dict[str, CompetitorData]:
+        """Cached competitors of a product by competitor ID."""
         cache_key = f"{marketplace}_{product_id}"
-        if cache_key in self.competitor_cache:
-            # Check if cache is still valid
-            cache_age = datetime.now() - self.competitor_cache[cache_key].get(
-                "_cache_timestamp", datetime.min
-            )
-            if cache_age.total_seconds() < self.cache_ttl_hours * 3600:
-                return list(self.competitor_cache[cache_key].values())
+        return await self.competitor_cache.get_or_load(
+            cache_key,
+            lambda: self._load_competitors(
+                cache_key, product_id, marketplace, competitor_ids
+            ),
+        )
 
+    async def _load_competitors(
+        self,
+        cache_key: str,
+        product_id: str,
+        marketplace: str,
+        competitor_ids: Optional[List[str]],
+    ) -> Dict[str, CompetitorData]:
+        """Fetch and rank competitors and ingest their price histories."""
         # Fetch fresh competitor data
         competitors = await self._fetch_competitor_data(
             product_id, marketplace, competitor_ids
@@ -84,12 +123,13 @@ class CompetitorMonitor:
         for competitor in competitors:
             competitor.rank = self._determine_competitor_rank(competitor, competitors)
 
-        # Cache results
-        competitor_dict = {c.competitor_id: c for c in competitors}
-        competitor_dict["_cache_timestamp"] = datetime.now()
-        self.competitor_cache[cache_key] = competitor_dict
+        # Ingest price histories
+        for competitor in competitors:
+            self.price_history.record(
+                (cache_key, competitor.competitor_id), competitor.price_history
+            )
 
-        return competitors
+        return {c.competitor_id: c for c in competitors}
 
     async def _fetch_competitor_data(
         self,
@@ -267,6 +307,28 @@ class CompetitorMonitor:
         else:
             return CompetitorRank.FOLLOWER
 
+    def record_prices(
+        self,
+        competitor_id: str,
+        product_id: str,
+        marketplace: str,
+        points: Iterable[PricePoint],
+    ) -> List[Dict[str, Any]]:
+        """
+        Record observed prices of a competitor offer.
+
+        Args:
+            competitor_id: ID of the competitor
+            product_id: ID of the product
+            marketplace: Marketplace of the offer
+            points: Observed price points
+
+        Returns:
+            Significant price moves flagged by this ingest
+        """
+        cache_key = f"{marketplace}_{product_id}"
+        return self.price_history.record((cache_key, competitor_id), points)
+
     async def detect_price_changes(
         self, competitor_id: str, product_id: str, marketplace: str, days: int = 30
     ) -> Dict[str, Union[bool, float, datetime]]:
@@ -282,71 +344,49 @@ class CompetitorMonitor:
         Returns:
             Dictionary with price change information
         """
-        # Get competitor data
-        cache_key = f"{marketplace}_{product_id}"
-        if cache_key not in self.competitor_cache:
-            await self.monitor_competitors(product_id, marketplace)
-
-        if (
-            cache_key not in self.competitor_cache
-            or competitor_id not in self.competitor_cache[cache_key]
-        ):
-            return {
-                "has_price_change": False,
-                "change_percent": 0.0,
-                "last_change_date": datetime.now(),
-            }
-
-        competitor = self.competitor_cache[cache_key][competitor_id]
-
-        # Filter price history to requested timeframe
-        cutoff_date = datetime.now() - timedelta(days=days)
-        recent_prices = [
-            p for p in competitor.price_history if p.timestamp >= cutoff_date
-        ]
-
-        if len(recent_prices) < 2:
-            return {
-                "has_price_change": False,
-                "change_percent": 0.0,
-                "last_change_date": datetime.now(),
-            }
-
-        # Sort by timestamp
-        recent_prices.sort(key=lambda p: p.timestamp)
-
-        # Calculate overall change
-        first_price = recent_prices[0].price
-        last_price = recent_prices[-1].price
-
-        if first_price == 0:
-            change_percent = 0.0
-        else:
-            change_percent = (last_price - first_price) / first_price
-
-        # Detect significant changes
-        has_significant_change = abs(change_percent) >= self.price_change_threshold
-
-        # Find date of last significant change
-        last_change_date = recent_prices[-1].timestamp
-        for i in range(len(recent_prices) - 1, 0, -1):
-            curr_price = recent_prices[i].price
-            prev_price = recent_prices[i - 1].price
+        results = await self.detect_price_changes_many(
+            [(competitor_id, product_id, marketplace)], days
+        )
+        return results[0]
 
-            if prev_price == 0:
-                continue
+    async def detect_price_changes_many(
+        self, offers: Sequence[Tuple[str, str, str]], days: int = 30
+    ) -> List[Dict[str, Union[bool, float, datetime]]]:
+        """
+        Detect significant price changes for many competitor offers.
 
-            change = abs((curr_price - prev_price) / prev_price)
+        Each product is fetched at most once and every offer is answered
+        from its columnar history with a bisect and the last change point
+        flagged at ingest.
 
-            if change >= self.price_change_threshold:
-                last_change_date = recent_prices[i].timestamp
-                break
+        Args:
+            offers: (competitor_id, product_id, marketplace) tuples
+            days: Number of days to analyze
 
-        return {
-            "has_price_change": has_significant_change,
-            "change_percent": change_percent,
-            "last_change_date": last_change_date,
+        Returns:
+            Price change dictionary per offer, in input order
+        """
+        # Fetch products without any history
+        missing = {
+            (product_id, marketplace)
+            for competitor_id, product_id, marketplace in offers
+            if (f"{marketplace}_{product_id}", competitor_id) not in self.price_history
         }
+        if missing:
+            await asyncio.gather(
+                *(
+                    self._get_competitors(product_id, marketplace)
+                    for product_id, marketplace in missing
+                )
+            )
+
+        cutoff_date = datetime.now() - timedelta(days=days)
+        return [
+            self.price_history.detect_changes(
+                (f"{marketplace}_{product_id}", competitor_id), cutoff_date
+            )
+            for competitor_id, product_id, marketplace in offers
+        ]
 
     async def analyze_pricing_strategy(
         self, competitor_id: str, product_id: str, marketplace: str
@@ -364,47 +404,31 @@ class CompetitorMonitor:
         """
         # Get competitor data
         cache_key = f"{marketplace}_{product_id}"
-        if cache_key not in self.competitor_cache:
-            await self.monitor_competitors(product_id, marketplace)
-
-        if (
-            cache_key not in self.competitor_cache
-            or competitor_id not in self.competitor_cache[cache_key]
-        ):
+        competitors = await self._get_competitors(product_id, marketplace)
+        if competitor_id not in competitors:
             return {"strategy": "unknown", "confidence": 0.0, "patterns": []}
 
-        competitor = self.competitor_cache[cache_key][competitor_id]
+        competitor = competitors[competitor_id]
 
-        # Analyze price history
-        if not competitor.price_history or len(competitor.price_history) < 5:
+        # Analyze the monitored period up to the latest observed price
+        offer_key = (cache_key, competitor_id)
+        history = self.price_history.get(offer_key)
+        if history is None or len(history) < 5:
+            return {"strategy": "insufficient_data", "confidence": 0.0, "patterns": []}
+        since = datetime.fromtimestamp(history.last_timestamp) - timedelta(
+            days=self.price_history_days
+        )
+        if len(history) - history.bounds(since.timestamp())[0] < 5:
             return {"strategy": "insufficient_data", "confidence": 0.0, "patterns": []}
 
-        # Sort by timestamp
-        prices = sorted(competitor.price_history, key=lambda p: p.timestamp)
-
-        # Calculate price changes
-        changes = []
-        for i in range(1, len(prices)):
-            prev_price = prices[i - 1].price
-            curr_price = prices[i].price
-
-            if prev_price == 0:
-                continue
-
-            change_percent = (curr_price - prev_price) / prev_price
-            changes.append(
-                {
-                    "date": prices[i].timestamp,
-                    "change": change_percent,
-                    "price": curr_price,
-                }
-            )
+        # Relative price changes in time order
+        _, changes = self.price_history.price_changes(offer_key, since)
 
         # Analyze patterns
         patterns = []
 
         # Check for consistent undercutting
-        if self._is_undercutting(competitor, self.competitor_cache[cache_key].values()):
+        if self._is_undercutting(competitor, list(competitors.values())):
             patterns.append(
                 {
                     "type": "undercutting",
@@ -488,14 +512,12 @@ class CompetitorMonitor:
         # Check if consistently below average
         return competitor.average_price < avg_other_price * 0.95
 
-    def _is_price_skimming(
-        self, price_changes: List[Dict[str, Union[datetime, float]]]
-    ) -> bool:
+    def _is_price_skimming(self, price_changes: np.ndarray) -> bool:
         """
         Check if price changes follow a skimming pattern (high to low).
 
         Args:
-            price_changes: List of price change data
+            price_changes: Relative price changes in time order
 
         Returns:
             True if skimming pattern detected, False otherwise
@@ -504,20 +526,18 @@ class CompetitorMonitor:
             return False
 
         # Count decreases vs increases
-        decreases = sum(1 for c in price_changes if c["change"] < -0.02)
-        increases = sum(1 for c in price_changes if c["change"] > 0.02)
+        decreases = int(np.count_nonzero(price_changes < -0.02))
+        increases = int(np.count_nonzero(price_changes > 0.02))
 
         # Price skimming has more decreases than increases
         return decreases > increases * 2
 
-    def _is_penetration_pricing(
-        self, price_changes: List[Dict[str, Union[datetime, float]]]
-    ) -> bool:
+    def _is_penetration_pricing(self, price_changes: np.ndarray) -> bool:
         """
         Check if price changes follow a penetration pattern (low to high).
 
         Args:
-            price_changes: List of price change data
+            price_changes: Relative price changes in time order
 
         Returns:
             True if penetration pattern detected, False otherwise
@@ -526,20 +546,18 @@ class CompetitorMonitor:
             return False
 
         # Count decreases vs increases
-        decreases = sum(1 for c in price_changes if c["change"] < -0.02)
-        increases = sum(1 for c in price_changes if c["change"] > 0.02)
+        decreases = int(np.count_nonzero(price_changes < -0.02))
+        increases = int(np.count_nonzero(price_changes > 0.02))
 
         # Penetration pricing has more increases than decreases
         return increases > decreases * 2
 
-    def _is_promotional_pricing(
-        self, price_changes: List[Dict[str, Union[datetime, float]]]
-    ) -> bool:
+    def _is_promotional_pricing(self, price_changes: np.ndarray) -> bool:
         """
         Check if price changes follow a promotional pattern (temporary drops).
 
         Args:
-            price_changes: List of price change data
+            price_changes: Relative price changes in time order
 
         Returns:
             True if promotional pattern detected, False otherwise
@@ -547,16 +565,10 @@ class CompetitorMonitor:
         if len(price_changes) < 4:
             return False
 
-        # Look for patterns of drop followed by increase
-        patterns = 0
-
-        for i in range(len(price_changes) - 1):
-            current_change = price_changes[i]["change"]
-            next_change = price_changes[i + 1]["change"]
-
-            # Significant drop followed by increase
-            if current_change < -0.05 and next_change > 0.03:
-                patterns += 1
+        # Look for patterns of significant drop followed by increase
+        patterns = int(
+            np.count_nonzero((price_changes[:-1] < -0.05) & (price_changes[1:] > 0.03))
+        )
 
         # Need at least 2 promotional patterns
         return patterns >= 2
@@ -11,6 +11,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Union
 
 from fs_agt_clean.core.analysis.models import DemandForecast
+from fs_agt_clean.core.cache.async_cache import AsyncCache
 
 logger = logging.getLogger(__name__)
 
@@ -36,7 +37,12 @@ class DemandForecaster:
         self.seasonality_periods = self.config.get(
             "seasonality_periods", [7, 30, 90, 365]
         )
-        self.forecast_cache: Dict[str, DemandForecast] = {}
+        # Forecasts are valid for a day; empty forecasts are not cached
+        self.forecast_cache = AsyncCache(
+            "DemandForecaster.forecasts",
+            maxsize=int(self.config.get("forecast_cache_size", 10000)),
+            ttl=self.config.get("forecast_cache_ttl_seconds", 86400),
+        )
 
     async def forecast_demand(
         self,
@@ -68,14 +74,28 @@ class DemandForecaster:
         # Generate cache key
         cache_key = f"{'p' if product_id else 'c'}_{product_id or category_id}"
 
-        # Check cache
-        if cache_key in self.forecast_cache:
-            cached_forecast = self.forecast_cache[cache_key]
-            # Check if forecast is still valid (not expired)
-            forecast_age = datetime.now() - cached_forecast.last_updated
-            if forecast_age.days < 1:  # Cache for 1 day
-                return cached_forecast
+        return await self.forecast_cache.get_or_load(
+            cache_key,
+            lambda: self._compute_forecast(
+                product_id,
+                category_id,
+                historical_data,
+                timeframe_days,
+                external_factors,
+            ),
+            # Empty forecasts (insufficient data) have no confidence intervals
+            cache_if=lambda forecast: forecast.confidence_intervals is not None,
+        )
 
+    async def _compute_forecast(
+        self,
+        product_id: Optional[str],
+        category_id: Optional[str],
+        historical_data: Optional[List[Tuple[datetime, float]]],
+        timeframe_days: int,
+        external_factors: Optional[Dict[str, float]],
+    ) -> DemandForecast:
+        """Compute a demand forecast (see ``forecast_demand``)."""
         # Get historical data if not provided
         if not historical_data:
             historical_data = await self._get_historical_data(product_id, category_id)
@@ -129,9 +149,6 @@ class DemandForecaster:
             last_updated=datetime.now(),
         )
 
-        # Cache forecast
-        self.forecast_cache[cache_key] = forecast
-
         return forecast
 
     async def _get_historical_data(
@@ -0,0 +1,404 @@
+"""
+Columnar price history for competitor offers.
+
+Each offer (marketplace, product and competitor) keeps its history as
+append-only chunks of two compact columns: timestamps as float64 epoch
+seconds and prices as int32 cents (12 bytes per point instead of a
+PricePoint object). Timestamps are sorted, so windowed queries bisect the
+chunk start times and then the chunk itself.
+
+Significant moves are detected online: every appended price is compared
+with the previous one and the point is flagged as a change point when the
+relative move reaches the change threshold. Window queries then only look
+at the last change point instead of walking the history.
+"""
+
+import bisect
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from fs_agt_clean.core.analysis.models import PricePoint
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_DTYPE = np.float64
+PRICE_DTYPE = np.int32
+
+# Largest price representable in int32 cents
+MAX_PRICE = np.iinfo(PRICE_DTYPE).max / 100
+
+
+def _to_cents(price: float) -> int:
+    if not 0 <= price <= MAX_PRICE:
+        raise ValueError(f"Price {price} out of range [0, {MAX_PRICE}]")
+    return int(round(price * 100))
+
+
+class OfferPriceHistory:
+    """Chunked, time-sorted price columns and change points of one offer."""
+
+    __slots__ = (
+        "chunk_size",
+        "change_threshold",
+        "_times",
+        "_prices",
+        "_chunk_starts",
+        "_fill",
+        "_base",
+        "_changes",
+        "currency",
+        "source",
+    )
+
+    def __init__(self, chunk_size: int = 1024, change_threshold: float = 0.05):
+        """
+        Initialize an empty offer history.
+
+        Args:
+            chunk_size: Points per column chunk
+            change_threshold: Relative move between consecutive prices that
+                marks a change point
+        """
+        self.chunk_size = chunk_size
+        self.change_threshold = change_threshold
+        self._times: List[np.ndarray] = []
+        self._prices: List[np.ndarray] = []
+        self._chunk_starts: List[float] = []
+        # Points used in the last chunk; earlier chunks are full
+        self._fill = 0
+        # Absolute index of the first stored point (older chunks are dropped)
+        self._base = 0
+        # Absolute indices of change points, ascending
+        self._changes: Deque[int] = deque()
+        self.currency = "USD"
+        self.source = ""
+
+    def __len__(self) -> int:
+        if not self._times:
+            return 0
+        return (len(self._times) - 1) * self.chunk_size + self._fill
+
+    @property
+    def last_timestamp(self) -> Optional[float]:
+        if not self._times:
+            return None
+        return float(self._times[-1][self._fill - 1])
+
+    def _last_cents(self) -> int:
+        return int(self._prices[-1][self._fill - 1])
+
+    def append(self, timestamp: float, price: float) -> Optional[float]:
+        """
+        Append a price point.
+
+        Points older than the latest one are inserted in place, which
+        rebuilds the offer (a rare path for late data).
+
+        Args:
+            timestamp: Epoch seconds of the observation
+            price: Observed price
+
+        Returns:
+            The relative move if the point is a change point, else None
+        """
+        cents = _to_cents(price)
+        last = self.last_timestamp
+        if last is not None and timestamp < last:
+            times, prices = self.columns()
+            position = int(np.searchsorted(times, timestamp, side="right"))
+            self._rebuild(
+                np.insert(times, position, timestamp),
+                np.insert(prices, position, cents),
+            )
+            return None
+
+        change = None
+        if last is not None:
+            previous = self._last_cents()
+            if previous != 0:
+                move = (cents - previous) / previous
+                if abs(move) >= self.change_threshold:
+                    change = move
+                    self._changes.append(self._base + len(self))
+
+        if not self._times or self._fill == self.chunk_size:
+            self._times.append(np.empty(self.chunk_size, dtype=TIMESTAMP_DTYPE))
+            self._prices.append(np.empty(self.chunk_size, dtype=PRICE_DTYPE))
+            self._chunk_starts.append(timestamp)
+            self._fill = 0
+        self._times[-1][self._fill] = timestamp
+        self._prices[-1][self._fill] = cents
+        self._fill += 1
+        return change
+
+    def _rebuild(self, times: np.ndarray, cents: np.ndarray) -> None:
+        """Rebuild chunks and change points from sorted columns."""
+        self._times, self._prices, self._chunk_starts = [], [], []
+        self._fill = 0
+        self._changes.clear()
+        for timestamp, price in zip(times.tolist(), cents.tolist()):
+            self.append(timestamp, price / 100)
+
+    def columns(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Timestamps and prices (in cents) in ``[start, end)``.
+
+        Args:
+            start: Earliest epoch seconds (inclusive), None for the beginning
+            end: Latest epoch seconds (exclusive), None for the end
+
+        Returns:
+            Tuple of (timestamps, cents) arrays
+        """
+        first, last = self.bounds(start, end)
+        if first >= last:
+            return (
+                np.empty(0, dtype=TIMESTAMP_DTYPE),
+                np.empty(0, dtype=PRICE_DTYPE),
+            )
+
+        size = self.chunk_size
+        times, prices = [], []
+        for chunk in range(first // size, (last - 1) // size + 1):
+            lo = max(first - chunk * size, 0)
+            hi = min(last - chunk * size, size)
+            times.append(self._times[chunk][lo:hi])
+            prices.append(self._prices[chunk][lo:hi])
+        if len(times) == 1:
+            return times[0].copy(), prices[0].copy()
+        return np.concatenate(times), np.concatenate(prices)
+
+    def point(self, index: int) -> Tuple[float, int]:
+        """Timestamp and price (in cents) of the point at a stored index."""
+        chunk, offset = divmod(index, self.chunk_size)
+        return float(self._times[chunk][offset]), int(self._prices[chunk][offset])
+
+    def _position(self, timestamp: float) -> int:
+        """Relative index of the first point at or after ``timestamp``."""
+        chunk = bisect.bisect_right(self._chunk_starts, timestamp) - 1
+        if chunk < 0:
+            return 0
+        # Equal timestamps may continue from the previous chunk
+        while chunk > 0 and self._chunk_starts[chunk] == timestamp:
+            chunk -= 1
+        filled = self._fill if chunk == len(self._times) - 1 else self.chunk_size
+        offset = np.searchsorted(self._times[chunk][:filled], timestamp, side="left")
+        return chunk * self.chunk_size + int(offset)
+
+    def bounds(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Tuple[int, int]:
+        """Stored index range of the points in ``[start, end)``."""
+        first = 0 if start is None else self._position(start)
+        last = len(self) if end is None else self._position(end)
+        return first, last
+
+    def last_change(self, start: Optional[float] = None) -> Optional[float]:
+        """
+        Timestamp of the latest change point whose previous point is at or
+        after ``start``.
+
+        Args:
+            start: Earliest epoch seconds of the window
+
+        Returns:
+            Epoch seconds of the change point, or None
+        """
+        if not self._changes:
+            return None
+        index = self._changes[-1] - self._base
+        if index - 1 < self.bounds(start, None)[0]:
+            return None
+        return self.point(index)[0]
+
+    def drop_before(self, timestamp: float) -> int:
+        """
+        Drop whole chunks whose points are all older than ``timestamp``.
+
+        Returns:
+            Number of points dropped
+        """
+        dropped = 0
+        # Chunks before the last are full, so their last point is the newest
+        while len(self._times) > 1 and self._times[0][-1] < timestamp:
+            self._times.pop(0)
+            self._prices.pop(0)
+            self._chunk_starts.pop(0)
+            self._base += self.chunk_size
+            dropped += self.chunk_size
+        while self._changes and self._changes[0] < self._base:
+            self._changes.popleft()
+        return dropped
+
+    @property
+    def nbytes(self) -> int:
+        return sum(t.nbytes + p.nbytes for t, p in zip(self._times, self._prices))
+
+
+class PriceHistoryStore:
+    """Columnar price histories of competitor offers."""
+
+    def __init__(
+        self,
+        change_threshold: float = 0.05,
+        chunk_size: int = 1024,
+        retention_days: float = 90,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            change_threshold: Relative move between consecutive prices that
+                marks a change point
+            chunk_size: Points per column chunk
+            retention_days: Chunks older than this are dropped on ingest
+        """
+        self.change_threshold = change_threshold
+        self.chunk_size = chunk_size
+        self.retention_seconds = retention_days * 86400
+        self._offers: Dict[Hashable, OfferPriceHistory] = {}
+        self.points_ingested = 0
+        self.flagged_changes = 0
+
+    def get(self, key: Hashable) -> Optional[OfferPriceHistory]:
+        """Get the history of an offer, or None if it has no points."""
+        return self._offers.get(key)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._offers
+
+    def record(
+        self, key: Hashable, points: Iterable[PricePoint]
+    ) -> List[Dict[str, Any]]:
+        """
+        Ingest price points of an offer.
+
+        Points already stored (at or before the latest stored timestamp with
+        the same price) are skipped, so re-ingesting a fetched history is
+        cheap.
+
+        Args:
+            key: Offer key
+            points: Price points, preferably in time order
+
+        Returns:
+            Change points flagged by this ingest, as dictionaries with
+            ``timestamp``, ``price`` and ``change_percent``
+        """
+        history = self._offers.get(key)
+        if history is None:
+            history = OfferPriceHistory(self.chunk_size, self.change_threshold)
+            self._offers[key] = history
+
+        flagged = []
+        latest = history.last_timestamp
+        for point in points:
+            timestamp = point.timestamp.timestamp()
+            if latest is not None and timestamp <= latest:
+                if self._is_stored(history, timestamp, point.price):
+                    continue
+            change = history.append(timestamp, point.price)
+            history.currency = point.currency
+            history.source = point.source
+            self.points_ingested += 1
+            if change is not None:
+                self.flagged_changes += 1
+                flagged.append(
+                    {
+                        "timestamp": point.timestamp,
+                        "price": point.price,
+                        "change_percent": change,
+                    }
+                )
+            latest = history.last_timestamp
+
+        if self.retention_seconds and latest is not None:
+            history.drop_before(latest - self.retention_seconds)
+        return flagged
+
+    def _is_stored(
+        self, history: OfferPriceHistory, timestamp: float, price: float
+    ) -> bool:
+        times, cents = history.columns(timestamp, np.nextafter(timestamp, np.inf))
+        return bool(np.any(cents == _to_cents(price)))
+
+    def detect_changes(self, key: Hashable, since: datetime) -> Dict[str, Any]:
+        """
+        Overall and latest significant price change of an offer since a date.
+
+        Args:
+            key: Offer key
+            since: Start of the window (inclusive)
+
+        Returns:
+            Dictionary with ``has_price_change``, ``change_percent`` and
+            ``last_change_date``
+        """
+        history = self._offers.get(key)
+        start = since.timestamp()
+        first, last = history.bounds(start, None) if history else (0, 0)
+        if last - first < 2:
+            return {
+                "has_price_change": False,
+                "change_percent": 0.0,
+                "last_change_date": datetime.now(),
+            }
+
+        _, first_price = history.point(first)
+        last_timestamp, last_price = history.point(last - 1)
+        change_percent = (
+            0.0 if first_price == 0 else (last_price - first_price) / first_price
+        )
+        change_at = history.last_change(start)
+        return {
+            "has_price_change": abs(change_percent) >= self.change_threshold,
+            "change_percent": change_percent,
+            "last_change_date": datetime.fromtimestamp(
+                change_at if change_at is not None else last_timestamp
+            ),
+        }
+
+    def price_changes(
+        self, key: Hashable, since: Optional[datetime] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Relative moves between consecutive prices of an offer.
+
+        Moves from a zero price are skipped.
+
+        Args:
+            key: Offer key
+            since: Start of the window, None for the whole history
+
+        Returns:
+            Tuple of (timestamps, changes) arrays, one entry per move
+        """
+        history = self._offers.get(key)
+        if history is None:
+            return np.empty(0), np.empty(0)
+        times, cents = history.columns(since.timestamp() if since else None)
+        previous = cents[:-1].astype(np.float64)
+        valid = previous != 0
+        changes = (cents[1:][valid] - previous[valid]) / previous[valid]
+        return times[1:][valid], changes
+
+    def discard(self, key: Hashable) -> None:
+        """Drop the history of an offer."""
+        self._offers.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store size statistics."""
+        points = sum(len(history) for history in self._offers.values())
+        return {
+            "offers": len(self._offers),
+            "points": points,
+            "points_ingested": self.points_ingested,
+            "flagged_changes": self.flagged_changes,
+            "memory_bytes": sum(h.nbytes for h in self._offers.values()),
+        }
@@ -0,0 +1,182 @@
+"""
+Tests for price_history.py and its use by CompetitorMonitor
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from fs_agt_clean.core.analysis.competitor_monitor import CompetitorMonitor
+from fs_agt_clean.core.analysis.models import PricePoint
+from fs_agt_clean.core.analysis.price_history import (
+    OfferPriceHistory,
+    PriceHistoryStore,
+)
+
+THRESHOLD = 0.05
+
+
+def random_points(rng, count, now):
+    """Price points with distinct timestamps over 60 days, partly shuffled."""
+    offsets = sorted(rng.sample(range(60 * 24 * 60), count), reverse=True)
+    price = rng.uniform(5, 500)
+    points = []
+    for offset in offsets:
+        if rng.random() < 0.3:
+            price *= rng.uniform(0.8, 1.2)
+        points.append(
+            PricePoint(
+                timestamp=now - timedelta(minutes=offset, seconds=30),
+                price=round(price, 2),
+                currency="USD",
+                source="test",
+            )
+        )
+    # Late data: swap a few neighbours out of time order
+    for _ in range(count // 10):
+        i = rng.randrange(count - 1)
+        points[i], points[i + 1] = points[i + 1], points[i]
+    return points
+
+
+def per_point_changes(points, since):
+    """Price change detection over every point in the window."""
+    recent = sorted(
+        (p for p in points if p.timestamp >= since), key=lambda p: p.timestamp
+    )
+    if len(recent) < 2:
+        return None
+    first, last = recent[0].price, recent[-1].price
+    change_percent = 0.0 if first == 0 else (last - first) / first
+    last_change_date = recent[-1].timestamp
+    for i in range(len(recent) - 1, 0, -1):
+        previous = recent[i - 1].price
+        if previous and abs((recent[i].price - previous) / previous) >= THRESHOLD:
+            last_change_date = recent[i].timestamp
+            break
+    return {
+        "has_price_change": abs(change_percent) >= THRESHOLD,
+        "change_percent": change_percent,
+        "last_change_date": last_change_date,
+    }
+
+
+def assert_same_changes(actual, expected):
+    assert actual["has_price_change"] == expected["has_price_change"]
+    assert actual["change_percent"] == pytest.approx(expected["change_percent"])
+    difference = actual["last_change_date"] - expected["last_change_date"]
+    assert abs(difference) < timedelta(milliseconds=1)
+
+
+class TestOfferPriceHistory:
+    """Tests for the chunked columns of one offer."""
+
+    def test_chunk_boundaries(self):
+        """Windowed columns span chunks and match a plain array slice."""
+        history = OfferPriceHistory(chunk_size=4)
+        times = [float(t) for t in (0, 1, 2, 3, 4, 4, 4, 5, 6, 7, 8)]
+        for i, timestamp in enumerate(times):
+            history.append(timestamp, 10 + i)
+        assert len(history) == len(times)
+
+        all_times = np.array(times)
+        all_cents = np.array([(10 + i) * 100 for i in range(len(times))])
+        for start in [None, 0.0, 3.0, 3.5, 4.0, 5.0, 9.0]:
+            for end in [None, 0.0, 4.0, 4.5, 6.0, 100.0]:
+                mask = np.ones(len(times), dtype=bool)
+                if start is not None:
+                    mask &= all_times >= start
+                if end is not None:
+                    mask &= all_times < end
+                got_times, got_cents = history.columns(start, end)
+                assert got_times.tolist() == all_times[mask].tolist()
+                assert got_cents.tolist() == all_cents[mask].tolist()
+
+    def test_out_of_order_points_sorted(self):
+        """Late points are inserted in time order."""
+        rng = random.Random(1)
+        history = OfferPriceHistory(chunk_size=5)
+        times = rng.sample(range(1000), 40)
+        for timestamp in times:
+            history.append(float(timestamp), timestamp / 10)
+        got_times, got_cents = history.columns()
+        assert got_times.tolist() == sorted(times)
+        assert got_cents.tolist() == [t * 10 for t in sorted(times)]
+
+    def test_cents_storage(self):
+        """Prices are stored as whole cents; out of range prices are rejected."""
+        history = OfferPriceHistory()
+        history.append(0.0, 19.999)
+        assert history.point(0) == (0.0, 2000)
+        with pytest.raises(ValueError):
+            history.append(1.0, -1.0)
+        with pytest.raises(ValueError):
+            history.append(1.0, 1e8)
+
+    def test_drop_before_keeps_partial_chunks(self):
+        """Only whole chunks older than the cutoff are dropped."""
+        history = OfferPriceHistory(chunk_size=4)
+        for timestamp in range(10):
+            history.append(float(timestamp), 10.0 + timestamp * 5)
+        assert history.drop_before(5.0) == 4
+        assert history.columns()[0].tolist() == [float(t) for t in range(4, 10)]
+        assert history.last_change() == 9.0
+
+
+class TestDetectChanges:
+    """Tests for change detection against checking every point."""
+
+    def test_store_matches_per_point(self):
+        """Windowed change detection equals scanning every point."""
+        rng = random.Random(3)
+        now = datetime.now()
+        for _ in range(30):
+            store = PriceHistoryStore(THRESHOLD, chunk_size=16)
+            points = random_points(rng, rng.randint(0, 120), now)
+            for start in range(0, len(points), 25):
+                store.record("offer", points[start : start + 25])
+            for days in (1, 7, 30, 90):
+                since = now - timedelta(days=days)
+                expected = per_point_changes(points, since)
+                actual = store.detect_changes("offer", since)
+                if expected is None:
+                    assert actual["has_price_change"] is False
+                    assert actual["change_percent"] == 0.0
+                else:
+                    assert_same_changes(actual, expected)
+
+    def test_reingest_skips_stored_points(self):
+        """Recording the same history again adds no points."""
+        rng = random.Random(4)
+        store = PriceHistoryStore(THRESHOLD, chunk_size=8)
+        points = random_points(rng, 50, datetime.now())
+        store.record("offer", points)
+        assert store.record("offer", points) == []
+        assert len(store.get("offer")) == 50
+
+    @pytest.mark.asyncio
+    async def test_detect_price_changes_many(self):
+        """Batched detection answers every offer like the per-point path."""
+        rng = random.Random(5)
+        now = datetime.now()
+        monitor = CompetitorMonitor({"price_change_threshold": THRESHOLD})
+        offers, histories = [], []
+        for index in range(20):
+            offer = (f"c{index}", f"p{index % 4}", "ebay")
+            points = random_points(rng, rng.randint(2, 80), now)
+            monitor.record_prices(*offer, points)
+            offers.append(offer)
+            histories.append(points)
+
+        results = await monitor.detect_price_changes_many(offers, days=14)
+        since = now - timedelta(days=14)
+        for points, result in zip(histories, results):
+            expected = per_point_changes(points, since)
+            if expected is None:
+                assert result["has_price_change"] is False
+            else:
+                assert_same_changes(result, expected)
+        single = await monitor.detect_price_changes(*offers[0], days=14)
+        assert single["change_percent"] == results[0]["change_percent"]
@@ -0,0 +1,62 @@
+"""
+Tests for trend_analyzer.py
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from fs_agt_clean.core.analysis.models import TrendDirection
+from fs_agt_clean.core.analysis.trend_analyzer import TrendAnalyzer
+
+TIMESTAMPS = [datetime(2026, 1, 1) + timedelta(days=i) for i in range(30)]
+
+
+def random_series(rng, rows, n):
+    """Rising, falling, flat, noisy and constant series."""
+    x = np.arange(n)
+    slopes = rng.choice([-2.0, -0.05, 0.0, 0.05, 2.0], size=(rows, 1))
+    noise = rng.choice([0.0, 0.5, 20.0], size=(rows, 1))
+    return 50 + slopes * x + noise * rng.standard_normal((rows, n))
+
+
+class TestAnalyzeTrend:
+    """Tests for single-series and batch trend analysis."""
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_single(self):
+        """Every batch result equals analyzing the series on its own."""
+        rng = np.random.default_rng(0)
+        analyzer = TrendAnalyzer()
+        for n in (5, 12, 30):
+            values = random_series(rng, 40, n)
+            names = [f"m{i}" for i in range(len(values))]
+            batch = await analyzer.analyze_trends_batch(
+                values, TIMESTAMPS[:n], names, parallel=False
+            )
+            for row, name, trend in zip(values.tolist(), names, batch):
+                single = await analyzer.analyze_trend(row, TIMESTAMPS[:n], name)
+                assert trend.direction == single.direction
+                assert trend.magnitude == pytest.approx(single.magnitude)
+                assert trend.confidence == pytest.approx(single.confidence)
+                assert trend.description == single.description
+
+    @pytest.mark.asyncio
+    async def test_directions(self):
+        """Clear rises and falls are detected; flat data is stable."""
+        analyzer = TrendAnalyzer()
+        x = list(range(20))
+        rising = await analyzer.analyze_trend([10 + 2 * i for i in x], [], "up")
+        falling = await analyzer.analyze_trend([60 - 2 * i for i in x], [], "down")
+        flat = await analyzer.analyze_trend([5.0] * 20, [], "flat")
+        assert rising.direction == TrendDirection.INCREASING
+        assert falling.direction == TrendDirection.DECREASING
+        assert flat.direction == TrendDirection.STABLE
+
+    @pytest.mark.asyncio
+    async def test_insufficient_data(self):
+        """Series shorter than min_data_points are stable with no confidence."""
+        trend = await TrendAnalyzer().analyze_trend([1.0, 2.0], [], "short")
+        assert trend.direction == TrendDirection.STABLE
+        assert trend.confidence == 0.0
@@ -3,17 +3,289 @@ Trend Analysis for market data.
 
 This module provides trend analysis capabilities for market data, including
 detection of trends, seasonality, and pattern recognition.
+
+Statistics are computed with NumPy over 2-D arrays of aligned series (one
+series per row), so a whole catalog is analyzed with a handful of array
+operations: closed-form least squares for every row at once, FFT based
+autocorrelation and mask based peak detection. The single-series methods
+use the same kernels on a one-row array.
 """
 
+import asyncio
 import logging
-import math
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 from fs_agt_clean.core.analysis.models import MarketTrend, TrendDirection
 
 logger = logging.getLogger(__name__)
 
+# Minimum series length for seasonality detection
+MIN_SEASONALITY_POINTS = 12
+
+# Coefficient of variation of absolute changes above which data is volatile
+VOLATILITY_CV_THRESHOLD = 0.5
+
+# Row order of the direction codes returned by analyze_trend_rows
+DIRECTION_CODES = (
+    TrendDirection.STABLE,
+    TrendDirection.VOLATILE,
+    TrendDirection.INCREASING,
+    TrendDirection.DECREASING,
+)
+
+SeasonalityResult = Dict[str, Union[bool, float, List[int]]]
+
+
+def linear_regression_rows(
+    x: np.ndarray, values: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Closed-form least squares of every row of ``values`` against ``x``.
+
+    Args:
+        x: Independent variable, shared by all rows (length n)
+        values: Dependent variables, one series per row (shape rows x n)
+
+    Returns:
+        Tuple of (slope, intercept, r_value, p_value, std_err) arrays
+    """
+    rows, n = values.shape
+    zeros = np.zeros(rows)
+    ones = np.ones(rows)
+    if n < 2:
+        return zeros, zeros.copy(), zeros.copy(), ones, zeros.copy()
+
+    x_mean = x.mean()
+    x_centered = x - x_mean
+    denominator = float(x_centered @ x_centered)
+    y_mean = values.mean(axis=1)
+    if denominator == 0:
+        return zeros, y_mean, zeros.copy(), ones, zeros.copy()
+
+    y_centered = values - y_mean[:, None]
+    numerator = y_centered @ x_centered
+    slope = numerator / denominator
+    intercept = y_mean - slope * x_mean
+
+    # Correlation coefficient (0 for constant series)
+    y_var = np.einsum("ij,ij->i", y_centered, y_centered)
+    r_value = np.divide(
+        numerator,
+        np.sqrt(denominator * y_var),
+        out=np.zeros(rows),
+        where=y_var != 0,
+    )
+
+    # Standard error (simplified)
+    residuals = values - (intercept[:, None] + slope[:, None] * x)
+    mse = np.einsum("ij,ij->i", residuals, residuals) / max(n - 2, 1)
+    std_err = np.sqrt(mse / max(denominator, 1))
+
+    # Simplified p-value (not exact but reasonable approximation)
+    if n > 2:
+        t_stat = np.abs(slope) / np.maximum(std_err, 1e-10)
+        p_value = np.maximum(
+            0.001, 2 * (1 - np.minimum(0.999, t_stat / (t_stat + n - 2)))
+        )
+    else:
+        p_value = ones
+
+    return slope, intercept, r_value, p_value, std_err
+
+
+def autocorrelation_rows(values: np.ndarray) -> np.ndarray:
+    """
+    Autocorrelation of every row for all lags, in O(n log n) per row.
+
+    The lagged products are obtained from the power spectrum of the
+    zero-padded series (Wiener-Khinchin), then normalized by the variance
+    and the number of overlapping points of each lag.
+
+    Args:
+        values: Series, one per row (shape rows x n)
+
+    Returns:
+        Autocorrelation array of the same shape (lag 0 first)
+    """
+    rows, n = values.shape
+    if n == 0:
+        return np.zeros((rows, 0))
+
+    centered = values - values.mean(axis=1, keepdims=True)
+    variance = np.einsum("ij,ij->i", centered, centered) / n
+
+    # Pad to at least 2n - 1 so the circular correlation has no wraparound
+    size = 1 << (2 * n - 1).bit_length()
+    spectrum = np.fft.rfft(centered, size, axis=1)
+    lagged = np.fft.irfft(spectrum.real**2 + spectrum.imag**2, size, axis=1)[:, :n]
+
+    scale = variance[:, None] * np.arange(n, 0, -1)
+    autocorr = np.divide(
+        lagged, scale, out=np.zeros((rows, n)), where=variance[:, None] != 0
+    )
+    autocorr[:, 0] = 1.0
+    return autocorr
+
+
+def peak_mask(values: np.ndarray, height: float = 0.1) -> np.ndarray:
+    """
+    Strict local maxima of at least ``height`` in every row.
+
+    Args:
+        values: Data, one series per row (shape rows x n)
+        height: Minimum height for peaks
+
+    Returns:
+        Boolean array of the same shape marking peaks
+    """
+    mask = np.zeros(values.shape, dtype=bool)
+    if values.shape[1] < 3:
+        return mask
+    middle = values[:, 1:-1]
+    mask[:, 1:-1] = (
+        (middle > values[:, :-2]) & (middle > values[:, 2:]) & (middle >= height)
+    )
+    return mask
+
+
+def _space_peaks(indices: Sequence[int], distance: int) -> List[int]:
+    """Keep peaks at least ``distance`` after the previously kept one."""
+    # Strict local maxima are never adjacent, so spacing 2 always holds
+    if distance <= 2:
+        return [int(i) for i in indices]
+    peaks: List[int] = []
+    for i in indices:
+        if not peaks or i - peaks[-1] >= distance:
+            peaks.append(int(i))
+    return peaks
+
+
+def analyze_trend_rows(
+    values: np.ndarray, significance_level: float, trend_threshold: float
+) -> List[Tuple[int, float, float]]:
+    """
+    Trend direction, magnitude and confidence of every row.
+
+    Module level so chunks can run in worker processes.
+
+    Args:
+        values: Series, one per row (shape rows x n)
+        significance_level: P-value above which a trend is not significant
+        trend_threshold: Minimum absolute slope of a trend
+
+    Returns:
+        List of (direction code, magnitude, confidence) per row; the code
+        indexes ``DIRECTION_CODES``
+    """
+    rows, n = values.shape
+    x = np.arange(n, dtype=float)
+    slope, _, r_value, p_value, _ = linear_regression_rows(x, values)
+
+    # Volatility: coefficient of variation of the absolute changes
+    volatile = np.zeros(rows, dtype=bool)
+    if n >= 4:
+        diffs = np.abs(np.diff(values, axis=1))
+        mean_diff = diffs.mean(axis=1)
+        std_diff = diffs.std(axis=1)
+        volatile = mean_diff != 0
+        volatile[volatile] = (
+            std_diff[volatile] / mean_diff[volatile] > VOLATILITY_CV_THRESHOLD
+        )
+
+    significant = p_value <= significance_level
+    direction = np.select(
+        [
+            ~significant & volatile,
+            significant & (slope > trend_threshold),
+            significant & (slope < -trend_threshold),
+        ],
+        [1, 2, 3],
+        default=0,
+    )
+
+    # Magnitude: relative change over the period, capped at 1
+    mean_value = values.mean(axis=1)
+    magnitude = np.minimum(
+        np.abs(
+            np.divide(
+                slope * n, mean_value, out=np.zeros(rows), where=mean_value != 0
+            )
+        ),
+        1.0,
+    )
+
+    # Confidence: goodness of fit and statistical significance
+    p_factor = 1.0 - np.minimum(p_value / significance_level, 1.0)
+    confidence = np.minimum(r_value**2 * 0.7 + p_factor * 0.3, 1.0)
+
+    return list(
+        zip(direction.tolist(), magnitude.tolist(), confidence.tolist())
+    )
+
+
+def detect_seasonality_rows(
+    values: np.ndarray,
+    seasonality_threshold: float,
+    height: float = 0.1,
+    distance: int = 2,
+) -> List[SeasonalityResult]:
+    """
+    Seasonality of every row from the peaks of its detrended autocorrelation.
+
+    Module level so chunks can run in worker processes.
+
+    Args:
+        values: Series, one per row (shape rows x n)
+        seasonality_threshold: Minimum autocorrelation of a seasonal period
+        height: Minimum height of autocorrelation peaks
+        distance: Minimum distance between autocorrelation peaks
+
+    Returns:
+        Seasonality result dictionary per row
+    """
+    rows, n = values.shape
+    if n < MIN_SEASONALITY_POINTS:
+        return [
+            {
+                "has_seasonality": False,
+                "seasonality_strength": 0.0,
+                "seasonal_periods": [],
+                "confidence": 0.0,
+            }
+            for _ in range(rows)
+        ]
+
+    # Detrend every row
+    x = np.arange(n, dtype=float)
+    slope, intercept, _, _, _ = linear_regression_rows(x, values)
+    detrended = values - (slope[:, None] * x + intercept[:, None])
+
+    autocorr = autocorrelation_rows(detrended)
+    peaks = peak_mask(autocorr, height)
+
+    results: List[SeasonalityResult] = []
+    for row, mask in zip(autocorr, peaks):
+        periods = [
+            p
+            for p in _space_peaks(np.flatnonzero(mask), distance)
+            if row[p] > seasonality_threshold
+        ]
+        strength = float(row[periods].max()) if periods else 0.0
+        results.append(
+            {
+                "has_seasonality": strength > seasonality_threshold,
+                "seasonality_strength": strength,
+                "seasonal_periods": periods,
+                "confidence": min(strength * 1.5, 1.0),
+            }
+        )
+    return results
+
 
 class TrendAnalyzer:
     """
@@ -36,6 +308,11 @@ class TrendAnalyzer:
         self.trend_threshold = self.config.get("trend_threshold", 0.1)
         self.seasonality_threshold = self.config.get("seasonality_threshold", 0.2)
 
+        # Batch analysis: rows per chunk and worker processes for large batches
+        self.batch_chunk_size = int(self.config.get("batch_chunk_size", 5000))
+        self.batch_workers = self.config.get("batch_workers")
+        self._batch_pool: Optional[ProcessPoolExecutor] = None
+
     async def analyze_trend(
         self, data: List[float], timestamps: List[datetime], metric_name: str
     ) -> MarketTrend:
@@ -62,20 +339,11 @@ class TrendAnalyzer:
                 description="Insufficient data for trend analysis",
             )
 
-        # Calculate trend using linear regression
-        x = list(range(len(data)))
-        y = data
-
-        slope, intercept, r_value, p_value, std_err = self._linear_regression(x, y)
-
-        # Determine trend direction
-        direction = self._determine_trend_direction(slope, p_value, data)
-
-        # Calculate magnitude (normalized slope)
-        magnitude = self._calculate_magnitude(slope, data)
-
-        # Calculate confidence based on r-squared and p-value
-        confidence = self._calculate_confidence(r_value, p_value)
+        values = np.asarray(data, dtype=float).reshape(1, -1)
+        code, magnitude, confidence = analyze_trend_rows(
+            values, self.significance_level, self.trend_threshold
+        )[0]
+        direction = DIRECTION_CODES[code]
 
         # Generate description
         description = self._generate_trend_description(
@@ -93,107 +361,161 @@ class TrendAnalyzer:
             description=description,
         )
 
-    def _determine_trend_direction(
-        self, slope: float, p_value: float, data: List[float]
-    ) -> TrendDirection:
-        """
-        Determine the direction of a trend.
-
-        Args:
-            slope: Slope of the linear regression
-            p_value: P-value of the linear regression
-            data: Original data points
-
-        Returns:
-            TrendDirection enum value
+    async def analyze_trends_batch(
+        self,
+        data: Union[np.ndarray, Sequence[Sequence[float]]],
+        timestamps: List[datetime],
+        metric_names: Sequence[str],
+        parallel: Optional[bool] = None,
+    ) -> List[MarketTrend]:
         """
-        # Check if trend is statistically significant
-        if p_value > self.significance_level:
-            # Check for volatility
-            if self._is_volatile(data):
-                return TrendDirection.VOLATILE
-            return TrendDirection.STABLE
-
-        if slope > self.trend_threshold:
-            return TrendDirection.INCREASING
-        elif slope < -self.trend_threshold:
-            return TrendDirection.DECREASING
-        else:
-            return TrendDirection.STABLE
+        Analyze trends of many aligned series at once.
 
-    def _is_volatile(self, data: List[float]) -> bool:
-        """
-        Check if data shows volatility.
+        Gives the same results as ``analyze_trend`` on every series, with
+        the statistics of all series computed together.
 
         Args:
-            data: List of data points
+            data: Series sharing the same timestamps, one per row
+            timestamps: Timestamps of the columns
+            metric_names: Metric name of every series
+            parallel: Run chunks in worker processes (defaults to True when
+                the batch spans several chunks)
 
         Returns:
-            True if data is volatile, False otherwise
-        """
-        if len(data) < 4:
-            return False
-
-        # Calculate differences between consecutive points
-        diffs = [abs(data[i] - data[i - 1]) for i in range(1, len(data))]
-
-        # Calculate coefficient of variation
-        mean_diff = sum(diffs) / len(diffs)
-        std_diff = math.sqrt(sum((d - mean_diff) ** 2 for d in diffs) / len(diffs))
-
-        # Check if coefficient of variation is high
-        if mean_diff == 0:
-            return False
-
-        cv = std_diff / mean_diff
-        return cv > 0.5  # Threshold for volatility
-
-    def _calculate_magnitude(self, slope: float, data: List[float]) -> float:
+            MarketTrend object per series, in input order
         """
-        Calculate the magnitude of a trend.
-
-        Args:
-            slope: Slope of the linear regression
-            data: Original data points
-
-        Returns:
-            Normalized magnitude between 0 and 1
-        """
-        if not data:
-            return 0.0
-
-        # Normalize slope by the mean of the data
-        mean_value = sum(data) / len(data)
-        if mean_value == 0:
-            return 0.0
+        values = self._as_rows(data)
+        if len(metric_names) != values.shape[0]:
+            raise ValueError(
+                f"Got {len(metric_names)} metric names for {values.shape[0]} series"
+            )
 
-        # Calculate relative change over the period
-        relative_change = abs(slope * len(data) / mean_value)
+        timeframe_days = self._calculate_timeframe_days(timestamps)
+        if values.shape[1] < self.min_data_points:
+            return [
+                MarketTrend(
+                    metric=metric_name,
+                    direction=TrendDirection.STABLE,
+                    magnitude=0.0,
+                    confidence=0.0,
+                    timeframe_days=timeframe_days,
+                    data_points=row,
+                    timestamps=timestamps,
+                    description="Insufficient data for trend analysis",
+                )
+                for metric_name, row in zip(metric_names, values.tolist())
+            ]
+
+        stats = await self._run_rows(
+            analyze_trend_rows,
+            values,
+            (self.significance_level, self.trend_threshold),
+            parallel,
+        )
 
-        # Cap at 1.0
-        return min(relative_change, 1.0)
+        trends = []
+        for metric_name, row, (code, magnitude, confidence) in zip(
+            metric_names, values.tolist(), stats
+        ):
+            direction = DIRECTION_CODES[code]
+            trends.append(
+                MarketTrend(
+                    metric=metric_name,
+                    direction=direction,
+                    magnitude=magnitude,
+                    confidence=confidence,
+                    timeframe_days=timeframe_days,
+                    data_points=row,
+                    timestamps=timestamps,
+                    description=self._generate_trend_description(
+                        direction, magnitude, confidence, metric_name
+                    ),
+                )
+            )
+        return trends
 
-    def _calculate_confidence(self, r_value: float, p_value: float) -> float:
+    async def detect_seasonality_batch(
+        self,
+        data: Union[np.ndarray, Sequence[Sequence[float]]],
+        timestamps: Optional[List[datetime]] = None,
+        parallel: Optional[bool] = None,
+    ) -> List[SeasonalityResult]:
         """
-        Calculate confidence in the trend.
+        Detect seasonality of many aligned series at once.
 
         Args:
-            r_value: R-value of the linear regression
-            p_value: P-value of the linear regression
+            data: Series sharing the same timestamps, one per row
+            timestamps: Timestamps of the columns
+            parallel: Run chunks in worker processes (defaults to True when
+                the batch spans several chunks)
 
         Returns:
-            Confidence score between 0 and 1
+            Seasonality result dictionary per series, as ``detect_seasonality``
         """
-        # R-squared measures goodness of fit
-        r_squared = r_value**2
-
-        # P-value measures statistical significance
-        p_factor = 1.0 - min(p_value / self.significance_level, 1.0)
-
-        # Combine both factors
-        confidence = (r_squared * 0.7) + (p_factor * 0.3)
+        values = self._as_rows(data)
+        return await self._run_rows(
+            detect_seasonality_rows,
+            values,
+            (self.seasonality_threshold,),
+            parallel,
+        )
 
-        return min(confidence, 1.0)
+    def _as_rows(
+        self, data: Union[np.ndarray, Sequence[Sequence[float]]]
+    ) -> np.ndarray:
+        values = np.asarray(data, dtype=float)
+        if values.ndim == 1 and values.size == 0:
+            values = values.reshape(0, 0)
+        if values.ndim != 2:
+            raise ValueError("Batch data must be a 2-D array of aligned series")
+        return values
+
+    async def _run_rows(
+        self,
+        fn: Callable[..., List[Any]],
+        values: np.ndarray,
+        args: Tuple[Any, ...],
+        parallel: Optional[bool],
+    ) -> List[Any]:
+        """Apply a row kernel chunk by chunk, in worker processes if requested."""
+        chunk_size = max(1, self.batch_chunk_size)
+        chunks = [
+            values[start : start + chunk_size]
+            for start in range(0, values.shape[0], chunk_size)
+        ]
+        if parallel is None:
+            parallel = len(chunks) > 1
+
+        results: List[Any] = []
+        if not parallel:
+            for chunk in chunks:
+                results.extend(fn(chunk, *args))
+            return results
+
+        loop = asyncio.get_running_loop()
+        pool = self._get_batch_pool()
+        try:
+            chunk_results = await asyncio.gather(
+                *(loop.run_in_executor(pool, fn, chunk, *args) for chunk in chunks)
+            )
+        except BrokenProcessPool:
+            logger.error("Trend worker pool broke, restarting on next batch")
+            self._batch_pool = None
+            raise
+        for chunk_result in chunk_results:
+            results.extend(chunk_result)
+        return results
+
+    def _get_batch_pool(self) -> ProcessPoolExecutor:
+        if self._batch_pool is None:
+            self._batch_pool = ProcessPoolExecutor(max_workers=self.batch_workers)
+        return self._batch_pool
+
+    def shutdown(self) -> None:
+        """Shut down the batch worker processes."""
+        if self._batch_pool is not None:
+            self._batch_pool.shutdown(wait=False, cancel_futures=True)
+            self._batch_pool = None
 
     def _linear_regression(
         self, x: List[float], y: List[float]
@@ -208,47 +530,10 @@ class TrendAnalyzer:
         Returns:
             Tuple of (slope, intercept, r_value, p_value, std_err)
         """
-        n = len(x)
-        if n < 2:
-            return 0.0, 0.0, 0.0, 1.0, 0.0
-
-        # Calculate means
-        x_mean = sum(x) / n
-        y_mean = sum(y) / n
-
-        # Calculate slope and intercept
-        numerator = sum((x[i] - x_mean) * (y[i] - y_mean) for i in range(n))
-        denominator = sum((x[i] - x_mean) ** 2 for i in range(n))
-
-        if denominator == 0:
-            return 0.0, y_mean, 0.0, 1.0, 0.0
-
-        slope = numerator / denominator
-        intercept = y_mean - slope * x_mean
-
-        # Calculate correlation coefficient
-        x_var = sum((x[i] - x_mean) ** 2 for i in range(n))
-        y_var = sum((y[i] - y_mean) ** 2 for i in range(n))
-
-        if x_var == 0 or y_var == 0:
-            r_value = 0.0
-        else:
-            r_value = numerator / math.sqrt(x_var * y_var)
-
-        # Calculate standard error (simplified)
-        y_pred = [intercept + slope * x[i] for i in range(n)]
-        residuals = [(y[i] - y_pred[i]) ** 2 for i in range(n)]
-        mse = sum(residuals) / max(n - 2, 1)
-        std_err = math.sqrt(mse / max(denominator, 1))
-
-        # Simplified p-value calculation (not exact but reasonable approximation)
-        if n > 2:
-            t_stat = abs(slope) / max(std_err, 1e-10)
-            # Rough approximation for p-value
-            p_value = max(0.001, 2 * (1 - min(0.999, t_stat / (t_stat + n - 2))))
-        else:
-            p_value = 1.0
-
+        stats = linear_regression_rows(
+            np.asarray(x, dtype=float), np.asarray([y], dtype=float)
+        )
+        slope, intercept, r_value, p_value, std_err = (float(s[0]) for s in stats)
         return slope, intercept, r_value, p_value, std_err
 
     def _calculate_timeframe_days(self, timestamps: List[datetime]) -> int:
@@ -332,46 +617,9 @@ class TrendAnalyzer:
         Returns:
             Dictionary with seasonality analysis results
         """
-        if len(data) < 12:  # Need at least a year of data for reliable seasonality
-            return {
-                "has_seasonality": False,
-                "seasonality_strength": 0.0,
-                "seasonal_periods": [],
-                "confidence": 0.0,
-            }
-
-        # Detrend the data
-        x = list(range(len(data)))
-        slope, intercept, _, _, _ = self._linear_regression(x, data)
-        trend = [slope * x[i] + intercept for i in range(len(data))]
-        detrended = [data[i] - trend[i] for i in range(len(data))]
-
-        # Calculate autocorrelation
-        autocorr = self._autocorrelation(detrended)
-
-        # Find peaks in autocorrelation (simplified peak detection)
-        peaks = self._find_peaks(autocorr, height=0.1, distance=2)
-
-        # Filter out peaks that are too small
-        significant_peaks = [
-            p for p in peaks if autocorr[p] > self.seasonality_threshold
-        ]
-
-        # Calculate seasonality strength
-        if significant_peaks:
-            seasonality_strength = max(autocorr[p] for p in significant_peaks)
-        else:
-            seasonality_strength = 0.0
-
-        # Calculate confidence
-        confidence = min(seasonality_strength * 1.5, 1.0)
-
-        return {
-            "has_seasonality": seasonality_strength > self.seasonality_threshold,
-            "seasonality_strength": seasonality_strength,
-            "seasonal_periods": significant_peaks,
-            "confidence": confidence,
-        }
+        # Need at least a year of data for reliable seasonality
+        values = np.asarray(data, dtype=float).reshape(1, -1)
+        return detect_seasonality_rows(values, self.seasonality_threshold)[0]
 
     def _autocorrelation(self, x: List[float]) -> List[float]:
         """
@@ -383,33 +631,8 @@ class TrendAnalyzer:
         Returns:
             Autocorrelation values
         """
-        n = len(x)
-        if n == 0:
-            return []
-
-        # Calculate mean and variance
-        mean_x = sum(x) / n
-        variance = sum((val - mean_x) ** 2 for val in x) / n
-
-        if variance == 0:
-            return [1.0] + [0.0] * (n - 1)
-
-        # Center the data
-        centered = [val - mean_x for val in x]
-
-        # Calculate autocorrelation
-        autocorr = []
-        for lag in range(n):
-            if lag == 0:
-                autocorr.append(1.0)
-            else:
-                correlation = sum(
-                    centered[i] * centered[i - lag] for i in range(lag, n)
-                )
-                correlation /= variance * (n - lag)
-                autocorr.append(correlation)
-
-        return autocorr
+        values = np.asarray(x, dtype=float).reshape(1, -1)
+        return autocorrelation_rows(values)[0].tolist()
 
     def _find_peaks(
         self, data: List[float], height: float = 0.1, distance: int = 2
@@ -425,14 +648,5 @@ class TrendAnalyzer:
         Returns:
             List of peak indices
         """
-        peaks = []
-        n = len(data)
-
-        for i in range(1, n - 1):
-            # Check if current point is higher than neighbors
-            if data[i] > data[i - 1] and data[i] > data[i + 1] and data[i] >= height:
-                # Check distance constraint
-                if not peaks or i - peaks[-1] >= distance:
-                    peaks.append(i)
-
-        return peaks
+        mask = peak_mask(np.asarray(data, dtype=float).reshape(1, -1), height)[0]
+        return _space_peaks(np.flatnonzero(mask), distance)
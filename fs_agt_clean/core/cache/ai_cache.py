@@ -5,6 +5,7 @@ This service provides Redis-based caching for AI analysis results:
 - Image analysis result caching
 - Hash-based cache keys for duplicate detection
 - TTL-based cache expiration
+- Namespace and tag index sets for invalidation without KEYS
 - Performance monitoring and metrics
 """
 
@@ -14,14 +15,15 @@ import json
 import logging
 import time
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 try:
     import aioredis
     from aioredis import Redis
 
     REDIS_AVAILABLE = True
-except ImportError:
+except (ImportError, TypeError):
+    # aioredis 2.0.x raises TypeError on import under Python 3.11+
     aioredis = None
     Redis = None
     REDIS_AVAILABLE = False
@@ -109,6 +111,12 @@ class AICacheService:
     - TTL-based cache expiration
     - Performance monitoring and metrics
     - Cache invalidation and cleanup
+
+    Every write also adds the key to a namespace index (the key without its
+    last segment) and to any tag indexes. Index entries are sorted sets
+    scored by expiry time, so invalidation reads set members instead of
+    walking the keyspace, expired members are pruned with a range delete on
+    every write and live key counts come from ``ZCOUNT``.
     """
 
     def __init__(self, redis_url: str = "redis://localhost:6379", db: int = 1):
@@ -124,8 +132,12 @@ class AICacheService:
             "image_analysis_ttl": 3600 * 24 * 7,  # 7 days
             "category_optimization_ttl": 3600 * 24 * 3,  # 3 days
             "pricing_analysis_ttl": 3600 * 6,  # 6 hours (pricing changes frequently)
+            "stale_ttl": 3600,  # Keep results 1 hour past expiry for stale serving
             "max_cache_size": 10000,  # Maximum number of cached items
             "key_prefix": "flipsync:ai:",
+            "index_prefix": "flipsync:ai-index:",
+            "delete_chunk_size": 500,  # Keys per UNLINK command
+            "scan_count": 1000,  # SCAN/ZRANGE batch size
         }
 
         logger.info("AI Cache Service initialized")
@@ -176,6 +188,68 @@ class AICacheService:
         # Return formatted key
         return f"{self.config['key_prefix']}{cache_type}:{data_hash}"
 
+    @staticmethod
+    def _namespace(cache_key: str) -> str:
+        """Namespace of a key: everything before its last segment."""
+        return cache_key.rsplit(":", 1)[0]
+
+    def _namespace_index(self, namespace: str) -> str:
+        return f"{self.config['index_prefix']}ns:{namespace}"
+
+    def _tag_index(self, tag: str) -> str:
+        return f"{self.config['index_prefix']}tag:{tag}"
+
+    @property
+    def _namespace_registry(self) -> str:
+        return f"{self.config['index_prefix']}namespaces"
+
+    @property
+    def _tag_registry(self) -> str:
+        return f"{self.config['index_prefix']}tags"
+
+    def _chunks(self, keys: List[str]) -> Iterable[List[str]]:
+        size = self.config["delete_chunk_size"]
+        for start in range(0, len(keys), size):
+            yield keys[start : start + size]
+
+    def _index_key(
+        self,
+        pipe: Any,
+        cache_key: str,
+        ttl: Optional[int],
+        tags: Optional[List[str]] = None,
+    ) -> None:
+        """Queue index updates for a key written with ``ttl`` seconds.
+
+        Members that have expired are pruned from each index written to, so
+        an index never holds more than its live keys plus those expired since
+        its last write.
+        """
+        now = time.time()
+        expires_at = now + ttl if ttl else float("inf")
+        namespace = self._namespace(cache_key)
+        indexes = [self._namespace_index(namespace)]
+        pipe.sadd(self._namespace_registry, namespace)
+        for tag in tags or ():
+            indexes.append(self._tag_index(tag))
+            pipe.sadd(self._tag_registry, tag)
+        for index in indexes:
+            pipe.zremrangebyscore(index, "-inf", now)
+            pipe.zadd(index, {cache_key: expires_at})
+
+    async def _store(
+        self,
+        cache_key: str,
+        value: str,
+        ttl: int,
+        tags: Optional[List[str]] = None,
+    ) -> None:
+        """Write a value and its index entries in one round trip."""
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.setex(cache_key, ttl, value)
+        self._index_key(pipe, cache_key, ttl, tags)
+        await pipe.execute()
+
     async def cache_image_analysis(
         self,
         image_data: bytes,
@@ -218,7 +292,7 @@ class AICacheService:
             cache_ttl = ttl or self.config["image_analysis_ttl"]
 
             # Cache the result
-            await self.redis.setex(cache_key, cache_ttl, json.dumps(cache_value))
+            await self._store(cache_key, json.dumps(cache_value), cache_ttl)
 
             self.metrics.record_set()
             logger.debug(f"Cached image analysis result: {cache_key}")
@@ -309,7 +383,7 @@ class AICacheService:
             cache_ttl = ttl or self.config["category_optimization_ttl"]
 
             # Cache the result
-            await self.redis.setex(cache_key, cache_ttl, json.dumps(cache_value))
+            await self._store(cache_key, json.dumps(cache_value), cache_ttl)
 
             self.metrics.record_set()
             logger.debug(f"Cached category optimization: {cache_key}")
@@ -357,10 +431,162 @@ class AICacheService:
             self.metrics.record_error()
             return None
 
+    async def cache_result(
+        self,
+        cache_key: str,
+        data: Dict[str, Any],
+        ttl: Optional[int] = None,
+        stale_ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+    ) -> bool:
+        """
+        Cache an arbitrary result under a fully qualified key.
+
+        The entry is fresh for ``ttl`` seconds and kept for another
+        ``stale_ttl`` seconds so it can still be served stale while it is
+        revalidated, or as a fallback when the upstream call fails.
+
+        Args:
+            cache_key: Fully qualified cache key
+            data: JSON serializable result
+            ttl: Freshness lifetime in seconds (optional)
+            stale_ttl: Additional stale retention in seconds (optional)
+            tags: Tags to index the entry under for ``invalidate_tag``
+
+        Returns:
+            True if cached successfully, False otherwise
+        """
+        if not self.redis:
+            return False
+
+        try:
+            fresh_ttl = ttl or self.config["default_ttl"]
+            stale_window = (
+                self.config["stale_ttl"] if stale_ttl is None else stale_ttl
+            )
+            cache_value = {
+                "data": data,
+                "cached_at": time.time(),
+                "ttl": fresh_ttl,
+            }
+
+            await self._store(
+                cache_key, json.dumps(cache_value), fresh_ttl + stale_window, tags
+            )
+
+            self.metrics.record_set()
+            return True
+
+        except Exception as e:
+            logger.error(f"Error caching result: {e}")
+            self.metrics.record_error()
+            return False
+
+    async def get_cached_entry(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve a cached result together with its freshness.
+
+        Returns:
+            Dict with ``data``, ``cached_at``, ``age`` and ``stale`` keys, or
+            None if the key is not cached at all
+        """
+        if not self.redis:
+            return None
+
+        start_time = time.time()
+
+        try:
+            cached_value = await self.redis.get(cache_key)
+            if not cached_value:
+                self.metrics.record_miss()
+                return None
+
+            entry = json.loads(cached_value)
+            age = time.time() - entry.get("cached_at", 0)
+            stale = age > entry.get("ttl", self.config["default_ttl"])
+            if stale:
+                self.metrics.record_miss()
+            else:
+                self.metrics.record_hit(time.time() - start_time)
+
+            return {
+                "data": entry.get("data"),
+                "cached_at": entry.get("cached_at"),
+                "age": age,
+                "stale": stale,
+            }
+
+        except Exception as e:
+            logger.error(f"Error retrieving cached result: {e}")
+            self.metrics.record_error()
+            return None
+
+    async def get_cached_result(
+        self, cache_key: str, allow_stale: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Retrieve a cached result, ignoring stale entries unless allowed."""
+        entry = await self.get_cached_entry(cache_key)
+        if entry is None or (entry["stale"] and not allow_stale):
+            return None
+        return entry["data"]
+
+    async def _scan_keys(self, match: str):
+        """Yield batches of keys matching ``match`` using ``SCAN``."""
+        cursor = 0
+        while True:
+            cursor, keys = await self.redis.scan(
+                cursor=cursor, match=match, count=self.config["scan_count"]
+            )
+            if keys:
+                yield keys
+            if not int(cursor):
+                break
+
+    async def _unlink_keys(
+        self, keys: List[str], source_index: Optional[str] = None
+    ) -> int:
+        """
+        Unlink keys in chunks and drop them from their indexes.
+
+        All chunks go out in a single pipeline. Keys are removed from their
+        namespace index and from ``source_index`` (the index they were read
+        from), so live key counts stay exact.
+        """
+        pipe = self.redis.pipeline(transaction=False)
+        chunks = list(self._chunks(keys))
+        for chunk in chunks:
+            pipe.unlink(*chunk)
+
+        by_namespace: Dict[str, List[str]] = {}
+        for key in keys:
+            by_namespace.setdefault(self._namespace(key), []).append(key)
+        for namespace, members in by_namespace.items():
+            pipe.zrem(self._namespace_index(namespace), *members)
+        if source_index is not None:
+            for chunk in chunks:
+                pipe.zrem(source_index, *chunk)
+
+        results = await pipe.execute()
+        return sum(results[: len(chunks)])
+
+    async def _drain_index(self, index: str) -> int:
+        """Unlink every key listed in an index."""
+        deleted = 0
+        while True:
+            keys = await self.redis.zrange(index, 0, self.config["scan_count"] - 1)
+            if not keys:
+                return deleted
+            deleted += await self._unlink_keys(keys, source_index=index)
+
     async def invalidate_cache(self, pattern: str) -> int:
         """
         Invalidate cache entries matching a pattern.
 
+        Namespace patterns such as ``"image_analysis:*"`` are served from the
+        namespace indexes. Any other pattern falls back to ``SCAN``. Keys
+        written before they were indexed are only found by the ``SCAN`` path
+        until ``cleanup_expired_cache(reindex=True)`` has run once.
+
         Args:
             pattern: Redis key pattern to match
 
@@ -371,50 +597,138 @@ class AICacheService:
             return 0
 
         try:
-            # Find matching keys
-            keys = await self.redis.keys(f"{self.config['key_prefix']}{pattern}")
+            full_pattern = f"{self.config['key_prefix']}{pattern}"
+            namespace = full_pattern[:-2]
+            deleted_count = 0
+
+            if full_pattern.endswith(":*") and not any(
+                char in namespace for char in "*?[\\"
+            ):
+                for indexed in await self.redis.smembers(self._namespace_registry):
+                    if indexed == namespace or indexed.startswith(f"{namespace}:"):
+                        deleted_count += await self._drain_index(
+                            self._namespace_index(indexed)
+                        )
+            else:
+                async for keys in self._scan_keys(full_pattern):
+                    deleted_count += await self._unlink_keys(keys)
 
-            if keys:
-                # Delete matching keys
-                deleted_count = await self.redis.delete(*keys)
-                self.metrics.deletes += deleted_count
+            self.metrics.deletes += deleted_count
+            if deleted_count:
                 logger.info(
                     f"Invalidated {deleted_count} cache entries matching pattern: {pattern}"
                 )
-                return deleted_count
-
-            return 0
+            return deleted_count
 
         except Exception as e:
             logger.error(f"Error invalidating cache: {e}")
             self.metrics.record_error()
             return 0
 
-    async def cleanup_expired_cache(self) -> Dict[str, Any]:
-        """Clean up expired cache entries and return statistics."""
+    async def invalidate_tag(self, tag: str) -> int:
+        """
+        Invalidate all cache entries written with a tag.
+
+        Args:
+            tag: Tag passed to ``cache_result``
+
+        Returns:
+            Number of keys deleted
+        """
         if not self.redis:
-            return {"error": "Redis not connected"}
+            return 0
 
         try:
-            # Get all cache keys
-            all_keys = await self.redis.keys(f"{self.config['key_prefix']}*")
+            deleted_count = await self._drain_index(self._tag_index(tag))
+            await self.redis.srem(self._tag_registry, tag)
 
-            expired_count = 0
-            total_keys = len(all_keys)
+            self.metrics.deletes += deleted_count
+            if deleted_count:
+                logger.info(f"Invalidated {deleted_count} cache entries tagged: {tag}")
+            return deleted_count
 
-            # Check each key for expiration
-            for key in all_keys:
-                ttl = await self.redis.ttl(key)
-                if ttl == -2:  # Key doesn't exist (expired)
-                    expired_count += 1
+        except Exception as e:
+            logger.error(f"Error invalidating cache tag: {e}")
+            self.metrics.record_error()
+            return 0
+
+    async def _reindex(self) -> int:
+        """Index keys under the key prefix that are missing from the indexes."""
+        indexed = 0
+        async for keys in self._scan_keys(f"{self.config['key_prefix']}*"):
+            pipe = self.redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.ttl(key)
+            ttls = await pipe.execute()
+
+            pipe = self.redis.pipeline(transaction=False)
+            for key, ttl in zip(keys, ttls):
+                if ttl == -2:  # Expired since the scan returned it
+                    continue
+                self._index_key(pipe, key, ttl if ttl > 0 else None)
+                indexed += 1
+            await pipe.execute()
+        return indexed
+
+    async def cleanup_expired_cache(self, reindex: bool = False) -> Dict[str, Any]:
+        """
+        Prune expired entries from the indexes and return statistics.
+
+        Redis expires the cached values itself; this drops index members
+        whose expiry time has passed and forgets empty indexes.
+
+        Args:
+            reindex: First ``SCAN`` the key prefix and index keys written
+                before indexing existed
+
+        Returns:
+            Cleanup statistics
+        """
+        if not self.redis:
+            return {"error": "Redis not connected"}
+
+        try:
+            reindexed = await self._reindex() if reindex else 0
+
+            namespaces = list(await self.redis.smembers(self._namespace_registry))
+            tags = list(await self.redis.smembers(self._tag_registry))
+            indexes = [self._namespace_index(ns) for ns in namespaces] + [
+                self._tag_index(tag) for tag in tags
+            ]
+
+            now = time.time()
+            pipe = self.redis.pipeline(transaction=False)
+            for index in indexes:
+                pipe.zremrangebyscore(index, "-inf", now)
+                pipe.zcard(index)
+            results = await pipe.execute()
+            pruned, remaining = results[0::2], results[1::2]
+
+            # Tag indexes hold the same keys again, only count namespaces
+            expired_count = sum(pruned[: len(namespaces)])
+            active_count = sum(remaining[: len(namespaces)])
+
+            empty_namespaces = [
+                ns for ns, count in zip(namespaces, remaining) if not count
+            ]
+            empty_tags = [
+                tag
+                for tag, count in zip(tags, remaining[len(namespaces) :])
+                if not count
+            ]
+            if empty_namespaces:
+                await self.redis.srem(self._namespace_registry, *empty_namespaces)
+            if empty_tags:
+                await self.redis.srem(self._tag_registry, *empty_tags)
 
             # Get memory usage info
             memory_info = await self.redis.info("memory")
 
             return {
-                "total_keys": total_keys,
+                "total_keys": active_count + expired_count,
                 "expired_keys": expired_count,
-                "active_keys": total_keys - expired_count,
+                "active_keys": active_count,
+                "reindexed_keys": reindexed,
                 "memory_used": memory_info.get("used_memory_human", "Unknown"),
                 "cleanup_timestamp": datetime.now(timezone.utc).isoformat(),
             }
@@ -423,6 +737,15 @@ class AICacheService:
             logger.error(f"Error during cache cleanup: {e}")
             return {"error": str(e)}
 
+    async def _count_live_keys(self) -> Dict[str, int]:
+        """Live key count per namespace, read from the namespace indexes."""
+        namespaces = sorted(await self.redis.smembers(self._namespace_registry))
+        pipe = self.redis.pipeline(transaction=False)
+        now = time.time()
+        for namespace in namespaces:
+            pipe.zcount(self._namespace_index(namespace), now, "+inf")
+        return dict(zip(namespaces, await pipe.execute()))
+
     async def get_cache_statistics(self) -> Dict[str, Any]:
         """Get comprehensive cache statistics."""
         stats = self.metrics.get_stats()
@@ -433,14 +756,15 @@ class AICacheService:
                 redis_info = await self.redis.info()
                 redis_memory = await self.redis.info("memory")
 
-                # Get cache key count
-                cache_keys = await self.redis.keys(f"{self.config['key_prefix']}*")
+                # Get cache key counts
+                namespace_keys = await self._count_live_keys()
 
                 stats.update(
                     {
                         "redis_connected": True,
                         "redis_version": redis_info.get("redis_version", "Unknown"),
-                        "total_cache_keys": len(cache_keys),
+                        "total_cache_keys": sum(namespace_keys.values()),
+                        "namespace_keys": namespace_keys,
                         "redis_memory_used": redis_memory.get(
                             "used_memory_human", "Unknown"
                         ),
@@ -0,0 +1,318 @@
+"""
+Bounded async memoization for FlipSync agent and analysis code.
+
+``AsyncCache`` keeps results in an LRU of bounded size with a TTL per entry.
+Concurrent misses for the same key share one execution (single-flight) and,
+with a stale window, expired entries are served while one background refresh
+runs (stale-while-revalidate). Failed loads are never cached.
+
+The ``async_cached`` decorator memoizes coroutine functions and methods on a
+stable hashable key built from their arguments. Every cache is registered by
+name so ``get_async_cache_stats`` reports hits, misses and evictions per
+function.
+"""
+
+import functools
+import logging
+import time
+import weakref
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from fs_agt_clean.core.cache.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# Caches by name; several instances (e.g. one per service object) may share
+# a name and are reported together
+_registry: Dict[str, "weakref.WeakSet[AsyncCache]"] = {}
+
+
+def freeze(value: Any) -> Hashable:
+    """
+    Stable hashable form of a value for use in cache keys.
+
+    Mappings, sequences and sets are converted recursively (mappings are
+    order-independent). Other hashable values are used as they are, so
+    objects without custom equality are keyed by identity. Arrays are keyed
+    by their bytes and other unhashable values by their type and repr.
+    """
+    if isinstance(value, Mapping):
+        items = [(freeze(k), freeze(v)) for k, v in value.items()]
+        try:
+            items.sort()
+        except TypeError:
+            items.sort(key=repr)
+        return ("__mapping__", tuple(items))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(freeze(item) for item in value))
+    if isinstance(value, (set, frozenset)):
+        return ("__set__", frozenset(freeze(item) for item in value))
+    try:
+        hash(value)
+    except TypeError:
+        if hasattr(value, "tobytes") and hasattr(value, "dtype"):
+            # NumPy arrays: repr would truncate large arrays
+            return ("__array__", str(value.dtype), value.shape, value.tobytes())
+        return ("__repr__", type(value).__qualname__, repr(value))
+    return value
+
+
+def make_key(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Hashable:
+    """Cache key of a call's positional and keyword arguments."""
+    key = freeze(args)
+    if kwargs:
+        key = (key, freeze(kwargs))
+    return key
+
+
+class AsyncCacheMetrics:
+    """Async cache metrics tracking."""
+
+    def __init__(self):
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.load_failures = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "load_failures": self.load_failures,
+            "hit_rate_percentage": round(
+                ((self.hits + self.stale_hits) / lookups) * 100 if lookups else 0.0,
+                2,
+            ),
+        }
+
+
+class AsyncCache:
+    """LRU + TTL cache of async results with single-flight loading."""
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int = 1024,
+        ttl: float = 300.0,
+        stale_ttl: float = 0.0,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            name: Name the cache is reported under
+            maxsize: Maximum number of entries
+            ttl: Seconds an entry is fresh
+            stale_ttl: Seconds after expiry during which the stale entry is
+                still returned while it is refreshed in the background
+        """
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.metrics = AsyncCacheMetrics()
+        self.single_flight = SingleFlight(name)
+        # key -> (fresh_until, value), in least recently used order
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        _registry.setdefault(name, weakref.WeakSet()).add(self)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.peek(key) is not _MISSING
+
+    def peek(self, key: Hashable, default: Any = _MISSING) -> Any:
+        """Fresh value of a key without loading or updating statistics."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return default
+        return entry[1]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Fresh value of a key, or ``default``."""
+        return self.peek(key, default)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting expired and least recently used entries."""
+        now = time.monotonic()
+        self._entries[key] = (now + self.ttl, value)
+        self._entries.move_to_end(key)
+
+        # Entries past their stale window at the LRU end are dropped first
+        while self._entries:
+            oldest_key, (fresh_until, _) = next(iter(self._entries.items()))
+            if fresh_until + self.stale_ttl > now:
+                break
+            del self._entries[oldest_key]
+            self.metrics.expirations += 1
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.metrics.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a key."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        cache_if: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Get a cached value or load it.
+
+        Concurrent misses for the same key share one ``loader`` call. Stale
+        entries inside the stale window are returned immediately while a
+        single background refresh runs.
+
+        Args:
+            key: Hashable cache key
+            loader: Coroutine function producing the value
+            cache_if: Optional predicate; results failing it are returned
+                but not cached
+
+        Returns:
+            The cached or loaded value
+        """
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        async def load() -> Any:
+            try:
+                value = await loader()
+            except Exception:
+                self.metrics.load_failures += 1
+                raise
+            if cache_if is None or cache_if(value):
+                self.set(key, value)
+            return value
+
+        if entry is not None:
+            fresh_until, value = entry
+            if fresh_until > now:
+                self._entries.move_to_end(key)
+                self.metrics.hits += 1
+                return value
+            if fresh_until + self.stale_ttl > now:
+                self._entries.move_to_end(key)
+                self.metrics.stale_hits += 1
+                self.single_flight.refresh_in_background(key, load)
+                return value
+            del self._entries[key]
+            self.metrics.expirations += 1
+
+        self.metrics.misses += 1
+        return await self.single_flight.do(key, load)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics including size and coalescing."""
+        stats = self.metrics.get_stats()
+        stats.update(
+            {
+                "name": self.name,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "stale_ttl_seconds": self.stale_ttl,
+                "coalesced_calls": self.single_flight.metrics.coalesced,
+            }
+        )
+        return stats
+
+
+def async_cached(
+    maxsize: int = 1024,
+    ttl: float = 300.0,
+    stale_ttl: float = 0.0,
+    name: Optional[str] = None,
+    key: Optional[Callable[..., Hashable]] = None,
+    cache_if: Optional[Callable[[Any], bool]] = None,
+) -> Callable:
+    """
+    Memoize a coroutine function in a bounded ``AsyncCache``.
+
+    Methods are keyed on their instance too, so instances do not share
+    results. The wrapper exposes ``cache``, ``cache_clear()`` and
+    ``cache_info()``.
+
+    Args:
+        maxsize: Maximum number of cached calls
+        ttl: Seconds a result is fresh
+        stale_ttl: Seconds a stale result is served while refreshing
+        name: Stats name (defaults to the function's qualified name)
+        key: Optional function of the call arguments returning the key
+        cache_if: Optional predicate deciding whether a result is cached
+    """
+
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable:
+        cache = AsyncCache(
+            name or f"{func.__module__}.{func.__qualname__}",
+            maxsize=maxsize,
+            ttl=ttl,
+            stale_ttl=stale_ttl,
+        )
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            cache_key = key(*args, **kwargs) if key else make_key(args, kwargs)
+            return await cache.get_or_load(
+                cache_key, lambda: func(*args, **kwargs), cache_if
+            )
+
+        wrapper.cache = cache  # type: ignore[attr-defined]
+        wrapper.cache_clear = cache.clear  # type: ignore[attr-defined]
+        wrapper.cache_info = cache.get_stats  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+def get_async_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Statistics of every live async cache, summed per name."""
+    report: Dict[str, Dict[str, Any]] = {}
+    for name, caches in list(_registry.items()):
+        caches = list(caches)
+        if not caches:
+            _registry.pop(name, None)
+            continue
+        totals: Dict[str, Any] = {"instances": len(caches)}
+        for cache in caches:
+            for field, value in cache.metrics.get_stats().items():
+                if field != "hit_rate_percentage":
+                    totals[field] = totals.get(field, 0) + value
+            totals["size"] = totals.get("size", 0) + len(cache)
+        lookups = totals["hits"] + totals["stale_hits"] + totals["misses"]
+        totals["hit_rate_percentage"] = round(
+            ((totals["hits"] + totals["stale_hits"]) / lookups) * 100
+            if lookups
+            else 0.0,
+            2,
+        )
+        report[name] = totals
+    return report
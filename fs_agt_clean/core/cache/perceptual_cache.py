@@ -0,0 +1,436 @@
+"""
+Perceptual-hash result cache for image analysis.
+
+Sellers upload the same product photo many times, re-encoded, resized or
+lightly edited, so byte hashes rarely match. This module fingerprints images
+with a DCT perceptual hash (pHash) and a gradient hash (dHash) and keeps them
+in a BK-tree per analysis namespace, so analyses of visually identical or
+near-identical images can be reused instead of calling the vision model again.
+
+A candidate must be within the pHash distance threshold (found through the
+BK-tree) and within the dHash threshold (verification) to count as a match.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from fs_agt_clean.core.ai.image_pipeline import ImageProcessingPool, get_image_pool
+from fs_agt_clean.core.cache.ai_cache import AICacheService, ai_cache_service
+
+logger = logging.getLogger(__name__)
+
+HASH_SIZE = 8
+_DCT_SIZE = 32
+
+# Unnormalized DCT-II basis; only the relative order of coefficients matters
+_DCT_MATRIX = np.cos(
+    np.pi
+    * np.outer(np.arange(_DCT_SIZE), 2 * np.arange(_DCT_SIZE) + 1)
+    / (2 * _DCT_SIZE)
+)
+
+
+@dataclass(frozen=True)
+class PerceptualHashes:
+    """64-bit perceptual fingerprints of an image."""
+
+    phash: int
+    dhash: int
+
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    return int.from_bytes(np.packbits(bits.flatten()).tobytes(), "big")
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return (a ^ b).bit_count()
+
+
+def compute_image_hashes(image_bytes: bytes) -> Dict[str, Any]:
+    """
+    Compute pHash and dHash of an encoded image.
+
+    JPEG input is decoded in draft mode at a fraction of its resolution since
+    only a 32x32 thumbnail is needed. Runs in the image worker pool.
+
+    Returns:
+        Dictionary with ``phash``, ``dhash`` and ``timings``
+    """
+    start = time.perf_counter()
+
+    image = Image.open(io.BytesIO(image_bytes))
+    image.draft("L", (_DCT_SIZE * 2, _DCT_SIZE * 2))
+    image = image.convert("L")
+
+    gradient = np.asarray(
+        image.resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.LANCZOS),
+        dtype=np.float64,
+    )
+    dhash = _bits_to_int(gradient[:, 1:] > gradient[:, :-1])
+
+    pixels = np.asarray(
+        image.resize((_DCT_SIZE, _DCT_SIZE), Image.Resampling.LANCZOS),
+        dtype=np.float64,
+    )
+    low_frequencies = (_DCT_MATRIX @ pixels @ _DCT_MATRIX.T)[:HASH_SIZE, :HASH_SIZE]
+    phash = _bits_to_int(low_frequencies > np.median(low_frequencies))
+
+    return {
+        "phash": phash,
+        "dhash": dhash,
+        "timings": [("perceptual_hash", time.perf_counter() - start)],
+    }
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over 64-bit hashes with Hamming distance.
+
+    Each node keeps the items stored under its exact hash; children are keyed
+    by their distance to the node, which lets range searches skip subtrees
+    via the triangle inequality.
+    """
+
+    def __init__(self):
+        self._root: Optional[list] = None
+        self._size = 0
+        self._empty_nodes = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, key: int, item: Hashable) -> None:
+        """Store an item under a hash."""
+        self._size += 1
+        if self._root is None:
+            self._root = [key, [item], {}]
+            return
+
+        node = self._root
+        while True:
+            distance = hamming_distance(key, node[0])
+            if distance == 0:
+                if not node[1]:
+                    self._empty_nodes -= 1
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [key, [item], {}]
+                return
+            node = child
+
+    def remove(self, key: int, item: Hashable) -> bool:
+        """
+        Remove an item.
+
+        Emptied nodes stay in place to keep routing intact; the tree is
+        rebuilt once they outnumber the stored items.
+        """
+        node = self._root
+        while node is not None:
+            distance = hamming_distance(key, node[0])
+            if distance == 0:
+                if item not in node[1]:
+                    return False
+                node[1].remove(item)
+                self._size -= 1
+                if not node[1]:
+                    self._empty_nodes += 1
+                    if self._empty_nodes > max(64, self._size):
+                        self._rebuild()
+                return True
+            node = node[2].get(distance)
+        return False
+
+    def _rebuild(self) -> None:
+        live = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            key, items, children = stack.pop()
+            live.extend((key, item) for item in items)
+            stack.extend(children.values())
+
+        self._root = None
+        self._size = 0
+        self._empty_nodes = 0
+        for key, item in live:
+            self.add(key, item)
+
+    def search(self, key: int, max_distance: int) -> List[Tuple[int, Hashable]]:
+        """Find all items within ``max_distance`` of a hash."""
+        if self._root is None:
+            return []
+
+        results = []
+        stack = [self._root]
+        while stack:
+            node_key, items, children = stack.pop()
+            distance = hamming_distance(key, node_key)
+            if distance <= max_distance:
+                results.extend((distance, item) for item in items)
+            low, high = distance - max_distance, distance + max_distance
+            for child_distance, child in children.items():
+                if low <= child_distance <= high:
+                    stack.append(child)
+        return results
+
+
+@dataclass
+class _CacheEntry:
+    namespace: str
+    hashes: PerceptualHashes
+    result: Dict[str, Any]
+    stored_at: float
+
+
+class PerceptualCacheMetrics:
+    """Perceptual cache metrics tracking."""
+
+    def __init__(self):
+        self.lookups = 0
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.remote_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.hash_errors = 0
+        self.total_hit_distance = 0
+
+    def record_hit(self, distance: int) -> None:
+        if distance == 0:
+            self.exact_hits += 1
+        else:
+            self.near_hits += 1
+        self.total_hit_distance += distance
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit statistics."""
+        hits = self.exact_hits + self.near_hits + self.remote_hits
+        return {
+            "lookups": self.lookups,
+            "hits": hits,
+            "exact_hits": self.exact_hits,
+            "near_hits": self.near_hits,
+            "remote_hits": self.remote_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hash_errors": self.hash_errors,
+            "hit_rate_percentage": round(
+                (hits / self.lookups) * 100 if self.lookups else 0.0, 2
+            ),
+            "average_hit_distance": round(
+                self.total_hit_distance / (self.exact_hits + self.near_hits)
+                if self.exact_hits + self.near_hits
+                else 0.0,
+                2,
+            ),
+        }
+
+
+class PerceptualAnalysisCache:
+    """
+    Reuse image analysis results across visually matching images.
+
+    Results are partitioned by namespace (for example marketplace and
+    analysis types) and kept in a bounded in-process LRU indexed by BK-trees,
+    with one entry per distinct pair of hashes. Expired entries are dropped
+    when a lookup reaches them.
+    Results are also written through to Redis keyed by the exact pHash, so
+    other workers can reuse analyses of perceptually identical images.
+    """
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        ai_cache: Optional[AICacheService] = None,
+        image_pool: Optional[ImageProcessingPool] = None,
+    ):
+        """
+        Initialize the perceptual cache.
+
+        Args:
+            config: Optional settings (``phash_threshold``, ``dhash_threshold``,
+                ``perceptual_cache_size``, ``perceptual_cache_ttl``)
+            ai_cache: Redis-backed cache for cross-process reuse
+            image_pool: Worker pool used to hash images off the event loop
+        """
+        config = config or {}
+        self.phash_threshold = config.get("phash_threshold", 8)
+        self.dhash_threshold = config.get("dhash_threshold", 10)
+        self.max_entries = config.get("perceptual_cache_size", 10000)
+        self.ttl = config.get("perceptual_cache_ttl", 3600 * 24 * 7)
+
+        self.ai_cache = ai_cache or ai_cache_service
+        self.image_pool = image_pool or get_image_pool(config)
+        self.metrics = PerceptualCacheMetrics()
+
+        self._entries: "OrderedDict[int, _CacheEntry]" = OrderedDict()
+        self._trees: Dict[str, BKTree] = {}
+        self._next_id = 0
+
+    @staticmethod
+    def make_namespace(*parts: Any) -> str:
+        """Build a namespace from the parameters that shape an analysis."""
+        return hashlib.sha256(
+            json.dumps(parts, sort_keys=True, default=str).encode()
+        ).hexdigest()[:16]
+
+    async def hash_image(self, image_bytes: bytes) -> Optional[PerceptualHashes]:
+        """Compute perceptual hashes in the worker pool; None if undecodable."""
+        try:
+            result = await self.image_pool.run(compute_image_hashes, image_bytes)
+            return PerceptualHashes(phash=result["phash"], dhash=result["dhash"])
+        except Exception as e:
+            self.metrics.hash_errors += 1
+            logger.debug(f"Could not compute perceptual hash: {e}")
+            return None
+
+    def _remote_key(self, namespace: str, phash: int) -> str:
+        prefix = self.ai_cache.config["key_prefix"]
+        return f"{prefix}perceptual:{namespace}:{phash:016x}"
+
+    async def lookup(
+        self, hashes: PerceptualHashes, namespace: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find a cached result for a visually matching image.
+
+        Args:
+            hashes: Hashes of the image being analyzed
+            namespace: Namespace of the analysis parameters
+
+        Returns:
+            Cached result dictionary, or None on a miss
+        """
+        self.metrics.lookups += 1
+        now = time.time()
+
+        best: Optional[Tuple[int, int]] = None
+        tree = self._trees.get(namespace)
+        if tree is not None:
+            for phash_distance, entry_id in tree.search(
+                hashes.phash, self.phash_threshold
+            ):
+                entry = self._entries.get(entry_id)
+                if entry is None:
+                    continue
+                if now - entry.stored_at > self.ttl:
+                    self._remove(entry_id)
+                    self.metrics.expirations += 1
+                    continue
+                dhash_distance = hamming_distance(hashes.dhash, entry.hashes.dhash)
+                if dhash_distance > self.dhash_threshold:
+                    continue
+                distance = phash_distance + dhash_distance
+                if best is None or distance < best[0]:
+                    best = (distance, entry_id)
+
+        if best is not None:
+            distance, entry_id = best
+            self._entries.move_to_end(entry_id)
+            self.metrics.record_hit(distance)
+            logger.debug(f"Perceptual cache hit at distance {distance}")
+            return self._entries[entry_id].result
+
+        remote = await self.ai_cache.get_cached_result(
+            self._remote_key(namespace, hashes.phash)
+        )
+        if remote and (
+            hamming_distance(hashes.dhash, remote.get("dhash", hashes.dhash))
+            <= self.dhash_threshold
+        ):
+            self.metrics.remote_hits += 1
+            self._insert(namespace, hashes, remote["result"], now)
+            return remote["result"]
+
+        self.metrics.misses += 1
+        return None
+
+    async def store(
+        self, hashes: PerceptualHashes, namespace: str, result: Dict[str, Any]
+    ) -> None:
+        """Cache a JSON serializable analysis result for an image."""
+        self._insert(namespace, hashes, result, time.time())
+        self.metrics.stores += 1
+        await self.ai_cache.cache_result(
+            self._remote_key(namespace, hashes.phash),
+            {"dhash": hashes.dhash, "result": result},
+            ttl=self.ttl,
+            stale_ttl=0,
+        )
+
+    def _insert(
+        self,
+        namespace: str,
+        hashes: PerceptualHashes,
+        result: Dict[str, Any],
+        stored_at: float,
+    ) -> None:
+        tree = self._trees.setdefault(namespace, BKTree())
+
+        # The same image stored again replaces its earlier result
+        for _, entry_id in tree.search(hashes.phash, 0):
+            entry = self._entries[entry_id]
+            if entry.hashes == hashes:
+                entry.result = result
+                entry.stored_at = stored_at
+                self._entries.move_to_end(entry_id)
+                return
+
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = _CacheEntry(namespace, hashes, result, stored_at)
+        tree.add(hashes.phash, entry_id)
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.metrics.evictions += 1
+
+    def _remove(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id)
+        tree = self._trees[entry.namespace]
+        tree.remove(entry.hashes.phash, entry_id)
+        if not len(tree):
+            del self._trees[entry.namespace]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit metrics and index size."""
+        stats = self.metrics.get_stats()
+        stats.update(
+            {
+                "entries": len(self._entries),
+                "namespaces": len(self._trees),
+                "phash_threshold": self.phash_threshold,
+                "dhash_threshold": self.dhash_threshold,
+            }
+        )
+        return stats
+
+
+# Global perceptual cache instance
+_perceptual_cache: Optional[PerceptualAnalysisCache] = None
+
+
+def get_perceptual_cache(
+    config: Optional[Dict[str, Any]] = None,
+) -> PerceptualAnalysisCache:
+    """Get the global perceptual analysis cache, creating it on first use."""
+    global _perceptual_cache
+    if _perceptual_cache is None:
+        _perceptual_cache = PerceptualAnalysisCache(config)
+    return _perceptual_cache
@@ -0,0 +1,127 @@
+"""
+Single-flight request coalescing for FlipSync.
+
+Concurrent callers asking for the same key share one in-flight execution
+instead of each paying for an identical AI/API call. Only the first caller
+(the leader) starts the work as a shared task and every caller, the leader
+included, awaits it through a shield, so cancelling one caller never cancels
+the work the others are waiting for.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlightMetrics:
+    """Coalescing metrics tracking."""
+
+    def __init__(self):
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.failures = 0
+        self.background_refreshes = 0
+        self.max_waiters = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics."""
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced_calls": self.coalesced,
+            "failures": self.failures,
+            "background_refreshes": self.background_refreshes,
+            "max_waiters": self.max_waiters,
+            "coalescing_rate_percentage": round(
+                (self.coalesced / self.calls) * 100 if self.calls else 0.0, 2
+            ),
+        }
+
+
+class SingleFlight:
+    """Deduplicate concurrent executions of identical work by key."""
+
+    def __init__(self, name: str = "default"):
+        self.name = name
+        self.metrics = SingleFlightMetrics()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        self._background: set = set()
+        self._refreshing: set = set()
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Whether work for the key is currently running."""
+        return key in self._inflight
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``fn`` once per key among concurrent callers.
+
+        All callers receive the shared result or exception. Cancelling any
+        caller, including the one that started the work, does not cancel the
+        shared execution.
+        """
+        self.metrics.calls += 1
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.metrics.coalesced += 1
+            waiters = self._waiters.get(key, 1) + 1
+            self._waiters[key] = waiters
+            self.metrics.max_waiters = max(self.metrics.max_waiters, waiters)
+        else:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            self._waiters[key] = 1
+            self.metrics.executions += 1
+            task.add_done_callback(lambda done: self._finish(key, done))
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Future) -> None:
+        """Forget a finished execution and record its failure, if any."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            self._waiters.pop(key, None)
+        # Retrieving the exception also avoids "exception was never
+        # retrieved" when every caller was cancelled
+        if task.cancelled() or task.exception() is not None:
+            self.metrics.failures += 1
+
+    def refresh_in_background(
+        self, key: Hashable, fn: Callable[[], Awaitable[Any]]
+    ) -> bool:
+        """
+        Start a background execution for the key unless one is already running.
+
+        Used for stale-while-revalidate: the caller returns stale data while a
+        single refresh runs. Returns True if a refresh was started.
+        """
+        if key in self._inflight or key in self._refreshing:
+            return False
+
+        self.metrics.background_refreshes += 1
+        self._refreshing.add(key)
+
+        async def refresh():
+            try:
+                await self.do(key, fn)
+            except Exception as e:
+                logger.warning(f"Background refresh failed for {self.name}: {e}")
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.create_task(refresh())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics including current in-flight keys."""
+        stats = self.metrics.get_stats()
+        stats["in_flight"] = len(self._inflight)
+        stats["name"] = self.name
+        return stats
@@ -0,0 +1,80 @@
+"""
+Tests for ai_cache.py
+"""
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+
+from fs_agt_clean.core.cache import ai_cache
+from fs_agt_clean.core.cache.ai_cache import AICacheService
+
+
+class Clock:
+    """Controllable stand-in for ``time.time``."""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def cache_service():
+    service = AICacheService()
+    service.redis = FakeRedis(decode_responses=True)
+    return service
+
+
+class TestIndexes:
+    """Tests for the namespace and tag index sets."""
+
+    @pytest.mark.asyncio
+    async def test_expired_members_pruned_on_write(self, monkeypatch):
+        """Index cardinality stays bounded by live keys across expiring writes."""
+        clock = Clock()
+        monkeypatch.setattr(ai_cache.time, "time", clock)
+        service = cache_service()
+        prefix = service.config["key_prefix"]
+        namespace_index = service._namespace_index(f"{prefix}pricing")
+        tag_index = service._tag_index("sku")
+
+        for i in range(200):
+            await service.cache_result(
+                f"{prefix}pricing:{i}", {"v": i}, ttl=10, stale_ttl=0, tags=["sku"]
+            )
+            clock.now += 1.0
+            assert await service.redis.zcard(namespace_index) <= 10
+            assert await service.redis.zcard(tag_index) <= 10
+
+        assert await service.redis.zcard(namespace_index) == 10
+
+    @pytest.mark.asyncio
+    async def test_live_members_kept(self, monkeypatch):
+        """Writes only prune members whose expiry has passed."""
+        clock = Clock()
+        monkeypatch.setattr(ai_cache.time, "time", clock)
+        service = cache_service()
+        prefix = service.config["key_prefix"]
+        await service.cache_result(f"{prefix}ns:long", {}, ttl=100, stale_ttl=0)
+        await service.cache_result(f"{prefix}ns:short", {}, ttl=5, stale_ttl=0)
+        clock.now += 10
+        await service.cache_result(f"{prefix}ns:new", {}, ttl=5, stale_ttl=0)
+
+        index = service._namespace_index(f"{prefix}ns")
+        assert set(await service.redis.zrange(index, 0, -1)) == {
+            f"{prefix}ns:long",
+            f"{prefix}ns:new",
+        }
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tag(self):
+        """Invalidating a tag deletes its keys and empties the index."""
+        service = cache_service()
+        prefix = service.config["key_prefix"]
+        await service.cache_result(f"{prefix}a:1", {}, tags=["t"])
+        await service.cache_result(f"{prefix}b:1", {}, tags=["t"])
+        await service.cache_result(f"{prefix}b:2", {})
+
+        assert await service.invalidate_tag("t") == 2
+        assert await service.redis.exists(f"{prefix}b:2")
+        assert await service.redis.zcard(service._tag_index("t")) == 0
@@ -0,0 +1,208 @@
+"""
+Tests for async_cache.py
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from fs_agt_clean.core.cache.async_cache import (
+    AsyncCache,
+    async_cached,
+    freeze,
+    get_async_cache_stats,
+    make_key,
+)
+
+
+class TestKeys:
+    """Tests for building cache keys."""
+
+    def test_mapping_order_independent(self):
+        """Mappings with the same items give the same key."""
+        assert freeze({"a": 1, "b": [1, 2]}) == freeze({"b": [1, 2], "a": 1})
+
+    def test_list_and_tuple_differ(self):
+        """Lists and tuples with the same items give different keys."""
+        assert freeze([1, 2]) != freeze((1, 2))
+
+    def test_arrays_keyed_by_content(self):
+        """Arrays are keyed by dtype, shape and bytes."""
+        assert freeze(np.arange(4)) == freeze(np.arange(4))
+        assert freeze(np.arange(4)) != freeze(np.arange(4).reshape(2, 2))
+
+    def test_kwargs_in_key(self):
+        """Keyword arguments are part of the key."""
+        assert make_key((1,), {}) != make_key((1,), {"x": 2})
+        hash(make_key(({"a": [1]},), {"b": {2}}))
+
+
+class TestAsyncCache:
+    """Tests for AsyncCache."""
+
+    @pytest.mark.asyncio
+    async def test_hit_after_load(self):
+        """A loaded value is served from the cache."""
+        cache = AsyncCache("test.hit")
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            return "value"
+
+        assert await cache.get_or_load("k", loader) == "value"
+        assert await cache.get_or_load("k", loader) == "value"
+        assert calls == 1
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_coalesce(self):
+        """Concurrent misses for one key share a single load."""
+        cache = AsyncCache("test.coalesce")
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(
+            *(cache.get_or_load("k", loader) for _ in range(5))
+        )
+        assert results == [1] * 5
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_failures_not_cached(self):
+        """A failed load is retried on the next call."""
+        cache = AsyncCache("test.failure")
+        attempts = 0
+
+        async def loader():
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise RuntimeError("boom")
+            return "ok"
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_load("k", loader)
+        assert await cache.get_or_load("k", loader) == "ok"
+        assert cache.get_stats()["load_failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_if(self):
+        """Results rejected by cache_if are returned but not stored."""
+        cache = AsyncCache("test.cache_if")
+
+        async def loader():
+            return None
+
+        assert await cache.get_or_load("k", loader, lambda v: v is not None) is None
+        assert "k" not in cache
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted beyond maxsize."""
+        cache = AsyncCache("test.lru", maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("a", 1)
+        cache.set("c", 3)
+        assert "b" not in cache
+        assert cache.get("a") == 1
+        assert len(cache) == 2
+        assert cache.get_stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_reloaded(self):
+        """An entry past its TTL is loaded again."""
+        cache = AsyncCache("test.ttl", ttl=0.01)
+        values = iter([1, 2])
+
+        async def loader():
+            return next(values)
+
+        assert await cache.get_or_load("k", loader) == 1
+        await asyncio.sleep(0.02)
+        assert await cache.get_or_load("k", loader) == 2
+        assert cache.get_stats()["expirations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self):
+        """A stale entry is served while one background refresh runs."""
+        cache = AsyncCache("test.stale", ttl=0.05, stale_ttl=10.0)
+        values = iter([1, 2])
+
+        async def loader():
+            return next(values)
+
+        assert await cache.get_or_load("k", loader) == 1
+        await asyncio.sleep(0.06)
+        assert await cache.get_or_load("k", loader) == 1
+        assert await cache.get_or_load("k", loader) == 1
+        await asyncio.sleep(0.01)
+        assert await cache.get_or_load("k", loader) == 2
+        assert cache.get_stats()["stale_hits"] == 2
+
+
+class TestAsyncCached:
+    """Tests for the async_cached decorator."""
+
+    @pytest.mark.asyncio
+    async def test_memoizes_per_arguments(self):
+        """Calls are cached per argument values."""
+        calls = []
+
+        @async_cached(name="test.decorated")
+        async def square(x, scale=1):
+            calls.append(x)
+            return x * x * scale
+
+        assert await square(3) == 9
+        assert await square(3) == 9
+        assert await square(3, scale=2) == 18
+        assert calls == [3, 3]
+        assert square.cache_info()["hits"] == 1
+
+        square.cache_clear()
+        assert await square(3) == 9
+        assert calls == [3, 3, 3]
+
+    @pytest.mark.asyncio
+    async def test_methods_keyed_per_instance(self):
+        """Instances of a class do not share cached results."""
+
+        class Service:
+            def __init__(self, base):
+                self.base = base
+
+            @async_cached(name="test.method")
+            async def value(self, x):
+                return self.base + x
+
+        assert await Service(1).value(1) == 2
+        assert await Service(10).value(1) == 11
+
+    @pytest.mark.asyncio
+    async def test_stats_by_name(self):
+        """Statistics are summed over caches sharing a name."""
+        first = AsyncCache("test.shared")
+        second = AsyncCache("test.shared")
+
+        async def loader():
+            return 1
+
+        await first.get_or_load("k", loader)
+        await second.get_or_load("k", loader)
+        await second.get_or_load("k", loader)
+
+        stats = get_async_cache_stats()["test.shared"]
+        assert stats["instances"] == 2
+        assert stats["misses"] == 2
+        assert stats["hits"] == 1
+        assert stats["size"] == 2
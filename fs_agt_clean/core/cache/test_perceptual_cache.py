@@ -0,0 +1,131 @@
+"""
+Tests for perceptual_cache.py
+"""
+
+import io
+
+import pytest
+from PIL import Image, ImageDraw
+
+from fs_agt_clean.core.ai.image_pipeline import ImageProcessingPool
+from fs_agt_clean.core.cache.perceptual_cache import (
+    BKTree,
+    PerceptualAnalysisCache,
+    PerceptualHashes,
+    hamming_distance,
+)
+
+
+class FakeAICache:
+    """In-memory stand-in for the Redis-backed AI cache."""
+
+    def __init__(self):
+        self.config = {"key_prefix": "test:"}
+        self.values = {}
+
+    async def get_cached_result(self, key):
+        return self.values.get(key)
+
+    async def cache_result(self, key, value, ttl=None, stale_ttl=None):
+        self.values[key] = value
+
+
+def photo(size=(128, 128), quality=90):
+    image = Image.new("RGB", (128, 128), (240, 240, 240))
+    draw = ImageDraw.Draw(image)
+    draw.ellipse((20, 30, 90, 110), fill=(200, 40, 40))
+    draw.rectangle((70, 10, 120, 60), fill=(30, 60, 180))
+    buffer = io.BytesIO()
+    image.resize(size).save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def cache():
+    return PerceptualAnalysisCache(
+        ai_cache=FakeAICache(),
+        image_pool=ImageProcessingPool(max_workers=1, use_processes=False),
+    )
+
+
+class TestBKTree:
+    """Tests for the Hamming-distance BK-tree."""
+
+    def test_search_and_remove(self):
+        """Range search finds items within the distance; removed items are gone."""
+        tree = BKTree()
+        for item, key in enumerate([0b0000, 0b0001, 0b0011, 0b1111]):
+            tree.add(key, item)
+        assert sorted(item for _, item in tree.search(0b0000, 1)) == [0, 1]
+        assert tree.remove(0b0001, 1)
+        assert not tree.remove(0b0001, 1)
+        assert sorted(item for _, item in tree.search(0b0000, 2)) == [0, 2]
+        assert len(tree) == 3
+
+    def test_hamming_distance(self):
+        """Distance counts differing bits."""
+        assert hamming_distance(0b1010, 0b0110) == 2
+
+
+class TestPerceptualAnalysisCache:
+    """Tests for storing and reusing analysis results."""
+
+    @pytest.mark.asyncio
+    async def test_near_duplicate_hit(self, cache):
+        """A re-encoded, resized copy reuses the stored result."""
+        namespace = cache.make_namespace("vision", "ebay")
+        await cache.store(await cache.hash_image(photo()), namespace, {"v": 1})
+
+        copy = await cache.hash_image(photo(size=(100, 100), quality=60))
+        assert await cache.lookup(copy, namespace) == {"v": 1}
+        assert await cache.lookup(copy, cache.make_namespace("other")) is None
+
+    @pytest.mark.asyncio
+    async def test_store_same_image_replaces(self, cache):
+        """Storing an image again replaces its entry instead of adding one."""
+        hashes = await cache.hash_image(photo())
+        await cache.store(hashes, "ns", {"v": 1})
+        await cache.store(hashes, "ns", {"v": 2})
+        assert cache.get_stats()["entries"] == 1
+        assert await cache.lookup(hashes, "ns") == {"v": 2}
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_removed(self, cache):
+        """An expired entry is dropped when a lookup reaches it."""
+        hashes = PerceptualHashes(phash=1, dhash=2)
+        cache._insert("ns", hashes, {"v": 1}, stored_at=0.0)
+        cache.ai_cache.values.clear()
+        assert await cache.lookup(hashes, "ns") is None
+        stats = cache.get_stats()
+        assert stats["entries"] == 0
+        assert stats["namespaces"] == 0
+        assert stats["expirations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, cache):
+        """The least recently used entry is evicted beyond the size bound."""
+        cache.max_entries = 2
+        for phash in (0, 2**32 - 1, 2**64 - 1):
+            await cache.store(PerceptualHashes(phash, phash), "ns", {"v": phash})
+        assert cache.get_stats()["entries"] == 2
+        assert cache.get_stats()["evictions"] == 1
+        cache.ai_cache.values.clear()
+        assert await cache.lookup(PerceptualHashes(0, 0), "ns") is None
+
+    @pytest.mark.asyncio
+    async def test_remote_hit(self, cache):
+        """Results written through by another worker are reused locally."""
+        hashes = PerceptualHashes(phash=5, dhash=7)
+        await cache.store(hashes, "ns", {"v": 1})
+        other = PerceptualAnalysisCache(
+            ai_cache=cache.ai_cache, image_pool=cache.image_pool
+        )
+        assert await other.lookup(hashes, "ns") == {"v": 1}
+        assert other.get_stats()["remote_hits"] == 1
+        assert other.get_stats()["entries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_undecodable_image(self, cache):
+        """Bytes that are not an image give no hashes."""
+        assert await cache.hash_image(b"not an image") is None
+        assert cache.get_stats()["hash_errors"] == 1
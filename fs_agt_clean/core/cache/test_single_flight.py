@@ -0,0 +1,108 @@
+"""
+Tests for single_flight.py
+"""
+
+import asyncio
+
+import pytest
+
+from fs_agt_clean.core.cache.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight("test")
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+        assert results == ["value"] * 5
+        assert calls == 1
+        stats = flight.get_stats()
+        assert stats["executions"] == 1
+        assert stats["coalesced_calls"] == 4
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_exception_reaches_every_caller(self):
+        flight = SingleFlight("test")
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            *(flight.do("k", work) for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert flight.metrics.failures == 1
+        assert not flight.in_flight("k")
+
+    @pytest.mark.asyncio
+    async def test_cancelling_leader_does_not_cancel_followers(self):
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return 42
+
+        leader = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await follower == 42
+        assert leader.cancelled()
+        assert flight.metrics.failures == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelling_follower_does_not_cancel_leader(self):
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return 42
+
+        leader = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+
+        follower.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await leader == 42
+
+    @pytest.mark.asyncio
+    async def test_refresh_in_background_runs_once(self):
+        flight = SingleFlight("test")
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+
+        assert flight.refresh_in_background("k", work)
+        assert not flight.refresh_in_background("k", work)
+        await asyncio.sleep(0.05)
+
+        assert calls == 1
+        assert flight.metrics.background_refreshes == 1
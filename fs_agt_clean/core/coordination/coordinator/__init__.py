@@ -14,6 +14,11 @@ The coordinator is designed to be:
 """
 
 from fs_agt_clean.core.coordination.coordinator.agent_registry import UnifiedAgentRegistry
+from fs_agt_clean.core.coordination.coordinator.consensus_engine import (
+    CandidateBatch,
+    ConsensusEngine,
+    ConsensusResult,
+)
 from fs_agt_clean.core.coordination.coordinator.conflict_resolver import (
     Conflict,
     ConflictResolver,
@@ -38,9 +43,21 @@ from fs_agt_clean.core.coordination.coordinator.result_aggregator import (
     AggregationStrategy,
     ResultAggregator,
 )
+from fs_agt_clean.core.coordination.coordinator.streaming_aggregate import (
+    QuantileSketch,
+    ResultLog,
+    RunningStats,
+    StreamingAggregate,
+    TopK,
+)
 from fs_agt_clean.core.coordination.coordinator.task_delegator import (
     Task,
     TaskDelegator,
     TaskPriority,
     TaskStatus,
 )
+from fs_agt_clean.core.coordination.coordinator.task_router import (
+    AgentWorkQueue,
+    RoutingStrategy,
+    TaskRouter,
+)
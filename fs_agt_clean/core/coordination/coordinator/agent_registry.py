@@ -8,6 +8,7 @@ of the Coordinator, enabling agent coordination and task delegation.
 
 import asyncio
 import logging
+import math
 import uuid
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Set, Tuple, Type, Union
@@ -31,6 +32,72 @@ from fs_agt_clean.core.coordination.event_system import (
 )
 from fs_agt_clean.core.monitoring import get_logger
 
+# Statuses the health check leaves alone until a heartbeat revives the agent
+_INACTIVE_STATUSES = (
+    UnifiedAgentStatus.INACTIVE,
+    UnifiedAgentStatus.DISCONNECTED,
+    UnifiedAgentStatus.ERROR,
+)
+
+
+class TimingWheel:
+    """
+    Hashed timing wheel of agent IDs.
+
+    Time is divided into ticks; an entry due in ``n`` ticks goes to slot
+    ``(cursor + n) % slots`` with the number of full rotations left.
+    Scheduling and cancelling are O(1) and each tick only looks at one slot.
+    """
+
+    def __init__(self, tick_seconds: float, slots: int = 60):
+        """
+        Initialize the wheel.
+
+        Args:
+            tick_seconds: Duration of one tick
+            slots: Number of slots
+        """
+        self.tick_seconds = tick_seconds
+        self.slots: List[Dict[str, int]] = [{} for _ in range(slots)]
+        self.cursor = 0
+        # Slot index of every scheduled entry
+        self._slot_of: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._slot_of
+
+    def schedule(self, key: str, delay_seconds: float) -> None:
+        """Schedule (or reschedule) a key to be due after a delay."""
+        self.cancel(key)
+        ticks = max(1, math.ceil(delay_seconds / self.tick_seconds))
+        rounds, offset = divmod(ticks - 1, len(self.slots))
+        slot = (self.cursor + 1 + offset) % len(self.slots)
+        self.slots[slot][key] = rounds
+        self._slot_of[key] = slot
+
+    def cancel(self, key: str) -> None:
+        """Remove a key from the wheel."""
+        slot = self._slot_of.pop(key, None)
+        if slot is not None:
+            del self.slots[slot][key]
+
+    def advance(self) -> List[str]:
+        """Move to the next tick and return the keys that became due."""
+        self.cursor = (self.cursor + 1) % len(self.slots)
+        entries = self.slots[self.cursor]
+        due = []
+        for key, rounds in list(entries.items()):
+            if rounds:
+                entries[key] = rounds - 1
+            else:
+                del entries[key]
+                del self._slot_of[key]
+                due.append(key)
+        return due
+
 
 class UnifiedAgentRegistry:
     """
@@ -41,12 +108,17 @@ class UnifiedAgentRegistry:
     and finding agents based on various criteria.
     """
 
-    def __init__(self, registry_id: str):
+    def __init__(
+        self,
+        registry_id: str,
+        health_check_interval: timedelta = timedelta(minutes=1),
+    ):
         """
         Initialize the agent registry.
 
         Args:
             registry_id: Unique identifier for this registry
+            health_check_interval: How often each agent is health checked
         """
         self.registry_id = registry_id
         self.logger = get_logger(f"coordinator.registry.{registry_id}")
@@ -62,13 +134,34 @@ class UnifiedAgentRegistry:
         # Initialize agent registry
         self.agents: Dict[str, UnifiedAgentInfo] = {}
 
+        # Inverted indexes to agent IDs, maintained with the registry
+        self.agents_by_type: Dict[UnifiedAgentType, Set[str]] = {}
+        self.agents_by_status: Dict[UnifiedAgentStatus, Set[str]] = {}
+        self.agents_by_capability: Dict[str, Set[str]] = {}
+        # Registration order, so lookups return agents in registry order
+        self._agent_rank: Dict[str, int] = {}
+        self._rank_counter = 0
+
         # Initialize lock for thread safety
         self.agent_lock = asyncio.Lock()
 
         # Initialize health check task
         self.health_check_task = None
-        self.health_check_interval = timedelta(minutes=1)
+        self.health_check_interval = health_check_interval
         self.health_check_running = False
+        self.health_check_concurrency = 16
+        # Agents not seen for this long are marked as disconnected
+        self.agent_timeout = timedelta(minutes=5)
+        # Agents seen within this window are considered alive without a ping
+        self.liveness_window = timedelta(minutes=1)
+        self.ping_timeout = 5.0
+
+        # Health checks are spread over the interval by a timing wheel
+        self.health_check_wheel = self._build_health_check_wheel()
+        # Checks in progress, run as tasks so the wheel keeps ticking
+        self.health_check_tasks: Set[asyncio.Task] = set()
+        self.pending_pings: Dict[str, asyncio.Future] = {}
+        self.health_stats = {"checks": 0, "skipped_alive": 0, "pings": 0}
 
     async def start(self) -> None:
         """
@@ -78,6 +171,10 @@ class UnifiedAgentRegistry:
         """
         # Start health check task
         if not self.health_check_running:
+            # The interval may have been changed since the wheel was built
+            tick_seconds = self.health_check_interval.total_seconds() / 60
+            if self.health_check_wheel.tick_seconds != tick_seconds:
+                self.health_check_wheel = self._build_health_check_wheel()
             self.health_check_running = True
             self.health_check_task = asyncio.create_task(self._health_check_loop())
 
@@ -101,6 +198,9 @@ class UnifiedAgentRegistry:
                     await self.health_check_task
                 except asyncio.CancelledError:
                     pass
+            for task in list(self.health_check_tasks):
+                task.cancel()
+            await asyncio.gather(*self.health_check_tasks, return_exceptions=True)
 
         # Unsubscribe from agent events
         # (Subscription IDs would be stored when subscribing)
@@ -125,8 +225,13 @@ class UnifiedAgentRegistry:
                 # Update status and last seen
                 agent_info.update_status(UnifiedAgentStatus.ACTIVE)
 
-                # Store agent info
+                # Store agent info, replacing a previous registration
+                previous = self.agents.get(agent_info.agent_id)
+                if previous is not None:
+                    self._unindex_agent(previous)
                 self.agents[agent_info.agent_id] = agent_info
+                self._index_agent(agent_info)
+                self._schedule_health_check(agent_info.agent_id)
 
                 self.logger.info(
                     f"UnifiedAgent registered: {agent_info.agent_id} ({agent_info.name})"
@@ -167,6 +272,9 @@ class UnifiedAgentRegistry:
 
                 # Remove agent
                 del self.agents[agent_id]
+                self._unindex_agent(agent_info)
+                self._agent_rank.pop(agent_id, None)
+                self.health_check_wheel.cancel(agent_id)
 
                 self.logger.info(f"UnifiedAgent unregistered: {agent_id}")
 
@@ -203,7 +311,9 @@ class UnifiedAgentRegistry:
 
                 # Update status
                 old_status = self.agents[agent_id].status
+                self._discard(self.agents_by_status, old_status, agent_id)
                 self.agents[agent_id].update_status(status)
+                self.agents_by_status.setdefault(status, set()).add(agent_id)
 
                 self.logger.info(
                     f"UnifiedAgent status updated: {agent_id} {old_status.value} -> {status.value}"
@@ -243,8 +353,15 @@ class UnifiedAgentRegistry:
                     return False
 
                 # Update capabilities
-                self.agents[agent_id].capabilities = capabilities
-                self.agents[agent_id].update_last_seen()
+                agent = self.agents[agent_id]
+                for capability in agent.capabilities:
+                    self._discard(self.agents_by_capability, capability.name, agent_id)
+                agent.capabilities = capabilities
+                for capability in capabilities:
+                    self.agents_by_capability.setdefault(capability.name, set()).add(
+                        agent_id
+                    )
+                agent.update_last_seen()
 
                 self.logger.info(
                     f"UnifiedAgent capabilities updated: {agent_id} ({len(capabilities)} capabilities)"
@@ -295,11 +412,7 @@ class UnifiedAgentRegistry:
         """
         try:
             async with self.agent_lock:
-                return [
-                    agent
-                    for agent in self.agents.values()
-                    if agent.agent_type == agent_type
-                ]
+                return self._agents_for(self.agents_by_type.get(agent_type, ()))
         except Exception as e:
             error_msg = f"Failed to find agents by type {agent_type.value}: {str(e)}"
             self.logger.error(error_msg, exc_info=True)
@@ -322,10 +435,13 @@ class UnifiedAgentRegistry:
         """
         try:
             async with self.agent_lock:
+                # The index narrows by name; parameters, tags and constraints
+                # are still matched per candidate
+                candidates = self._agents_for(
+                    self.agents_by_capability.get(capability.name, ())
+                )
                 return [
-                    agent
-                    for agent in self.agents.values()
-                    if agent.has_capability(capability)
+                    agent for agent in candidates if agent.has_capability(capability)
                 ]
         except Exception as e:
             error_msg = (
@@ -349,9 +465,7 @@ class UnifiedAgentRegistry:
         """
         try:
             async with self.agent_lock:
-                return [
-                    agent for agent in self.agents.values() if agent.status == status
-                ]
+                return self._agents_for(self.agents_by_status.get(status, ()))
         except Exception as e:
             error_msg = f"Failed to find agents by status {status.value}: {str(e)}"
             self.logger.error(error_msg, exc_info=True)
@@ -403,9 +517,8 @@ class UnifiedAgentRegistry:
                 if agent.last_seen is None:
                     return False
 
-                # Consider an agent unhealthy if not seen in the last 5 minutes
-                max_age = timedelta(minutes=5)
-                if datetime.now() - agent.last_seen > max_age:
+                # Consider an agent unhealthy if not seen recently
+                if datetime.now() - agent.last_seen > self.agent_timeout:
                     return False
 
                 return True
@@ -427,16 +540,13 @@ class UnifiedAgentRegistry:
         Raises:
             CoordinationError: If the ping fails
         """
+        # Create a correlation ID for this ping
+        correlation_id = str(uuid.uuid4())
         try:
-            # Create a future to wait for the response
-            response_future = asyncio.Future()
-
-            # Create a correlation ID for this ping
-            correlation_id = str(uuid.uuid4())
-
-            # Store the future with the correlation ID
-            # In a real implementation, this would be stored in a dictionary
-            # and cleaned up after a timeout
+            # Create a future resolved by the ping response handler
+            response_future = asyncio.get_running_loop().create_future()
+            self.pending_pings[correlation_id] = response_future
+            self.health_stats["pings"] += 1
 
             # Send a ping command to the agent
             await self.publisher.publish_command(
@@ -448,7 +558,7 @@ class UnifiedAgentRegistry:
 
             # Wait for the response with a timeout
             try:
-                await asyncio.wait_for(response_future, timeout=5.0)
+                await asyncio.wait_for(response_future, timeout=self.ping_timeout)
                 return True
             except asyncio.TimeoutError:
                 self.logger.warning(f"Ping timeout for agent {agent_id}")
@@ -457,81 +567,156 @@ class UnifiedAgentRegistry:
             error_msg = f"Failed to ping agent {agent_id}: {str(e)}"
             self.logger.error(error_msg, exc_info=True)
             raise CoordinationError(error_msg, agent_id=agent_id, cause=e)
+        finally:
+            self.pending_pings.pop(correlation_id, None)
 
     async def _health_check_loop(self) -> None:
         """
         Periodic health check loop for all agents.
 
-        This method runs in the background and periodically checks
-        the health of all registered agents.
+        Every agent is due once per health check interval. Due agents are
+        taken from the timing wheel each tick, so checks are spread over the
+        interval. Each check runs as its own task, up to
+        ``health_check_concurrency`` at a time, so slow pings never hold up
+        the following ticks; ticks are kept on a fixed schedule.
         """
+        semaphore = asyncio.Semaphore(self.health_check_concurrency)
+
+        async def check(agent_id: str) -> None:
+            async with semaphore:
+                try:
+                    await self._check_agent(agent_id)
+                except Exception as e:
+                    self.logger.error(
+                        f"Error checking health of agent {agent_id}: {str(e)}",
+                        exc_info=True,
+                    )
+                finally:
+                    if agent_id in self.agents:
+                        self._schedule_health_check(agent_id)
+
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
         try:
             while self.health_check_running:
-                self.logger.debug("Running agent health check")
-
                 try:
-                    # Get all agents
-                    agents = await self.get_all_agents()
-
-                    # Check each agent's health
-                    for agent in agents:
-                        try:
-                            # Skip agents that are already known to be inactive
-                            if agent.status in (
-                                UnifiedAgentStatus.INACTIVE,
-                                UnifiedAgentStatus.DISCONNECTED,
-                                UnifiedAgentStatus.ERROR,
-                            ):
-                                continue
-
-                            # Check if the agent has been seen recently
-                            if agent.last_seen is None:
-                                await self.update_agent_status(
-                                    agent.agent_id, UnifiedAgentStatus.UNKNOWN
-                                )
-                                continue
-
-                            # Consider an agent unhealthy if not seen in the last 5 minutes
-                            max_age = timedelta(minutes=5)
-                            if datetime.now() - agent.last_seen > max_age:
-                                self.logger.warning(
-                                    f"UnifiedAgent {agent.agent_id} has not been seen recently, marking as disconnected"
-                                )
-                                await self.update_agent_status(
-                                    agent.agent_id, UnifiedAgentStatus.DISCONNECTED
-                                )
-                                continue
-
-                            # For agents that are active but haven't been seen very recently,
-                            # ping them to check if they're still responsive
-                            recent_threshold = timedelta(minutes=1)
-                            if datetime.now() - agent.last_seen > recent_threshold:
-                                is_responsive = await self.ping_agent(agent.agent_id)
-                                if not is_responsive:
-                                    self.logger.warning(
-                                        f"UnifiedAgent {agent.agent_id} is not responsive, marking as disconnected"
-                                    )
-                                    await self.update_agent_status(
-                                        agent.agent_id, UnifiedAgentStatus.DISCONNECTED
-                                    )
-                        except Exception as e:
-                            self.logger.error(
-                                f"Error checking health of agent {agent.agent_id}: {str(e)}",
-                                exc_info=True,
-                            )
+                    due = self.health_check_wheel.advance()
+                    if due:
+                        self.logger.debug(
+                            f"Running health check for {len(due)} agents"
+                        )
+                    for agent_id in due:
+                        task = asyncio.create_task(check(agent_id))
+                        self.health_check_tasks.add(task)
+                        task.add_done_callback(self.health_check_tasks.discard)
                 except Exception as e:
                     self.logger.error(
                         f"Error in health check loop: {str(e)}", exc_info=True
                     )
 
-                # Wait for the next health check interval
-                await asyncio.sleep(self.health_check_interval.total_seconds())
+                # Wait for the next tick of the wheel
+                next_tick += self.health_check_wheel.tick_seconds
+                await asyncio.sleep(max(0.0, next_tick - loop.time()))
         except asyncio.CancelledError:
             # Task was cancelled, exit gracefully
             self.logger.info("Health check loop cancelled")
         except Exception as e:
             self.logger.error(f"Health check loop failed: {str(e)}", exc_info=True)
 
+    async def _check_agent(self, agent_id: str) -> None:
+        """
+        Check the health of one agent and update its status.
+
+        Args:
+            agent_id: ID of the agent
+        """
+        agent = self.agents.get(agent_id)
+        # Skip agents that are gone or already known to be inactive
+        if agent is None or agent.status in _INACTIVE_STATUSES:
+            return
+        self.health_stats["checks"] += 1
+
+        # Check if the agent has been seen recently
+        if agent.last_seen is None:
+            await self.update_agent_status(agent_id, UnifiedAgentStatus.UNKNOWN)
+            return
+
+        age = datetime.now() - agent.last_seen
+        if age > self.agent_timeout:
+            self.logger.warning(
+                f"UnifiedAgent {agent_id} has not been seen recently, "
+                "marking as disconnected"
+            )
+            await self.update_agent_status(agent_id, UnifiedAgentStatus.DISCONNECTED)
+            return
+
+        # A recent heartbeat already proves liveness
+        if age <= self.liveness_window:
+            self.health_stats["skipped_alive"] += 1
+            return
+
+        # Active but quiet agents are pinged to check they still respond
+        if not await self.ping_agent(agent_id):
+            self.logger.warning(
+                f"UnifiedAgent {agent_id} is not responsive, marking as disconnected"
+            )
+            await self.update_agent_status(agent_id, UnifiedAgentStatus.DISCONNECTED)
+
+    def get_health_check_stats(self) -> Dict[str, Any]:
+        """Get health check statistics."""
+        return {
+            **self.health_stats,
+            "scheduled_agents": len(self.health_check_wheel),
+            "pending_pings": len(self.pending_pings),
+        }
+
+    def _build_health_check_wheel(self) -> TimingWheel:
+        """Build a wheel for the current interval with every agent scheduled."""
+        wheel = TimingWheel(self.health_check_interval.total_seconds() / 60, slots=60)
+        for agent_id in self.agents:
+            wheel.schedule(agent_id, self.health_check_interval.total_seconds())
+        return wheel
+
+    def _schedule_health_check(self, agent_id: str) -> None:
+        """Schedule the next health check of an agent one interval ahead."""
+        self.health_check_wheel.schedule(
+            agent_id, self.health_check_interval.total_seconds()
+        )
+
+    def _index_agent(self, agent: UnifiedAgentInfo) -> None:
+        """Add an agent to the inverted indexes."""
+        agent_id = agent.agent_id
+        if agent_id not in self._agent_rank:
+            self._agent_rank[agent_id] = self._rank_counter
+            self._rank_counter += 1
+        self.agents_by_type.setdefault(agent.agent_type, set()).add(agent_id)
+        self.agents_by_status.setdefault(agent.status, set()).add(agent_id)
+        for capability in agent.capabilities:
+            self.agents_by_capability.setdefault(capability.name, set()).add(agent_id)
+
+    def _unindex_agent(self, agent: UnifiedAgentInfo) -> None:
+        """Remove an agent from the inverted indexes."""
+        agent_id = agent.agent_id
+        self._discard(self.agents_by_type, agent.agent_type, agent_id)
+        self._discard(self.agents_by_status, agent.status, agent_id)
+        for capability in agent.capabilities:
+            self._discard(self.agents_by_capability, capability.name, agent_id)
+
+    @staticmethod
+    def _discard(index: Dict[Any, Set[str]], key: Any, agent_id: str) -> None:
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(agent_id)
+            if not ids:
+                del index[key]
+
+    def _agents_for(self, agent_ids) -> List[UnifiedAgentInfo]:
+        """Agents of an index entry in registration order."""
+        return [
+            self.agents[agent_id]
+            for agent_id in sorted(agent_ids, key=self._agent_rank.__getitem__)
+        ]
+
     async def _subscribe_to_events(self) -> None:
         """
         Subscribe to agent-related events.
@@ -579,12 +764,16 @@ class UnifiedAgentRegistry:
 
             # Update the agent's last seen timestamp
             async with self.agent_lock:
-                if agent_id in self.agents:
-                    self.agents[agent_id].update_last_seen()
-
-                    # If the agent was disconnected, mark it as active
-                    if self.agents[agent_id].status == UnifiedAgentStatus.DISCONNECTED:
-                        await self.update_agent_status(agent_id, UnifiedAgentStatus.ACTIVE)
+                agent = self.agents.get(agent_id)
+                if agent is None:
+                    return
+                agent.update_last_seen()
+                reconnected = agent.status == UnifiedAgentStatus.DISCONNECTED
+
+            # If the agent was disconnected, mark it as active (outside the
+            # lock, which update_agent_status takes itself)
+            if reconnected:
+                await self.update_agent_status(agent_id, UnifiedAgentStatus.ACTIVE)
         except Exception as e:
             self.logger.error(
                 f"Error handling agent heartbeat: {str(e)}", exc_info=True
@@ -672,8 +861,10 @@ class UnifiedAgentRegistry:
                 if agent_id in self.agents:
                     self.agents[agent_id].update_last_seen()
 
-            # In a real implementation, we would resolve the future
-            # associated with this correlation ID
+            # Resolve the pending ping with this correlation ID
+            future = self.pending_pings.get(correlation_id)
+            if future is not None and not future.done():
+                future.set_result(True)
         except Exception as e:
             self.logger.error(f"Error handling ping response: {str(e)}", exc_info=True)
 
@@ -13,6 +13,11 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type, Union
 
+from fs_agt_clean.core.coordination.coordinator.consensus_engine import (
+    CandidateBatch,
+    ConsensusEngine,
+    ConsensusResult,
+)
 from fs_agt_clean.core.coordination.coordinator.coordinator import (
     UnifiedAgentCapability,
     UnifiedAgentInfo,
@@ -74,6 +79,7 @@ class ResolutionStrategy(enum.Enum):
     PRIORITY = "priority"  # Resolve based on priority
     AUTHORITY = "authority"  # Resolve based on authority
     CONSENSUS = "consensus"  # Resolve based on consensus
+    WEIGHTED_CONSENSUS = "weighted_consensus"  # Weighted vote and robust numeric
     FIRST = "first"  # Resolve in favor of the first entity
     LAST = "last"  # Resolve in favor of the last entity
     MERGE = "merge"  # Merge conflicting entities
@@ -258,6 +264,13 @@ class Conflict:
         return f"Conflict({self.conflict_id}, {self.conflict_type.value}, {self.status.value})"
 
 
+# Strategies answered by the consensus engine, which can batch them
+_CONSENSUS_STRATEGIES = (
+    ResolutionStrategy.CONSENSUS,
+    ResolutionStrategy.WEIGHTED_CONSENSUS,
+)
+
+
 class ConflictResolver:
     """
     Component for resolving conflicts between entities.
@@ -294,6 +307,9 @@ class ConflictResolver:
         # Initialize custom resolution functions
         self.custom_resolvers: Dict[str, Callable] = {}
 
+        # Vectorized voting and numeric consensus
+        self.consensus_engine = ConsensusEngine()
+
         # Initialize locks for thread safety
         self.conflict_lock = asyncio.Lock()
 
@@ -574,6 +590,82 @@ class ConflictResolver:
             self.logger.error(error_msg, exc_info=True)
             raise CoordinationError(error_msg, cause=e)
 
+    async def resolve_conflicts(
+        self,
+        conflict_ids: List[str],
+        strategy: Optional[ResolutionStrategy] = None,
+        resolution_params: Dict[str, Any] = None,
+    ) -> Dict[str, bool]:
+        """
+        Resolve several conflicts.
+
+        Conflicts resolved by consensus are resolved together in one batch by
+        the consensus engine; the others are resolved one by one.
+
+        Args:
+            conflict_ids: IDs of the conflicts
+            strategy: Resolution strategy to use, or None to use the defaults
+            resolution_params: Parameters for the resolution strategy
+
+        Returns:
+            Whether each conflict was resolved, by conflict ID
+
+        Raises:
+            CoordinationError: If resolution fails
+        """
+        try:
+            resolution_params = resolution_params or {}
+            outcomes: Dict[str, bool] = {}
+            consensus: List[Tuple[Conflict, ResolutionStrategy]] = []
+
+            for conflict_id in conflict_ids:
+                conflict = await self.get_conflict(conflict_id)
+                if conflict and conflict.is_active():
+                    conflict_strategy = strategy or self.resolution_strategies.get(
+                        conflict.conflict_type, ResolutionStrategy.PRIORITY
+                    )
+                    if conflict_strategy in _CONSENSUS_STRATEGIES:
+                        consensus.append((conflict, conflict_strategy))
+                        continue
+                outcomes[conflict_id] = await self.resolve_conflict(
+                    conflict_id, strategy, resolution_params
+                )
+
+            candidates = self._prepare_candidates(
+                [conflict for conflict, _ in consensus], resolution_params
+            )
+            results = self.consensus_engine.resolve_batch(candidates)
+            batch = 0
+            for (conflict, conflict_strategy), result, size in zip(
+                consensus, results, candidates.sizes.tolist()
+            ):
+                if not size:
+                    # Let the single-conflict path report the missing values
+                    outcomes[conflict.conflict_id] = await self.resolve_conflict(
+                        conflict.conflict_id, conflict_strategy, resolution_params
+                    )
+                    continue
+                conflict.update_status(ConflictStatus.RESOLVING)
+                conflict.resolve(
+                    strategy=conflict_strategy,
+                    description=f"Resolved using {conflict_strategy.value} strategy",
+                    result=self._consensus_resolution(conflict_strategy, result),
+                )
+                await self._publish_conflict_resolved_event(conflict)
+                outcomes[conflict.conflict_id] = True
+                batch += 1
+
+            if batch:
+                self.logger.info(f"Resolved {batch} conflicts by consensus")
+
+            return outcomes
+        except CoordinationError:
+            raise
+        except Exception as e:
+            error_msg = f"Failed to resolve conflicts: {str(e)}"
+            self.logger.error(error_msg, exc_info=True)
+            raise CoordinationError(error_msg, cause=e)
+
     async def mark_conflict_unresolvable(self, conflict_id: str, reason: str) -> bool:
         """
         Mark a conflict as unresolvable.
@@ -728,11 +820,10 @@ class ConflictResolver:
                 # Return the highest authority entity
                 return sorted_entities[0]
 
-            elif strategy == ResolutionStrategy.CONSENSUS:
+            elif strategy in _CONSENSUS_STRATEGIES:
                 # Resolve based on consensus
-                # Find the most common value
-                entities = conflict.entities
-                if not entities:
+                # Weighted vote over the values (and robust numeric consensus)
+                if not conflict.entities:
                     raise CoordinationError(
                         "No entities to resolve",
                         cause=ValueError("Empty entities list"),
@@ -741,27 +832,15 @@ class ConflictResolver:
                 # Get value field name from params or use default
                 value_field = params.get("value_field", "value")
 
-                # Count occurrences of each value
-                value_counts = {}
-                for entity in entities:
-                    value = entity.get(value_field)
-                    if value is not None:
-                        value_str = str(value)  # Convert to string for counting
-                        if value_str not in value_counts:
-                            value_counts[value_str] = 0
-                        value_counts[value_str] += 1
-
-                if not value_counts:
+                candidates = self._prepare_candidates([conflict], params)
+                if not candidates.sizes[0]:
                     raise CoordinationError(
                         f"No values found in field '{value_field}'",
                         cause=ValueError(f"No values in field '{value_field}'"),
                     )
 
-                # Find the most common value
-                most_common_value = max(value_counts.items(), key=lambda x: x[1])[0]
-
-                # Return the most common value
-                return most_common_value
+                result = self.consensus_engine.resolve_batch(candidates)[0]
+                return self._consensus_resolution(strategy, result)
 
             elif strategy == ResolutionStrategy.FIRST:
                 # Resolve in favor of the first entity
@@ -862,6 +941,40 @@ class ConflictResolver:
             self.logger.error(error_msg, exc_info=True)
             raise CoordinationError(error_msg, cause=e)
 
+    def _prepare_candidates(
+        self, conflicts: List[Conflict], params: Dict[str, Any]
+    ) -> CandidateBatch:
+        """
+        Convert the entities of conflicts into consensus engine candidates.
+
+        Args:
+            conflicts: The conflicts
+            params: Resolution parameters naming the value, confidence,
+                weight, agent and timestamp fields, and optional agent weights
+
+        Returns:
+            Candidate batch of the conflicts
+        """
+        return self.consensus_engine.prepare(
+            [conflict.entities for conflict in conflicts],
+            value_field=params.get("value_field", "value"),
+            confidence_field=params.get("confidence_field", "confidence"),
+            weight_field=params.get("weight_field", "weight"),
+            agent_field=params.get("agent_field", "agent_id"),
+            agent_weights=params.get("agent_weights"),
+            timestamp_field=params.get("timestamp_field", "timestamp"),
+        )
+
+    @staticmethod
+    def _consensus_resolution(
+        strategy: ResolutionStrategy, result: ConsensusResult
+    ) -> Any:
+        """Resolution result of a consensus strategy."""
+        if strategy == ResolutionStrategy.CONSENSUS:
+            # The winning value, as a string
+            return str(result.winner)
+        return result.to_dict()
+
     async def _subscribe_to_events(self) -> None:
         """
         Subscribe to conflict-related events.
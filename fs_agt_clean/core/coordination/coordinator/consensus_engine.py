@@ -0,0 +1,507 @@
+"""
+Vectorized consensus over conflicting agent results.
+
+The candidate results of many conflicts are turned, in one pass, into flat
+arrays of vote label, numeric value, confidence, agent weight and recency
+(an exponential decay by candidate age). ``ConsensusEngine`` resolves the
+whole batch at once:
+
+- weighted voting: one ``bincount`` over the labels of all conflicts, with
+  the winner of each conflict picked by segmented ``reduceat`` maxima
+- numeric consensus: median, trimmed mean, MAD-based outlier rejection and
+  the weighted mean of the remaining values, over a padded 2-D array sorted
+  once
+"""
+
+import math
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+# Scales the MAD to the standard deviation of a normal distribution
+_MAD_SCALE = 0.6745
+# Mean absolute deviation to standard deviation, used when the MAD is zero
+_MEAN_AD_SCALE = 1.253314
+
+
+def _as_number(value: Any) -> float:
+    if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+        return float(value)
+    return math.nan
+
+
+def _timestamp(value: Any) -> float:
+    """Epoch seconds of a datetime, ISO string or number; NaN if unknown."""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return math.nan
+    return _as_number(value)
+
+
+def _to_floats(raw: List[Any]) -> np.ndarray:
+    """Float array of raw values; values that are not numbers become NaN."""
+    if raw:
+        try:
+            array = np.array(raw)
+        except ValueError:
+            # Ragged nested values
+            array = None
+        # Fast path: every value is an int or float
+        if array is not None and array.ndim == 1 and array.dtype.kind in "iuf":
+            return array.astype(float, copy=False)
+    return np.array([_as_number(value) for value in raw], dtype=float)
+
+
+def _code_labels(
+    values: Sequence[Any], codes: List[int], by_string: bool = False
+) -> List[Hashable]:
+    """
+    Append the vote label code of each value to ``codes``.
+
+    Values vote as themselves, or by their string form when ``by_string`` is
+    set or any of them is unhashable (lists, dicts).
+
+    Returns:
+        Distinct labels in first-seen order
+    """
+    index: Dict[Hashable, int] = {}
+    setdefault = index.setdefault
+    if not by_string:
+        try:
+            codes.extend([setdefault(v, len(index)) for v in values])
+            return list(index)
+        except TypeError:
+            index.clear()
+    codes.extend([setdefault(str(v), len(index)) for v in values])
+    return list(index)
+
+
+def _optional(values: np.ndarray) -> List[Optional[float]]:
+    """Floats of an array with NaN as None."""
+    return np.where(np.isnan(values), None, values).tolist()
+
+
+@dataclass
+class CandidateBatch:
+    """
+    Candidates of several conflicts as flat arrays.
+
+    Attributes:
+        sizes: Number of candidates of each conflict
+        labels: Distinct vote labels of each conflict, in first-seen order
+        codes: Index of each candidate's label within its conflict's labels
+        values: Numeric value of each candidate (NaN if not numeric)
+        confidence: Confidence of each candidate
+        agent_weight: Weight of each candidate's agent
+        recency: Recency factor of each candidate (1 for current results)
+    """
+
+    sizes: np.ndarray
+    labels: List[List[Hashable]]
+    codes: np.ndarray
+    values: np.ndarray
+    confidence: np.ndarray
+    agent_weight: np.ndarray
+    recency: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @property
+    def weights(self) -> np.ndarray:
+        """Combined weight of each candidate; non-numeric parts count as 0."""
+        return np.nan_to_num(self.confidence * self.agent_weight * self.recency)
+
+    @classmethod
+    def from_values(
+        cls,
+        label_lists: Sequence[Sequence[Hashable]],
+        weight_lists: Optional[Sequence[Sequence[float]]] = None,
+        value_lists: Optional[Sequence[Sequence[Any]]] = None,
+    ) -> "CandidateBatch":
+        """
+        Build a batch from per-conflict sequences.
+
+        Args:
+            label_lists: Vote labels of each conflict's candidates
+            weight_lists: Candidate weights (default 1), used as confidence
+            value_lists: Numeric values (defaults to the labels where numeric)
+
+        Returns:
+            Candidate batch
+        """
+        labels: List[List[Hashable]] = []
+        codes: List[int] = []
+        values: List[float] = []
+        for i, conflict_labels in enumerate(label_lists):
+            labels.append(_code_labels(conflict_labels, codes))
+            source = conflict_labels if value_lists is None else value_lists[i]
+            values.extend(_as_number(value) for value in source)
+
+        total = len(codes)
+        if weight_lists is None:
+            confidence = np.ones(total)
+        else:
+            confidence = np.array(
+                [_as_number(w) for weights in weight_lists for w in weights],
+                dtype=float,
+            )
+        return cls(
+            sizes=np.array([len(ls) for ls in label_lists], dtype=np.intp),
+            labels=labels,
+            codes=np.array(codes, dtype=np.intp),
+            values=np.array(values, dtype=float),
+            confidence=confidence,
+            agent_weight=np.ones(total),
+            recency=np.ones(total),
+        )
+
+
+@dataclass
+class ConsensusResult:
+    """
+    Consensus of one conflict.
+
+    Attributes:
+        winner: Label with the highest total weight (first seen wins ties)
+        consensus_score: Share of the total weight held by the winner
+        labels: Distinct labels, in first-seen order
+        label_votes: Total weight of each label
+        label_counts: Number of candidates of each label
+        total_weight: Total weight of all candidates
+        value: Weighted mean of the numeric values that are not outliers
+        median: Median of the numeric values
+        trimmed_mean: Mean after trimming both tails
+        outliers: Indices of the candidates rejected as outliers
+        numeric_count: Number of candidates with a numeric value
+    """
+
+    winner: Optional[Hashable]
+    consensus_score: float
+    labels: List[Hashable]
+    label_votes: List[float]
+    label_counts: List[int]
+    total_weight: float
+    value: Optional[float] = None
+    median: Optional[float] = None
+    trimmed_mean: Optional[float] = None
+    outliers: List[int] = field(default_factory=list)
+    numeric_count: int = 0
+
+    @property
+    def votes(self) -> Dict[Hashable, float]:
+        """Total weight per label."""
+        return dict(zip(self.labels, self.label_votes))
+
+    @property
+    def counts(self) -> Dict[Hashable, int]:
+        """Number of candidates per label."""
+        return dict(zip(self.labels, self.label_counts))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "winner": self.winner,
+            "consensus_score": self.consensus_score,
+            "votes": self.votes,
+            "counts": self.counts,
+            "total_weight": self.total_weight,
+            "value": self.value,
+            "median": self.median,
+            "trimmed_mean": self.trimmed_mean,
+            "outliers": self.outliers,
+            "numeric_count": self.numeric_count,
+        }
+
+
+def _row_medians(sorted_rows: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Row medians of arrays sorted with NaN padding at the end."""
+    rows = np.arange(len(counts))
+    low = np.maximum((counts - 1) // 2, 0)
+    high = np.maximum(counts // 2, 0)
+    return np.where(
+        counts > 0,
+        (sorted_rows[rows, low] + sorted_rows[rows, high]) / 2,
+        np.nan,
+    )
+
+
+class ConsensusEngine:
+    """
+    Resolves conflicts by weighted voting and robust numeric consensus.
+    """
+
+    def __init__(
+        self,
+        outlier_threshold: float = 3.5,
+        trim_fraction: float = 0.1,
+        recency_half_life: Optional[float] = None,
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            outlier_threshold: Robust z-score above which a value is an outlier
+            trim_fraction: Fraction trimmed from each tail for the trimmed mean
+            recency_half_life: Seconds after which a candidate's weight halves,
+                or None to ignore candidate age
+        """
+        self.outlier_threshold = outlier_threshold
+        self.trim_fraction = trim_fraction
+        self.recency_half_life = recency_half_life
+
+    def prepare(
+        self,
+        entity_lists: Sequence[Sequence[Mapping[str, Any]]],
+        value_field: str = "value",
+        confidence_field: Optional[str] = "confidence",
+        weight_field: Optional[str] = "weight",
+        agent_field: str = "agent_id",
+        agent_weights: Optional[Mapping[str, float]] = None,
+        timestamp_field: Optional[str] = "timestamp",
+        now: Optional[float] = None,
+    ) -> CandidateBatch:
+        """
+        Convert the entities of several conflicts into one candidate batch.
+
+        Entities without a value are skipped. Missing confidences and weights
+        count as 1. Candidates vote with their values; in a conflict whose
+        values have different types or are unhashable the string forms are
+        used instead.
+
+        Args:
+            entity_lists: Conflicting entities of each conflict
+            value_field: Field holding the candidate value
+            confidence_field: Field holding the candidate's confidence
+            weight_field: Field holding an explicit candidate weight, applied
+                on top of the agent weight
+            agent_field: Field holding the agent ID for ``agent_weights``
+            agent_weights: Weight per agent ID
+            timestamp_field: Field holding the candidate's time, for recency
+            now: Reference epoch time for recency (defaults to now)
+
+        Returns:
+            Candidate batch
+        """
+        use_recency = bool(self.recency_half_life and timestamp_field)
+
+        # Flatten once so every field is read by a single pass over all
+        # candidates; only label coding runs per conflict
+        sizes = [len(entities) for entities in entity_lists]
+        flat = [entity for entities in entity_lists for entity in entities]
+        raw_values = [entity.get(value_field) for entity in flat]
+        if None in raw_values:
+            sizes = [
+                sum(1 for e in entities if e.get(value_field) is not None)
+                for entities in entity_lists
+            ]
+            flat = [e for e, v in zip(flat, raw_values) if v is not None]
+            raw_values = [v for v in raw_values if v is not None]
+
+        labels: List[List[Hashable]] = []
+        codes: List[int] = []
+        mixed_types = len(set(map(type, raw_values))) > 1
+        start = 0
+        for size in sizes:
+            values = raw_values[start : start + size]
+            start += size
+            # Mixed types (e.g. 1, 1.0 and "1") vote by their string form
+            by_string = mixed_types and len(set(map(type, values))) > 1
+            labels.append(_code_labels(values, codes, by_string))
+
+        total = len(codes)
+        confidence = np.ones(total)
+        if confidence_field:
+            confidence = _to_floats([e.get(confidence_field, 1.0) for e in flat])
+        agent_weight = np.ones(total)
+        if weight_field:
+            agent_weight = _to_floats([e.get(weight_field, 1.0) for e in flat])
+        if agent_weights:
+            agent_weight = agent_weight * np.array(
+                [agent_weights.get(e.get(agent_field), 1.0) for e in flat],
+                dtype=float,
+            )
+
+        if use_recency:
+            times = np.array(
+                [_timestamp(e.get(timestamp_field)) for e in flat], dtype=float
+            )
+            reference = datetime.now().timestamp() if now is None else now
+            age = np.clip(reference - times, 0.0, None)
+            recency = np.where(
+                np.isnan(age), 1.0, np.exp2(-age / self.recency_half_life)
+            )
+        else:
+            recency = np.ones(total)
+
+        return CandidateBatch(
+            sizes=np.array(sizes, dtype=np.intp),
+            labels=labels,
+            codes=np.array(codes, dtype=np.intp),
+            values=_to_floats(raw_values),
+            confidence=confidence,
+            agent_weight=agent_weight,
+            recency=recency,
+        )
+
+    def resolve(
+        self, entities: Sequence[Mapping[str, Any]], **fields: Any
+    ) -> ConsensusResult:
+        """
+        Resolve one conflict.
+
+        Args:
+            entities: Conflicting entities
+            **fields: Field options of ``prepare``
+
+        Returns:
+            Consensus result
+        """
+        return self.resolve_batch(self.prepare([entities], **fields))[0]
+
+    def resolve_batch(self, batch: CandidateBatch) -> List[ConsensusResult]:
+        """
+        Resolve every conflict of a batch at once.
+
+        Args:
+            batch: Candidate batch
+
+        Returns:
+            Consensus result of each conflict, in order
+        """
+        n = len(batch)
+        if n == 0:
+            return []
+        weights = batch.weights
+        winners, scores, label_votes, label_counts, totals = self._vote(
+            batch, weights
+        )
+        median, trimmed, mean, outliers, numeric_counts = self._numeric(
+            batch, weights
+        )
+
+        return [
+            ConsensusResult(
+                winner=winners[i],
+                consensus_score=scores[i],
+                labels=batch.labels[i],
+                label_votes=label_votes[i],
+                label_counts=label_counts[i],
+                total_weight=totals[i],
+                value=mean[i],
+                median=median[i],
+                trimmed_mean=trimmed[i],
+                outliers=outliers[i],
+                numeric_count=numeric_counts[i],
+            )
+            for i in range(n)
+        ]
+
+    def _vote(self, batch: CandidateBatch, weights: np.ndarray):
+        """Weighted vote of every conflict over global label codes."""
+        n = len(batch)
+        label_sizes = np.array([len(labels) for labels in batch.labels], dtype=np.intp)
+        label_starts = np.concatenate(([0], np.cumsum(label_sizes)[:-1])).astype(
+            np.intp
+        )
+        num_labels = int(label_sizes.sum())
+        conflict_ids = np.repeat(np.arange(n), batch.sizes)
+
+        global_codes = batch.codes + label_starts[conflict_ids]
+        votes = np.bincount(global_codes, weights=weights, minlength=num_labels)
+        counts = np.bincount(global_codes, minlength=num_labels)
+        # Summed in candidate order, like the label totals
+        totals = np.bincount(conflict_ids, weights=weights, minlength=n)
+
+        # Winner of each conflict: most votes, then first seen
+        has_labels = label_sizes > 0
+        best = np.zeros(n, dtype=np.intp)
+        if num_labels:
+            segments = label_starts[has_labels]
+            top = np.maximum.reduceat(votes, segments)
+            positions = np.where(
+                votes == np.repeat(top, label_sizes[has_labels]),
+                np.arange(num_labels),
+                num_labels,
+            )
+            best[has_labels] = np.minimum.reduceat(positions, segments)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            best_votes = votes[best] if num_labels else np.zeros(n)
+            scores = np.where(totals > 0, best_votes / totals, 0.0)
+
+        votes_list = votes.tolist()
+        counts_list = counts.tolist()
+        starts = label_starts.tolist()
+        best_list = best.tolist()
+        winners, label_votes, label_counts = [], [], []
+        for i, labels in enumerate(batch.labels):
+            start = starts[i]
+            end = start + len(labels)
+            winners.append(labels[best_list[i] - start] if labels else None)
+            label_votes.append(votes_list[start:end])
+            label_counts.append(counts_list[start:end])
+        return winners, scores.tolist(), label_votes, label_counts, totals.tolist()
+
+    def _numeric(self, batch: CandidateBatch, weights: np.ndarray):
+        """Median, trimmed mean, outliers and weighted inlier mean per conflict."""
+        n = len(batch)
+        width = max(int(batch.sizes.max()), 1)
+        valid = np.arange(width) < batch.sizes[:, None]
+        values = np.full((n, width), np.nan)
+        row_weights = np.zeros((n, width))
+        values[valid] = batch.values
+        row_weights[valid] = weights
+
+        numeric = ~np.isnan(values)
+        counts = numeric.sum(axis=1)
+
+        # NaN padding sorts to the end of each row
+        ordered = np.sort(values, axis=1)
+        median = _row_medians(ordered, counts)
+
+        deviation = np.abs(values - median[:, None])
+        mad = _row_medians(np.sort(deviation, axis=1), counts)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_ad = np.nansum(deviation, axis=1) / counts
+            scale = np.where(mad > 0, mad / _MAD_SCALE, _MEAN_AD_SCALE * mean_ad)
+            z = deviation / scale[:, None]
+        outliers = numeric & (scale[:, None] > 0) & (z > self.outlier_threshold)
+
+        # Trimmed mean over the sorted rows
+        trim = np.floor(counts * self.trim_fraction).astype(np.intp)
+        rank = np.arange(width)
+        kept = (rank >= trim[:, None]) & (rank < (counts - trim)[:, None])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            trimmed = np.where(kept, ordered, 0.0).sum(axis=1) / kept.sum(axis=1)
+
+            # Weighted mean of the inliers; unweighted if their weights are 0
+            inliers = numeric & ~outliers
+            inlier_values = np.where(inliers, values, 0.0)
+            inlier_weights = np.where(inliers, row_weights, 0.0)
+            weight_sum = inlier_weights.sum(axis=1)
+            mean = np.where(
+                weight_sum > 0,
+                (inlier_values * inlier_weights).sum(axis=1) / weight_sum,
+                inlier_values.sum(axis=1) / inliers.sum(axis=1),
+            )
+
+        # Outlier column indices split per conflict
+        rows, columns = np.nonzero(outliers)
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=n))))
+        bounds = bounds.tolist()
+        columns = columns.tolist()
+        outlier_lists = [columns[bounds[i] : bounds[i + 1]] for i in range(n)]
+
+        return (
+            _optional(median),
+            _optional(trimmed),
+            _optional(mean),
+            outlier_lists,
+            counts.tolist(),
+        )
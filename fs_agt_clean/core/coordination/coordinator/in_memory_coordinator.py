@@ -150,7 +150,11 @@ class InMemoryCoordinator(Coordinator):
         Raises:
             CoordinationError: If unregistration fails
         """
-        return await self.agent_registry.unregister_agent(agent_id)
+        unregistered = await self.agent_registry.unregister_agent(agent_id)
+        if unregistered:
+            # Hand the agent's queued tasks to its peers
+            await self.task_delegator.release_agent(agent_id)
+        return unregistered
 
     async def update_agent_status(self, agent_id: str, status: UnifiedAgentStatus) -> bool:
         """
@@ -335,7 +339,8 @@ class InMemoryCoordinator(Coordinator):
                     )
 
             # If no target agent is specified but a capability is required,
-            # find a suitable agent
+            # find the suitable agents; the task is routed to one of them
+            # once created
             elif required_capability:
                 agents = await self.find_agents_by_capability(required_capability)
                 healthy_agents = [
@@ -350,10 +355,6 @@ class InMemoryCoordinator(Coordinator):
                         task_id=task_id,
                     )
 
-                # Select the agent with the fewest tasks
-                # This is a simple load balancing strategy
-                target_agent_id = await self._select_agent_for_task(healthy_agents)
-
             else:
                 raise CoordinationError(
                     "Either target_agent_id or required_capability must be specified",
@@ -372,12 +373,23 @@ class InMemoryCoordinator(Coordinator):
                 deadline=deadline,
             )
 
-            # Assign the task to the agent
-            await self.task_delegator.assign_task(created_task_id, target_agent_id)
+            # Assign the task to the target agent, or route it to the least
+            # loaded capable agent
+            if target_agent_id:
+                await self.task_delegator.assign_task(
+                    created_task_id, target_agent_id, agent_info.agent_type
+                )
+            else:
+                target_agent_id = await self.task_delegator.route_task(
+                    created_task_id, healthy_agents
+                )
 
-            # Register the task for result aggregation
+            # Register the task for result aggregation; the one assigned agent
+            # reports one result, which drives the progress snapshots
             await self.result_aggregator.register_task(
-                task_id=created_task_id, strategy=AggregationStrategy.COLLECT
+                task_id=created_task_id,
+                strategy=AggregationStrategy.COLLECT,
+                expected_results=1,
             )
 
             self.logger.info(
@@ -541,34 +553,6 @@ class InMemoryCoordinator(Coordinator):
             self.logger.error(error_msg, exc_info=True)
             raise CoordinationError(error_msg, cause=e)
 
-    async def _select_agent_for_task(self, agents: List[UnifiedAgentInfo]) -> str:
-        """
-        Select an agent for a task from a list of candidates.
-
-        This implementation uses a simple load balancing strategy.
-
-        Args:
-            agents: List of candidate agents
-
-        Returns:
-            ID of the selected agent
-        """
-        # If there's only one agent, select it
-        if len(agents) == 1:
-            return agents[0].agent_id
-
-        # Get the number of tasks for each agent
-        agent_task_counts = {}
-        for agent in agents:
-            tasks = await self.get_agent_tasks(agent.agent_id)
-            active_tasks = [
-                task for task in tasks if task["status"] in ("assigned", "processing")
-            ]
-            agent_task_counts[agent.agent_id] = len(active_tasks)
-
-        # Select the agent with the fewest active tasks
-        return min(agent_task_counts.items(), key=lambda x: x[1])[0]
-
     async def _subscribe_to_events(self) -> None:
         """
         Subscribe to coordination-related events.
@@ -4,6 +4,10 @@ Result Aggregator component for the FlipSync application.
 This module provides the ResultAggregator component, which manages result
 collection, validation, and aggregation. It is a core component of the
 Coordinator, enabling the aggregation of results from multiple agents.
+
+Results are folded into running aggregates as they arrive (see
+streaming_aggregate), so aggregation at completion does not revisit every
+result and partial aggregates can be queried while a task is in progress.
 """
 
 import asyncio
@@ -20,6 +24,10 @@ from fs_agt_clean.core.coordination.coordinator.coordinator import (
     UnifiedAgentType,
     CoordinationError,
 )
+from fs_agt_clean.core.coordination.coordinator.streaming_aggregate import (
+    ResultLog,
+    StreamingAggregate,
+)
 from fs_agt_clean.core.coordination.coordinator.task_delegator import (
     Task,
     TaskPriority,
@@ -60,14 +68,27 @@ class ResultAggregator:
     aggregating them into a single result.
     """
 
-    def __init__(self, aggregator_id: str):
+    def __init__(
+        self,
+        aggregator_id: str,
+        spill_threshold: Optional[int] = 10_000,
+        spill_dir: Optional[str] = None,
+        top_k: int = 10,
+    ):
         """
         Initialize the result aggregator.
 
         Args:
             aggregator_id: Unique identifier for this aggregator
+            spill_threshold: Raw results per task kept in memory before they
+                spill to disk; None to keep them all in memory
+            spill_dir: Directory for spill files (default temp directory)
+            top_k: Number of best scored results kept per task
         """
         self.aggregator_id = aggregator_id
+        self.spill_threshold = spill_threshold
+        self.spill_dir = spill_dir
+        self.top_k = top_k
         self.logger = get_logger(f"coordinator.aggregator.{aggregator_id}")
 
         # Create publisher and subscriber for event-based communication
@@ -79,8 +100,15 @@ class ResultAggregator:
         )
 
         # Initialize result registry
-        # Maps task IDs to lists of results
-        self.results: Dict[str, List[Dict[str, Any]]] = {}
+        # Maps task IDs to logs of raw results
+        self.results: Dict[str, ResultLog] = {}
+
+        # Initialize running aggregates
+        # Maps task IDs to aggregates folded as results arrive
+        self.aggregates: Dict[str, StreamingAggregate] = {}
+
+        # Maps task IDs to the number of results expected, if known
+        self.expected_results: Dict[str, int] = {}
 
         # Initialize aggregation strategies
         # Maps task IDs to aggregation strategies
@@ -126,6 +154,7 @@ class ResultAggregator:
         task_id: str,
         strategy: AggregationStrategy = AggregationStrategy.COLLECT,
         custom_aggregator: Optional[Callable] = None,
+        expected_results: Optional[int] = None,
     ) -> bool:
         """
         Register a task for result aggregation.
@@ -134,6 +163,7 @@ class ResultAggregator:
             task_id: ID of the task
             strategy: Aggregation strategy to use
             custom_aggregator: Custom aggregation function, if strategy is CUSTOM
+            expected_results: Number of results expected, for progress reporting
 
         Returns:
             True if registration was successful
@@ -143,12 +173,15 @@ class ResultAggregator:
         """
         try:
             async with self.result_lock:
-                # Initialize result list for the task
-                if task_id not in self.results:
-                    self.results[task_id] = []
+                # Initialize result log for the task
+                self._ensure_task(task_id)
+                if expected_results is not None:
+                    self.expected_results[task_id] = expected_results
 
                 # Set aggregation strategy
                 self.strategies[task_id] = strategy
+                if strategy == AggregationStrategy.MAJORITY:
+                    self.aggregates[task_id].count_labels_from(self.results[task_id])
 
                 # Set custom aggregator if provided
                 if strategy == AggregationStrategy.CUSTOM:
@@ -192,9 +225,8 @@ class ResultAggregator:
         """
         try:
             async with self.result_lock:
-                # Initialize result list for the task if needed
-                if task_id not in self.results:
-                    self.results[task_id] = []
+                # Initialize result log for the task if needed
+                self._ensure_task(task_id)
 
                 # Create result entry
                 result_entry = {
@@ -204,7 +236,8 @@ class ResultAggregator:
                     "metadata": metadata or {},
                 }
 
-                # Add result to the list
+                # Fold the result into the running aggregates and log it
+                self.aggregates[task_id].add(result_entry)
                 self.results[task_id].append(result_entry)
 
                 self.logger.info(
@@ -212,7 +245,9 @@ class ResultAggregator:
                 )
 
                 # Publish result added event
-                await self._publish_result_added_event(task_id, agent_id, result)
+                await self._publish_result_added_event(
+                    task_id, agent_id, result, self.aggregates[task_id].count
+                )
 
                 return True
         except Exception as e:
@@ -235,12 +270,85 @@ class ResultAggregator:
         """
         try:
             async with self.result_lock:
-                return self.results.get(task_id, [])
+                log = self.results.get(task_id)
+                return list(log) if log is not None else []
         except Exception as e:
             error_msg = f"Failed to get results for task {task_id}: {str(e)}"
             self.logger.error(error_msg, exc_info=True)
             raise CoordinationError(error_msg, task_id=task_id, cause=e)
 
+    async def get_result_count(self, task_id: str) -> int:
+        """
+        Get the number of results received for a task.
+
+        Args:
+            task_id: ID of the task
+
+        Returns:
+            Number of results
+        """
+        aggregate = self.aggregates.get(task_id)
+        return aggregate.count if aggregate is not None else 0
+
+    async def get_partial_aggregate(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the running aggregates of a task, e.g. for progress reporting.
+
+        Args:
+            task_id: ID of the task
+
+        Returns:
+            Snapshot of the running aggregates, or None if the task is unknown
+
+        Raises:
+            CoordinationError: If building the snapshot fails
+        """
+        try:
+            async with self.result_lock:
+                aggregate = self.aggregates.get(task_id)
+                if aggregate is None:
+                    return None
+                return self._snapshot(task_id, aggregate)
+        except Exception as e:
+            error_msg = f"Failed to get partial aggregate for task {task_id}: {str(e)}"
+            self.logger.error(error_msg, exc_info=True)
+            raise CoordinationError(error_msg, task_id=task_id, cause=e)
+
+    async def get_combined_aggregate(self, task_ids: List[str]) -> Dict[str, Any]:
+        """
+        Merge the running aggregates of several tasks, e.g. all subtasks of a
+        decomposed task.
+
+        Args:
+            task_ids: IDs of the tasks
+
+        Returns:
+            Snapshot of the merged aggregates
+
+        Raises:
+            CoordinationError: If merging fails
+        """
+        try:
+            async with self.result_lock:
+                combined = StreamingAggregate(self.top_k, count_labels=True)
+                expected = 0
+                for task_id in task_ids:
+                    aggregate = self.aggregates.get(task_id)
+                    if aggregate is not None:
+                        combined.merge(aggregate)
+                    expected += self.expected_results.get(task_id, 1)
+                snapshot = combined.snapshot()
+                snapshot["tasks"] = len(task_ids)
+                snapshot["expected"] = expected
+                snapshot["progress"] = (
+                    min(1.0, combined.count / expected) if expected else None
+                )
+                return snapshot
+        except Exception as e:
+            error_msg = f"Failed to combine aggregates: {str(e)}"
+            self.logger.error(error_msg, exc_info=True)
+            raise CoordinationError(error_msg, cause=e)
+
     async def aggregate_results(self, task_id: str) -> Any:
         """
         Aggregate results for a task.
@@ -255,10 +363,10 @@ class ResultAggregator:
             CoordinationError: If aggregation fails
         """
         try:
-            # Get all results for the task
-            results = await self.get_results(task_id)
+            # Results are folded into the aggregate as they arrive
+            aggregate = self.aggregates.get(task_id)
 
-            if not results:
+            if aggregate is None or not aggregate.count:
                 self.logger.warning(f"No results to aggregate for task {task_id}")
                 return None
 
@@ -267,50 +375,31 @@ class ResultAggregator:
 
             # Aggregate results based on strategy
             if strategy == AggregationStrategy.COLLECT:
-                # Simply collect all results
-                aggregated_result = {
-                    result["agent_id"]: result["result"] for result in results
-                }
+                # Simply collect all results (latest per agent)
+                aggregated_result = dict(aggregate.by_agent)
             elif strategy == AggregationStrategy.MAJORITY:
-                # Use the majority result
-                # This assumes results are comparable
-                result_counts = {}
-                for result_entry in results:
-                    result_value = str(
-                        result_entry["result"]
-                    )  # Convert to string for counting
-                    if result_value not in result_counts:
-                        result_counts[result_value] = 0
-                    result_counts[result_value] += 1
-
-                # Find the majority result
-                majority_result = max(result_counts.items(), key=lambda x: x[1])[0]
-                aggregated_result = majority_result
+                # Use the majority result, compared as strings
+                aggregated_result = aggregate.leader
             elif strategy == AggregationStrategy.WEIGHTED:
                 # Weight results by source
                 # This assumes results are numeric and weights are in metadata
-                weighted_sum = 0
-                total_weight = 0
-
-                for result_entry in results:
-                    weight = result_entry["metadata"].get("weight", 1.0)
-                    weighted_sum += result_entry["result"] * weight
-                    total_weight += weight
-
-                if total_weight > 0:
-                    aggregated_result = weighted_sum / total_weight
-                else:
-                    aggregated_result = None
+                if aggregate.weighted_error is not None:
+                    raise CoordinationError(
+                        f"Cannot weight results: {aggregate.weighted_error}",
+                        task_id=task_id,
+                    )
+                aggregated_result = aggregate.weighted_mean
             elif strategy == AggregationStrategy.FIRST:
                 # Use the first result
-                aggregated_result = results[0]["result"]
+                aggregated_result = aggregate.first["result"]
             elif strategy == AggregationStrategy.LAST:
                 # Use the last result
-                aggregated_result = results[-1]["result"]
+                aggregated_result = aggregate.last["result"]
             elif strategy == AggregationStrategy.CUSTOM:
-                # Use a custom aggregation function
+                # Use a custom aggregation function over the raw results
                 custom_aggregator = self.custom_aggregators.get(task_id)
                 if custom_aggregator:
+                    results = await self.get_results(task_id)
                     aggregated_result = custom_aggregator(results)
                 else:
                     raise CoordinationError(
@@ -355,7 +444,10 @@ class ResultAggregator:
         try:
             async with self.result_lock:
                 if task_id in self.results:
-                    del self.results[task_id]
+                    self.results.pop(task_id).close()
+
+                self.aggregates.pop(task_id, None)
+                self.expected_results.pop(task_id, None)
 
                 if task_id in self.strategies:
                     del self.strategies[task_id]
@@ -371,6 +463,48 @@ class ResultAggregator:
             self.logger.error(error_msg, exc_info=True)
             raise CoordinationError(error_msg, task_id=task_id, cause=e)
 
+    def _ensure_task(self, task_id: str) -> None:
+        """
+        Create the result log and aggregate of a task if needed.
+
+        Args:
+            task_id: ID of the task
+        """
+        if task_id not in self.results:
+            self.results[task_id] = ResultLog(self.spill_threshold, self.spill_dir)
+            self.aggregates[task_id] = StreamingAggregate(
+                self.top_k,
+                count_labels=self.strategies.get(task_id)
+                == AggregationStrategy.MAJORITY,
+            )
+
+    def _snapshot(self, task_id: str, aggregate: StreamingAggregate) -> Dict[str, Any]:
+        """
+        Build the progress snapshot of a task.
+
+        Args:
+            task_id: ID of the task
+            aggregate: Running aggregate of the task
+
+        Returns:
+            Snapshot of the running aggregates
+        """
+        snapshot = aggregate.snapshot()
+        strategy = self.strategies.get(task_id, AggregationStrategy.COLLECT)
+        expected = self.expected_results.get(task_id)
+        snapshot.update(
+            {
+                "task_id": task_id,
+                "strategy": strategy.value,
+                "expected": expected,
+                "progress": (
+                    min(1.0, aggregate.count / expected) if expected else None
+                ),
+                "spilled": self.results[task_id].spilled,
+            }
+        )
+        return snapshot
+
     async def _subscribe_to_events(self) -> None:
         """
         Subscribe to result-related events.
@@ -430,8 +564,7 @@ class ResultAggregator:
                 return
 
             # Check if we have results for this task
-            results = await self.get_results(task_id)
-            if not results:
+            if not await self.get_result_count(task_id):
                 self.logger.warning(f"No results found for completed task {task_id}")
                 return
 
@@ -446,7 +579,7 @@ class ResultAggregator:
             )
 
     async def _publish_result_added_event(
-        self, task_id: str, agent_id: str, result: Any
+        self, task_id: str, agent_id: str, result: Any, result_count: int
     ) -> None:
         """
         Publish a result added event.
@@ -455,12 +588,16 @@ class ResultAggregator:
             task_id: ID of the task
             agent_id: ID of the agent that produced the result
             result: The result data
+            result_count: Number of results received for the task so far
         """
+        expected = self.expected_results.get(task_id)
         await self.publisher.publish_notification(
             notification_name="result_added",
             data={
                 "task_id": task_id,
                 "agent_id": agent_id,
+                "result_count": result_count,
+                "expected_results": expected,
                 "timestamp": datetime.now().isoformat(),
             },
         )
@@ -0,0 +1,542 @@
+"""
+Streaming aggregation of task results for the Coordinator.
+
+Each result is folded into a StreamingAggregate as it arrives, so the
+built-in aggregation strategies (COLLECT, MAJORITY, WEIGHTED, FIRST, LAST)
+are answered from running state instead of a pass over every result when the
+task completes. The aggregate also keeps running numeric statistics, a top-k
+of the best scored results and a quantile sketch, all of which can be merged
+across tasks and queried at any time as a progress snapshot.
+
+Raw results are still kept for CUSTOM aggregators and get_results(); the
+ResultLog holding them spills to a temporary file once a task has more than
+``spill_threshold`` results in memory.
+"""
+
+import heapq
+import itertools
+import math
+import pickle
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def _as_number(value: Any) -> Optional[float]:
+    """Return value as a finite float, or None if it is not a real number."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+class RunningStats:
+    """
+    Count, sum, min, max, mean and variance of a stream of numbers.
+
+    Uses Welford's update, and Chan's formula to merge two streams.
+    """
+
+    __slots__ = ("count", "total", "minimum", "maximum", "mean", "_m2")
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.count = 0
+        self.total = 0.0
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        """
+        Fold a value into the statistics.
+
+        Args:
+            value: The value to add
+        """
+        self.count += 1
+        self.total += value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def merge(self, other: "RunningStats") -> None:
+        """
+        Merge another stream's statistics into these.
+
+        Args:
+            other: Statistics to merge
+        """
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.total = other.count, other.total
+            self.minimum, self.maximum = other.minimum, other.maximum
+            self.mean, self._m2 = other.mean, other._m2
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Sample variance, or None with fewer than two values."""
+        return self._m2 / (self.count - 1) if self.count > 1 else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the statistics to a dictionary.
+
+        Returns:
+            Dictionary representation of the statistics
+        """
+        variance = self.variance
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.minimum,
+            "max": self.maximum,
+            "mean": self.mean if self.count else None,
+            "stddev": math.sqrt(variance) if variance is not None else None,
+        }
+
+
+class TopK:
+    """
+    The k highest scored items of a stream.
+
+    A min-heap of size k; ties keep the earlier item.
+    """
+
+    def __init__(self, k: int):
+        """
+        Initialize the top-k.
+
+        Args:
+            k: Number of items to keep
+        """
+        self.k = k
+        # (score, -seq, item); the root is the weakest kept item
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._seq = itertools.count()
+
+    def add(self, score: float, item: Any) -> None:
+        """
+        Offer an item to the top-k.
+
+        Args:
+            score: Score of the item
+            item: The item
+        """
+        if self.k <= 0:
+            return
+        entry = (score, -next(self._seq), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def merge(self, other: "TopK") -> None:
+        """
+        Merge another top-k into this one.
+
+        Args:
+            other: Top-k to merge
+        """
+        for score, _, item in other.items():
+            self.add(score, item)
+
+    def items(self) -> List[Tuple[float, int, Any]]:
+        """
+        Kept entries, best first.
+
+        Returns:
+            List of (score, -seq, item) tuples
+        """
+        return sorted(self._heap, key=lambda entry: entry[:2], reverse=True)
+
+    def to_list(self) -> List[Any]:
+        """
+        Kept items, best first.
+
+        Returns:
+            List of items
+        """
+        return [item for _, _, item in self.items()]
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative error guarantees.
+
+    Values are counted in logarithmic buckets (as in DDSketch), so any
+    quantile is estimated within ``relative_accuracy`` of the true value.
+    When more than ``max_buckets`` buckets are in use, the lowest buckets are
+    collapsed, which only affects the accuracy of the lowest quantiles.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        """
+        Initialize the sketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of quantile estimates
+            max_buckets: Maximum number of buckets per sign
+        """
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._positive: Dict[int, int] = {}
+        self._negative: Dict[int, int] = {}
+        self._zero = 0
+        self.count = 0
+
+    def _index(self, magnitude: float) -> int:
+        """Bucket index of a positive magnitude."""
+        return math.ceil(math.log(magnitude) / self._log_gamma)
+
+    def _value(self, index: int) -> float:
+        """Representative magnitude of a bucket."""
+        return 2 * self._gamma**index / (self._gamma + 1)
+
+    def _collapse(self, buckets: Dict[int, int]) -> None:
+        """Fold the lowest buckets into one until max_buckets remain."""
+        if len(buckets) <= self.max_buckets:
+            return
+        indexes = sorted(buckets)
+        excess = len(indexes) - self.max_buckets
+        target = indexes[excess]
+        for index in indexes[:excess]:
+            buckets[target] += buckets.pop(index)
+
+    def add(self, value: float) -> None:
+        """
+        Add a value to the sketch.
+
+        Args:
+            value: The value to add
+        """
+        self.count += 1
+        if value > 0:
+            buckets = self._positive
+        elif value < 0:
+            buckets = self._negative
+            value = -value
+        else:
+            self._zero += 1
+            return
+        index = self._index(value)
+        buckets[index] = buckets.get(index, 0) + 1
+        if len(buckets) > self.max_buckets:
+            self._collapse(buckets)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """
+        Merge another sketch into this one.
+
+        Args:
+            other: Sketch to merge; must have the same relative accuracy
+
+        Raises:
+            ValueError: If the sketches have different relative accuracies
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracies")
+        for mine, theirs in (
+            (self._positive, other._positive),
+            (self._negative, other._negative),
+        ):
+            for index, count in theirs.items():
+                mine[index] = mine.get(index, 0) + count
+            self._collapse(mine)
+        self._zero += other._zero
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value, or None if the sketch is empty
+        """
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self._negative, reverse=True):
+            seen += self._negative[index]
+            if seen > rank:
+                return -self._value(index)
+        seen += self._zero
+        if seen > rank:
+            return 0.0
+        for index in sorted(self._positive):
+            seen += self._positive[index]
+            if seen > rank:
+                return self._value(index)
+        return self._value(max(self._positive))
+
+
+class ResultLog:
+    """
+    Append-only log of result entries that spills to disk.
+
+    Entries are kept in memory until ``spill_threshold`` of them are
+    buffered; the buffer is then pickled to a temporary file, which is
+    removed when the log is closed. Iteration yields entries in insertion
+    order. If the buffer cannot be pickled the log stays in memory.
+    """
+
+    def __init__(self, spill_threshold: Optional[int], spill_dir: Optional[str] = None):
+        """
+        Initialize the log.
+
+        Args:
+            spill_threshold: Buffered entries that trigger a spill; None to
+                never spill
+            spill_dir: Directory for the spill file (default temp directory)
+        """
+        self.spill_threshold = spill_threshold
+        self.spill_dir = spill_dir
+        self._buffer: List[Dict[str, Any]] = []
+        self._file = None
+        self.spilled = 0
+        self.spillable = spill_threshold is not None
+
+    def __len__(self) -> int:
+        return self.spilled + len(self._buffer)
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """
+        Append an entry, spilling the buffer if it is full.
+
+        Args:
+            entry: The result entry
+        """
+        self._buffer.append(entry)
+        if self.spillable and len(self._buffer) >= self.spill_threshold:
+            self._spill()
+
+    def _spill(self) -> None:
+        """Move the buffer to the spill file."""
+        try:
+            data = b"".join(pickle.dumps(entry) for entry in self._buffer)
+        except Exception:
+            # Unpicklable results; keep everything in memory from now on
+            self.spillable = False
+            return
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(
+                prefix="fs_results_", dir=self.spill_dir
+            )
+        self._file.seek(0, 2)
+        self._file.write(data)
+        self._file.flush()
+        self.spilled += len(self._buffer)
+        self._buffer = []
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if self._file is not None:
+            self._file.seek(0)
+            for _ in range(self.spilled):
+                yield pickle.load(self._file)
+        yield from list(self._buffer)
+
+    def close(self) -> None:
+        """Drop all entries and remove the spill file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._buffer = []
+        self.spilled = 0
+
+
+class StreamingAggregate:
+    """
+    Running aggregates over the results of one task.
+
+    Results are folded in one at a time with add(); the aggregates never
+    look at earlier results again.
+    """
+
+    def __init__(self, top_k: int = 10, count_labels: bool = False):
+        """
+        Initialize an empty aggregate.
+
+        Args:
+            top_k: Number of best scored results to keep
+            count_labels: Whether to count results by their string form for
+                MAJORITY (see count_labels_from)
+        """
+        self.count = 0
+        self.first: Optional[Dict[str, Any]] = None
+        self.last: Optional[Dict[str, Any]] = None
+        # Latest result per agent (COLLECT)
+        self.by_agent: Dict[str, Any] = {}
+        # str(result) -> count, and -> first-seen rank (MAJORITY)
+        self.count_labels = count_labels
+        self.label_counts: Dict[str, int] = {}
+        self._label_ranks: Dict[str, int] = {}
+        self.leader: Optional[str] = None
+        # Running weighted sum (WEIGHTED); error is set by non-numeric results
+        self.weighted_sum: Any = 0
+        self.total_weight: Any = 0
+        self.weighted_error: Optional[str] = None
+        self.numeric = RunningStats()
+        self.sketch = QuantileSketch()
+        self.top = TopK(top_k)
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        """
+        Fold a result entry into the aggregate.
+
+        Args:
+            entry: Result entry with agent_id, result, timestamp and metadata
+        """
+        result = entry["result"]
+        metadata = entry["metadata"]
+        self.count += 1
+        if self.first is None:
+            self.first = entry
+        self.last = entry
+        self.by_agent[entry["agent_id"]] = result
+
+        if self.count_labels:
+            self._count_label(str(result))
+
+        if self.weighted_error is None:
+            weight = metadata.get("weight", 1.0)
+            try:
+                self.weighted_sum += result * weight
+                self.total_weight += weight
+            except TypeError as e:
+                self.weighted_error = str(e)
+
+        value = _as_number(result)
+        if value is not None:
+            self.numeric.add(value)
+            self.sketch.add(value)
+        score = _as_number(metadata.get("score", result))
+        if score is not None:
+            self.top.add(
+                score, {"agent_id": entry["agent_id"], "result": result, "score": score}
+            )
+
+    def _count_label(self, label: str, count: int = 1) -> None:
+        """Add to a label's count and update the leader."""
+        rank = self._label_ranks.setdefault(label, len(self._label_ranks))
+        count += self.label_counts.get(label, 0)
+        self.label_counts[label] = count
+        # Ties go to the label seen first
+        leader = self.leader
+        if (
+            leader is None
+            or count > self.label_counts[leader]
+            or (count == self.label_counts[leader] and rank < self._label_ranks[leader])
+        ):
+            self.leader = label
+
+    def count_labels_from(self, entries: Iterable[Dict[str, Any]]) -> None:
+        """
+        Start counting labels, replaying the results already folded in.
+
+        Used when a task switches to MAJORITY after results have arrived.
+
+        Args:
+            entries: Result entries already added, in arrival order
+        """
+        if self.count_labels:
+            return
+        self.count_labels = True
+        for entry in entries:
+            self._count_label(str(entry["result"]))
+
+    def merge(self, other: "StreamingAggregate") -> None:
+        """
+        Merge another task's aggregate into this one.
+
+        Args:
+            other: Aggregate to merge
+        """
+        if other.first is not None and (
+            self.first is None or other.first["timestamp"] < self.first["timestamp"]
+        ):
+            self.first = other.first
+        if other.last is not None and (
+            self.last is None or other.last["timestamp"] >= self.last["timestamp"]
+        ):
+            self.last = other.last
+        self.count += other.count
+        self.by_agent.update(other.by_agent)
+        if other.count_labels:
+            self.count_labels = True
+            for label, count in other.label_counts.items():
+                self._count_label(label, count)
+        if self.weighted_error is None:
+            self.weighted_error = other.weighted_error
+        if self.weighted_error is None:
+            self.weighted_sum += other.weighted_sum
+            self.total_weight += other.total_weight
+        self.numeric.merge(other.numeric)
+        self.sketch.merge(other.sketch)
+        self.top.merge(other.top)
+
+    @property
+    def weighted_mean(self) -> Any:
+        """Weighted mean of the results, or None without positive weight."""
+        if self.weighted_error is not None or not self.total_weight > 0:
+            return None
+        return self.weighted_sum / self.total_weight
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Summarize the aggregate for progress reporting.
+
+        Returns:
+            Dictionary of the running aggregates
+        """
+
+        def iso(entry: Optional[Dict[str, Any]]) -> Optional[str]:
+            if entry is None or not isinstance(entry["timestamp"], datetime):
+                return None
+            return entry["timestamp"].isoformat()
+
+        numeric = self.numeric.to_dict()
+        numeric.update(
+            {
+                "p50": self.sketch.quantile(0.5),
+                "p90": self.sketch.quantile(0.9),
+                "p99": self.sketch.quantile(0.99),
+            }
+        )
+        return {
+            "count": self.count,
+            "agents": len(self.by_agent),
+            "first_at": iso(self.first),
+            "last_at": iso(self.last),
+            "distinct_results": (
+                len(self.label_counts) if self.count_labels else None
+            ),
+            "majority": (
+                {"result": self.leader, "count": self.label_counts[self.leader]}
+                if self.leader is not None
+                else None
+            ),
+            "weighted_mean": self.weighted_mean,
+            "numeric": numeric,
+            "top": self.top.to_list(),
+        }
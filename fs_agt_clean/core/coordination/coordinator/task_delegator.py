@@ -20,6 +20,7 @@ from fs_agt_clean.core.coordination.coordinator.coordinator import (
     UnifiedAgentType,
     CoordinationError,
 )
+from fs_agt_clean.core.coordination.coordinator.task_router import TaskRouter
 from fs_agt_clean.core.coordination.event_system import (
     CompositeFilter,
     Event,
@@ -353,6 +354,15 @@ class Task:
         return f"Task({self.task_id}, {self.task_type}, {self.status.value})"
 
 
+# Statuses after which a task no longer occupies its agent
+_FINISHED_STATUSES = (
+    TaskStatus.COMPLETED,
+    TaskStatus.FAILED,
+    TaskStatus.TIMEOUT,
+    TaskStatus.CANCELLED,
+)
+
+
 class TaskDelegator:
     """
     Component for delegating tasks to agents.
@@ -362,12 +372,13 @@ class TaskDelegator:
     their status and results.
     """
 
-    def __init__(self, delegator_id: str):
+    def __init__(self, delegator_id: str, router: Optional[TaskRouter] = None):
         """
         Initialize the task delegator.
 
         Args:
             delegator_id: Unique identifier for this delegator
+            router: Task router holding the per-agent work queues
         """
         self.delegator_id = delegator_id
         self.logger = get_logger(f"coordinator.delegator.{delegator_id}")
@@ -387,6 +398,10 @@ class TaskDelegator:
         # Maps task IDs to lists of dependent task IDs
         self.task_dependencies: Dict[str, List[str]] = {}
 
+        # Per-agent work queues; tasks are sent to an agent when it has a
+        # free slot rather than as soon as they are assigned
+        self.router = router or TaskRouter()
+
         # Initialize locks for thread safety
         self.task_lock = asyncio.Lock()
 
@@ -511,19 +526,24 @@ class TaskDelegator:
             self.logger.error(error_msg, exc_info=True)
             raise CoordinationError(error_msg, cause=e)
 
-    async def assign_task(self, task_id: str, agent_id: str) -> bool:
+    async def assign_task(
+        self, task_id: str, agent_id: str, agent_type: Any = None
+    ) -> bool:
         """
         Assign a task to an agent.
 
         Args:
             task_id: ID of the task
             agent_id: ID of the agent
+            agent_type: Type of the agent, so that it can share work with its
+                peers
 
         Returns:
             True if assignment was successful
 
         Raises:
-            CoordinationError: If assignment fails
+            CoordinationError: If assignment fails, e.g. the agent's queue is
+                full (the task then stays unassigned)
         """
         try:
             async with self.task_lock:
@@ -540,12 +560,15 @@ class TaskDelegator:
                     )
                     return False
 
-                # Update task agent and status
+                # Queue the task first; a full queue leaves it unassigned
+                self.router.enqueue(
+                    task_id, agent_id, task.priority, agent_type=agent_type
+                )
                 task.agent_id = agent_id
                 task.update_status(TaskStatus.ASSIGNED)
 
-            # Publish task assignment event
-            await self._publish_task_assignment_event(task)
+            # Send the task (or earlier queued ones) if the agent has a slot
+            await self._dispatch(agent_id)
 
             self.logger.info(f"Task assigned: {task_id} to agent {agent_id}")
 
@@ -555,6 +578,110 @@ class TaskDelegator:
             self.logger.error(error_msg, exc_info=True)
             raise CoordinationError(error_msg, task_id=task_id, cause=e)
 
+    async def route_task(
+        self, task_id: str, candidates: List[UnifiedAgentInfo]
+    ) -> Optional[str]:
+        """
+        Assign a task to the least loaded of several capable agents.
+
+        Args:
+            task_id: ID of the task
+            candidates: Capability-matched, healthy agents
+
+        Returns:
+            ID of the chosen agent, or None if the task cannot be assigned
+
+        Raises:
+            CoordinationError: If routing fails, e.g. all candidate queues are
+                full (the task is then marked as failed)
+        """
+        try:
+            async with self.task_lock:
+                task = self.tasks.get(task_id)
+                if task is None:
+                    self.logger.warning(f"Task not found for routing: {task_id}")
+                    return None
+                if task.status != TaskStatus.CREATED:
+                    self.logger.warning(
+                        f"Cannot route task {task_id} with status {task.status.value}"
+                    )
+                    return None
+
+                agent_id = self.router.route(task_id, candidates, task.priority)
+                task.agent_id = agent_id
+                task.update_status(TaskStatus.ASSIGNED)
+
+            self.logger.debug(
+                f"Task {task_id} routed to {agent_id} among {len(candidates)} agents"
+            )
+            await self._dispatch(agent_id)
+
+            self.logger.info(f"Task assigned: {task_id} to agent {agent_id}")
+
+            return agent_id
+        except CoordinationError as e:
+            await self.update_task_status(task_id, TaskStatus.FAILED, error=str(e))
+            raise
+        except Exception as e:
+            error_msg = f"Failed to route task {task_id}: {str(e)}"
+            self.logger.error(error_msg, exc_info=True)
+            raise CoordinationError(error_msg, task_id=task_id, cause=e)
+
+    async def release_agent(self, agent_id: str) -> None:
+        """
+        Drop an agent's work queue, e.g. when it is unregistered.
+
+        Queued tasks move to another eligible agent; tasks no other agent can
+        take are marked as failed. Tasks already sent to the agent keep their
+        status.
+
+        Args:
+            agent_id: ID of the agent
+        """
+        moved, orphaned = self.router.remove_agent(agent_id)
+        async with self.task_lock:
+            for task_id, new_agent_id in moved.items():
+                if task_id in self.tasks:
+                    self.tasks[task_id].agent_id = new_agent_id
+        for new_agent_id in set(moved.values()):
+            await self._dispatch(new_agent_id)
+        for task_id in orphaned:
+            await self.update_task_status(
+                task_id, TaskStatus.FAILED, error=f"Agent unregistered: {agent_id}"
+            )
+
+    def get_routing_stats(self) -> Dict[str, Any]:
+        """
+        Get routing decisions, queue waits and per-agent load.
+
+        Returns:
+            Routing statistics
+        """
+        return self.router.get_stats()
+
+    async def _dispatch(self, agent_id: str) -> None:
+        """
+        Send queued tasks to an agent while it has free slots.
+
+        When the agent's own queue is empty it may steal a task from a peer of
+        the same type, which moves the task to the agent.
+
+        Args:
+            agent_id: ID of the agent
+        """
+        while True:
+            async with self.task_lock:
+                task_id = self.router.dispatch(agent_id)
+                if task_id is None:
+                    return
+                task = self.tasks.get(task_id)
+                if task is None:
+                    self.router.complete(task_id, success=False)
+                    continue
+                task.agent_id = agent_id
+
+            await self._publish_task_assignment_event(task)
+
     async def update_task_status(
         self, task_id: str, status: TaskStatus, result: Any = None, error: str = None
     ) -> bool:
@@ -585,6 +712,13 @@ class TaskDelegator:
                 # Update task status
                 task.update_status(status)
 
+                # Free the agent's slot (or queue entry) for finished tasks
+                released_agent = None
+                if status in _FINISHED_STATUSES:
+                    released_agent = self.router.complete(
+                        task_id, success=status == TaskStatus.COMPLETED
+                    )
+
                 # Update result or error if provided
                 if status == TaskStatus.COMPLETED and result is not None:
                     task.result = result
@@ -601,6 +735,9 @@ class TaskDelegator:
                 f"Task status updated: {task_id} {old_status.value} -> {status.value}"
             )
 
+            if released_agent:
+                await self._dispatch(released_agent)
+
             # If the task is completed or failed, check if it has a parent task
             # and update the parent task if all subtasks are completed
             if (
@@ -649,10 +786,14 @@ class TaskDelegator:
 
                 # Update task status
                 task.update_status(TaskStatus.CANCELLED)
+                released_agent = self.router.complete(task_id, success=False)
 
             # Publish task cancellation event
             await self._publish_task_cancellation_event(task)
 
+            if released_agent:
+                await self._dispatch(released_agent)
+
             self.logger.info(f"Task cancelled: {task_id}")
 
             # Cancel all subtasks
@@ -0,0 +1,448 @@
+"""
+Load-aware task routing for the Coordinator.
+
+The TaskRouter keeps a bounded work queue per agent together with live load
+(queued and in-flight tasks) and an EWMA of task latency. Tasks are routed to
+the least loaded of their capability-matched candidates, or with
+power-of-two-choices, which samples two candidates and takes the less loaded
+one. Each agent runs at most ``max_in_flight`` tasks; further tasks wait in
+its queue and are dequeued by priority (FIFO within a priority). An agent
+with an empty queue steals waiting work from the busiest peer of the same
+agent type, as long as it is eligible for the task.
+"""
+
+import enum
+import heapq
+import itertools
+import random
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from fs_agt_clean.core.coordination.coordinator.coordinator import (
+    CoordinationError,
+    UnifiedAgentInfo,
+)
+
+
+class RoutingStrategy(enum.Enum):
+    """
+    Strategy for choosing among candidate agents.
+    """
+
+    LEAST_LOADED = "least_loaded"
+    POWER_OF_TWO = "power_of_two"
+
+
+class _RoutedTask:
+    """Routing state of one task."""
+
+    __slots__ = ("task_id", "priority", "seq", "eligible", "agent_id", "enqueued_at")
+
+    def __init__(
+        self, task_id: str, priority: int, seq: int, eligible: Set[str], agent_id: str
+    ):
+        self.task_id = task_id
+        self.priority = priority
+        self.seq = seq
+        self.eligible = eligible
+        self.agent_id = agent_id
+        self.enqueued_at = time.monotonic()
+
+
+class AgentWorkQueue:
+    """
+    Priority work queue and load statistics of one agent.
+    """
+
+    def __init__(self, agent_id: str, agent_type: Any, ewma_alpha: float):
+        """
+        Initialize the queue.
+
+        Args:
+            agent_id: ID of the agent
+            agent_type: Type of the agent (peers of a type steal from each other)
+            ewma_alpha: Weight of the newest sample in the latency EWMA
+        """
+        self.agent_id = agent_id
+        self.agent_type = agent_type
+        self.ewma_alpha = ewma_alpha
+        # (-priority, seq, task_id); cancelled entries are skipped lazily
+        self._heap: List[Tuple[int, int, str]] = []
+        self.queued: Set[str] = set()
+        # task_id -> dispatch time
+        self.in_flight: Dict[str, float] = {}
+        self.ewma_latency: Optional[float] = None
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def load(self) -> int:
+        """Queued plus in-flight tasks."""
+        return len(self.queued) + len(self.in_flight)
+
+    def push(self, entry: _RoutedTask) -> None:
+        heapq.heappush(self._heap, (-entry.priority, entry.seq, entry.task_id))
+        self.queued.add(entry.task_id)
+
+    def pop(self, accept=None) -> Optional[str]:
+        """
+        Remove the highest-priority queued task.
+
+        Args:
+            accept: Optional predicate; tasks it rejects stay queued
+
+        Returns:
+            Task ID, or None if no (acceptable) task is queued
+        """
+        skipped = []
+        task_id = None
+        while self._heap:
+            item = heapq.heappop(self._heap)
+            if item[2] not in self.queued:
+                continue
+            if accept is not None and not accept(item[2]):
+                skipped.append(item)
+                continue
+            task_id = item[2]
+            self.queued.discard(task_id)
+            break
+        for item in skipped:
+            heapq.heappush(self._heap, item)
+        return task_id
+
+    def discard(self, task_id: str) -> None:
+        self.queued.discard(task_id)
+        if not self.queued:
+            self._heap.clear()
+
+    def record_latency(self, seconds: float) -> None:
+        if self.ewma_latency is None:
+            self.ewma_latency = seconds
+        else:
+            self.ewma_latency += self.ewma_alpha * (seconds - self.ewma_latency)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "agent_type": getattr(self.agent_type, "value", self.agent_type),
+            "queued": len(self.queued),
+            "in_flight": len(self.in_flight),
+            "ewma_latency_seconds": self.ewma_latency,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+class TaskRouter:
+    """
+    Routes tasks to per-agent bounded work queues by live load.
+    """
+
+    def __init__(
+        self,
+        strategy: RoutingStrategy = RoutingStrategy.LEAST_LOADED,
+        max_queue_depth: int = 100,
+        max_in_flight: int = 4,
+        ewma_alpha: float = 0.2,
+        work_stealing: bool = True,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            strategy: How to choose among candidate agents
+            max_queue_depth: Maximum queued (not yet dispatched) tasks per agent
+            max_in_flight: Maximum dispatched, unfinished tasks per agent
+            ewma_alpha: Weight of the newest latency sample
+            work_stealing: Whether idle agents take work from busy peers
+            seed: Seed for power-of-two-choices sampling
+        """
+        self.strategy = strategy
+        self.max_queue_depth = max_queue_depth
+        self.max_in_flight = max_in_flight
+        self.ewma_alpha = ewma_alpha
+        self.work_stealing = work_stealing
+        self.rng = random.Random(seed)
+
+        self.queues: Dict[str, AgentWorkQueue] = {}
+        self.peers: Dict[Any, Set[str]] = {}
+        self.tasks: Dict[str, _RoutedTask] = {}
+        self._seq = itertools.count()
+
+        self.metrics = {
+            "routed": 0,
+            "rejected": 0,
+            "dispatched": 0,
+            "stolen": 0,
+            "queue_wait_count": 0,
+            "queue_wait_total_seconds": 0.0,
+            "queue_wait_max_seconds": 0.0,
+        }
+
+    def add_agent(self, agent_id: str, agent_type: Any = None) -> AgentWorkQueue:
+        """
+        Get or create the work queue of an agent.
+
+        A queue created without a type joins its type's peers once the type
+        is given.
+        """
+        queue = self.queues.get(agent_id)
+        if queue is None:
+            queue = AgentWorkQueue(agent_id, agent_type, self.ewma_alpha)
+            self.queues[agent_id] = queue
+            self.peers.setdefault(agent_type, set()).add(agent_id)
+        elif queue.agent_type is None and agent_type is not None:
+            peers = self.peers.get(None)
+            if peers is not None:
+                peers.discard(agent_id)
+                if not peers:
+                    del self.peers[None]
+            queue.agent_type = agent_type
+            self.peers.setdefault(agent_type, set()).add(agent_id)
+        return queue
+
+    def remove_agent(self, agent_id: str) -> Tuple[Dict[str, str], List[str]]:
+        """
+        Drop an agent's queue, moving its queued tasks to other eligible agents.
+
+        Tasks in flight on the agent are no longer tracked.
+
+        Args:
+            agent_id: ID of the agent
+
+        Returns:
+            Tuple of (task ID -> new agent ID for moved tasks, IDs of queued
+            tasks no other agent can take)
+        """
+        queue = self.queues.pop(agent_id, None)
+        if queue is None:
+            return {}, []
+        peers = self.peers.get(queue.agent_type)
+        if peers is not None:
+            peers.discard(agent_id)
+            if not peers:
+                del self.peers[queue.agent_type]
+        for task_id in queue.in_flight:
+            self.tasks.pop(task_id, None)
+
+        moved: Dict[str, str] = {}
+        orphaned: List[str] = []
+        while True:
+            task_id = queue.pop()
+            if task_id is None:
+                break
+            entry = self.tasks[task_id]
+            entry.eligible.discard(agent_id)
+            new_agent_id = self.select(entry.eligible)
+            if new_agent_id is None:
+                del self.tasks[task_id]
+                orphaned.append(task_id)
+                continue
+            entry.agent_id = new_agent_id
+            self.queues[new_agent_id].push(entry)
+            moved[task_id] = new_agent_id
+        return moved, orphaned
+
+    def _score(self, queue: AgentWorkQueue) -> Tuple[int, float]:
+        # Load first; among equally loaded agents prefer the faster one
+        return (queue.load, queue.ewma_latency or 0.0)
+
+    def select(self, candidates: Iterable[str]) -> Optional[str]:
+        """
+        Choose an agent with queue capacity among candidates.
+
+        Args:
+            candidates: IDs of the eligible agents
+
+        Returns:
+            Agent ID, or None if every candidate is full
+        """
+        open_queues = [
+            self.queues[agent_id]
+            for agent_id in candidates
+            if agent_id in self.queues
+            and len(self.queues[agent_id].queued) < self.max_queue_depth
+        ]
+        if not open_queues:
+            return None
+        if self.strategy == RoutingStrategy.POWER_OF_TWO and len(open_queues) > 2:
+            open_queues = self.rng.sample(open_queues, 2)
+        return min(open_queues, key=self._score).agent_id
+
+    def route(
+        self,
+        task_id: str,
+        candidates: List[UnifiedAgentInfo],
+        priority: int = 0,
+    ) -> str:
+        """
+        Route a task to one of its candidate agents and queue it there.
+
+        Args:
+            task_id: ID of the task
+            candidates: Capability-matched agents
+            priority: Task priority (higher is dequeued first)
+
+        Returns:
+            ID of the chosen agent
+
+        Raises:
+            CoordinationError: If every candidate's queue is full
+        """
+        for agent in candidates:
+            self.add_agent(agent.agent_id, agent.agent_type)
+        eligible = {agent.agent_id for agent in candidates}
+        agent_id = self.select(eligible)
+        if agent_id is None:
+            self.metrics["rejected"] += 1
+            raise CoordinationError(
+                f"All {len(eligible)} candidate agent queues are full",
+                task_id=task_id,
+            )
+        self.enqueue(task_id, agent_id, priority, eligible)
+        return agent_id
+
+    def enqueue(
+        self,
+        task_id: str,
+        agent_id: str,
+        priority: int = 0,
+        eligible: Optional[Set[str]] = None,
+        agent_type: Any = None,
+    ) -> None:
+        """
+        Queue a task on a specific agent.
+
+        Args:
+            task_id: ID of the task
+            agent_id: ID of the agent
+            priority: Task priority
+            eligible: Agents allowed to steal the task (defaults to the agent)
+            agent_type: Type of the agent, if known
+
+        Raises:
+            CoordinationError: If the agent's queue is full
+        """
+        queue = self.add_agent(agent_id, agent_type)
+        if len(queue.queued) >= self.max_queue_depth:
+            self.metrics["rejected"] += 1
+            raise CoordinationError(
+                f"Queue of agent {agent_id} is full",
+                agent_id=agent_id,
+                task_id=task_id,
+            )
+        entry = _RoutedTask(
+            task_id, int(priority), next(self._seq), eligible or {agent_id}, agent_id
+        )
+        self.tasks[task_id] = entry
+        queue.push(entry)
+        self.metrics["routed"] += 1
+
+    def dispatch(self, agent_id: str) -> Optional[str]:
+        """
+        Start the next task of an agent if it has a free slot.
+
+        The agent's own queue is served first; when it is empty the agent
+        steals from the busiest peer of the same type.
+
+        Args:
+            agent_id: ID of the agent
+
+        Returns:
+            ID of the dispatched task, or None
+        """
+        queue = self.queues.get(agent_id)
+        if queue is None or len(queue.in_flight) >= self.max_in_flight:
+            return None
+
+        task_id = queue.pop()
+        if task_id is None and self.work_stealing:
+            task_id = self._steal(queue)
+        if task_id is None:
+            return None
+
+        entry = self.tasks[task_id]
+        now = time.monotonic()
+        wait = now - entry.enqueued_at
+        entry.agent_id = agent_id
+        queue.in_flight[task_id] = now
+
+        self.metrics["dispatched"] += 1
+        self.metrics["queue_wait_count"] += 1
+        self.metrics["queue_wait_total_seconds"] += wait
+        self.metrics["queue_wait_max_seconds"] = max(
+            self.metrics["queue_wait_max_seconds"], wait
+        )
+        return task_id
+
+    def _steal(self, thief: AgentWorkQueue) -> Optional[str]:
+        """Take the best waiting task the thief is eligible for from a peer."""
+        victims = sorted(
+            (
+                self.queues[peer_id]
+                for peer_id in self.peers.get(thief.agent_type, ())
+                if peer_id != thief.agent_id and self.queues[peer_id].queued
+            ),
+            key=lambda queue: len(queue.queued),
+            reverse=True,
+        )
+        for victim in victims:
+            task_id = victim.pop(
+                accept=lambda i: thief.agent_id in self.tasks[i].eligible
+            )
+            if task_id is not None:
+                self.metrics["stolen"] += 1
+                return task_id
+        return None
+
+    def complete(self, task_id: str, success: bool = True) -> Optional[str]:
+        """
+        Finish (or cancel) a task and release its slot or queue entry.
+
+        Args:
+            task_id: ID of the task
+            success: Whether the task completed successfully
+
+        Returns:
+            ID of the agent that held the task, or None if it was not routed
+        """
+        entry = self.tasks.pop(task_id, None)
+        if entry is None:
+            return None
+        queue = self.queues.get(entry.agent_id)
+        if queue is None:
+            return None
+
+        started = queue.in_flight.pop(task_id, None)
+        if started is None:
+            # Never dispatched: just drop it from the queue
+            queue.discard(task_id)
+            return entry.agent_id
+
+        queue.record_latency(time.monotonic() - started)
+        if success:
+            queue.completed += 1
+        else:
+            queue.failed += 1
+        return entry.agent_id
+
+    def agent_of(self, task_id: str) -> Optional[str]:
+        """Agent currently holding a routed task."""
+        entry = self.tasks.get(task_id)
+        return entry.agent_id if entry else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get routing metrics and per-agent load."""
+        waits = self.metrics["queue_wait_count"]
+        return {
+            "strategy": self.strategy.value,
+            **self.metrics,
+            "queue_wait_avg_seconds": (
+                self.metrics["queue_wait_total_seconds"] / waits if waits else 0.0
+            ),
+            "queued": sum(len(q.queued) for q in self.queues.values()),
+            "in_flight": sum(len(q.in_flight) for q in self.queues.values()),
+            "agents": {
+                agent_id: queue.get_stats() for agent_id, queue in self.queues.items()
+            },
+        }
@@ -0,0 +1,246 @@
+"""
+Tests for agent_registry.py
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from fs_agt_clean.core.coordination.coordinator.agent_registry import (
+    TimingWheel,
+    UnifiedAgentRegistry,
+)
+from fs_agt_clean.core.coordination.coordinator.coordinator import (
+    UnifiedAgentCapability,
+    UnifiedAgentInfo,
+    UnifiedAgentStatus,
+    UnifiedAgentType,
+)
+
+
+def agent(agent_id, agent_type=UnifiedAgentType.SPECIALIST, capabilities=()):
+    return UnifiedAgentInfo(
+        agent_id=agent_id,
+        agent_type=agent_type,
+        name=agent_id,
+        capabilities=[UnifiedAgentCapability(name=name) for name in capabilities],
+    )
+
+
+def ids(agents):
+    return [a.agent_id for a in agents]
+
+
+def event(agent_id, correlation_id=None):
+    return SimpleNamespace(
+        payload={"data": {"agent_id": agent_id}}, correlation_id=correlation_id
+    )
+
+
+class TestTimingWheel:
+    """Tests for TimingWheel."""
+
+    def test_due_after_delay(self):
+        """A key becomes due on the tick its delay ends."""
+        wheel = TimingWheel(tick_seconds=1.0, slots=4)
+        wheel.schedule("a", 2.0)
+        wheel.schedule("b", 0.1)
+        assert wheel.advance() == ["b"]
+        assert wheel.advance() == ["a"]
+        assert len(wheel) == 0
+
+    def test_multiple_rotations(self):
+        """Delays longer than the wheel wait for full rotations."""
+        wheel = TimingWheel(tick_seconds=1.0, slots=4)
+        wheel.schedule("a", 10.0)
+        due_at = [tick for tick in range(1, 13) if wheel.advance()]
+        assert due_at == [10]
+
+    def test_reschedule_and_cancel(self):
+        """Rescheduling moves a key; cancelled keys never become due."""
+        wheel = TimingWheel(tick_seconds=1.0, slots=8)
+        wheel.schedule("a", 1.0)
+        wheel.schedule("a", 3.0)
+        wheel.schedule("b", 2.0)
+        wheel.cancel("b")
+        assert "b" not in wheel
+        assert [wheel.advance() for _ in range(3)] == [[], [], ["a"]]
+
+
+class TestRegistryIndexes:
+    """Tests for the agent lookups by type, status and capability."""
+
+    @pytest.mark.asyncio
+    async def test_lookups_follow_registration_order(self):
+        """Indexed lookups return agents in registration order."""
+        registry = UnifiedAgentRegistry("test_indexes")
+        for agent_id in ["c", "a", "b"]:
+            await registry.register_agent(agent(agent_id, capabilities=["price"]))
+        await registry.register_agent(
+            agent("d", UnifiedAgentType.UTILITY, capabilities=["ship"])
+        )
+
+        specialists = await registry.find_agents_by_type(UnifiedAgentType.SPECIALIST)
+        assert ids(specialists) == ["c", "a", "b"]
+        pricing = UnifiedAgentCapability(name="price")
+        assert ids(await registry.find_agents_by_capability(pricing)) == ["c", "a", "b"]
+        active = await registry.find_agents_by_status(UnifiedAgentStatus.ACTIVE)
+        assert ids(active) == ["c", "a", "b", "d"]
+
+    @pytest.mark.asyncio
+    async def test_indexes_follow_updates(self):
+        """Status, capability and registration changes update the indexes."""
+        registry = UnifiedAgentRegistry("test_updates")
+        await registry.register_agent(agent("a", capabilities=["price"]))
+        await registry.register_agent(agent("b", capabilities=["price"]))
+
+        await registry.update_agent_status("a", UnifiedAgentStatus.BUSY)
+        busy = await registry.find_agents_by_status(UnifiedAgentStatus.BUSY)
+        assert ids(busy) == ["a"]
+        active = await registry.find_agents_by_status(UnifiedAgentStatus.ACTIVE)
+        assert ids(active) == ["b"]
+
+        await registry.update_agent_capabilities(
+            "b", [UnifiedAgentCapability(name="ship")]
+        )
+        pricing = UnifiedAgentCapability(name="price")
+        assert ids(await registry.find_agents_by_capability(pricing)) == ["a"]
+
+        # Re-registering replaces the entry and keeps the original order
+        await registry.register_agent(
+            agent("a", UnifiedAgentType.UTILITY, capabilities=["ship"])
+        )
+        shipping = UnifiedAgentCapability(name="ship")
+        assert ids(await registry.find_agents_by_capability(shipping)) == ["a", "b"]
+        assert await registry.find_agents_by_capability(pricing) == []
+        assert "a" not in registry.agents_by_status.get(UnifiedAgentStatus.BUSY, ())
+
+        await registry.unregister_agent("a")
+        assert ids(await registry.find_agents_by_capability(shipping)) == ["b"]
+        assert await registry.find_agents_by_type(UnifiedAgentType.UTILITY) == []
+        assert "a" not in registry.health_check_wheel
+
+
+class TestHealthChecks:
+    """Tests for heartbeats, pings and per-agent health checks."""
+
+    @pytest.mark.asyncio
+    async def test_registration_schedules_check(self):
+        """Registered agents are due once per health check interval."""
+        registry = UnifiedAgentRegistry("test_schedule")
+        await registry.register_agent(agent("a"))
+        assert registry.get_health_check_stats()["scheduled_agents"] == 1
+        due = [registry.health_check_wheel.advance() for _ in range(60)]
+        assert due[-1] == ["a"]
+        assert not any(due[:-1])
+
+    @pytest.mark.asyncio
+    async def test_stale_agent_disconnected_and_revived(self):
+        """An agent not seen in time is disconnected; a heartbeat revives it."""
+        registry = UnifiedAgentRegistry("test_stale")
+        await registry.register_agent(agent("a"))
+        registry.agents["a"].last_seen = datetime.now() - timedelta(hours=1)
+
+        await registry._check_agent("a")
+        assert registry.agents["a"].status == UnifiedAgentStatus.DISCONNECTED
+
+        await asyncio.wait_for(registry._handle_agent_heartbeat(event("a")), 1.0)
+        assert registry.agents["a"].status == UnifiedAgentStatus.ACTIVE
+
+    @pytest.mark.asyncio
+    async def test_recent_agent_not_pinged(self):
+        """A recently seen agent is alive without a ping."""
+        registry = UnifiedAgentRegistry("test_recent")
+        await registry.register_agent(agent("a"))
+        await registry._check_agent("a")
+        stats = registry.get_health_check_stats()
+        assert stats["skipped_alive"] == 1
+        assert stats["pings"] == 0
+
+    @pytest.mark.asyncio
+    async def test_quiet_agent_pinged(self, monkeypatch):
+        """A quiet agent that answers the ping stays active."""
+        registry = UnifiedAgentRegistry("test_ping")
+        await registry.register_agent(agent("a"))
+        registry.agents["a"].last_seen = datetime.now() - timedelta(minutes=2)
+
+        async def publish_command(command_name, parameters, target, correlation_id):
+            asyncio.get_running_loop().call_soon(
+                asyncio.ensure_future,
+                registry._handle_ping_response(event(target, correlation_id)),
+            )
+
+        monkeypatch.setattr(registry.publisher, "publish_command", publish_command)
+        await registry._check_agent("a")
+        assert registry.agents["a"].status == UnifiedAgentStatus.ACTIVE
+        assert registry.get_health_check_stats()["pings"] == 1
+        assert not registry.pending_pings
+
+    @pytest.mark.asyncio
+    async def test_unresponsive_agent_disconnected(self, monkeypatch):
+        """A quiet agent that does not answer the ping is disconnected."""
+        registry = UnifiedAgentRegistry("test_no_ping")
+        registry.ping_timeout = 0.01
+        await registry.register_agent(agent("a"))
+        registry.agents["a"].last_seen = datetime.now() - timedelta(minutes=2)
+
+        async def publish_command(**kwargs):
+            return None
+
+        monkeypatch.setattr(registry.publisher, "publish_command", publish_command)
+        await registry._check_agent("a")
+        assert registry.agents["a"].status == UnifiedAgentStatus.DISCONNECTED
+
+
+class TestHealthCheckLoop:
+    """Tests for the health check loop and its timing wheel."""
+
+    @pytest.mark.asyncio
+    async def test_interval_argument(self):
+        """The wheel ticks 60 times per health check interval."""
+        registry = UnifiedAgentRegistry(
+            "test_interval", health_check_interval=timedelta(seconds=6)
+        )
+        assert registry.health_check_wheel.tick_seconds == pytest.approx(0.1)
+
+    @pytest.mark.asyncio
+    async def test_interval_changed_before_start(self):
+        """Changing the interval before start rebuilds the wheel."""
+        registry = UnifiedAgentRegistry("test_rebuild")
+        await registry.register_agent(agent("a"))
+        registry.health_check_interval = timedelta(seconds=6)
+        await registry.start()
+        try:
+            assert registry.health_check_wheel.tick_seconds == pytest.approx(0.1)
+            assert "a" in registry.health_check_wheel
+        finally:
+            await registry.stop()
+
+    @pytest.mark.asyncio
+    async def test_slow_check_does_not_stall_wheel(self, monkeypatch):
+        """Other agents keep being checked while one check hangs."""
+        registry = UnifiedAgentRegistry(
+            "test_slow", health_check_interval=timedelta(seconds=0.6)
+        )
+        await registry.register_agent(agent("slow"))
+        await registry.register_agent(agent("fast"))
+        checked = []
+        released = asyncio.Event()
+
+        async def check_agent(agent_id):
+            checked.append(agent_id)
+            if agent_id == "slow":
+                await released.wait()
+
+        monkeypatch.setattr(registry, "_check_agent", check_agent)
+        await registry.start()
+        try:
+            await asyncio.sleep(1.5)
+            assert checked.count("slow") == 1
+            assert checked.count("fast") >= 2
+            assert len(registry.health_check_tasks) == 1
+        finally:
+            await registry.stop()
+        assert not registry.health_check_tasks
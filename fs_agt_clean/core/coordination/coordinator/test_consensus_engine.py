@@ -0,0 +1,130 @@
+"""
+Tests for consensus_engine.py and consensus resolution in ConflictResolver
+"""
+
+import statistics
+
+import pytest
+
+from fs_agt_clean.core.coordination.coordinator.conflict_resolver import (
+    ConflictResolver,
+    ConflictType,
+    ResolutionStrategy,
+)
+from fs_agt_clean.core.coordination.coordinator.consensus_engine import (
+    CandidateBatch,
+    ConsensusEngine,
+)
+
+
+def candidates(values, confidences=None):
+    confidences = confidences or [1.0] * len(values)
+    return [
+        {"value": value, "confidence": confidence, "agent_id": f"agent_{i}"}
+        for i, (value, confidence) in enumerate(zip(values, confidences))
+    ]
+
+
+class TestConsensusEngine:
+    """Tests for ConsensusEngine."""
+
+    def test_weighted_vote_and_first_seen_ties(self):
+        engine = ConsensusEngine()
+        result = engine.resolve(candidates(["a", "b", "b"], [0.9, 0.5, 0.4]))
+        assert result.winner == "a"
+        assert result.votes == {"a": 0.9, "b": pytest.approx(0.9)}
+
+        tie = engine.resolve(candidates(["x", "y"], [0.5, 0.5]))
+        assert tie.winner == "x"
+        assert tie.consensus_score == pytest.approx(0.5)
+
+    def test_numeric_consensus_rejects_outliers(self):
+        values = [10.0, 10.5, 11.0, 500.0, 10.2]
+        result = ConsensusEngine().resolve(candidates(values))
+
+        assert result.median == statistics.median(values)
+        assert result.outliers == [3]
+        assert result.value == pytest.approx(statistics.fmean([10.0, 10.5, 11.0, 10.2]))
+        assert result.numeric_count == 5
+
+    def test_batch_matches_single_resolution(self):
+        engine = ConsensusEngine()
+        conflicts = [
+            candidates([1, 2, 2]),
+            candidates(["x"]),
+            [],
+            candidates([3.0, 3, "3"]),
+        ]
+        batch = engine.resolve_batch(engine.prepare(conflicts))
+
+        assert [r.winner for r in batch] == [
+            engine.resolve(entities).winner for entities in conflicts
+        ]
+        assert batch[2].winner is None
+        # Mixed types vote by their string form
+        assert batch[3].counts == {"3.0": 1, "3": 2}
+
+    def test_unhashable_values_vote_by_string_form(self):
+        engine = ConsensusEngine()
+        values = [{"price": 10}, {"price": 12}, {"price": 10}, [1, 2]]
+        result = engine.resolve(candidates(values))
+
+        assert result.winner == "{'price': 10}"
+        assert result.counts["{'price': 10}"] == 2
+        assert result.numeric_count == 0
+
+        nested = engine.resolve(candidates([[1, 2], [1, 2], [3]]))
+        assert nested.winner == "[1, 2]"
+
+        batch = CandidateBatch.from_values([[["a"], ["a"], ["b"]]])
+        assert engine.resolve_batch(batch)[0].winner == "['a']"
+
+    def test_recency_discounts_old_candidates(self):
+        engine = ConsensusEngine(recency_half_life=10.0)
+        entities = [
+            {"value": "old", "confidence": 1.0, "timestamp": 0.0},
+            {"value": "new", "confidence": 0.6, "timestamp": 100.0},
+        ]
+        result = engine.resolve(entities, now=100.0)
+
+        assert result.winner == "new"
+
+
+class TestConflictResolverConsensus:
+    """Tests for consensus strategies of ConflictResolver."""
+
+    @pytest.mark.asyncio
+    async def test_consensus_on_structured_values(self):
+        resolver = ConflictResolver("test")
+        conflict_id = await resolver.detect_conflict(
+            ConflictType.DATA,
+            candidates([{"sku": "A"}, {"sku": "B"}, {"sku": "A"}]),
+            "structured results",
+        )
+
+        assert await resolver.resolve_conflict(
+            conflict_id, ResolutionStrategy.CONSENSUS
+        )
+        conflict = await resolver.get_conflict(conflict_id)
+        assert conflict.resolution_result == "{'sku': 'A'}"
+
+    @pytest.mark.asyncio
+    async def test_resolve_conflicts_in_batch(self):
+        resolver = ConflictResolver("test")
+        ids = [
+            await resolver.detect_conflict(
+                ConflictType.DATA, candidates(values), "prices"
+            )
+            for values in ([10, 10, 12], [[1], [1], [2]])
+        ]
+
+        outcomes = await resolver.resolve_conflicts(
+            ids, ResolutionStrategy.WEIGHTED_CONSENSUS
+        )
+
+        assert outcomes == {conflict_id: True for conflict_id in ids}
+        first = (await resolver.get_conflict(ids[0])).resolution_result
+        assert first["winner"] == 10
+        assert first["median"] == 10
+        second = (await resolver.get_conflict(ids[1])).resolution_result
+        assert second["winner"] == "[1]"
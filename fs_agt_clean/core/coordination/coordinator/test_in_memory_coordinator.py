@@ -0,0 +1,57 @@
+"""
+Tests for in_memory_coordinator.py
+"""
+
+import pytest
+
+from fs_agt_clean.core.coordination.coordinator.coordinator import (
+    UnifiedAgentInfo,
+    UnifiedAgentType,
+)
+from fs_agt_clean.core.coordination.coordinator.in_memory_coordinator import (
+    InMemoryCoordinator,
+)
+
+
+async def coordinator_with_agent(agent_id="a"):
+    coordinator = InMemoryCoordinator("c")
+    await coordinator.register_agent(
+        UnifiedAgentInfo(
+            agent_id=agent_id, agent_type=UnifiedAgentType.SPECIALIST, name=agent_id
+        )
+    )
+    return coordinator
+
+
+class TestDelegatedTaskProgress:
+    """Tests for progress snapshots of delegated tasks."""
+
+    @pytest.mark.asyncio
+    async def test_partial_aggregate_progress(self):
+        """A delegated task expects one result from its agent."""
+        coordinator = await coordinator_with_agent()
+        task_id = await coordinator.delegate_task(None, "work", {}, "a")
+        aggregator = coordinator.result_aggregator
+
+        snapshot = await aggregator.get_partial_aggregate(task_id)
+        assert snapshot["expected"] == 1
+        assert snapshot["progress"] == 0.0
+
+        await aggregator.add_result(task_id, "a", {"value": 1})
+        snapshot = await aggregator.get_partial_aggregate(task_id)
+        assert snapshot["progress"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_combined_aggregate_progress(self):
+        """Progress over several delegated tasks counts one result each."""
+        coordinator = await coordinator_with_agent()
+        task_ids = [
+            await coordinator.delegate_task(None, "work", {}, "a") for _ in range(4)
+        ]
+        aggregator = coordinator.result_aggregator
+        for task_id in task_ids[:3]:
+            await aggregator.add_result(task_id, "a", {"value": 1})
+
+        snapshot = await aggregator.get_combined_aggregate(task_ids)
+        assert snapshot["expected"] == 4
+        assert snapshot["progress"] == pytest.approx(0.75)
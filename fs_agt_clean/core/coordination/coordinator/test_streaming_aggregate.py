@@ -0,0 +1,236 @@
+"""
+Tests for streaming_aggregate.py and its use by ResultAggregator
+"""
+
+import random
+import statistics
+
+import pytest
+
+from fs_agt_clean.core.coordination.coordinator.coordinator import CoordinationError
+from fs_agt_clean.core.coordination.coordinator.result_aggregator import (
+    AggregationStrategy,
+    ResultAggregator,
+)
+from fs_agt_clean.core.coordination.coordinator.streaming_aggregate import (
+    QuantileSketch,
+    ResultLog,
+    RunningStats,
+    StreamingAggregate,
+    TopK,
+)
+
+
+def entry(result, agent_id="agent", **metadata):
+    return {
+        "agent_id": agent_id,
+        "result": result,
+        "timestamp": None,
+        "metadata": metadata,
+    }
+
+
+class TestRunningStats:
+    """Tests for RunningStats."""
+
+    def test_merge_matches_single_stream(self):
+        rng = random.Random(0)
+        values = [rng.gauss(10, 3) for _ in range(1000)]
+        left, right = RunningStats(), RunningStats()
+        for i, value in enumerate(values):
+            (left if i % 3 else right).add(value)
+        left.merge(right)
+
+        stats = left.to_dict()
+        assert stats["count"] == 1000
+        assert stats["mean"] == pytest.approx(statistics.fmean(values))
+        assert stats["stddev"] == pytest.approx(statistics.stdev(values))
+        assert stats["min"] == min(values)
+        assert stats["max"] == max(values)
+
+    def test_empty(self):
+        assert RunningStats().to_dict()["mean"] is None
+
+
+class TestTopK:
+    """Tests for TopK."""
+
+    def test_keeps_best_and_earliest_on_ties(self):
+        top = TopK(2)
+        for score, item in [(1, "a"), (3, "b"), (3, "c"), (2, "d")]:
+            top.add(score, item)
+
+        assert top.to_list() == ["b", "c"]
+
+    def test_merge(self):
+        left, right = TopK(2), TopK(2)
+        left.add(1, "a")
+        right.add(5, "b")
+        right.add(4, "c")
+        left.merge(right)
+
+        assert left.to_list() == ["b", "c"]
+
+
+class TestQuantileSketch:
+    """Tests for QuantileSketch."""
+
+    def test_quantiles_within_relative_accuracy_after_merge(self):
+        rng = random.Random(1)
+        values = [rng.lognormvariate(0, 2) * rng.choice([-1, 1]) for _ in range(5000)]
+        left, right = QuantileSketch(), QuantileSketch()
+        for i, value in enumerate(values):
+            (left if i % 2 else right).add(value)
+        left.merge(right)
+
+        ordered = sorted(values)
+        for q in (0.01, 0.25, 0.5, 0.9, 0.99):
+            expected = ordered[int(q * (len(ordered) - 1))]
+            assert left.quantile(q) == pytest.approx(expected, rel=0.02)
+
+    def test_empty_and_mismatched_merge(self):
+        assert QuantileSketch().quantile(0.5) is None
+        with pytest.raises(ValueError):
+            QuantileSketch(0.01).merge(QuantileSketch(0.02))
+
+
+class TestResultLog:
+    """Tests for ResultLog."""
+
+    def test_spills_and_reads_back_in_order(self):
+        log = ResultLog(spill_threshold=3)
+        for i in range(10):
+            log.append(entry(i))
+
+        assert len(log) == 10
+        assert log.spilled == 9
+        assert [e["result"] for e in log] == list(range(10))
+        log.close()
+        assert len(log) == 0
+
+    def test_unpicklable_results_stay_in_memory(self):
+        log = ResultLog(spill_threshold=1)
+        log.append(entry(lambda: None))
+
+        assert log.spilled == 0
+        assert not log.spillable
+        assert len(list(log)) == 1
+
+
+class TestStreamingAggregate:
+    """Tests for StreamingAggregate."""
+
+    def test_majority_tie_goes_to_first_seen(self):
+        aggregate = StreamingAggregate(count_labels=True)
+        for result in ["A", "B", "B", "A"]:
+            aggregate.add(entry(result))
+
+        assert aggregate.leader == "A"
+
+    def test_labels_not_counted_unless_requested(self):
+        aggregate = StreamingAggregate()
+        aggregate.add(entry("A"))
+
+        assert aggregate.label_counts == {}
+        assert aggregate.snapshot()["distinct_results"] is None
+
+    def test_weighted_mean_and_error(self):
+        aggregate = StreamingAggregate()
+        aggregate.add(entry(1.0, weight=1.0))
+        aggregate.add(entry(4.0, weight=2.0))
+        assert aggregate.weighted_mean == pytest.approx(3.0)
+
+        aggregate.add(entry("x"))
+        assert aggregate.weighted_error is not None
+        assert aggregate.weighted_mean is None
+
+
+class TestResultAggregatorStreaming:
+    """Tests for ResultAggregator on top of the streaming aggregates."""
+
+    @pytest.mark.asyncio
+    async def test_strategies_match_full_pass(self):
+        aggregator = ResultAggregator("test", spill_threshold=4)
+        rng = random.Random(2)
+        values = [rng.choice([1, 2, 2.5, 3]) for _ in range(30)]
+        weights = [rng.random() for _ in values]
+        for strategy in AggregationStrategy:
+            custom = (
+                (lambda results: [r["result"] for r in results])
+                if strategy == AggregationStrategy.CUSTOM
+                else None
+            )
+            await aggregator.register_task(strategy.value, strategy, custom)
+            for i, (value, weight) in enumerate(zip(values, weights)):
+                await aggregator.add_result(
+                    strategy.value, f"a{i % 4}", value, {"weight": weight}
+                )
+
+        async def aggregate(strategy):
+            return await aggregator.aggregate_results(strategy.value)
+
+        counts = {}
+        for value in values:
+            counts[str(value)] = counts.get(str(value), 0) + 1
+        assert await aggregate(AggregationStrategy.COLLECT) == {
+            f"a{i % 4}": value for i, value in enumerate(values)
+        }
+        assert await aggregate(AggregationStrategy.MAJORITY) == max(
+            counts.items(), key=lambda item: item[1]
+        )[0]
+        assert await aggregate(AggregationStrategy.WEIGHTED) == sum(
+            v * w for v, w in zip(values, weights)
+        ) / sum(weights)
+        assert await aggregate(AggregationStrategy.FIRST) == values[0]
+        assert await aggregate(AggregationStrategy.LAST) == values[-1]
+        assert await aggregate(AggregationStrategy.CUSTOM) == values
+
+    @pytest.mark.asyncio
+    async def test_majority_tie_regression(self):
+        aggregator = ResultAggregator("test")
+        await aggregator.register_task("t", AggregationStrategy.MAJORITY)
+        for result in ["A", "B", "B", "A"]:
+            await aggregator.add_result("t", "agent", result)
+
+        assert await aggregator.aggregate_results("t") == "A"
+
+    @pytest.mark.asyncio
+    async def test_majority_registered_after_results(self):
+        aggregator = ResultAggregator("test")
+        for result in ["A", "B", "B"]:
+            await aggregator.add_result("t", "agent", result)
+        await aggregator.register_task("t", AggregationStrategy.MAJORITY)
+        await aggregator.add_result("t", "agent", "A")
+
+        assert await aggregator.aggregate_results("t") == "A"
+
+    @pytest.mark.asyncio
+    async def test_weighted_non_numeric_raises(self):
+        aggregator = ResultAggregator("test")
+        await aggregator.register_task("t", AggregationStrategy.WEIGHTED)
+        await aggregator.add_result("t", "agent", "text")
+
+        with pytest.raises(CoordinationError):
+            await aggregator.aggregate_results("t")
+
+    @pytest.mark.asyncio
+    async def test_partial_and_combined_aggregates(self):
+        aggregator = ResultAggregator("test")
+        await aggregator.register_task("a", expected_results=4)
+        await aggregator.register_task("b", expected_results=4)
+        for value in [1, 2]:
+            await aggregator.add_result("a", "x", value)
+        await aggregator.add_result("b", "y", 10)
+
+        partial = await aggregator.get_partial_aggregate("a")
+        assert partial["count"] == 2
+        assert partial["progress"] == 0.5
+        assert partial["numeric"]["max"] == 2.0
+
+        combined = await aggregator.get_combined_aggregate(["a", "b"])
+        assert combined["count"] == 3
+        assert combined["expected"] == 8
+        assert combined["top"][0]["result"] == 10
+
+        await aggregator.clear_results("a")
+        assert await aggregator.get_partial_aggregate("a") is None
@@ -0,0 +1,138 @@
+"""
+Tests for task_router.py
+"""
+
+import pytest
+
+from fs_agt_clean.core.coordination.coordinator.coordinator import (
+    CoordinationError,
+    UnifiedAgentInfo,
+    UnifiedAgentType,
+)
+from fs_agt_clean.core.coordination.coordinator.task_router import (
+    RoutingStrategy,
+    TaskRouter,
+)
+
+
+def agent(agent_id, agent_type=UnifiedAgentType.SPECIALIST):
+    return UnifiedAgentInfo(agent_id=agent_id, agent_type=agent_type, name=agent_id)
+
+
+class TestRouting:
+    """Tests for choosing an agent."""
+
+    def test_least_loaded(self):
+        """Tasks spread over the candidates by load."""
+        router = TaskRouter()
+        candidates = [agent("a"), agent("b")]
+        chosen = [router.route(f"t{i}", candidates) for i in range(4)]
+        assert chosen.count("a") == 2
+        assert chosen.count("b") == 2
+
+    def test_power_of_two(self):
+        """Power-of-two-choices picks a candidate with capacity."""
+        router = TaskRouter(strategy=RoutingStrategy.POWER_OF_TWO, seed=1)
+        candidates = [agent(f"a{i}") for i in range(5)]
+        for i in range(20):
+            assert router.route(f"t{i}", candidates) in router.queues
+        assert max(len(q.queued) for q in router.queues.values()) <= 6
+
+    def test_full_queues_reject(self):
+        """A task is rejected when every candidate queue is full."""
+        router = TaskRouter(max_queue_depth=1)
+        router.route("t1", [agent("a")])
+        with pytest.raises(CoordinationError):
+            router.route("t2", [agent("a")])
+        assert router.get_stats()["rejected"] == 1
+
+
+class TestDispatch:
+    """Tests for dispatching, stealing and completing tasks."""
+
+    def test_priority_order(self):
+        """Higher priority first, FIFO within a priority."""
+        router = TaskRouter(max_in_flight=10)
+        router.enqueue("low", "a", priority=0)
+        router.enqueue("high1", "a", priority=5)
+        router.enqueue("high2", "a", priority=5)
+        order = [router.dispatch("a") for _ in range(3)]
+        assert order == ["high1", "high2", "low"]
+
+    def test_in_flight_limit(self):
+        """An agent runs at most max_in_flight tasks."""
+        router = TaskRouter(max_in_flight=1)
+        router.enqueue("t1", "a")
+        router.enqueue("t2", "a")
+        assert router.dispatch("a") == "t1"
+        assert router.dispatch("a") is None
+        assert router.complete("t1") == "a"
+        assert router.dispatch("a") == "t2"
+
+    def test_steal_from_peer(self):
+        """An idle agent takes eligible work from a busy peer of its type."""
+        router = TaskRouter()
+        specialist = UnifiedAgentType.SPECIALIST
+        router.add_agent("b", specialist)
+        router.enqueue("t1", "a", eligible={"a", "b"}, agent_type=specialist)
+        router.enqueue("t2", "a", agent_type=specialist)
+        assert router.dispatch("b") == "t1"
+        assert router.dispatch("b") is None
+        assert router.agent_of("t1") == "b"
+        assert router.get_stats()["stolen"] == 1
+
+    def test_complete_records_latency(self):
+        """Completing a dispatched task updates counters and latency."""
+        router = TaskRouter()
+        router.enqueue("t1", "a")
+        router.enqueue("t2", "a")
+        router.dispatch("a")
+        router.dispatch("a")
+        router.complete("t1")
+        router.complete("t2", success=False)
+        stats = router.get_stats()["agents"]["a"]
+        assert stats["completed"] == 1
+        assert stats["failed"] == 1
+        assert stats["ewma_latency_seconds"] is not None
+
+    def test_remove_agent_moves_queued_tasks(self):
+        """Queued tasks move to another eligible agent or are orphaned."""
+        router = TaskRouter()
+        router.add_agent("b")
+        router.enqueue("shared", "a", eligible={"a", "b"})
+        router.enqueue("own", "a")
+        moved, orphaned = router.remove_agent("a")
+        assert moved == {"shared": "b"}
+        assert orphaned == ["own"]
+        assert router.dispatch("b") == "shared"
+
+
+class TestEnqueue:
+    """Tests for queueing a task on a given agent."""
+
+    def test_unseen_agent_joins_its_type(self):
+        """Work queued on an agent first seen here can be stolen by its peers."""
+        router = TaskRouter()
+        router.add_agent("a", UnifiedAgentType.SPECIALIST)
+        router.enqueue(
+            "t1", "b", eligible={"a", "b"}, agent_type=UnifiedAgentType.SPECIALIST
+        )
+        assert router.dispatch("a") == "t1"
+
+    def test_type_set_later(self):
+        """An untyped queue joins its peer group once the type is known."""
+        router = TaskRouter()
+        router.enqueue("t1", "b")
+        router.enqueue("t2", "b", agent_type=UnifiedAgentType.UTILITY)
+        assert router.queues["b"].agent_type == UnifiedAgentType.UTILITY
+        assert router.peers == {UnifiedAgentType.UTILITY: {"b"}}
+
+    def test_depth_limit(self):
+        """Enqueueing onto a full queue raises."""
+        router = TaskRouter(max_queue_depth=2)
+        router.enqueue("t1", "a")
+        router.enqueue("t2", "a")
+        with pytest.raises(CoordinationError):
+            router.enqueue("t3", "a")
+        assert "t3" not in router.tasks
+        assert router.get_stats()["queued"] == 2
@@ -25,6 +25,10 @@ from fs_agt_clean.core.coordination.decision.decision_maker import (
     BaseDecisionMaker,
     InMemoryDecisionMaker,
 )
+from fs_agt_clean.core.coordination.decision.decision_store import (
+    DecisionArchive,
+    DecisionStore,
+)
 from fs_agt_clean.core.coordination.decision.decision_tracker import (
     BaseDecisionTracker,
     InMemoryDecisionTracker,
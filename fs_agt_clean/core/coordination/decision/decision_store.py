@@ -0,0 +1,450 @@
+"""
+Indexed decision store for the Decision Pipeline.
+
+Decisions are kept in tracking order with secondary indexes by decision
+type, status, source agent and creation time, so filtered history queries
+start from the most selective index instead of scanning every decision.
+In-memory retention is bounded: the oldest decisions are evicted and can be
+archived to daily JSON Lines files by ``DecisionArchive``.
+
+Metrics are served from running aggregates (count and confidence sum) per
+(decision type, status, source) cell. The aggregates also cover evicted
+decisions, so metrics filtered only by type, status or source stay exact
+after eviction without rescanning.
+"""
+
+import asyncio
+import bisect
+import itertools
+import json
+import logging
+from collections import OrderedDict
+from datetime import date, datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from fs_agt_clean.core.coordination.decision.models import (
+    Decision,
+    DecisionStatus,
+    DecisionType,
+)
+
+logger = logging.getLogger(__name__)
+
+# Filters answered by the secondary indexes and aggregate cells
+INDEXED_FILTERS = ("decision_type", "status", "source")
+TIME_FILTERS = ("created_after", "created_before")
+
+# Aggregate cell key: (decision type, status, source)
+_Cell = Tuple[DecisionType, DecisionStatus, Optional[str]]
+
+
+def matches_filters(decision: Decision, filters: Dict[str, Any]) -> bool:
+    """Check if a decision matches history/metrics filters.
+
+    Args:
+        decision: Decision to check
+        filters: Filters to apply
+
+    Returns:
+        True if the decision matches the filters, False otherwise
+    """
+    for key, value in filters.items():
+        if key == "decision_type" and decision.decision_type != value:
+            return False
+        elif key == "action" and decision.action != value:
+            return False
+        elif key == "min_confidence" and decision.confidence < value:
+            return False
+        elif key == "max_confidence" and decision.confidence > value:
+            return False
+        elif key == "status" and decision.metadata.status != value:
+            return False
+        elif key == "source" and decision.metadata.source != value:
+            return False
+        elif key == "target" and decision.metadata.target != value:
+            return False
+        elif key == "created_after" and decision.metadata.created_at < value:
+            return False
+        elif key == "created_before" and decision.metadata.created_at > value:
+            return False
+        elif key == "battery_efficient" and decision.battery_efficient != value:
+            return False
+        elif key == "network_efficient" and decision.network_efficient != value:
+            return False
+
+    return True
+
+
+def _coerce(enum_cls, value: Any) -> Any:
+    """Enum member for a filter value given as its string value."""
+    try:
+        return enum_cls(value)
+    except ValueError:
+        return value
+
+
+class DecisionStore:
+    """Bounded, indexed in-memory decision store with running aggregates."""
+
+    def __init__(self, max_decisions: int = 10000):
+        """Initialize the store.
+
+        Args:
+            max_decisions: Maximum decisions kept in memory; older ones are
+                evicted in tracking order
+        """
+        self.max_decisions = max_decisions
+        self._decisions: "OrderedDict[str, Decision]" = OrderedDict()
+        self._seq: Dict[str, int] = {}
+        self._counter = itertools.count()
+
+        # Secondary indexes; dicts keep the IDs in tracking order
+        self._by_type: Dict[DecisionType, Dict[str, None]] = {}
+        self._by_status: Dict[DecisionStatus, Dict[str, None]] = {}
+        self._by_source: Dict[Optional[str], Dict[str, None]] = {}
+        # Creation times (sorted) and the matching IDs
+        self._times: List[datetime] = []
+        self._time_ids: List[str] = []
+
+        # Running [count, confidence sum] per cell, including evicted decisions
+        self._cells: Dict[_Cell, List[float]] = {}
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._decisions)
+
+    def __contains__(self, decision_id: str) -> bool:
+        return decision_id in self._decisions
+
+    @property
+    def decisions(self) -> Mapping[str, Decision]:
+        """Read-only view of the retained decisions by ID."""
+        return MappingProxyType(self._decisions)
+
+    def get(self, decision_id: str) -> Optional[Decision]:
+        """Get a retained decision by ID."""
+        return self._decisions.get(decision_id)
+
+    def values(self) -> List[Decision]:
+        """Retained decisions in tracking order."""
+        return list(self._decisions.values())
+
+    def add(self, decision: Decision) -> List[Decision]:
+        """Add a decision, replacing an earlier one with the same ID.
+
+        Args:
+            decision: Decision to add
+
+        Returns:
+            Decisions evicted to respect the retention bound, oldest first
+        """
+        decision_id = decision.metadata.decision_id
+        previous = self._decisions.get(decision_id)
+        if previous is not None:
+            self._remove(previous)
+            self._aggregate(previous, -1)
+
+        self._decisions[decision_id] = decision
+        self._seq[decision_id] = next(self._counter)
+        self._index(decision)
+        self._aggregate(decision, 1)
+
+        evicted = []
+        while len(self._decisions) > self.max_decisions:
+            _, oldest = self._decisions.popitem(last=False)
+            self._remove(oldest, stored=False)
+            evicted.append(oldest)
+        self.evicted += len(evicted)
+        return evicted
+
+    def update_status(
+        self, decision_id: str, status: DecisionStatus
+    ) -> Optional[DecisionStatus]:
+        """Update the status of a retained decision.
+
+        Args:
+            decision_id: ID of the decision
+            status: New status
+
+        Returns:
+            The previous status, or None if the decision is not retained
+        """
+        decision = self._decisions.get(decision_id)
+        if decision is None:
+            return None
+
+        old_status = decision.metadata.status
+        self._aggregate(decision, -1)
+        self._discard(self._by_status, old_status, decision_id)
+        decision.update_status(status)
+        self._by_status.setdefault(status, {})[decision_id] = None
+        self._aggregate(decision, 1)
+        return old_status
+
+    def query(
+        self, filters: Dict[str, Any], limit: Optional[int] = None
+    ) -> List[Decision]:
+        """Retained decisions matching filters, in tracking order.
+
+        Args:
+            filters: History filters (see ``matches_filters``)
+            limit: Maximum number of decisions
+
+        Returns:
+            Matching decisions
+        """
+        candidates = self._candidates(filters)
+        matches = (
+            decision
+            for decision in (self._decisions[i] for i in candidates)
+            if matches_filters(decision, filters)
+        )
+        return list(itertools.islice(matches, limit))
+
+    def metrics(self, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Decision metrics, optionally filtered.
+
+        Without filters, or with filters only on decision type, status and
+        source, metrics come from the running aggregates and include evicted
+        decisions. Other filters are evaluated on the retained decisions.
+
+        Args:
+            filters: Optional filters to apply
+
+        Returns:
+            Dictionary with total_decisions, decisions_by_status,
+            decisions_by_type and average_confidence
+        """
+        metrics: Dict[str, Any] = {
+            "total_decisions": 0,
+            "decisions_by_status": {},
+            "decisions_by_type": {},
+            "average_confidence": 0.0,
+        }
+        total_confidence = 0.0
+
+        if not filters or all(key in INDEXED_FILTERS for key in filters):
+            wanted = self._indexed_values(filters or {})
+            for cell, (count, confidence) in self._cells.items():
+                decision_type, status, source = cell
+                if (
+                    wanted.get("decision_type", decision_type) != decision_type
+                    or wanted.get("status", status) != status
+                    or wanted.get("source", source) != source
+                ):
+                    continue
+                # Unfiltered metrics keep statuses that dropped to zero
+                if not count and filters:
+                    continue
+                count = int(count)
+                metrics["total_decisions"] += count
+                by_status = metrics["decisions_by_status"]
+                by_status[status.value] = by_status.get(status.value, 0) + count
+                if count:
+                    by_type = metrics["decisions_by_type"]
+                    by_type[decision_type.value] = (
+                        by_type.get(decision_type.value, 0) + count
+                    )
+                total_confidence += confidence
+        else:
+            for decision in self.query(filters):
+                metrics["total_decisions"] += 1
+                status = decision.metadata.status.value
+                by_status = metrics["decisions_by_status"]
+                by_status[status] = by_status.get(status, 0) + 1
+                decision_type = decision.decision_type.value
+                by_type = metrics["decisions_by_type"]
+                by_type[decision_type] = by_type.get(decision_type, 0) + 1
+                total_confidence += decision.confidence
+
+        if metrics["total_decisions"]:
+            metrics["average_confidence"] = (
+                total_confidence / metrics["total_decisions"]
+            )
+        return metrics
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store size statistics."""
+        return {
+            "retained_decisions": len(self._decisions),
+            "max_decisions": self.max_decisions,
+            "evicted_decisions": self.evicted,
+            "decision_types": len(self._by_type),
+            "sources": len(self._by_source),
+        }
+
+    # Index maintenance
+
+    def _index(self, decision: Decision) -> None:
+        decision_id = decision.metadata.decision_id
+        self._by_type.setdefault(decision.decision_type, {})[decision_id] = None
+        self._by_status.setdefault(decision.metadata.status, {})[decision_id] = None
+        self._by_source.setdefault(decision.metadata.source, {})[decision_id] = None
+
+        created_at = decision.metadata.created_at
+        position = bisect.bisect_right(self._times, created_at)
+        self._times.insert(position, created_at)
+        self._time_ids.insert(position, decision_id)
+
+    def _remove(self, decision: Decision, stored: bool = True) -> None:
+        decision_id = decision.metadata.decision_id
+        if stored:
+            del self._decisions[decision_id]
+        del self._seq[decision_id]
+        self._discard(self._by_type, decision.decision_type, decision_id)
+        self._discard(self._by_status, decision.metadata.status, decision_id)
+        self._discard(self._by_source, decision.metadata.source, decision_id)
+
+        created_at = decision.metadata.created_at
+        position = bisect.bisect_left(self._times, created_at)
+        while self._time_ids[position] != decision_id:
+            position += 1
+        del self._times[position]
+        del self._time_ids[position]
+
+    @staticmethod
+    def _discard(
+        index: Dict[Any, Dict[str, None]], key: Any, decision_id: str
+    ) -> None:
+        ids = index.get(key)
+        if ids is not None:
+            ids.pop(decision_id, None)
+            if not ids:
+                del index[key]
+
+    def _aggregate(self, decision: Decision, sign: int) -> None:
+        cell = (
+            decision.decision_type,
+            decision.metadata.status,
+            decision.metadata.source,
+        )
+        totals = self._cells.setdefault(cell, [0, 0.0])
+        totals[0] += sign
+        totals[1] += sign * decision.confidence
+
+    # Query planning
+
+    def _indexed_values(self, filters: Dict[str, Any]) -> Dict[str, Any]:
+        wanted = {}
+        if "decision_type" in filters:
+            wanted["decision_type"] = _coerce(DecisionType, filters["decision_type"])
+        if "status" in filters:
+            wanted["status"] = _coerce(DecisionStatus, filters["status"])
+        if "source" in filters:
+            wanted["source"] = filters["source"]
+        return wanted
+
+    def _candidates(self, filters: Dict[str, Any]) -> Iterable[str]:
+        """IDs to check against the filters, from the most selective index."""
+        best: Optional[Iterable[str]] = None
+        best_size = len(self._decisions)
+        best_ordered = True
+
+        wanted = self._indexed_values(filters)
+        for key, index in (
+            ("decision_type", self._by_type),
+            ("status", self._by_status),
+            ("source", self._by_source),
+        ):
+            if key in wanted:
+                ids = index.get(wanted[key], {})
+                if len(ids) <= best_size:
+                    best, best_size = ids, len(ids)
+                    # Status changes re-append IDs, so that index is not
+                    # in tracking order
+                    best_ordered = key != "status"
+
+        if any(key in filters for key in TIME_FILTERS):
+            lo, hi = 0, len(self._times)
+            if "created_after" in filters:
+                lo = bisect.bisect_left(self._times, filters["created_after"])
+            if "created_before" in filters:
+                hi = bisect.bisect_right(self._times, filters["created_before"])
+            if hi - lo < best_size:
+                # Time order is not tracking order
+                return sorted(self._time_ids[lo:hi], key=self._seq.__getitem__)
+
+        if best is None:
+            return list(self._decisions)
+        if not best_ordered:
+            return sorted(best, key=self._seq.__getitem__)
+        return list(best)
+
+
+class DecisionArchive:
+    """Daily JSON Lines files of decisions evicted from memory."""
+
+    def __init__(self, directory: str):
+        """Initialize the archive.
+
+        Args:
+            directory: Directory of the archive files
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.archived = 0
+
+    def _path(self, day: date) -> Path:
+        return self.directory / f"decisions-{day:%Y%m%d}.jsonl"
+
+    async def append(self, decisions: List[Decision]) -> None:
+        """Append decisions to the files of their creation day.
+
+        Args:
+            decisions: Decisions to archive
+        """
+        lines: Dict[Path, List[str]] = {}
+        for decision in decisions:
+            path = self._path(decision.metadata.created_at.date())
+            lines.setdefault(path, []).append(
+                json.dumps(decision.to_dict(), default=str)
+            )
+        await asyncio.to_thread(self._write, lines)
+        self.archived += len(decisions)
+
+    @staticmethod
+    def _write(lines: Dict[Path, List[str]]) -> None:
+        for path, records in lines.items():
+            with open(path, "a", encoding="utf-8") as f:
+                f.write("\n".join(records) + "\n")
+
+    async def load(self, filters: Optional[Dict[str, Any]] = None) -> List[Decision]:
+        """Archived decisions matching filters, oldest file first.
+
+        Files outside a ``created_after``/``created_before`` range are
+        skipped without being read.
+
+        Args:
+            filters: Optional history filters
+
+        Returns:
+            Matching archived decisions
+        """
+        filters = filters or {}
+        return await asyncio.to_thread(self._load, filters)
+
+    def _load(self, filters: Dict[str, Any]) -> List[Decision]:
+        after = filters.get("created_after")
+        before = filters.get("created_before")
+        decisions = []
+        for path in sorted(self.directory.glob("decisions-*.jsonl")):
+            try:
+                day = datetime.strptime(path.stem, "decisions-%Y%m%d").date()
+            except ValueError:
+                continue
+            if (after and day < after.date()) or (before and day > before.date()):
+                continue
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        decision = Decision.from_json(line)
+                    except (ValueError, KeyError) as e:
+                        logger.warning(f"Skipping unreadable archived decision: {e}")
+                        continue
+                    if matches_filters(decision, filters):
+                        decisions.append(decision)
+        return decisions
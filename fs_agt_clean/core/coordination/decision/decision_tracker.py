@@ -14,11 +14,15 @@ The decision tracker is designed to be:
 
 import abc
 import asyncio
-import copy
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple, Union
 
+from fs_agt_clean.core.coordination.decision.decision_store import (
+    DecisionArchive,
+    DecisionStore,
+    matches_filters,
+)
 from fs_agt_clean.core.coordination.decision.interfaces import DecisionTracker
 from fs_agt_clean.core.coordination.decision.models import (
     Decision,
@@ -53,28 +57,40 @@ class BaseDecisionTracker(DecisionTracker):
 class InMemoryDecisionTracker(BaseDecisionTracker):
     """In-memory implementation of a decision tracker.
 
-    This implementation stores decisions in memory and provides basic
-    tracking capabilities. It is suitable for testing and development,
-    but not for production use with large numbers of decisions.
+    Decisions are kept in an indexed ``DecisionStore`` bounded to
+    ``max_decisions``; older decisions are evicted and, if an archive
+    directory is configured, appended to daily JSON Lines files.
     """
 
-    def __init__(self, tracker_id: str, publisher: EventPublisher):
+    def __init__(
+        self,
+        tracker_id: str,
+        publisher: EventPublisher,
+        max_decisions: int = 10000,
+        archive_dir: Optional[str] = None,
+    ):
         """Initialize the in-memory decision tracker.
 
         Args:
             tracker_id: Unique identifier for this tracker
             publisher: Event publisher for publishing decision events
+            max_decisions: Maximum decisions kept in memory
+            archive_dir: Optional directory for archiving evicted decisions
         """
         super().__init__(tracker_id, publisher)
-        self.decisions: Dict[str, Decision] = {}
-        self.decision_history: List[Decision] = []
+        self.store = DecisionStore(max_decisions)
+        self.archive = DecisionArchive(archive_dir) if archive_dir else None
         self.offline_decisions: List[Decision] = []
-        self.metrics: Dict[str, Any] = {
-            "total_decisions": 0,
-            "decisions_by_status": {},
-            "decisions_by_type": {},
-            "average_confidence": 0.0,
-        }
+
+    @property
+    def decisions(self) -> Mapping[str, Decision]:
+        """Read-only view of the retained decisions by ID."""
+        return self.store.decisions
+
+    @property
+    def decision_history(self) -> List[Decision]:
+        """Retained decisions in tracking order."""
+        return self.store.values()
 
     async def track_decision(
         self, decision: Decision, publish_event: bool = False, offline: bool = False
@@ -91,12 +107,13 @@ class InMemoryDecisionTracker(BaseDecisionTracker):
         """
         logger.debug(f"Tracking decision {decision.metadata.decision_id}")
 
-        # Store the decision
-        self.decisions[decision.metadata.decision_id] = decision
-        self.decision_history.append(decision)
-
-        # Update metrics
-        self._update_metrics_for_decision(decision)
+        # Store the decision; the store updates indexes and metrics
+        evicted = self.store.add(decision)
+        if evicted and self.archive:
+            try:
+                await self.archive.append(evicted)
+            except Exception as e:
+                logger.error(f"Error archiving {len(evicted)} decisions: {e}")
 
         # If offline, add to offline decisions
         if offline:
@@ -146,27 +163,12 @@ class InMemoryDecisionTracker(BaseDecisionTracker):
         """
         logger.debug(f"Updating decision {decision_id} status to {status}")
 
-        # Check if the decision exists
-        if decision_id not in self.decisions:
+        # Update the status, its index entry and metrics
+        old_status = self.store.update_status(decision_id, status)
+        if old_status is None:
             logger.warning(f"Decision {decision_id} not found")
             return False
 
-        # Get the decision
-        decision = self.decisions[decision_id]
-
-        # Update metrics for old status
-        old_status = decision.metadata.status
-        if old_status.value in self.metrics["decisions_by_status"]:
-            self.metrics["decisions_by_status"][old_status.value] -= 1
-
-        # Update the status
-        decision.update_status(status)
-
-        # Update metrics for new status
-        if status.value not in self.metrics["decisions_by_status"]:
-            self.metrics["decisions_by_status"][status.value] = 0
-        self.metrics["decisions_by_status"][status.value] += 1
-
         # Publish event if requested
         if publish_event:
             try:
@@ -198,18 +200,23 @@ class InMemoryDecisionTracker(BaseDecisionTracker):
         """
         logger.debug(f"Getting decision {decision_id}")
 
-        return self.decisions.get(decision_id)
+        return self.store.get(decision_id)
 
     async def get_decision_history(
         self,
         decision_id: Optional[str] = None,
         filters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        include_archived: bool = False,
     ) -> List[Decision]:
         """Get the history of decisions.
 
         Args:
             decision_id: Optional ID of a specific decision
             filters: Optional filters to apply
+            limit: Maximum number of decisions
+            include_archived: Whether to also read archived decisions, which
+                are returned before the retained ones
 
         Returns:
             List of decisions
@@ -218,20 +225,17 @@ class InMemoryDecisionTracker(BaseDecisionTracker):
 
         # If decision_id is provided, return only that decision
         if decision_id:
-            if decision_id in self.decisions:
-                return [self.decisions[decision_id]]
-            return []
+            decision = self.store.get(decision_id)
+            return [decision] if decision else []
 
-        # If filters are provided, apply them
-        if filters:
-            return [
-                decision
-                for decision in self.decision_history
-                if self._matches_filters(decision, filters)
-            ]
+        decisions = []
+        if include_archived and self.archive:
+            decisions = await self.archive.load(filters)
 
-        # Otherwise, return all decisions
-        return self.decision_history
+        decisions.extend(self.store.query(filters or {}))
+        if limit is not None:
+            decisions = decisions[:limit]
+        return decisions
 
     async def get_decision_metrics(
         self, filters: Optional[Dict[str, Any]] = None
@@ -246,45 +250,7 @@ class InMemoryDecisionTracker(BaseDecisionTracker):
         """
         logger.debug("Getting decision metrics")
 
-        # If no filters, return the global metrics
-        if not filters:
-            return copy.deepcopy(self.metrics)
-
-        # Otherwise, calculate metrics for filtered decisions
-        filtered_decisions = [
-            decision
-            for decision in self.decision_history
-            if self._matches_filters(decision, filters)
-        ]
-
-        # Calculate metrics
-        metrics = {
-            "total_decisions": len(filtered_decisions),
-            "decisions_by_status": {},
-            "decisions_by_type": {},
-            "average_confidence": 0.0,
-        }
-
-        # Calculate status and type counts
-        for decision in filtered_decisions:
-            status = decision.metadata.status.value
-            if status not in metrics["decisions_by_status"]:
-                metrics["decisions_by_status"][status] = 0
-            metrics["decisions_by_status"][status] += 1
-
-            decision_type = decision.decision_type.value
-            if decision_type not in metrics["decisions_by_type"]:
-                metrics["decisions_by_type"][decision_type] = 0
-            metrics["decisions_by_type"][decision_type] += 1
-
-        # Calculate average confidence
-        if filtered_decisions:
-            total_confidence = sum(
-                decision.confidence for decision in filtered_decisions
-            )
-            metrics["average_confidence"] = total_confidence / len(filtered_decisions)
-
-        return metrics
+        return self.store.metrics(filters)
 
     async def sync_offline_decisions(self) -> int:
         """Synchronize offline decisions.
@@ -321,36 +287,6 @@ class InMemoryDecisionTracker(BaseDecisionTracker):
 
         return count
 
-    def _update_metrics_for_decision(self, decision: Decision) -> None:
-        """Update metrics for a new decision.
-
-        Args:
-            decision: The decision to update metrics for
-        """
-        # Update total count
-        self.metrics["total_decisions"] += 1
-
-        # Update status count
-        status = decision.metadata.status.value
-        if status not in self.metrics["decisions_by_status"]:
-            self.metrics["decisions_by_status"][status] = 0
-        self.metrics["decisions_by_status"][status] += 1
-
-        # Update type count
-        decision_type = decision.decision_type.value
-        if decision_type not in self.metrics["decisions_by_type"]:
-            self.metrics["decisions_by_type"][decision_type] = 0
-        self.metrics["decisions_by_type"][decision_type] += 1
-
-        # Update average confidence
-        total_confidence = self.metrics["average_confidence"] * (
-            self.metrics["total_decisions"] - 1
-        )
-        total_confidence += decision.confidence
-        self.metrics["average_confidence"] = (
-            total_confidence / self.metrics["total_decisions"]
-        )
-
     def _matches_filters(self, decision: Decision, filters: Dict[str, Any]) -> bool:
         """Check if a decision matches the given filters.
 
@@ -361,28 +297,4 @@ class InMemoryDecisionTracker(BaseDecisionTracker):
         Returns:
             True if the decision matches the filters, False otherwise
         """
-        for key, value in filters.items():
-            if key == "decision_type" and decision.decision_type != value:
-                return False
-            elif key == "action" and decision.action != value:
-                return False
-            elif key == "min_confidence" and decision.confidence < value:
-                return False
-            elif key == "max_confidence" and decision.confidence > value:
-                return False
-            elif key == "status" and decision.metadata.status != value:
-                return False
-            elif key == "source" and decision.metadata.source != value:
-                return False
-            elif key == "target" and decision.metadata.target != value:
-                return False
-            elif key == "created_after" and decision.metadata.created_at < value:
-                return False
-            elif key == "created_before" and decision.metadata.created_at > value:
-                return False
-            elif key == "battery_efficient" and decision.battery_efficient != value:
-                return False
-            elif key == "network_efficient" and decision.network_efficient != value:
-                return False
-
-        return True
+        return matches_filters(decision, filters)
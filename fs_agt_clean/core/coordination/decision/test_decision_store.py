@@ -0,0 +1,193 @@
+"""
+Tests for decision_store.py
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from fs_agt_clean.core.coordination.decision.decision_store import (
+    DecisionArchive,
+    DecisionStore,
+    matches_filters,
+)
+from fs_agt_clean.core.coordination.decision.models import (
+    Decision,
+    DecisionMetadata,
+    DecisionStatus,
+    DecisionType,
+)
+
+START = datetime(2026, 1, 1)
+TYPES = [DecisionType.ACTION, DecisionType.RECOMMENDATION, DecisionType.PREDICTION]
+STATUSES = [DecisionStatus.PENDING, DecisionStatus.APPROVED, DecisionStatus.FAILED]
+SOURCES = ["agent_a", "agent_b", None]
+
+
+def make_decision(index, rng, decision_id=None):
+    return Decision(
+        decision_type=rng.choice(TYPES),
+        action=rng.choice(["list", "reprice"]),
+        confidence=round(rng.random(), 3),
+        reasoning="test",
+        metadata=DecisionMetadata(
+            decision_id=decision_id or f"d{index}",
+            source=rng.choice(SOURCES),
+            created_at=START + timedelta(hours=rng.randrange(96)),
+            status=rng.choice(STATUSES),
+        ),
+        battery_efficient=rng.random() < 0.5,
+    )
+
+
+def random_filters(rng):
+    filters = {}
+    if rng.random() < 0.5:
+        filters["decision_type"] = rng.choice(TYPES)
+    if rng.random() < 0.4:
+        filters["status"] = rng.choice(STATUSES)
+    if rng.random() < 0.4:
+        filters["source"] = rng.choice(SOURCES)
+    if rng.random() < 0.3:
+        filters["created_after"] = START + timedelta(hours=rng.randrange(96))
+    if rng.random() < 0.3:
+        filters["created_before"] = START + timedelta(hours=rng.randrange(96))
+    if rng.random() < 0.2:
+        filters["min_confidence"] = 0.5
+    if rng.random() < 0.2:
+        filters["battery_efficient"] = True
+    return filters
+
+
+def brute_force_metrics(decisions):
+    metrics = {
+        "total_decisions": len(decisions),
+        "decisions_by_status": {},
+        "decisions_by_type": {},
+        "average_confidence": 0.0,
+    }
+    for decision in decisions:
+        status = decision.metadata.status.value
+        by_status = metrics["decisions_by_status"]
+        by_status[status] = by_status.get(status, 0) + 1
+        by_type = metrics["decisions_by_type"]
+        decision_type = decision.decision_type.value
+        by_type[decision_type] = by_type.get(decision_type, 0) + 1
+    if decisions:
+        metrics["average_confidence"] = sum(d.confidence for d in decisions) / len(
+            decisions
+        )
+    return metrics
+
+
+def assert_same_metrics(actual, expected):
+    assert actual["total_decisions"] == expected["total_decisions"]
+    assert actual["decisions_by_type"] == expected["decisions_by_type"]
+    assert {k: v for k, v in actual["decisions_by_status"].items() if v} == (
+        expected["decisions_by_status"]
+    )
+    assert actual["average_confidence"] == pytest.approx(
+        expected["average_confidence"]
+    )
+
+
+class TestDecisionStore:
+    """Tests for DecisionStore."""
+
+    def test_query_matches_scan(self):
+        """Indexed queries equal scanning every decision, in tracking order."""
+        rng = random.Random(3)
+        store = DecisionStore()
+        decisions = [make_decision(i, rng) for i in range(200)]
+        for decision in decisions:
+            store.add(decision)
+        for decision in rng.sample(decisions, 50):
+            store.update_status(decision.metadata.decision_id, rng.choice(STATUSES))
+
+        for _ in range(300):
+            filters = random_filters(rng)
+            expected = [d for d in decisions if matches_filters(d, filters)]
+            assert store.query(filters) == expected
+            assert store.query(filters, limit=3) == expected[:3]
+            assert_same_metrics(store.metrics(filters), brute_force_metrics(expected))
+
+    def test_string_filter_values(self):
+        """Type and status filters may be given as their string values."""
+        rng = random.Random(5)
+        store = DecisionStore()
+        for i in range(30):
+            store.add(make_decision(i, rng))
+        filters = {"decision_type": "action", "status": "approved"}
+        expected = store.query(
+            {
+                "decision_type": DecisionType.ACTION,
+                "status": DecisionStatus.APPROVED,
+            }
+        )
+        assert store.metrics(filters)["total_decisions"] == len(expected)
+
+    def test_replace_same_id(self):
+        """Adding a decision again replaces it in indexes and aggregates."""
+        rng = random.Random(1)
+        store = DecisionStore()
+        store.add(make_decision(0, rng, decision_id="same"))
+        replacement = make_decision(1, rng, decision_id="same")
+        store.add(replacement)
+        assert len(store) == 1
+        assert store.get("same") is replacement
+        assert store.metrics()["total_decisions"] == 1
+        assert store.query({"decision_type": replacement.decision_type}) == [
+            replacement
+        ]
+
+    def test_eviction_keeps_aggregates(self):
+        """Evicted decisions leave memory but still count in indexed metrics."""
+        rng = random.Random(9)
+        store = DecisionStore(max_decisions=10)
+        decisions = [make_decision(i, rng) for i in range(25)]
+        evicted = []
+        for decision in decisions:
+            evicted.extend(store.add(decision))
+
+        assert len(store) == 10
+        assert evicted == decisions[:15]
+        assert store.values() == decisions[15:]
+        assert store.get_stats()["evicted_decisions"] == 15
+        assert_same_metrics(store.metrics(), brute_force_metrics(decisions))
+        source = {"source": "agent_a"}
+        assert_same_metrics(
+            store.metrics(source),
+            brute_force_metrics([d for d in decisions if matches_filters(d, source)]),
+        )
+        assert store.query({"created_after": START}) == decisions[15:]
+
+    def test_update_status_unknown(self):
+        """Updating a decision that is not retained returns None."""
+        assert DecisionStore().update_status("missing", DecisionStatus.FAILED) is None
+
+
+class TestDecisionArchive:
+    """Tests for DecisionArchive."""
+
+    @pytest.mark.asyncio
+    async def test_append_and_load(self, tmp_path):
+        """Archived decisions are read back by filter from their day files."""
+        rng = random.Random(4)
+        archive = DecisionArchive(str(tmp_path))
+        decisions = [make_decision(i, rng) for i in range(20)]
+        await archive.append(decisions)
+        assert archive.archived == 20
+        assert len(list(tmp_path.glob("decisions-*.jsonl"))) > 1
+
+        loaded = await archive.load()
+        assert sorted(d.metadata.decision_id for d in loaded) == sorted(
+            d.metadata.decision_id for d in decisions
+        )
+
+        after = START + timedelta(days=2)
+        loaded = await archive.load({"created_after": after})
+        expected = {
+            d.metadata.decision_id for d in decisions if d.metadata.created_at >= after
+        }
+        assert {d.metadata.decision_id for d in loaded} == expected
@@ -67,6 +67,10 @@ from fs_agt_clean.core.coordination.knowledge_repository.knowledge_validator imp
     SchemaValidator,
     ValidationError,
 )
+from fs_agt_clean.core.coordination.knowledge_repository.query_planner import (
+    QueryPlan,
+    QueryPlanner,
+)
 from fs_agt_clean.core.coordination.knowledge_repository.vector_storage import (
     InMemoryVectorStorage,
     VectorStorage,
@@ -6,8 +6,21 @@ interface, suitable for testing and small-scale deployments.
 """
 
 import asyncio
+import heapq
+import itertools
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import numpy as np
 
@@ -56,6 +69,10 @@ from fs_agt_clean.core.coordination.knowledge_repository.knowledge_validator imp
     SchemaValidator,
     ValidationError,
 )
+from fs_agt_clean.core.coordination.knowledge_repository.query_planner import (
+    QueryPlan,
+    QueryPlanner,
+)
 from fs_agt_clean.core.coordination.knowledge_repository.vector_storage import (
     InMemoryVectorStorage,
     VectorStorage,
@@ -126,6 +143,20 @@ class InMemoryKnowledgeRepository(
         self.tag_index: Dict[str, Set[str]] = {}
         self.status_index: Dict[KnowledgeStatus, Set[str]] = {}
 
+        # Insertion rank of each item, so indexed results keep storage order
+        self._item_rank: Dict[str, int] = {}
+        self._rank_counter = itertools.count()
+
+        # Compiles metadata filters into set operations over the indexes
+        self.query_planner = QueryPlanner(
+            self.knowledge_items,
+            self.topic_index,
+            self.type_index,
+            self.source_index,
+            self.tag_index,
+            self.status_index,
+        )
+
         # Initialize subscriptions
         self.subscriptions: Dict[str, Tuple[SubscriptionFilter, KnowledgeHandler]] = {}
         self.subscription_counter = 0
@@ -454,16 +485,11 @@ class InMemoryKnowledgeRepository(
                 return cached_items
 
             # Get from index
-            knowledge_ids = self.topic_index.get(topic, set())
+            items = self._ordered_items(self.topic_index.get(topic, set()))
 
-            # Get knowledge items
-            items = []
-            for knowledge_id in knowledge_ids:
-                knowledge = self.knowledge_items.get(knowledge_id)
-                if knowledge:
-                    items.append(knowledge)
-                    # Add to cache
-                    await self.cache.add(knowledge)
+            # Add to cache
+            for knowledge in items:
+                await self.cache.add(knowledge)
 
             return items
         except Exception as e:
@@ -493,16 +519,11 @@ class InMemoryKnowledgeRepository(
                 return cached_items
 
             # Get from index
-            knowledge_ids = self.type_index.get(knowledge_type, set())
+            items = self._ordered_items(self.type_index.get(knowledge_type, set()))
 
-            # Get knowledge items
-            items = []
-            for knowledge_id in knowledge_ids:
-                knowledge = self.knowledge_items.get(knowledge_id)
-                if knowledge:
-                    items.append(knowledge)
-                    # Add to cache
-                    await self.cache.add(knowledge)
+            # Add to cache
+            for knowledge in items:
+                await self.cache.add(knowledge)
 
             return items
         except Exception as e:
@@ -527,16 +548,11 @@ class InMemoryKnowledgeRepository(
         """
         try:
             # Get from index
-            knowledge_ids = self.source_index.get(source_id, set())
+            items = self._ordered_items(self.source_index.get(source_id, set()))
 
-            # Get knowledge items
-            items = []
-            for knowledge_id in knowledge_ids:
-                knowledge = self.knowledge_items.get(knowledge_id)
-                if knowledge:
-                    items.append(knowledge)
-                    # Add to cache
-                    await self.cache.add(knowledge)
+            # Add to cache
+            for knowledge in items:
+                await self.cache.add(knowledge)
 
             return items
         except Exception as e:
@@ -564,16 +580,11 @@ class InMemoryKnowledgeRepository(
                 return cached_items
 
             # Get from index
-            knowledge_ids = self.tag_index.get(tag, set())
+            items = self._ordered_items(self.tag_index.get(tag, set()))
 
-            # Get knowledge items
-            items = []
-            for knowledge_id in knowledge_ids:
-                knowledge = self.knowledge_items.get(knowledge_id)
-                if knowledge:
-                    items.append(knowledge)
-                    # Add to cache
-                    await self.cache.add(knowledge)
+            # Add to cache
+            for knowledge in items:
+                await self.cache.add(knowledge)
 
             return items
         except Exception as e:
@@ -603,16 +614,11 @@ class InMemoryKnowledgeRepository(
                 return cached_items
 
             # Get from index
-            knowledge_ids = self.status_index.get(status, set())
+            items = self._ordered_items(self.status_index.get(status, set()))
 
-            # Get knowledge items
-            items = []
-            for knowledge_id in knowledge_ids:
-                knowledge = self.knowledge_items.get(knowledge_id)
-                if knowledge:
-                    items.append(knowledge)
-                    # Add to cache
-                    await self.cache.add(knowledge)
+            # Add to cache
+            for knowledge in items:
+                await self.cache.add(knowledge)
 
             return items
         except Exception as e:
@@ -1116,16 +1122,11 @@ class InMemoryKnowledgeRepository(
                 return cached_items
 
             # Get from index
-            knowledge_ids = self.topic_index.get(topic, set())
+            items = self._ordered_items(self.topic_index.get(topic, set()))
 
-            # Get knowledge items
-            items = []
-            for knowledge_id in knowledge_ids:
-                knowledge = self.knowledge_items.get(knowledge_id)
-                if knowledge:
-                    items.append(knowledge)
-                    # Add to cache
-                    await self.cache.add(knowledge)
+            # Add to cache
+            for knowledge in items:
+                await self.cache.add(knowledge)
 
             return items
         except Exception as e:
@@ -1152,16 +1153,11 @@ class InMemoryKnowledgeRepository(
                 return cached_items
 
             # Get from index
-            knowledge_ids = self.type_index.get(knowledge_type, set())
+            items = self._ordered_items(self.type_index.get(knowledge_type, set()))
 
-            # Get knowledge items
-            items = []
-            for knowledge_id in knowledge_ids:
-                knowledge = self.knowledge_items.get(knowledge_id)
-                if knowledge:
-                    items.append(knowledge)
-                    # Add to cache
-                    await self.cache.add(knowledge)
+            # Add to cache
+            for knowledge in items:
+                await self.cache.add(knowledge)
 
             return items
         except Exception as e:
@@ -1183,16 +1179,11 @@ class InMemoryKnowledgeRepository(
         """
         try:
             # Get from index
-            knowledge_ids = self.source_index.get(source_id, set())
+            items = self._ordered_items(self.source_index.get(source_id, set()))
 
-            # Get knowledge items
-            items = []
-            for knowledge_id in knowledge_ids:
-                knowledge = self.knowledge_items.get(knowledge_id)
-                if knowledge:
-                    items.append(knowledge)
-                    # Add to cache
-                    await self.cache.add(knowledge)
+            # Add to cache
+            for knowledge in items:
+                await self.cache.add(knowledge)
 
             return items
         except Exception as e:
@@ -1217,16 +1208,11 @@ class InMemoryKnowledgeRepository(
                 return cached_items
 
             # Get from index
-            knowledge_ids = self.tag_index.get(tag, set())
+            items = self._ordered_items(self.tag_index.get(tag, set()))
 
-            # Get knowledge items
-            items = []
-            for knowledge_id in knowledge_ids:
-                knowledge = self.knowledge_items.get(knowledge_id)
-                if knowledge:
-                    items.append(knowledge)
-                    # Add to cache
-                    await self.cache.add(knowledge)
+            # Add to cache
+            for knowledge in items:
+                await self.cache.add(knowledge)
 
             return items
         except Exception as e:
@@ -1253,56 +1239,92 @@ class InMemoryKnowledgeRepository(
                 self.logger.error(f"Failed to generate embedding for query: {str(e)}")
                 return []
 
-            # Search by vector
-            try:
-                results = await self.vector_storage.search_by_vector(
-                    query_vector, limit
-                )
-            except VectorStorageError as e:
-                self.logger.error(f"Failed to search by vector: {str(e)}")
-                return []
-
-            # Get knowledge items
-            query_results = []
-            for knowledge_id, score in results:
-                knowledge = self.knowledge_items.get(knowledge_id)
-                if knowledge:
-                    query_results.append(QueryResult(knowledge=knowledge, score=score))
-
-            return query_results
+            return await self._search_vectors(query_vector, limit)
         except Exception as e:
             self.logger.error(f"Failed to search knowledge: {str(e)}")
             return []
 
+    async def _search_vectors(
+        self,
+        query_vector: np.ndarray,
+        limit: int,
+        candidate_ids: Optional[Iterable[str]] = None,
+    ) -> List[QueryResult]:
+        """
+        Run a similarity search and map the hits to knowledge items.
+
+        Args:
+            query_vector: Query embedding
+            limit: Maximum number of results
+            candidate_ids: If given, only these items are searched
+
+        Returns:
+            List of query results, an empty list if the search fails
+        """
+        try:
+            results = await self.vector_storage.search_by_vector(
+                query_vector, limit, candidate_ids=candidate_ids
+            )
+        except VectorStorageError as e:
+            self.logger.error(f"Failed to search by vector: {str(e)}")
+            return []
+
+        query_results = []
+        for knowledge_id, score in results:
+            knowledge = self.knowledge_items.get(knowledge_id)
+            if knowledge:
+                query_results.append(QueryResult(knowledge=knowledge, score=score))
+        return query_results
+
     async def filter_knowledge(
-        self, filter: MetadataFilter, limit: Optional[int] = None
+        self, filter: MetadataFilter, limit: Optional[int] = None, offset: int = 0
     ) -> List[KnowledgeItem]:
         """
         Filter knowledge items based on metadata.
 
+        Filters built from the knowledge filter classes are answered from the
+        indexes; other filters are checked item by item.
+
         Args:
             filter: Metadata filter
             limit: Maximum number of results
+            offset: Number of matching items to skip, in storage order
 
         Returns:
             List of knowledge items matching the filter
         """
         try:
-            # Get all knowledge items
-            all_items = await self.get_all_knowledge()
-
-            # Filter items
-            filtered_items = [item for item in all_items if filter.matches(item)]
-
-            # Limit results if specified
-            if limit is not None:
-                filtered_items = filtered_items[:limit]
-
-            return filtered_items
+            plan = self.query_planner.plan(filter)
+            stop = None if limit is None else offset + limit
+            return list(itertools.islice(self._iter_plan(plan, stop), offset, stop))
         except Exception as e:
             self.logger.error(f"Failed to filter knowledge: {str(e)}")
             return []
 
+    async def iter_knowledge(
+        self, filter: MetadataFilter, page_size: int = 100
+    ) -> AsyncIterator[List[KnowledgeItem]]:
+        """
+        Stream the items matching a filter in pages, in storage order.
+
+        The filter is planned once; items deleted while paging are skipped.
+
+        Args:
+            filter: Metadata filter
+            page_size: Maximum number of items per page
+
+        Yields:
+            Lists of matching knowledge items
+        """
+        items = self._iter_plan(self.query_planner.plan(filter))
+        while True:
+            page = list(itertools.islice(items, page_size))
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+
     async def search_and_filter(
         self, query: str, filter: MetadataFilter, limit: int = 10
     ) -> List[QueryResult]:
@@ -1318,24 +1340,79 @@ class InMemoryKnowledgeRepository(
             List of query results
         """
         try:
-            # Search by similarity
-            search_results = await self.search_knowledge(
-                query, limit * 2
-            )  # Get more results to filter
-
-            # Filter results
-            filtered_results = [
-                result for result in search_results if filter.matches(result.knowledge)
-            ]
+            try:
+                query_vector = await self.embedding_provider.get_embedding(query)
+            except EmbeddingError as e:
+                self.logger.error(f"Failed to generate embedding for query: {str(e)}")
+                return []
 
-            # Limit results
-            return filtered_results[:limit]
+            # Restrict the similarity search to the matching items instead of
+            # post-filtering the top hits
+            plan = self.query_planner.plan(filter)
+            candidate_ids = self.query_planner.resolve(plan)
+            if not candidate_ids:
+                return []
+            return await self._search_vectors(query_vector, limit, candidate_ids)
         except Exception as e:
             self.logger.error(f"Failed to search and filter knowledge: {str(e)}")
             return []
 
     # Helper methods
 
+    def _ordered_ids(
+        self, ids: Iterable[str], limit: Optional[int] = None
+    ) -> List[str]:
+        """
+        IDs of stored items in storage order.
+
+        Args:
+            ids: Knowledge IDs (e.g. an index set)
+            limit: Only the first ``limit`` IDs are needed
+
+        Returns:
+            List of IDs
+        """
+        rank = self._item_rank
+        ids = [i for i in ids if i in rank]
+        if limit is not None and limit < len(ids):
+            return heapq.nsmallest(limit, ids, key=rank.__getitem__)
+        if len(ids) * 4 > len(rank):
+            # Large selections: walk the items instead of sorting
+            selected = set(ids)
+            return [i for i in self.knowledge_items if i in selected]
+        return sorted(ids, key=rank.__getitem__)
+
+    def _ordered_items(self, ids: Iterable[str]) -> List[KnowledgeItem]:
+        """Stored items of the given IDs in storage order."""
+        return [self.knowledge_items[i] for i in self._ordered_ids(ids)]
+
+    def _iter_plan(
+        self, plan: QueryPlan, limit: Optional[int] = None
+    ) -> Iterator[KnowledgeItem]:
+        """
+        Items matching a query plan, in storage order.
+
+        Args:
+            plan: Compiled filter
+            limit: Number of items the caller will consume at most
+
+        Yields:
+            Matching knowledge items that are still stored
+        """
+        if plan.candidates is None:
+            ids = list(self.knowledge_items)
+        else:
+            # The residual may reject candidates, so only exact plans can
+            # stop sorting early
+            ids = self._ordered_ids(plan.candidates, limit if plan.exact else None)
+
+        for knowledge_id in ids:
+            knowledge = self.knowledge_items.get(knowledge_id)
+            if knowledge is None:
+                continue
+            if plan.residual is None or plan.residual(knowledge):
+                yield knowledge
+
     def _update_indexes(self, knowledge: KnowledgeItem) -> None:
         """
         Update indexes for a knowledge item.
@@ -1343,6 +1420,9 @@ class InMemoryKnowledgeRepository(
         Args:
             knowledge: Knowledge item to index
         """
+        if knowledge.knowledge_id not in self._item_rank:
+            self._item_rank[knowledge.knowledge_id] = next(self._rank_counter)
+
         # Update topic index
         topic = knowledge.topic
         if topic not in self.topic_index:
@@ -1381,6 +1461,8 @@ class InMemoryKnowledgeRepository(
         Args:
             knowledge: Knowledge item to remove
         """
+        self._item_rank.pop(knowledge.knowledge_id, None)
+
         # Remove from topic index
         topic = knowledge.topic
         if topic in self.topic_index:
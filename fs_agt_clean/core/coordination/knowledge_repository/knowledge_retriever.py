@@ -203,7 +203,7 @@ class KnowledgeRetriever(abc.ABC):
 
     @abc.abstractmethod
     async def filter_knowledge(
-        self, filter: MetadataFilter, limit: Optional[int] = None
+        self, filter: MetadataFilter, limit: Optional[int] = None, offset: int = 0
     ) -> List[KnowledgeItem]:
         """
         Filter knowledge items based on metadata.
@@ -211,6 +211,7 @@ class KnowledgeRetriever(abc.ABC):
         Args:
             filter: Metadata filter
             limit: Maximum number of results
+            offset: Number of matching items to skip
 
         Returns:
             List of knowledge items matching the filter
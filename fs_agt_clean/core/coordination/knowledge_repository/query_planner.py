@@ -0,0 +1,283 @@
+"""
+Query planner for metadata filters over the knowledge repository indexes.
+
+Filters built from the classes in ``knowledge_filter`` are compiled into set
+operations over the repository's topic, type, source, tag and status
+indexes instead of calling ``matches`` on every item:
+
+- topic, type, status, source and tag filters become unions of index sets
+  (topic patterns are matched against the index keys, not the items)
+- AND intersects its children, starting from the most selective one and
+  probing the others by membership
+- OR unions its children, NOT takes the complement against all items
+
+Filters the indexes cannot answer (custom ``MetadataFilter`` subclasses, or
+composites containing one) are kept as a residual predicate that is only
+evaluated on the candidates of the indexed part.
+"""
+
+import abc
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Set
+
+from fs_agt_clean.core.coordination.knowledge_repository.knowledge_filter import (
+    AndFilter,
+    NotFilter,
+    OrFilter,
+    SourceFilter,
+    StatusFilter,
+    TagFilter,
+    TopicFilter,
+    TypeFilter,
+)
+from fs_agt_clean.core.coordination.knowledge_repository.knowledge_repository import (
+    KnowledgeItem,
+)
+
+_EMPTY: Set[str] = frozenset()  # type: ignore[assignment]
+
+
+class _Node(abc.ABC):
+    """Set of knowledge IDs described by index operations."""
+
+    @abc.abstractmethod
+    def estimate(self) -> int:
+        """Upper bound of the number of IDs, used to order intersections."""
+        pass
+
+    @abc.abstractmethod
+    def contains(self, knowledge_id: str) -> bool:
+        """Whether an ID is in the node's set."""
+        pass
+
+    @abc.abstractmethod
+    def materialize(self) -> Set[str]:
+        """IDs of the node; may return an index set, which must not be mutated."""
+        pass
+
+
+class _Union(_Node):
+    def __init__(self, sets: List[Set[str]]):
+        self.sets = [s for s in sets if s]
+
+    def estimate(self) -> int:
+        return sum(len(s) for s in self.sets)
+
+    def contains(self, knowledge_id: str) -> bool:
+        return any(knowledge_id in s for s in self.sets)
+
+    def materialize(self) -> Set[str]:
+        if not self.sets:
+            return _EMPTY
+        if len(self.sets) == 1:
+            return self.sets[0]
+        return set().union(*self.sets)
+
+
+class _Intersection(_Node):
+    def __init__(self, nodes: List[_Node]):
+        self.nodes = nodes
+
+    def estimate(self) -> int:
+        return min(node.estimate() for node in self.nodes)
+
+    def contains(self, knowledge_id: str) -> bool:
+        return all(node.contains(knowledge_id) for node in self.nodes)
+
+    def materialize(self) -> Set[str]:
+        # Start from the most selective child and probe the rest
+        nodes = sorted(self.nodes, key=lambda node: node.estimate())
+        result = nodes[0].materialize()
+        for node in nodes[1:]:
+            if not result:
+                break
+            if isinstance(node, _Union) and len(node.sets) == 1:
+                result = result & node.sets[0]
+            else:
+                result = {i for i in result if node.contains(i)}
+        return result
+
+
+class _Complement(_Node):
+    def __init__(self, node: _Node, universe: Mapping[str, KnowledgeItem]):
+        self.node = node
+        self.universe = universe
+
+    def estimate(self) -> int:
+        return len(self.universe)
+
+    def contains(self, knowledge_id: str) -> bool:
+        return knowledge_id in self.universe and not self.node.contains(knowledge_id)
+
+    def materialize(self) -> Set[str]:
+        return self.universe.keys() - self.node.materialize()
+
+
+class _All(_Node):
+    def __init__(self, universe: Mapping[str, KnowledgeItem]):
+        self.universe = universe
+
+    def estimate(self) -> int:
+        return len(self.universe)
+
+    def contains(self, knowledge_id: str) -> bool:
+        return knowledge_id in self.universe
+
+    def materialize(self) -> Set[str]:
+        return set(self.universe)
+
+
+@dataclass
+class QueryPlan:
+    """
+    Compiled filter.
+
+    Attributes:
+        candidates: IDs selected by the indexes, or None for all items. May
+            be a live index set, so it must be copied before awaiting
+        residual: Predicate still to be checked on each candidate, or None
+            if the candidates are exact
+    """
+
+    candidates: Optional[Set[str]]
+    residual: Optional[Callable[[KnowledgeItem], bool]] = None
+
+    @property
+    def exact(self) -> bool:
+        return self.residual is None
+
+
+class QueryPlanner:
+    """Compiles metadata filters into index set operations."""
+
+    def __init__(
+        self,
+        knowledge_items: Mapping[str, KnowledgeItem],
+        topic_index: Dict[str, Set[str]],
+        type_index: Dict,
+        source_index: Dict[str, Set[str]],
+        tag_index: Dict[str, Set[str]],
+        status_index: Dict,
+    ):
+        """
+        Initialize the planner over live repository indexes.
+
+        Args:
+            knowledge_items: Knowledge items by ID
+            topic_index: Topic to IDs
+            type_index: Knowledge type to IDs
+            source_index: Source ID to IDs
+            tag_index: Tag to IDs
+            status_index: Knowledge status to IDs
+        """
+        self.knowledge_items = knowledge_items
+        self.topic_index = topic_index
+        self.type_index = type_index
+        self.source_index = source_index
+        self.tag_index = tag_index
+        self.status_index = status_index
+
+    def plan(self, filter) -> QueryPlan:
+        """
+        Compile a filter.
+
+        Args:
+            filter: Knowledge or metadata filter (anything with ``matches``)
+
+        Returns:
+            Query plan with index candidates and residual predicate
+        """
+        node = self._compile(filter)
+        if node is not None:
+            return QueryPlan(candidates=node.materialize())
+
+        if isinstance(filter, AndFilter):
+            # Answer the indexable children with the indexes and check the
+            # remaining ones on the candidates only
+            indexed, residual = [], []
+            for child in filter.filters:
+                child_node = self._compile(child)
+                if child_node is None:
+                    residual.append(child)
+                else:
+                    indexed.append(child_node)
+            candidates = None
+            if indexed:
+                candidates = _Intersection(indexed).materialize()
+            return QueryPlan(
+                candidates=candidates,
+                residual=lambda item: all(f.matches(item) for f in residual),
+            )
+
+        return QueryPlan(candidates=None, residual=filter.matches)
+
+    def resolve(self, plan: QueryPlan) -> Set[str]:
+        """Exact set of IDs matching a plan."""
+        if plan.residual is None:
+            if plan.candidates is None:
+                return set(self.knowledge_items)
+            return plan.candidates
+        items = self.knowledge_items
+        ids = items.keys() if plan.candidates is None else plan.candidates
+        return {i for i in ids if i in items and plan.residual(items[i])}
+
+    def _compile(self, filter) -> Optional[_Node]:
+        """Index node answering a filter exactly, or None."""
+        if isinstance(filter, TopicFilter):
+            sets = [self.topic_index.get(topic, _EMPTY) for topic in filter.topics]
+            if filter.compiled_patterns:
+                sets.extend(
+                    ids
+                    for topic, ids in self.topic_index.items()
+                    if topic not in filter.topics
+                    and any(p.match(topic) for p in filter.compiled_patterns)
+                )
+            return _Union(sets)
+
+        if isinstance(filter, TypeFilter):
+            return self._lookup(self.type_index, filter.types)
+
+        if isinstance(filter, StatusFilter):
+            return self._lookup(self.status_index, filter.statuses)
+
+        if isinstance(filter, SourceFilter):
+            # Items without a source are not in the source index
+            if not all(filter.sources):
+                return None
+            return self._lookup(self.source_index, filter.sources)
+
+        if isinstance(filter, TagFilter):
+            if not filter.match_all:
+                return self._lookup(self.tag_index, filter.tags)
+            if not filter.tags:
+                # Vacuously true for every item that has tags
+                return _Union(list(self.tag_index.values()))
+            return _Intersection(
+                [self._lookup(self.tag_index, [tag]) for tag in filter.tags]
+            )
+
+        if isinstance(filter, AndFilter):
+            if not filter.filters:
+                return _All(self.knowledge_items)
+            nodes = [self._compile(child) for child in filter.filters]
+            if any(node is None for node in nodes):
+                return None
+            return _Intersection(nodes)
+
+        if isinstance(filter, OrFilter):
+            nodes = [self._compile(child) for child in filter.filters]
+            if any(node is None for node in nodes):
+                return None
+            return _Union([node.materialize() for node in nodes])
+
+        if isinstance(filter, NotFilter):
+            node = self._compile(filter.filter)
+            if node is None:
+                return None
+            return _Complement(node, self.knowledge_items)
+
+        return None
+
+    @staticmethod
+    def _lookup(index: Dict, keys: Iterable) -> _Union:
+        return _Union([index.get(key, _EMPTY) for key in keys])
@@ -0,0 +1,168 @@
+"""
+Tests for query_planner.py and its use by InMemoryKnowledgeRepository
+"""
+
+import random
+
+import pytest
+
+from fs_agt_clean.core.coordination.knowledge_repository import (
+    InMemoryKnowledgeRepository,
+)
+from fs_agt_clean.core.coordination.knowledge_repository.knowledge_filter import (
+    AndFilter,
+    KnowledgeFilter,
+    NotFilter,
+    OrFilter,
+    SourceFilter,
+    StatusFilter,
+    TagFilter,
+    TopicFilter,
+    TypeFilter,
+)
+from fs_agt_clean.core.coordination.knowledge_repository.knowledge_repository import (
+    KnowledgeItem,
+    KnowledgeStatus,
+    KnowledgeType,
+)
+
+TOPICS = ["pricing.ebay", "pricing.amazon", "shipping.usps", "listing"]
+TAGS = ["a", "b", "c"]
+SOURCES = ["s1", "s2", None]
+
+
+class EvenFilter(KnowledgeFilter):
+    """Filter the indexes cannot answer."""
+
+    def matches(self, knowledge):
+        return int(knowledge.knowledge_id[1:]) % 2 == 0
+
+
+def make_item(index, rng):
+    return KnowledgeItem(
+        knowledge_id=f"k{index}",
+        knowledge_type=rng.choice(list(KnowledgeType)),
+        topic=rng.choice(TOPICS),
+        content={"text": f"item {index}"},
+        source_id=rng.choice(SOURCES),
+        status=rng.choice(list(KnowledgeStatus)),
+        tags=set(rng.sample(TAGS, rng.randint(0, 2))),
+    )
+
+
+def random_filter(rng, depth=0):
+    kind = rng.randrange(9 if depth < 2 else 6)
+    if kind == 0:
+        return TopicFilter(topics={rng.choice(TOPICS)})
+    if kind == 1:
+        return TopicFilter(patterns={rng.choice([r"pricing\.", r"ship", r"x"])})
+    if kind == 2:
+        return TypeFilter(set(rng.sample(list(KnowledgeType), 2)))
+    if kind == 3:
+        return StatusFilter({rng.choice(list(KnowledgeStatus))})
+    if kind == 4:
+        return TagFilter(set(rng.sample(TAGS, 2)), match_all=rng.random() < 0.5)
+    if kind == 5:
+        return SourceFilter(set(rng.sample(SOURCES, 2)))
+    children = [random_filter(rng, depth + 1) for _ in range(rng.randint(1, 3))]
+    if rng.random() < 0.2:
+        children.append(EvenFilter())
+    if kind == 6:
+        return AndFilter(children)
+    if kind == 7:
+        return OrFilter(children)
+    return NotFilter(children[0])
+
+
+async def build_repository():
+    rng = random.Random(7)
+    repository = InMemoryKnowledgeRepository("test_query_planner")
+    for index in range(60):
+        await repository.add_knowledge(make_item(index, rng))
+    return repository
+
+
+def brute_force(repository, filter):
+    return [
+        item.knowledge_id
+        for item in repository.knowledge_items.values()
+        if filter.matches(item)
+    ]
+
+
+class TestQueryPlanner:
+    """Tests for compiling filters into index operations."""
+
+    @pytest.mark.asyncio
+    async def test_matches_brute_force(self):
+        """Planned results equal checking every item, in storage order."""
+        repository = await build_repository()
+        rng = random.Random(11)
+        planner = repository.query_planner
+        for _ in range(300):
+            filter = random_filter(rng)
+            expected = brute_force(repository, filter)
+            assert planner.resolve(planner.plan(filter)) == set(expected)
+            found = await repository.filter_knowledge(filter)
+            assert [item.knowledge_id for item in found] == expected
+
+    @pytest.mark.asyncio
+    async def test_indexed_filter_is_exact(self):
+        """Filters the indexes answer need no residual check."""
+        repository = await build_repository()
+        planner = repository.query_planner
+        topic = TopicFilter(patterns={r"pricing\."})
+        plan = planner.plan(AndFilter([topic, NotFilter(TagFilter({"a"}))]))
+        assert plan.exact
+
+    @pytest.mark.asyncio
+    async def test_residual_only_on_candidates(self):
+        """Unindexable AND children are checked on the indexed candidates only."""
+        repository = await build_repository()
+        planner = repository.query_planner
+        topic = TopicFilter(topics={"listing"})
+        plan = planner.plan(AndFilter([topic, EvenFilter()]))
+        assert not plan.exact
+        assert plan.candidates == set(brute_force(repository, topic))
+
+    @pytest.mark.asyncio
+    async def test_source_filter_with_none(self):
+        """Items without a source are found although they are not indexed."""
+        repository = await build_repository()
+        filter = SourceFilter({None})
+        found = await repository.filter_knowledge(filter)
+        assert found
+        assert all(item.source_id is None for item in found)
+        assert [item.knowledge_id for item in found] == brute_force(repository, filter)
+
+
+class TestRepositoryFiltering:
+    """Tests for the repository methods that use the planner."""
+
+    @pytest.mark.asyncio
+    async def test_limit_and_offset(self):
+        """Pages follow storage order."""
+        repository = await build_repository()
+        filter = OrFilter([TagFilter({"a"}), TagFilter({"b"})])
+        expected = brute_force(repository, filter)
+        page = await repository.filter_knowledge(filter, limit=5, offset=3)
+        assert [item.knowledge_id for item in page] == expected[3:8]
+
+    @pytest.mark.asyncio
+    async def test_iter_knowledge_pages(self):
+        """Streaming yields every match once, in pages."""
+        repository = await build_repository()
+        filter = NotFilter(StatusFilter({KnowledgeStatus.ARCHIVED}))
+        pages = [page async for page in repository.iter_knowledge(filter, page_size=7)]
+        assert all(len(page) <= 7 for page in pages)
+        ids = [item.knowledge_id for page in pages for item in page]
+        assert ids == brute_force(repository, filter)
+
+    @pytest.mark.asyncio
+    async def test_search_and_filter_restricted(self):
+        """Vector search only returns items matching the filter."""
+        repository = await build_repository()
+        filter = TopicFilter(topics={"shipping.usps"})
+        expected = set(brute_force(repository, filter))
+        results = await repository.search_and_filter("item", filter, limit=100)
+        assert {result.knowledge.knowledge_id for result in results} == expected
@@ -8,7 +8,18 @@ other vector-based operations.
 
 import abc
 import heapq
-from typing import Any, Dict, Generic, List, Optional, Set, Tuple, TypeVar, Union
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import numpy as np
 
@@ -158,7 +169,10 @@ class VectorStorage(abc.ABC):
 
     @abc.abstractmethod
     async def search_by_vector(
-        self, query_vector: np.ndarray, limit: int = 10
+        self,
+        query_vector: np.ndarray,
+        limit: int = 10,
+        candidate_ids: Optional[Iterable[str]] = None,
     ) -> List[Tuple[str, float]]:
         """
         Search for items by similarity to a query vector.
@@ -166,6 +180,7 @@ class VectorStorage(abc.ABC):
         Args:
             query_vector: Query vector
             limit: Maximum number of results
+            candidate_ids: If given, only these items are searched
 
         Returns:
             List of (item_id, similarity score) tuples
@@ -434,7 +449,10 @@ class InMemoryVectorStorage(VectorStorage):
             raise VectorStorageError(error_msg, item_id=item_id, cause=e)
 
     async def search_by_vector(
-        self, query_vector: np.ndarray, limit: int = 10
+        self,
+        query_vector: np.ndarray,
+        limit: int = 10,
+        candidate_ids: Optional[Iterable[str]] = None,
     ) -> List[Tuple[str, float]]:
         """
         Search for items by similarity to a query vector.
@@ -442,6 +460,7 @@ class InMemoryVectorStorage(VectorStorage):
         Args:
             query_vector: Query vector
             limit: Maximum number of results
+            candidate_ids: If given, only these items are searched
 
         Returns:
             List of (item_id, similarity score) tuples
@@ -453,15 +472,29 @@ class InMemoryVectorStorage(VectorStorage):
             # Normalize the query vector
             normalized_query = self._normalize_vector(query_vector)
 
-            # Calculate similarity scores
-            scores = []
-            for item_id, vector in self.vectors.items():
-                similarity = self._cosine_similarity(normalized_query, vector)
-                scores.append((item_id, similarity))
-
-            # Sort by similarity (highest first) and limit results
-            scores.sort(key=lambda x: x[1], reverse=True)
-            return scores[:limit]
+            if candidate_ids is None:
+                item_ids = list(self.vectors)
+            else:
+                candidates = set(candidate_ids)
+                if len(candidates) * 4 < len(self.vectors):
+                    item_ids = [i for i in candidates if i in self.vectors]
+                else:
+                    # Keep insertion order so ties rank as in a full search
+                    item_ids = [i for i in self.vectors if i in candidates]
+            if not item_ids or limit <= 0:
+                return []
+
+            # Cosine similarity of normalized vectors in one product
+            matrix = np.stack([self.vectors[i] for i in item_ids])
+            scores = matrix @ normalized_query
+
+            # Top results, highest first
+            if limit < len(item_ids):
+                top = np.argpartition(-scores, limit - 1)[:limit]
+                top = top[np.lexsort((top, -scores[top]))]
+            else:
+                top = np.argsort(-scores, kind="stable")
+            return [(item_ids[i], float(scores[i])) for i in top]
         except Exception as e:
             error_msg = f"Failed to search by vector: {str(e)}"
             self.logger.error(error_msg, exc_info=True)
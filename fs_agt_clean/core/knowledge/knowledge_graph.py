@@ -5,12 +5,15 @@ This module implements a knowledge graph for storing and querying
 structured knowledge.
 """
 
+import bisect
 import datetime
 import json
 import logging
+import re
 import uuid
+import weakref
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 import networkx as nx
 
@@ -70,6 +73,8 @@ class Node:
         self.source = source
         self.created_at = created_at or datetime.datetime.now()
         self.updated_at = updated_at or self.created_at
+        # Search indexes of the graphs holding this node, notified on update
+        self._indexes: "weakref.WeakSet[NodeSearchIndex]" = weakref.WeakSet()
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert node to dictionary representation."""
@@ -128,6 +133,9 @@ class Node:
             self.source = source
         self.updated_at = datetime.datetime.now()
 
+        for index in list(self._indexes):
+            index.update(self)
+
 
 class Edge:
     """Represents an edge in the knowledge graph."""
@@ -210,6 +218,197 @@ class Edge:
         self.updated_at = datetime.datetime.now()
 
 
+# Length of the character n-grams used to answer substring queries
+NGRAM_SIZE = 3
+
+# Word tokens used for prefix queries
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def _ngrams(text: str) -> Set[str]:
+    return {text[i : i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class NodeSearchIndex:
+    """
+    Inverted index over node names and string properties.
+
+    Substring queries intersect the postings of the query's character
+    n-grams and verify the few remaining candidates; prefix queries range
+    over the sorted word vocabulary. Nodes are also partitioned by type.
+    """
+
+    def __init__(self):
+        self._texts: Dict[str, Tuple[str, ...]] = {}
+        self._types: Dict[str, NodeType] = {}
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+        self._by_type: Dict[NodeType, Set[str]] = {}
+        self._ngrams: Dict[str, Set[str]] = {}
+        self._words: Dict[str, Set[str]] = {}
+        self._sorted_words: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._texts
+
+    @staticmethod
+    def _node_texts(node: "Node") -> Tuple[str, ...]:
+        texts = [node.name.lower()]
+        texts.extend(
+            value.lower()
+            for value in node.properties.values()
+            if isinstance(value, str)
+        )
+        return tuple(texts)
+
+    @staticmethod
+    def _terms(texts: Tuple[str, ...]) -> Tuple[Set[str], Set[str]]:
+        grams: Set[str] = set()
+        words: Set[str] = set()
+        for text in texts:
+            grams |= _ngrams(text)
+            words.update(WORD_PATTERN.findall(text))
+        return grams, words
+
+    @staticmethod
+    def _post(postings: Dict[str, Set[str]], terms: Set[str], node_id: str) -> None:
+        for term in terms:
+            postings.setdefault(term, set()).add(node_id)
+
+    def _unpost(
+        self, postings: Dict[str, Set[str]], terms: Set[str], node_id: str
+    ) -> None:
+        for term in terms:
+            node_ids = postings.get(term)
+            if node_ids is None:
+                continue
+            node_ids.discard(node_id)
+            if not node_ids:
+                del postings[term]
+                if postings is self._words:
+                    self._sorted_words = None
+
+    def add(self, node: "Node") -> None:
+        """Index a node, or reindex it if it is already indexed."""
+        if node.node_id in self._texts:
+            self.update(node)
+            return
+
+        texts = self._node_texts(node)
+        grams, words = self._terms(texts)
+        self._texts[node.node_id] = texts
+        self._types[node.node_id] = node.node_type
+        self._order[node.node_id] = self._next_order
+        self._next_order += 1
+        self._by_type.setdefault(node.node_type, set()).add(node.node_id)
+        self._post(self._ngrams, grams, node.node_id)
+        if words - self._words.keys():
+            self._sorted_words = None
+        self._post(self._words, words, node.node_id)
+        node._indexes.add(self)
+
+    def remove(self, node_id: str) -> None:
+        """Remove a node from the index."""
+        texts = self._texts.pop(node_id, None)
+        if texts is None:
+            return
+
+        grams, words = self._terms(texts)
+        self._unpost(self._ngrams, grams, node_id)
+        self._unpost(self._words, words, node_id)
+        node_type = self._types.pop(node_id)
+        self._by_type[node_type].discard(node_id)
+        del self._order[node_id]
+
+    def update(self, node: "Node") -> None:
+        """Apply changes of an indexed node, touching only changed terms."""
+        old_texts = self._texts.get(node.node_id)
+        if old_texts is None:
+            return
+
+        new_texts = self._node_texts(node)
+        if new_texts != old_texts:
+            old_grams, old_words = self._terms(old_texts)
+            new_grams, new_words = self._terms(new_texts)
+            self._unpost(self._ngrams, old_grams - new_grams, node.node_id)
+            self._unpost(self._words, old_words - new_words, node.node_id)
+            self._post(self._ngrams, new_grams - old_grams, node.node_id)
+            if new_words - self._words.keys():
+                self._sorted_words = None
+            self._post(self._words, new_words - old_words, node.node_id)
+            self._texts[node.node_id] = new_texts
+
+        old_type = self._types[node.node_id]
+        if node.node_type != old_type:
+            self._by_type[old_type].discard(node.node_id)
+            self._by_type.setdefault(node.node_type, set()).add(node.node_id)
+            self._types[node.node_id] = node.node_type
+
+    def _partition(self, node_type: Optional[NodeType]) -> Set[str]:
+        if node_type is None:
+            return self._texts.keys()
+        return self._by_type.get(node_type, set())
+
+    def _ordered(self, node_ids) -> List[str]:
+        return sorted(node_ids, key=self._order.__getitem__)
+
+    def search(self, query: str, node_type: Optional[NodeType] = None) -> List[str]:
+        """IDs of nodes whose name or a string property contains ``query``."""
+        query = query.lower()
+        partition = self._partition(node_type)
+
+        if len(query) < NGRAM_SIZE:
+            candidates = partition
+        else:
+            postings = []
+            for gram in _ngrams(query):
+                node_ids = self._ngrams.get(gram)
+                if not node_ids:
+                    return []
+                postings.append(node_ids)
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for node_ids in postings[1:]:
+                candidates &= node_ids
+                if not candidates:
+                    return []
+            if node_type is not None:
+                candidates &= partition
+
+        return self._ordered(
+            node_id
+            for node_id in candidates
+            if any(query in text for text in self._texts[node_id])
+        )
+
+    def search_prefix(
+        self, prefix: str, node_type: Optional[NodeType] = None
+    ) -> List[str]:
+        """IDs of nodes with a name or property word starting with ``prefix``."""
+        prefix = prefix.lower()
+        if self._sorted_words is None:
+            self._sorted_words = sorted(self._words)
+
+        words = self._sorted_words
+        matches: Set[str] = set()
+        for position in range(bisect.bisect_left(words, prefix), len(words)):
+            word = words[position]
+            if not word.startswith(prefix):
+                break
+            matches |= self._words[word]
+
+        if node_type is not None:
+            matches &= self._partition(node_type)
+        return self._ordered(matches)
+
+    def nodes_of_type(self, node_type: NodeType) -> List[str]:
+        """IDs of all nodes of a type."""
+        return self._ordered(self._partition(node_type))
+
+
 class KnowledgeGraph:
     """Knowledge graph for storing and querying structured knowledge."""
 
@@ -217,6 +416,27 @@ class KnowledgeGraph:
         self.nodes: Dict[str, Node] = {}
         self.edges: Dict[str, Edge] = {}
         self.graph = nx.MultiDiGraph()
+        # Built on the first search, then maintained incrementally
+        self._index: Optional[NodeSearchIndex] = None
+
+    def _get_index(self) -> NodeSearchIndex:
+        if self._index is None:
+            index = NodeSearchIndex()
+            for node in self.nodes.values():
+                index.add(node)
+            self._index = index
+        return self._index
+
+    def reindex_node(self, node_id: str) -> None:
+        """
+        Refresh the search index for a node.
+
+        Only needed after changing a node's attributes directly instead of
+        through ``Node.update`` or ``add_node``.
+        """
+        node = self.nodes.get(node_id)
+        if node is not None and self._index is not None:
+            self._index.update(node)
 
     def add_node(self, node: Node) -> str:
         """
@@ -248,6 +468,8 @@ class KnowledgeGraph:
                 properties=node.properties,
                 confidence=node.confidence,
             )
+            if self._index is not None:
+                self._index.add(node)
 
         return node.node_id
 
@@ -276,18 +498,23 @@ class KnowledgeGraph:
         if node_id not in self.nodes:
             return False
 
-        # Remove all edges connected to this node
-        edges_to_remove = []
-        for edge_id, edge in self.edges.items():
-            if edge.source_id == node_id or edge.target_id == node_id:
-                edges_to_remove.append(edge_id)
+        # Remove all edges connected to this node (self loops appear twice)
+        edges_to_remove = {
+            key for _, _, key in self.graph.out_edges(node_id, keys=True)
+        }
+        edges_to_remove.update(
+            key for _, _, key in self.graph.in_edges(node_id, keys=True)
+        )
 
         for edge_id in edges_to_remove:
             self.remove_edge(edge_id)
 
         # Remove the node
-        del self.nodes[node_id]
+        node = self.nodes.pop(node_id)
         self.graph.remove_node(node_id)
+        if self._index is not None:
+            self._index.remove(node_id)
+            node._indexes.discard(self._index)
 
         return True
 
@@ -448,84 +675,150 @@ class KnowledgeGraph:
         """
         Search for nodes by name or properties.
 
+        Matches nodes whose name or any string property contains the query
+        (case-insensitive), using the n-gram index.
+
         Args:
             query: Search query
             node_type: Optional filter for node type
 
         Returns:
-            List of matching nodes
+            List of matching nodes, in insertion order
         """
-        query = query.lower()
-        results = []
+        node_ids = self._get_index().search(query, node_type)
+        return [self.nodes[node_id] for node_id in node_ids]
 
-        for node in self.nodes.values():
-            if node_type is not None and node.node_type != node_type:
-                continue
+    def search_prefix(
+        self, prefix: str, node_type: Optional[NodeType] = None
+    ) -> List[Node]:
+        """
+        Search for nodes with a word starting with a prefix.
 
-            # Check name
-            if query in node.name.lower():
-                results.append(node)
-                continue
+        Args:
+            prefix: Word prefix (case-insensitive)
+            node_type: Optional filter for node type
 
-            # Check properties
-            for key, value in node.properties.items():
-                if isinstance(value, str) and query in value.lower():
-                    results.append(node)
-                    break
+        Returns:
+            List of matching nodes, in insertion order
+        """
+        node_ids = self._get_index().search_prefix(prefix, node_type)
+        return [self.nodes[node_id] for node_id in node_ids]
 
-        return results
+    def get_nodes_by_type(self, node_type: NodeType) -> List[Node]:
+        """
+        Get all nodes of a type.
 
-    def get_subgraph(self, node_ids: List[str], max_depth: int = 1) -> "KnowledgeGraph":
+        Args:
+            node_type: Node type
+
+        Returns:
+            List of nodes, in insertion order
         """
-        Get a subgraph centered on the specified nodes.
+        node_ids = self._get_index().nodes_of_type(node_type)
+        return [self.nodes[node_id] for node_id in node_ids]
+
+    def expand(
+        self,
+        node_ids: Iterable[str],
+        max_depth: int = 1,
+        edge_types: Optional[Set[EdgeType]] = None,
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Expand a set of nodes breadth first, one whole frontier per hop.
 
         Args:
-            node_ids: IDs of the central nodes
-            max_depth: Maximum depth of the subgraph
+            node_ids: IDs of the start nodes
+            max_depth: Maximum number of hops
+            edge_types: Only follow edges of these types (optional)
 
         Returns:
-            Subgraph as a new KnowledgeGraph
+            Tuple of reached node IDs and traversed edge IDs, in discovery
+            order. Edges are those incident to every expanded node.
         """
-        # Create a new knowledge graph
-        subgraph = KnowledgeGraph()
+        type_values = {edge_type.value for edge_type in edge_types or ()}
+        successors = self.graph.succ
+        predecessors = self.graph.pred
 
-        # Add the central nodes
-        nodes_to_process = set()
-        for node_id in node_ids:
-            if node_id in self.nodes:
-                node = self.nodes[node_id]
-                subgraph.add_node(node)
-                nodes_to_process.add(node_id)
+        reached = dict.fromkeys(
+            node_id for node_id in node_ids if node_id in self.nodes
+        )
+        traversed: Dict[str, None] = {}
+        frontier = list(reached)
 
-        # Expand the subgraph
         for _ in range(max_depth):
-            new_nodes = set()
-            for node_id in nodes_to_process:
-                # Add outgoing edges and nodes
-                for _, target_id, key in self.graph.out_edges(node_id, keys=True):
-                    if target_id not in subgraph.nodes:
-                        target_node = self.nodes[target_id]
-                        subgraph.add_node(target_node)
-                        new_nodes.add(target_id)
-
-                    edge = self.edges[key]
-                    subgraph.add_edge(edge)
-
-                # Add incoming edges and nodes
-                for source_id, _, key in self.graph.in_edges(node_id, keys=True):
-                    if source_id not in subgraph.nodes:
-                        source_node = self.nodes[source_id]
-                        subgraph.add_node(source_node)
-                        new_nodes.add(source_id)
-
-                    edge = self.edges[key]
-                    subgraph.add_edge(edge)
-
-            nodes_to_process = new_nodes
-            if not nodes_to_process:
+            next_frontier = []
+            for node_id in frontier:
+                for adjacency in (successors[node_id], predecessors[node_id]):
+                    for neighbor_id, edges in adjacency.items():
+                        followed = False
+                        for edge_id, edge_data in edges.items():
+                            edge_type = edge_data["edge_type"]
+                            if type_values and edge_type not in type_values:
+                                continue
+                            traversed[edge_id] = None
+                            followed = True
+                        if followed and neighbor_id not in reached:
+                            reached[neighbor_id] = None
+                            next_frontier.append(neighbor_id)
+
+            frontier = next_frontier
+            if not frontier:
                 break
 
-        return subgraph
+        return list(reached), list(traversed)
+
+    def get_subgraph(self, node_ids: List[str], max_depth: int = 1) -> "KnowledgeGraph":
+        """
+        Get a subgraph centered on the specified nodes.
+
+        Args:
+            node_ids: IDs of the central nodes
+            max_depth: Maximum depth of the subgraph
+
+        Returns:
+            Subgraph as a new KnowledgeGraph sharing this graph's nodes and
+            edges
+        """
+        reached, traversed = self.expand(node_ids, max_depth)
+        return KnowledgeGraph._from_parts(
+            (self.nodes[node_id] for node_id in reached),
+            (self.edges[edge_id] for edge_id in traversed),
+        )
+
+    @classmethod
+    def _from_parts(
+        cls, nodes: Iterable[Node], edges: Iterable[Edge]
+    ) -> "KnowledgeGraph":
+        """Build a graph from nodes and edges known to be consistent."""
+        graph = cls()
+        graph.nodes = {node.node_id: node for node in nodes}
+        graph.edges = {edge.edge_id: edge for edge in edges}
+        graph.graph.add_nodes_from(
+            (
+                node.node_id,
+                {
+                    "node_type": node.node_type.value,
+                    "name": node.name,
+                    "properties": node.properties,
+                    "confidence": node.confidence,
+                },
+            )
+            for node in graph.nodes.values()
+        )
+        graph.graph.add_edges_from(
+            (
+                edge.source_id,
+                edge.target_id,
+                edge.edge_id,
+                {
+                    "edge_type": edge.edge_type.value,
+                    "properties": edge.properties,
+                    "confidence": edge.confidence,
+                },
+            )
+            for edge in graph.edges.values()
+        )
+        return graph
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert knowledge graph to dictionary representation."""
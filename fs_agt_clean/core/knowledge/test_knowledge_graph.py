@@ -6,11 +6,21 @@ Tier: 2
 Note:
 """
 
+import random
+import re
 import sys
 from pathlib import Path
 
 import pytest
 
+from fs_agt_clean.core.knowledge.knowledge_graph import (
+    Edge,
+    EdgeType,
+    KnowledgeGraph,
+    Node,
+    NodeType,
+)
+
 # Add the parent directory to the path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -65,3 +75,200 @@ class TestKnowledgeGraphUnifiedAgent:
 
 if __name__ == "__main__":
     pytest.main([__file__])
+
+
+WORDS = ["Red", "reed", "shoe", "shoebox", "lamp", "Lamps", "blue", "bluetooth", "x"]
+NODE_TYPES = [NodeType.PRODUCT, NodeType.CONCEPT, NodeType.ENTITY]
+EDGE_TYPES = [EdgeType.RELATED_TO, EdgeType.PART_OF, EdgeType.IS_A]
+
+
+def random_text(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 3)))
+
+
+def random_node(rng, node_id):
+    return Node(
+        node_id=node_id,
+        node_type=rng.choice(NODE_TYPES),
+        name=random_text(rng),
+        properties={"brand": random_text(rng), "weight": rng.randint(1, 9)},
+    )
+
+
+def node_texts(node):
+    texts = [node.name]
+    texts.extend(v for v in node.properties.values() if isinstance(v, str))
+    return [text.lower() for text in texts]
+
+
+def scan_substring(graph, query, node_type=None):
+    """Linear scan for nodes containing ``query``, in insertion order."""
+    return [
+        node.node_id
+        for node in graph.nodes.values()
+        if (node_type is None or node.node_type == node_type)
+        and any(query.lower() in text for text in node_texts(node))
+    ]
+
+
+def scan_prefix(graph, prefix, node_type=None):
+    """Linear scan for nodes with a word starting with ``prefix``."""
+    return [
+        node.node_id
+        for node in graph.nodes.values()
+        if (node_type is None or node.node_type == node_type)
+        and any(
+            word.startswith(prefix.lower())
+            for text in node_texts(node)
+            for word in re.findall(r"\w+", text)
+        )
+    ]
+
+
+def assert_index_matches_scan(graph, rng):
+    for _ in range(15):
+        query = rng.choice(WORDS)[: rng.randint(1, 5)]
+        if rng.random() < 0.3:
+            query = query.upper()
+        node_type = rng.choice([None] + NODE_TYPES)
+        found = [node.node_id for node in graph.search_nodes(query, node_type)]
+        assert found == scan_substring(graph, query, node_type)
+        found = [node.node_id for node in graph.search_prefix(query, node_type)]
+        assert found == scan_prefix(graph, query, node_type)
+    for node_type in NODE_TYPES:
+        found = [node.node_id for node in graph.get_nodes_by_type(node_type)]
+        assert found == [
+            node.node_id
+            for node in graph.nodes.values()
+            if node.node_type == node_type
+        ]
+
+
+class TestNodeSearchIndex:
+    """Tests for substring, prefix and type lookups against a linear scan."""
+
+    def test_matches_scan_after_changes(self):
+        """Lookups equal a scan through adds, updates, re-adds and removals."""
+        rng = random.Random(11)
+        graph = KnowledgeGraph()
+        for i in range(30):
+            graph.add_node(random_node(rng, f"n{i}"))
+        assert_index_matches_scan(graph, rng)
+
+        next_id = 30
+        for _ in range(150):
+            action = rng.random()
+            node_ids = list(graph.nodes)
+            if action < 0.25 or not node_ids:
+                graph.add_node(random_node(rng, f"n{next_id}"))
+                next_id += 1
+            elif action < 0.5:
+                graph.nodes[rng.choice(node_ids)].update(
+                    name=random_text(rng),
+                    node_type=rng.choice(NODE_TYPES),
+                )
+            elif action < 0.65:
+                graph.nodes[rng.choice(node_ids)].update(
+                    properties={"brand": random_text(rng), "color": random_text(rng)}
+                )
+            elif action < 0.8:
+                # Re-adding an existing ID updates the stored node in place
+                graph.add_node(random_node(rng, rng.choice(node_ids)))
+            else:
+                graph.remove_node(rng.choice(node_ids))
+            assert_index_matches_scan(graph, rng)
+
+    def test_reindex_after_direct_change(self):
+        """reindex_node picks up attributes changed without Node.update."""
+        graph = KnowledgeGraph()
+        graph.add_node(Node(node_id="a", name="red lamp"))
+        assert [n.node_id for n in graph.search_nodes("lamp")] == ["a"]
+
+        graph.nodes["a"].name = "blue shoe"
+        graph.reindex_node("a")
+        assert graph.search_nodes("lamp") == []
+        assert [n.node_id for n in graph.search_prefix("sho")] == ["a"]
+
+    def test_removed_node_unlinked(self):
+        """Updating a node after removal does not put it back in the index."""
+        graph = KnowledgeGraph()
+        node = Node(node_id="a", name="lamp")
+        graph.add_node(node)
+        graph.search_nodes("lamp")
+        graph.remove_node("a")
+        node.update(name="lamp shade")
+        assert graph.search_nodes("lamp") == []
+        assert graph.search_prefix("la") == []
+
+
+def bfs_reference(graph, start_ids, max_depth, edge_types=None):
+    """Per-node breadth first search following edges in both directions."""
+    allowed = {edge_type.value for edge_type in edge_types or ()}
+    reached = {node_id for node_id in start_ids if node_id in graph.nodes}
+    traversed = set()
+    frontier = set(reached)
+    for _ in range(max_depth):
+        next_frontier = set()
+        for node_id in frontier:
+            for edge in graph.edges.values():
+                if node_id not in (edge.source_id, edge.target_id):
+                    continue
+                if allowed and edge.edge_type.value not in allowed:
+                    continue
+                traversed.add(edge.edge_id)
+                for neighbor_id in (edge.source_id, edge.target_id):
+                    if neighbor_id not in reached:
+                        reached.add(neighbor_id)
+                        next_frontier.add(neighbor_id)
+        frontier = next_frontier
+    return reached, traversed
+
+
+class TestExpand:
+    """Tests for frontier-at-a-time expansion."""
+
+    def test_matches_per_node_bfs(self):
+        """Reached nodes and traversed edges equal a per-node search."""
+        rng = random.Random(12)
+        for _ in range(20):
+            graph = KnowledgeGraph()
+            for i in range(25):
+                graph.add_node(random_node(rng, f"n{i}"))
+            for _ in range(rng.randint(0, 40)):
+                graph.add_edge(
+                    Edge(
+                        edge_type=rng.choice(EDGE_TYPES),
+                        source_id=f"n{rng.randrange(25)}",
+                        target_id=f"n{rng.randrange(25)}",
+                    )
+                )
+
+            start_ids = [f"n{rng.randrange(25)}" for _ in range(3)] + ["missing"]
+            max_depth = rng.randint(0, 4)
+            edge_types = rng.choice([None, {EdgeType.IS_A, EdgeType.PART_OF}])
+            reached, traversed = graph.expand(start_ids, max_depth, edge_types)
+
+            expected_reached, expected_traversed = bfs_reference(
+                graph, start_ids, max_depth, edge_types
+            )
+            assert set(reached) == expected_reached
+            assert len(reached) == len(set(reached))
+            assert set(traversed) == expected_traversed
+            assert len(traversed) == len(set(traversed))
+            starts = list(dict.fromkeys(s for s in start_ids if s in graph.nodes))
+            assert reached[: len(starts)] == starts
+
+    def test_subgraph_shares_expanded_parts(self):
+        """get_subgraph holds exactly the expanded nodes and edges."""
+        graph = KnowledgeGraph()
+        for node_id in "abcd":
+            graph.add_node(Node(node_id=node_id, name=node_id))
+        graph.add_edge(Edge(edge_id="ab", source_id="a", target_id="b"))
+        graph.add_edge(Edge(edge_id="cb", source_id="c", target_id="b"))
+        graph.add_edge(Edge(edge_id="cd", source_id="c", target_id="d"))
+
+        subgraph = graph.get_subgraph(["a"], max_depth=2)
+        assert set(subgraph.nodes) == {"a", "b", "c"}
+        assert set(subgraph.edges) == {"ab", "cb"}
+        assert subgraph.nodes["a"] is graph.nodes["a"]
+        assert [n.node_id for n in subgraph.search_nodes("c")] == ["c"]
@@ -7,6 +7,7 @@ from uuid import uuid4
 
 import numpy as np
 
+from fs_agt_clean.core.cache.async_cache import async_cached
 from fs_agt_clean.core.knowledge import (
     KnowledgeSharingService,
     KnowledgeStatus,
@@ -16,31 +17,6 @@ from fs_agt_clean.core.knowledge import (
 "\nLearning Module for FlipSync UnifiedAgent System.\nHandles knowledge acquisition, model updates, and predictions.\n"
 
 
-def async_ttl_cache(ttl_seconds: int = 300):
-    def decorator(func):
-        cache = {}
-
-        async def wrapper(*args, **kwargs):
-            key = str(args) + str(kwargs)
-            now = datetime.now()
-            if key in cache:
-                result, timestamp = cache[key]
-                if (now - timestamp).total_seconds() < ttl_seconds:
-                    return result
-                del cache[key]
-            result = await func(*args, **kwargs)
-            cache[key] = (result, now)
-            return result
-
-        def cache_clear():
-            cache.clear()
-
-        wrapper.cache_clear = cache_clear  # type: ignore
-        return wrapper
-
-    return decorator
-
-
 class LearningModule:
 
     def __init__(
@@ -518,7 +494,7 @@ class LearningModule:
             self.performance_history[asin] = performance_score
         await self._check_and_update_models()
 
-    @async_ttl_cache(ttl_seconds=1)  # 1 second TTL to match test
+    @async_cached(maxsize=4096, ttl=1)  # 1 second TTL to match test
     async def get_learned_insights(
         self, asin: str, context: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -842,7 +818,7 @@ class LearningModule:
         }
         return strategies.get(strategy_type.lower(), 0.5)
 
-    @async_ttl_cache(ttl_seconds=1)  # 1 second TTL to match test
+    @async_cached(maxsize=4096, ttl=1)  # 1 second TTL to match test
     async def _get_price_prediction(self, asin: str, context: Dict[str, Any]) -> float:
         """Get price prediction based on context and history."""
         try:
@@ -862,7 +838,7 @@ class LearningModule:
         except Exception:
             return 99.99
 
-    @async_ttl_cache(ttl_seconds=1)  # 1 second TTL to match test
+    @async_cached(maxsize=4096, ttl=1)  # 1 second TTL to match test
     async def _get_strategy_prediction(
         self, asin: str, context: Dict[str, Any]
     ) -> float:
@@ -875,7 +851,7 @@ class LearningModule:
         except Exception:
             return 0.5
 
-    @async_ttl_cache(ttl_seconds=1)  # 1 second TTL to match test
+    @async_cached(maxsize=4096, ttl=1)  # 1 second TTL to match test
     async def _generate_analysis(
         self,
         similar_cases: List[Dict[str, Any]],
@@ -3,9 +3,15 @@
 import abc
 import asyncio
 import json
-from datetime import datetime
+import math
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from itertools import groupby
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Protocol, Union
+from typing import Any, Dict, List, Optional, Protocol, Tuple, Union
+
+import numpy as np
 
 try:
     import aiofiles
@@ -29,6 +35,9 @@ from fs_agt_clean.core.monitoring.protocols.alerting_protocol import AlertStatus
 from ..alert_types import AlertType
 from ..metric_types import MetricType
 
+# Fixed-size per-line record in a segment's .idx file
+_RECORD_DTYPE = np.dtype([("timestamp", "<f8"), ("offset", "<u8"), ("severity", "u1")])
+
 
 class AlertStorage(Protocol):
     """Protocol for alert storage implementations."""
@@ -196,8 +205,82 @@ class BaseAlertStorage(abc.ABC):
         raise NotImplementedError
 
 
+@dataclass
+class _Segment:
+    """Summary of one segment file, kept in the sidecar index."""
+
+    name: str
+    partition: int
+    seq: int
+    count: int = 0
+    size: int = 0
+    min_ts: float = math.inf
+    max_ts: float = -math.inf
+    severity_counts: Dict[str, int] = field(default_factory=dict)
+    # Per-line (timestamp, offset, severity) records, loaded lazily
+    records: Optional[np.ndarray] = None
+
+    def overlaps(self, start: float, end: float) -> bool:
+        """Whether any alert in the segment may fall within [start, end]."""
+        return self.count > 0 and self.max_ts >= start and self.min_ts <= end
+
+    def within(self, start: float, end: float) -> bool:
+        """Whether every alert in the segment falls within [start, end]."""
+        return start <= self.min_ts and self.max_ts <= end
+
+    def matching_count(self, severity: Optional[str]) -> int:
+        """Number of alerts with the given severity (all if None)."""
+        if severity is None:
+            return self.count
+        return self.severity_counts.get(severity, 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "partition": self.partition,
+            "seq": self.seq,
+            "count": self.count,
+            "size": self.size,
+            "min_ts": self.min_ts if self.count else None,
+            "max_ts": self.max_ts if self.count else None,
+            "severity_counts": self.severity_counts,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "_Segment":
+        return cls(
+            name=data["name"],
+            partition=data["partition"],
+            seq=data["seq"],
+            count=data["count"],
+            size=data["size"],
+            min_ts=data["min_ts"] if data["min_ts"] is not None else math.inf,
+            max_ts=data["max_ts"] if data["max_ts"] is not None else -math.inf,
+            severity_counts=dict(data["severity_counts"]),
+        )
+
+
+def _to_epoch(value: datetime) -> float:
+    """Convert a datetime to epoch seconds, treating naive values as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
 class FileAlertStorage(BaseAlertStorage):
-    """File-based implementation of alert storage."""
+    """File-based implementation of alert storage.
+
+    Alerts are appended as JSON lines to segment files partitioned by alert
+    time. A sidecar index keeps each segment's min/max timestamp, severity
+    counts and size, and a per-segment ``.idx`` file holds a fixed-size
+    (timestamp, byte offset, severity) record per line. Queries skip
+    segments outside the requested range or without the requested severity,
+    filter the records and seek straight to the matching lines; counts are
+    answered from the index without reading alert data.
+    """
+
+    INDEX_FILE = "index.json"
+    SEGMENT_PREFIX = "alerts"
 
     def __init__(
         self,
@@ -205,14 +288,21 @@ class FileAlertStorage(BaseAlertStorage):
         max_file_size: int = 10 * 1024 * 1024,  # 10MB
         rotation_count: int = 5,
         config: Optional[Dict[str, Any]] = None,
+        partition_interval: int = 3600,
     ):
         """Initialize file storage.
 
         Args:
-            storage_path: Directory or file path for alert logs.
-            max_file_size: Max size in bytes before rotating.
-            rotation_count: Number of backup files to keep.
+            storage_path: Directory for alert segments. A file path (such as
+                a log written by earlier versions) stores segments in a
+                sibling ``<name>.segments`` directory; its alerts and rotated
+                backups are imported on first use.
+            max_file_size: Max size in bytes of a segment before starting
+                a new one.
+            rotation_count: Number of full segments' worth of data to keep
+                in addition to the current one (oldest segments are dropped).
             config: Optional configuration dictionary.
+            partition_interval: Seconds of alert time covered by a segment.
         """
         super().__init__(config)
 
@@ -224,62 +314,380 @@ class FileAlertStorage(BaseAlertStorage):
         self.storage_path = Path(storage_path)
         self.max_file_size = max_file_size
         self.rotation_count = rotation_count
+        self.partition_interval = partition_interval
+        self.max_total_size = max_file_size * (rotation_count + 1)
+
+        if self.storage_path.is_dir() or not self.storage_path.suffix:
+            self.segment_dir = self.storage_path
+            self._legacy_path: Optional[Path] = None
+        else:
+            self.segment_dir = self.storage_path.with_name(
+                f"{self.storage_path.name}.segments"
+            )
+            self._legacy_path = self.storage_path
         self._ensure_storage_path()
         self._lock = asyncio.Lock()
 
+        self._segments: Dict[str, _Segment] = {}
+        self._active: Dict[int, _Segment] = {}
+        self._severities: List[str] = [severity.value for severity in AlertSeverity]
+        self._loaded = False
+
+        # Group commit: alerts stored concurrently are appended in one batch
+        self._pending: List[Tuple[Alert, asyncio.Future]] = []
+        self._flusher: Optional[asyncio.Task] = None
+
     def _ensure_storage_path(self) -> None:
-        """Ensure storage directory exists. If path is file, use parent dir."""
-        path = (
-            self.storage_path.parent
-            if self.storage_path.is_file()
-            else self.storage_path
+        """Ensure the segment directory exists."""
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+
+    def _data_path(self, segment: _Segment) -> Path:
+        return self.segment_dir / f"{segment.name}.jsonl"
+
+    def _records_path(self, segment: _Segment) -> Path:
+        return self.segment_dir / f"{segment.name}.idx"
+
+    def _segment_name(self, partition: int, seq: int) -> str:
+        start = datetime.fromtimestamp(partition, tz=timezone.utc)
+        return f"{self.SEGMENT_PREFIX}-{start:%Y%m%dT%H%M%SZ}-{seq:04d}"
+
+    def _parse_segment_name(self, name: str) -> Optional[Tuple[int, int]]:
+        try:
+            _, start, seq = name.rsplit("-", 2)
+            partition = datetime.strptime(start, "%Y%m%dT%H%M%SZ").replace(
+                tzinfo=timezone.utc
+            )
+            return int(partition.timestamp()), int(seq)
+        except ValueError:
+            return None
+
+    def _severity_code(self, severity: str) -> int:
+        if severity not in self._severities:
+            self._severities.append(severity)
+        return self._severities.index(severity)
+
+    def _ordered_segments(self) -> List[_Segment]:
+        """Segments from newest to oldest."""
+        return sorted(
+            self._segments.values(),
+            key=lambda segment: (segment.partition, segment.seq),
+            reverse=True,
         )
-        path.mkdir(parents=True, exist_ok=True)
 
-    async def _rotate_files(self) -> None:
-        """Rotate log files if current file exceeds max size."""
-        # Don't rotate if path is a directory
-        if not self.storage_path.is_file():
-            return
-        if self.storage_path.stat().st_size < self.max_file_size:
+    async def _ensure_loaded(self) -> None:
+        """Load the sidecar index and reconcile it with the segment files.
+
+        Must be called with the lock held.
+        """
+        if self._loaded:
             return
 
-        async with self._lock:
-            # Delete oldest backup if rotation count is exceeded
-            oldest_backup = self.storage_path.with_suffix(
-                f".{self.rotation_count}"  # Shorten line (E501 fix attempt)
+        index_path = self.segment_dir / self.INDEX_FILE
+        if index_path.exists():
+            try:
+                async with aiofiles.open(index_path, mode="r") as f:
+                    data = json.loads(await f.read())
+                self._severities = data.get("severities", self._severities)
+                for entry in data.get("segments", []):
+                    segment = _Segment.from_dict(entry)
+                    self._segments[segment.name] = segment
+            except (ValueError, KeyError, TypeError):
+                # Corrupt index, rebuild it from the segment files
+                self._segments = {}
+
+        changed = False
+        on_disk = set()
+        for data_path in self.segment_dir.glob(f"{self.SEGMENT_PREFIX}-*.jsonl"):
+            name = data_path.stem
+            parsed = self._parse_segment_name(name)
+            if parsed is None:
+                continue
+            on_disk.add(name)
+            segment = self._segments.get(name)
+            if segment is None:
+                segment = _Segment(name=name, partition=parsed[0], seq=parsed[1])
+                self._segments[name] = segment
+            if (
+                data_path.stat().st_size != segment.size
+                or not self._records_path(segment).exists()
+            ):
+                # Crash between data and index writes, or unindexed file
+                await self._reindex_segment(segment)
+                changed = True
+
+        for name in set(self._segments) - on_disk:
+            del self._segments[name]
+            changed = True
+
+        for segment in self._segments.values():
+            active = self._active.get(segment.partition)
+            if active is None or segment.seq > active.seq:
+                self._active[segment.partition] = segment
+
+        self._loaded = True
+
+        if self._legacy_path is not None:
+            changed = await self._import_legacy_files() or changed
+
+        if changed:
+            await self._save_index()
+
+    async def _reindex_segment(self, segment: _Segment) -> None:
+        """Rebuild a segment's summary and records from its data file.
+
+        A trailing partial line left by an interrupted write is truncated so
+        the next append starts on a line of its own.
+        """
+        data_path = self._data_path(segment)
+        async with aiofiles.open(data_path, mode="rb") as f:
+            data = await f.read()
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            os.truncate(data_path, complete)
+            data = data[:complete]
+
+        timestamps, offsets, codes = [], [], []
+        severity_counts: Dict[str, int] = {}
+        position = 0
+        for line in data.splitlines(keepends=True):
+            try:
+                alert = Alert.model_validate_json(line)
+            except Exception:
+                # Malformed lines stay in the file but are not indexed
+                position += len(line)
+                continue
+            timestamps.append(_to_epoch(alert.timestamp))
+            offsets.append(position)
+            codes.append(self._severity_code(alert.severity.value))
+            severity_counts[alert.severity.value] = (
+                severity_counts.get(alert.severity.value, 0) + 1
+            )
+            position += len(line)
+
+        records = np.zeros(len(timestamps), dtype=_RECORD_DTYPE)
+        records["timestamp"] = timestamps
+        records["offset"] = offsets
+        records["severity"] = codes
+
+        async with aiofiles.open(self._records_path(segment), mode="wb") as f:
+            await f.write(records.tobytes())
+
+        segment.records = records
+        segment.count = len(records)
+        segment.size = len(data)
+        segment.min_ts = min(timestamps, default=math.inf)
+        segment.max_ts = max(timestamps, default=-math.inf)
+        segment.severity_counts = severity_counts
+
+    async def _import_legacy_files(self) -> bool:
+        """Import alerts from a rotated JSON-lines log written by earlier
+        versions, then remove the old files.
+
+        Returns:
+            bool: True if anything was imported
+        """
+        legacy_files = [self._legacy_path]
+        legacy_files.extend(
+            self._legacy_path.with_suffix(f".{i}")
+            for i in range(1, self.rotation_count + 1)
+        )
+
+        imported = False
+        for file_path in reversed(legacy_files):  # oldest first
+            if not file_path.is_file():
+                continue
+            alerts = []
+            async with aiofiles.open(file_path, mode="r") as f:
+                async for line in f:
+                    try:
+                        alerts.append(Alert.model_validate_json(line.strip()))
+                    except Exception:
+                        continue
+            if alerts:
+                await self._write_batch(alerts)
+                imported = True
+            file_path.unlink()
+        return imported
+
+    async def _save_index(self) -> None:
+        """Atomically write the sidecar index."""
+        index_path = self.segment_dir / self.INDEX_FILE
+        temp_path = index_path.with_suffix(".tmp")
+        data = {
+            "version": 1,
+            "partition_interval": self.partition_interval,
+            "severities": self._severities,
+            "segments": [segment.to_dict() for segment in self._segments.values()],
+        }
+        async with aiofiles.open(temp_path, mode="w") as f:
+            await f.write(json.dumps(data))
+        os.replace(temp_path, index_path)
+
+    async def _load_records(self, segment: _Segment) -> np.ndarray:
+        """Get a segment's line records, reading the .idx file if needed."""
+        if segment.records is None:
+            async with aiofiles.open(self._records_path(segment), mode="rb") as f:
+                data = await f.read()
+            segment.records = np.frombuffer(data, dtype=_RECORD_DTYPE)
+        return segment.records
+
+    def _writable_segment(self, partition: int) -> _Segment:
+        """Get the segment new alerts of a partition are appended to."""
+        segment = self._active.get(partition)
+        if segment is None or segment.size >= self.max_file_size:
+            seq = segment.seq + 1 if segment is not None else 0
+            segment = _Segment(
+                name=self._segment_name(partition, seq),
+                partition=partition,
+                seq=seq,
+            )
+            self._segments[segment.name] = segment
+            self._active[partition] = segment
+        return segment
+
+    async def _write_batch(self, alerts: List[Alert]) -> None:
+        """Append a batch of alerts to their segments.
+
+        Must be called with the lock held.
+        """
+        writes: Dict[str, Tuple[_Segment, List[bytes], List[Tuple]]] = {}
+        for alert in alerts:
+            timestamp = _to_epoch(alert.timestamp)
+            partition = int(timestamp // self.partition_interval)
+            partition *= self.partition_interval
+            line = (alert.model_dump_json() + "\n").encode()
+            severity = alert.severity.value
+
+            segment = self._writable_segment(partition)
+            _, lines, records = writes.setdefault(segment.name, (segment, [], []))
+            lines.append(line)
+            records.append((timestamp, segment.size, self._severity_code(severity)))
+
+            segment.size += len(line)
+            segment.count += 1
+            segment.min_ts = min(segment.min_ts, timestamp)
+            segment.max_ts = max(segment.max_ts, timestamp)
+            segment.severity_counts[severity] = (
+                segment.severity_counts.get(severity, 0) + 1
             )
-            if oldest_backup.exists():
-                oldest_backup.unlink()
-
-            # Shift existing backups
-            for i in range(self.rotation_count - 1, 0, -1):
-                src = self.storage_path.with_suffix(f".{i}")
-                dst = self.storage_path.with_suffix(f".{i + 1}")
-                if src.exists():
-                    src.rename(dst)
-
-            # Rotate current log file
-            if self.storage_path.exists():
-                self.storage_path.rename(
-                    self.storage_path.with_suffix(
-                        ".1"
-                    )  # Shorten line (E501 fix attempt)
-                )
 
-    async def store_alert(self, alert: Alert) -> bool:
-        """Store an alert in a JSON line file."""
         try:
-            await self._rotate_files()
-            # Use model_dump_json for Pydantic v2+, or dict() for v1
-            alert_json = alert.model_dump_json() + "\n"
-            async with self._lock:
-                async with aiofiles.open(self.storage_path, mode="a") as f:
-                    await f.write(alert_json)
-                return True
-        except Exception as e:
-            # Add proper logging
-            raise IOError(f"Failed to store alert: {e}")
+            for segment, lines, records in writes.values():
+                new_records = np.array(records, dtype=_RECORD_DTYPE)
+                async with aiofiles.open(self._data_path(segment), mode="ab") as f:
+                    await f.write(b"".join(lines))
+                async with aiofiles.open(self._records_path(segment), mode="ab") as f:
+                    await f.write(new_records.tobytes())
+                if segment.records is not None:
+                    segment.records = np.concatenate([segment.records, new_records])
+        except Exception:
+            # Resynchronize the summaries with what reached the disk
+            for segment, _, _ in writes.values():
+                if self._data_path(segment).exists():
+                    await self._reindex_segment(segment)
+                else:
+                    self._drop_segment(segment)
+            raise
+
+        self._enforce_retention()
+        await self._save_index()
+
+    def _drop_segment(self, segment: _Segment) -> None:
+        """Remove a segment and its files."""
+        self._segments.pop(segment.name, None)
+        if self._active.get(segment.partition) is segment:
+            del self._active[segment.partition]
+            remaining = [
+                s for s in self._segments.values() if s.partition == segment.partition
+            ]
+            if remaining:
+                self._active[segment.partition] = max(remaining, key=lambda s: s.seq)
+        for path in (self._data_path(segment), self._records_path(segment)):
+            if path.exists():
+                path.unlink()
+
+    def _enforce_retention(self) -> None:
+        """Drop the oldest segments once the total size exceeds the budget."""
+        total_size = sum(segment.size for segment in self._segments.values())
+        for segment in reversed(self._ordered_segments()[1:]):
+            if total_size <= self.max_total_size:
+                break
+            total_size -= segment.size
+            self._drop_segment(segment)
+
+    async def _flush_pending(self) -> None:
+        """Write queued alerts in batches until the queue is empty."""
+        while self._pending:
+            batch, self._pending = self._pending, []
+            try:
+                async with self._lock:
+                    await self._ensure_loaded()
+                    await self._write_batch([alert for alert, _ in batch])
+            except Exception as e:
+                error = IOError(f"Failed to store alert: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+            else:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result(True)
+
+    async def store_alerts(self, alerts: List[Alert]) -> bool:
+        """Store several alerts in one batched append.
+
+        Alerts stored concurrently (including through ``store_alert``) are
+        coalesced into the same write.
+        """
+        if not alerts:
+            return True
+
+        loop = asyncio.get_running_loop()
+        futures = []
+        for alert in alerts:
+            future = loop.create_future()
+            self._pending.append((alert, future))
+            futures.append(future)
+
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_pending())
+
+        await asyncio.gather(*futures)
+        return True
+
+    async def store_alert(self, alert: Alert) -> bool:
+        """Store an alert in the current segment of its time partition."""
+        return await self.store_alerts([alert])
+
+    def _query_bounds(
+        self, start_time: Optional[datetime], end_time: Optional[datetime]
+    ) -> Tuple[float, float]:
+        start = _to_epoch(start_time) if start_time else -math.inf
+        end = _to_epoch(end_time) if end_time else math.inf
+        return start, end
+
+    def _candidate_segments(
+        self, start: float, end: float, severity: Optional[str]
+    ) -> List[_Segment]:
+        """Newest-first segments that may hold matching alerts."""
+        return [
+            segment
+            for segment in self._ordered_segments()
+            if segment.overlaps(start, end) and segment.matching_count(severity)
+        ]
+
+    def _match(
+        self,
+        records: np.ndarray,
+        start: float,
+        end: float,
+        severity: Optional[str],
+    ) -> np.ndarray:
+        """Mask of records matching the time range and severity."""
+        mask = (records["timestamp"] >= start) & (records["timestamp"] <= end)
+        if severity is not None:
+            mask &= records["severity"] == self._severities.index(severity)
+        return mask
 
     async def get_alerts(
         self,
@@ -289,58 +697,98 @@ class FileAlertStorage(BaseAlertStorage):
         limit: Optional[int] = None,
         offset: int = 0,
     ) -> List[Alert]:
-        """Get alerts from file storage with filtering and pagination."""
-        alerts_list = []
-        current_offset = 0
-        found_count = 0
-
-        files_to_check = [self.storage_path]
-        files_to_check.extend(
-            self.storage_path.with_suffix(f".{i}")
-            for i in range(1, self.rotation_count + 1)
-        )
+        """Get alerts from file storage with filtering and pagination.
 
-        try:
-            for file_path in files_to_check:
-                if not file_path.exists():
-                    continue
+        Alerts are returned newest first.
+        """
+        if limit is not None and limit <= 0:
+            return []
 
-                async with aiofiles.open(file_path, mode="r") as f:
-                    lines = await f.readlines()
-                    # Read in reverse for recent alerts first
-                    for line in reversed(lines):
-                        try:
-                            # Use model_validate_json for Pydantic v2+,
-                            # or parse_raw for v1
-                            alert = Alert.model_validate_json(line.strip())
-
-                            # Apply filters
-                            if start_time and alert.timestamp < start_time:
-                                continue
-                            if end_time and alert.timestamp > end_time:
-                                continue
-                            if severity and alert.severity != severity:
-                                continue
-
-                            # Handle pagination
-                            if current_offset < offset:
-                                current_offset += 1
-                                continue
-
-                            alerts_list.append(alert)
-                            found_count += 1
-                            if limit is not None and found_count >= limit:
-                                # Return early if limit reached
-                                return alerts_list
-
-                        except json.JSONDecodeError:
-                            # Log error - malformed line
-                            continue
-                        except Exception:
-                            # Log other potential parsing/validation errors
+        try:
+            async with self._lock:
+                await self._ensure_loaded()
+                start, end = self._query_bounds(start_time, end_time)
+                severity_value = severity.value if severity else None
+                if severity_value is not None and severity_value not in (
+                    self._severities
+                ):
+                    return []
+
+                # Select (segment, byte offset) of the page, newest first.
+                # Segments of one partition overlap in time, so they are
+                # merged before ordering.
+                selected: List[Tuple[_Segment, int]] = []
+                remaining_offset = offset
+                candidates = self._candidate_segments(start, end, severity_value)
+                for _, group in groupby(candidates, key=lambda s: s.partition):
+                    group = list(group)
+
+                    if all(segment.within(start, end) for segment in group):
+                        group_count = sum(
+                            segment.matching_count(severity_value) for segment in group
+                        )
+                        if group_count <= remaining_offset:
+                            remaining_offset -= group_count
                             continue
 
-            # Return whatever was found across files
+                    timestamps, offsets, owners = [], [], []
+                    for position, segment in enumerate(reversed(group)):
+                        records = await self._load_records(segment)
+                        matched = records[
+                            self._match(records, start, end, severity_value)
+                        ]
+                        timestamps.append(matched["timestamp"])
+                        offsets.append(matched["offset"])
+                        owners.append(np.full(len(matched), position))
+
+                    # Newest first; ties keep the most recently written first
+                    timestamps = np.concatenate(timestamps)[::-1]
+                    offsets = np.concatenate(offsets)[::-1]
+                    owners = np.concatenate(owners)[::-1]
+                    order = np.argsort(-timestamps, kind="stable")
+
+                    if remaining_offset >= len(order):
+                        remaining_offset -= len(order)
+                        continue
+                    order = order[remaining_offset:]
+                    remaining_offset = 0
+                    if limit is not None:
+                        order = order[: limit - len(selected)]
+
+                    ordered_group = list(reversed(group))
+                    selected.extend(
+                        (ordered_group[owner], line_offset)
+                        for owner, line_offset in zip(
+                            owners[order].tolist(), offsets[order].tolist()
+                        )
+                    )
+                    if limit is not None and len(selected) >= limit:
+                        break
+
+                # Read only the selected lines, one open file per segment
+                lines: Dict[Tuple[str, int], bytes] = {}
+                by_segment: Dict[str, List[int]] = {}
+                segments: Dict[str, _Segment] = {}
+                for segment, line_offset in selected:
+                    by_segment.setdefault(segment.name, []).append(line_offset)
+                    segments[segment.name] = segment
+                for name, line_offsets in by_segment.items():
+                    async with aiofiles.open(
+                        self._data_path(segments[name]), mode="rb"
+                    ) as f:
+                        for line_offset in sorted(line_offsets):
+                            await f.seek(line_offset)
+                            lines[(name, line_offset)] = await f.readline()
+
+            alerts_list = []
+            for segment, line_offset in selected:
+                try:
+                    alerts_list.append(
+                        Alert.model_validate_json(lines[(segment.name, line_offset)])
+                    )
+                except Exception:
+                    # Skip lines that no longer parse
+                    continue
             return alerts_list
 
         except Exception as e:
@@ -352,90 +800,137 @@ class FileAlertStorage(BaseAlertStorage):
         older_than: Optional[datetime] = None,
         severity: Optional[AlertSeverity] = None,
     ) -> int:
-        """Delete alerts from file storage with optional filtering."""
+        """Delete alerts from file storage with optional filtering.
+
+        As with the SQLite backend, an alert is deleted when it matches every
+        given filter (older than ``older_than`` and of ``severity``); with no
+        filters every alert is deleted. Segments entirely matching the filters
+        are removed without being read; others are rewritten without the
+        deleted lines.
+        """
         deleted_count = 0
-        files_to_check = [self.storage_path]
-        files_to_check.extend(
-            self.storage_path.with_suffix(f".{i}")
-            for i in range(1, self.rotation_count + 1)
-        )
+        cutoff = _to_epoch(older_than) if older_than else math.inf
+        severity_value = severity.value if severity else None
 
         async with self._lock:
-            for file_path in files_to_check:
-                if not file_path.exists():
+            await self._ensure_loaded()
+            if severity_value is not None and severity_value not in self._severities:
+                return 0
+
+            for segment in self._ordered_segments():
+                matching = segment.matching_count(severity_value)
+                if not matching or segment.min_ts >= cutoff:
                     continue
 
-                temp_file_path = file_path.with_suffix(".tmp")
-                try:
-                    async with (
-                        aiofiles.open(file_path, mode="r") as infile,
-                        aiofiles.open(temp_file_path, mode="w") as outfile,
-                    ):
-                        async for line in infile:
-                            keep_line = True
-                            try:
-                                alert = Alert.model_validate_json(line.strip())
-                                if older_than and alert.timestamp < older_than:
-                                    keep_line = False
-                                if severity and alert.severity != severity:
-                                    keep_line = False
-                            except Exception:
-                                # Keep malformed lines or log error?
-                                pass  # Decide on handling
-
-                            if keep_line:
-                                await outfile.write(line)
-                            else:
-                                deleted_count += 1
-
-                    # Replace original file with temp file
-                    file_path.unlink()
-                    temp_file_path.rename(file_path)
+                if segment.max_ts < cutoff and matching == segment.count:
+                    deleted_count += segment.count
+                    self._drop_segment(segment)
+                    continue
 
+                try:
+                    deleted_count += await self._rewrite_segment(
+                        segment, cutoff, severity_value
+                    )
                 except Exception as e:
-                    # Clean up temp file on error
-                    if temp_file_path.exists():
-                        temp_file_path.unlink()
                     # Log error
                     raise IOError(
-                        f"Failed to delete alerts in {file_path}: {e}"  # Reformat E501
+                        f"Failed to delete alerts in {self._data_path(segment)}: {e}"
                     )
+
+            await self._save_index()
         return deleted_count
 
+    async def _rewrite_segment(
+        self, segment: _Segment, cutoff: float, severity: Optional[str]
+    ) -> int:
+        """Rewrite a segment without alerts older than ``cutoff`` with the
+        given severity.
+
+        Returns:
+            Number of alerts deleted
+        """
+        records = await self._load_records(segment)
+        delete_mask = records["timestamp"] < cutoff
+        if severity is not None:
+            delete_mask &= records["severity"] == self._severities.index(severity)
+        deleted = int(delete_mask.sum())
+        if not deleted:
+            return 0
+        if deleted == segment.count:
+            self._drop_segment(segment)
+            return deleted
+
+        data_path = self._data_path(segment)
+        async with aiofiles.open(data_path, mode="rb") as f:
+            data = await f.read()
+
+        kept_records = records[~delete_mask].copy()
+        chunks = []
+        position = 0
+        for record_index, line_offset in enumerate(kept_records["offset"].tolist()):
+            line_end = data.find(b"\n", line_offset) + 1 or len(data)
+            chunks.append(data[line_offset:line_end])
+            kept_records["offset"][record_index] = position
+            position += line_end - line_offset
+
+        temp_data_path = data_path.with_suffix(".tmp")
+        temp_records_path = self._records_path(segment).with_suffix(".idx.tmp")
+        try:
+            async with aiofiles.open(temp_data_path, mode="wb") as f:
+                await f.write(b"".join(chunks))
+            async with aiofiles.open(temp_records_path, mode="wb") as f:
+                await f.write(kept_records.tobytes())
+            os.replace(temp_data_path, data_path)
+            os.replace(temp_records_path, self._records_path(segment))
+        finally:
+            for temp_path in (temp_data_path, temp_records_path):
+                if temp_path.exists():
+                    temp_path.unlink()
+
+        codes = np.bincount(kept_records["severity"], minlength=len(self._severities))
+        segment.records = kept_records
+        segment.count = len(kept_records)
+        segment.size = position
+        segment.min_ts = float(kept_records["timestamp"].min())
+        segment.max_ts = float(kept_records["timestamp"].max())
+        segment.severity_counts = {
+            self._severities[code]: int(count)
+            for code, count in enumerate(codes.tolist())
+            if count
+        }
+        return deleted
+
     async def get_alert_count(
         self,
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None,
         severity: Optional[AlertSeverity] = None,
     ) -> int:
-        """Get count of alerts from file storage with optional filtering."""
-        count = 0
-        files_to_check = [self.storage_path]
-        files_to_check.extend(
-            self.storage_path.with_suffix(f".{i}")
-            for i in range(1, self.rotation_count + 1)
-        )
+        """Get count of alerts from file storage with optional filtering.
 
+        Segments entirely within the time range are counted from the index;
+        only segments straddling a range boundary consult their records.
+        """
         try:
-            for file_path in files_to_check:
-                if not file_path.exists():
-                    continue
-                async with aiofiles.open(file_path, mode="r") as f:
-                    async for line in f:
-                        try:
-                            alert = Alert.model_validate_json(line.strip())
-                            # Apply filters
-                            if start_time and alert.timestamp < start_time:
-                                continue
-                            if end_time and alert.timestamp > end_time:
-                                continue
-                            if severity and alert.severity != severity:
-                                continue
-                            count += 1
-                        except Exception:
-                            # Skip malformed lines
-                            continue
-            return count
+            async with self._lock:
+                await self._ensure_loaded()
+                start, end = self._query_bounds(start_time, end_time)
+                severity_value = severity.value if severity else None
+                if severity_value is not None and severity_value not in (
+                    self._severities
+                ):
+                    return 0
+
+                count = 0
+                for segment in self._candidate_segments(start, end, severity_value):
+                    if segment.within(start, end):
+                        count += segment.matching_count(severity_value)
+                    else:
+                        records = await self._load_records(segment)
+                        count += int(
+                            self._match(records, start, end, severity_value).sum()
+                        )
+                return count
         except Exception as e:
             # Log error
             raise IOError(f"Failed to count alerts: {e}")
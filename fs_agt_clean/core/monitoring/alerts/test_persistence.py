@@ -0,0 +1,224 @@
+"""
+Tests for persistence.py
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from fs_agt_clean.core.monitoring.alert_types import AlertType
+from fs_agt_clean.core.monitoring.alerts.models import Alert, AlertSeverity
+from fs_agt_clean.core.monitoring.alerts.persistence import FileAlertStorage
+from fs_agt_clean.core.monitoring.metric_types import MetricType
+
+START = datetime(2026, 3, 1, tzinfo=timezone.utc)
+SEVERITIES = list(AlertSeverity)
+
+
+def make_alert(index, timestamp, severity=AlertSeverity.LOW):
+    return Alert(
+        id=f"a{index}",
+        timestamp=timestamp,
+        severity=severity,
+        alert_type=AlertType.PERFORMANCE,
+        component="api",
+        source="test",
+        message=f"alert {index}",
+        metric_type=MetricType.GAUGE,
+        metric_value=float(index),
+        threshold=1.0,
+    )
+
+
+def random_alerts(rng, count):
+    """Alerts with distinct timestamps over six hours, in random order."""
+    seconds = rng.sample(range(6 * 3600), count)
+    return [
+        make_alert(i, START + timedelta(seconds=s), rng.choice(SEVERITIES))
+        for i, s in enumerate(seconds)
+    ]
+
+
+def expected_alerts(alerts, start_time=None, end_time=None, severity=None):
+    """Brute-force filter, newest first."""
+    matched = [
+        alert
+        for alert in alerts
+        if (start_time is None or alert.timestamp >= start_time)
+        and (end_time is None or alert.timestamp <= end_time)
+        and (severity is None or alert.severity == severity)
+    ]
+    return sorted(matched, key=lambda alert: alert.timestamp, reverse=True)
+
+
+def ids(alerts):
+    return [alert.id for alert in alerts]
+
+
+class TestQueries:
+    """Tests for get_alerts and get_alert_count."""
+
+    @pytest.mark.asyncio
+    async def test_matches_brute_force(self, tmp_path):
+        """Filtered, paged queries equal filtering every alert."""
+        rng = random.Random(2)
+        storage = FileAlertStorage(tmp_path, max_file_size=4096, rotation_count=100)
+        alerts = random_alerts(rng, 300)
+        for start in range(0, len(alerts), 50):
+            await storage.store_alerts(alerts[start : start + 50])
+        assert len(list(tmp_path.glob("*.jsonl"))) > 6
+
+        for _ in range(100):
+            start_time = end_time = severity = None
+            if rng.random() < 0.6:
+                start_time = START + timedelta(seconds=rng.randrange(6 * 3600))
+            if rng.random() < 0.6:
+                end_time = START + timedelta(seconds=rng.randrange(6 * 3600))
+            if rng.random() < 0.5:
+                severity = rng.choice(SEVERITIES)
+            expected = expected_alerts(alerts, start_time, end_time, severity)
+
+            count = await storage.get_alert_count(start_time, end_time, severity)
+            assert count == len(expected)
+            limit, offset = rng.choice([None, 1, 10, 40]), rng.randrange(30)
+            page = await storage.get_alerts(
+                start_time, end_time, severity, limit=limit, offset=offset
+            )
+            end = None if limit is None else offset + limit
+            assert ids(page) == ids(expected[offset:end])
+
+    @pytest.mark.asyncio
+    async def test_reload_from_index(self, tmp_path):
+        """A new instance answers from the saved index and segment files."""
+        alerts = random_alerts(random.Random(3), 40)
+        await FileAlertStorage(tmp_path).store_alerts(alerts)
+
+        reopened = FileAlertStorage(tmp_path)
+        assert await reopened.get_alert_count() == 40
+        assert ids(await reopened.get_alerts(limit=5)) == ids(
+            expected_alerts(alerts)[:5]
+        )
+
+
+class TestRetention:
+    """Tests for dropping the oldest segments."""
+
+    @pytest.mark.asyncio
+    async def test_oldest_segments_dropped(self, tmp_path):
+        """Total size stays within the budget and the newest alerts are kept."""
+        storage = FileAlertStorage(tmp_path, max_file_size=2048, rotation_count=2)
+        alerts = [make_alert(i, START + timedelta(minutes=i)) for i in range(100)]
+        for alert in alerts:
+            await storage.store_alert(alert)
+
+        total = sum(path.stat().st_size for path in tmp_path.glob("*.jsonl"))
+        assert total <= storage.max_total_size
+        kept = await storage.get_alerts()
+        assert 0 < len(kept) < 100
+        assert ids(kept) == ids(expected_alerts(alerts)[: len(kept)])
+
+
+class TestRecovery:
+    """Tests for rebuilding the index from segment files."""
+
+    @pytest.mark.asyncio
+    async def test_reindex_after_truncated_write(self, tmp_path):
+        """A partial last line is dropped and later writes stay readable."""
+        alerts = [make_alert(i, START + timedelta(seconds=i)) for i in range(10)]
+        await FileAlertStorage(tmp_path).store_alerts(alerts)
+
+        (segment_path,) = tmp_path.glob("*.jsonl")
+        data = segment_path.read_bytes()
+        segment_path.write_bytes(data[: data.rfind(b"\n", 0, -1) + 20])
+
+        storage = FileAlertStorage(tmp_path)
+        assert await storage.get_alert_count() == 9
+        extra = make_alert(10, START + timedelta(seconds=10))
+        await storage.store_alert(extra)
+
+        # Rebuilding from the data file alone still finds every alert
+        (tmp_path / FileAlertStorage.INDEX_FILE).unlink()
+        reopened = FileAlertStorage(tmp_path)
+        assert await reopened.get_alert_count() == 10
+        assert ids(await reopened.get_alerts(limit=2)) == ["a10", "a8"]
+
+    @pytest.mark.asyncio
+    async def test_missing_index_rebuilt(self, tmp_path):
+        """Segments are reindexed when the sidecar files are gone."""
+        alerts = random_alerts(random.Random(4), 30)
+        await FileAlertStorage(tmp_path).store_alerts(alerts)
+        (tmp_path / FileAlertStorage.INDEX_FILE).unlink()
+        for path in tmp_path.glob("*.idx"):
+            path.unlink()
+
+        storage = FileAlertStorage(tmp_path)
+        high = AlertSeverity.HIGH
+        assert await storage.get_alert_count(severity=high) == len(
+            expected_alerts(alerts, severity=high)
+        )
+        assert ids(await storage.get_alerts()) == ids(expected_alerts(alerts))
+
+    @pytest.mark.asyncio
+    async def test_legacy_log_imported(self, tmp_path):
+        """Alerts in an old rotated log are imported and the files removed."""
+        log_path = tmp_path / "alerts.log"
+        current = [make_alert(i, START + timedelta(hours=i)) for i in range(3)]
+        rotated = [make_alert(i, START - timedelta(hours=i)) for i in range(3, 5)]
+        log_path.write_text("".join(a.model_dump_json() + "\n" for a in current))
+        log_path.with_suffix(".1").write_text(
+            "".join(a.model_dump_json() + "\n" for a in rotated) + "not json\n"
+        )
+
+        storage = FileAlertStorage(log_path)
+        assert ids(await storage.get_alerts()) == ids(
+            expected_alerts(current + rotated)
+        )
+        assert not log_path.exists()
+        assert not log_path.with_suffix(".1").exists()
+        assert storage.segment_dir == tmp_path / "alerts.log.segments"
+
+
+class TestDelete:
+    """Tests for delete_alerts."""
+
+    @pytest.mark.asyncio
+    async def test_deletes_alerts_matching_all_filters(self, tmp_path):
+        """Only alerts older than the cutoff and of the severity are deleted."""
+        alerts = random_alerts(random.Random(5), 200)
+        storage = FileAlertStorage(tmp_path, max_file_size=4096, rotation_count=100)
+        await storage.store_alerts(alerts)
+
+        cutoff = START + timedelta(hours=3)
+        deleted = await storage.delete_alerts(
+            older_than=cutoff, severity=AlertSeverity.HIGH
+        )
+        removed = [
+            a
+            for a in alerts
+            if a.timestamp < cutoff and a.severity == AlertSeverity.HIGH
+        ]
+        assert deleted == len(removed)
+        kept = [a for a in alerts if a not in removed]
+        assert ids(await storage.get_alerts()) == ids(expected_alerts(kept))
+        assert await storage.get_alert_count() == len(kept)
+
+    @pytest.mark.asyncio
+    async def test_older_than_only(self, tmp_path):
+        """Without a severity every alert older than the cutoff is deleted."""
+        alerts = random_alerts(random.Random(6), 100)
+        storage = FileAlertStorage(tmp_path)
+        await storage.store_alerts(alerts)
+        cutoff = START + timedelta(hours=2)
+        kept = expected_alerts(alerts, start_time=cutoff)
+        assert await storage.delete_alerts(older_than=cutoff) == 100 - len(kept)
+        assert ids(await storage.get_alerts()) == ids(kept)
+
+    @pytest.mark.asyncio
+    async def test_no_filters_deletes_all(self, tmp_path):
+        """With no filters every alert is deleted."""
+        storage = FileAlertStorage(tmp_path)
+        await storage.store_alerts(random_alerts(random.Random(7), 20))
+        assert await storage.delete_alerts() == 20
+        assert await storage.get_alert_count() == 0
+        assert not list(tmp_path.glob("*.jsonl"))
@@ -0,0 +1,172 @@
+"""Token-level multi-pattern phrase matching.
+
+Compiles any number of keyword phrases into a single Aho-Corasick automaton
+over normalized tokens so that a text can be matched against the whole
+vocabulary in one left-to-right scan, independent of the number of phrases.
+"""
+
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+# Word runs and single punctuation characters, mirroring regex ``\b`` boundaries
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word and punctuation tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+@dataclass(frozen=True)
+class PhraseHit:
+    """A single phrase occurrence found during a scan."""
+
+    start: int
+    end: int
+    phrase: str
+    payload: Any
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton whose alphabet is tokens rather than characters.
+
+    Phrases are registered with an arbitrary payload (for example an
+    ``(intent, weight)`` pair). The same phrase may be registered several
+    times with different payloads; every payload is reported for each hit.
+    """
+
+    def __init__(self) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Phrases ending at each state, and those plus the phrases of its
+        # failure chain (rebuilt by every compile)
+        self._own_output: List[List[Tuple[int, str, Any]]] = [[]]
+        self._output: List[List[Tuple[int, str, Any]]] = [[]]
+        self._compiled = True
+
+    def add(self, phrase: str, payload: Any = None) -> None:
+        """Register a phrase with its payload."""
+        tokens = tokenize(phrase)
+        if not tokens:
+            return
+
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._own_output.append([])
+                self._output.append([])
+                self._goto[state][token] = next_state
+            state = next_state
+
+        self._own_output[state].append((len(tokens), phrase, payload))
+        self._compiled = False
+
+    def add_many(self, phrases: Iterable[str], payload: Any = None) -> None:
+        """Register several phrases sharing the same payload."""
+        for phrase in phrases:
+            self.add(phrase, payload)
+
+    def compile(self) -> "PhraseMatcher":
+        """Build failure links; called lazily on the first scan after ``add``."""
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            self._output[state] = list(self._own_output[state])
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                # Inherit outputs of the longest proper suffix state, which is
+                # shallower and so already rebuilt
+                self._output[next_state] = (
+                    self._own_output[next_state]
+                    + self._output[self._fail[next_state]]
+                )
+
+        self._compiled = True
+        return self
+
+    @property
+    def state_count(self) -> int:
+        """Number of automaton states (trie nodes)."""
+        return len(self._goto)
+
+    def scan_tokens(self, tokens: List[str]) -> List[PhraseHit]:
+        """Return every phrase occurrence in an already tokenized text."""
+        if not self._compiled:
+            self.compile()
+
+        hits: List[PhraseHit] = []
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+
+        for index, token in enumerate(tokens):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for length, phrase, payload in output[state]:
+                hits.append(PhraseHit(index - length + 1, index + 1, phrase, payload))
+
+        return hits
+
+    def scan(self, text: str) -> List[PhraseHit]:
+        """Tokenize and scan a text in a single pass."""
+        return self.scan_tokens(tokenize(text))
+
+
+def select_non_overlapping(
+    hits: Iterable[PhraseHit],
+    key: Hashable = None,
+    priority: Optional[Dict[str, int]] = None,
+) -> List[PhraseHit]:
+    """Reduce overlapping hits to leftmost non-overlapping matches.
+
+    This reproduces ``re.findall`` semantics for an alternation pattern: at
+    each position the earliest-listed phrase (lowest ``priority``) wins and
+    scanning resumes after it.
+
+    Args:
+        hits: Hits to reduce
+        key: Only consider hits whose payload equals this key (if given)
+        priority: Optional phrase -> rank mapping; defaults to longest first
+    """
+    by_start: Dict[int, PhraseHit] = {}
+    for hit in hits:
+        if key is not None and hit.payload != key:
+            continue
+        current = by_start.get(hit.start)
+        if current is None:
+            by_start[hit.start] = hit
+            continue
+        if priority is not None:
+            better = priority.get(hit.phrase, 0) < priority.get(current.phrase, 0)
+        else:
+            better = hit.end > current.end
+        if better:
+            by_start[hit.start] = hit
+
+    selected: List[PhraseHit] = []
+    position = 0
+    for start in sorted(by_start):
+        if start < position:
+            continue
+        hit = by_start[start]
+        selected.append(hit)
+        position = hit.end
+
+    return selected
@@ -0,0 +1,84 @@
+"""
+Tests for phrase_matcher.py
+"""
+
+import re
+
+from fs_agt_clean.core.utils.phrase_matcher import (
+    PhraseMatcher,
+    select_non_overlapping,
+    tokenize,
+)
+
+
+def phrases_found(hits):
+    return sorted((hit.start, hit.end, hit.phrase) for hit in hits)
+
+
+class TestTokenize:
+    """Tests for tokenize."""
+
+    def test_words_and_punctuation(self):
+        assert tokenize("Don't ship, OK?") == ["don", "'", "t", "ship", ",", "ok", "?"]
+
+
+class TestPhraseMatcher:
+    """Tests for PhraseMatcher."""
+
+    def test_finds_overlapping_and_nested_phrases(self):
+        matcher = PhraseMatcher()
+        matcher.add_many(["free shipping", "shipping", "free shipping today"])
+
+        hits = matcher.scan("Get FREE shipping today!")
+
+        assert phrases_found(hits) == [
+            (1, 3, "free shipping"),
+            (1, 4, "free shipping today"),
+            (2, 3, "shipping"),
+        ]
+
+    def test_reports_every_payload(self):
+        matcher = PhraseMatcher()
+        matcher.add("refund", ("return", 1.0))
+        matcher.add("refund", ("complaint", 0.5))
+
+        payloads = [hit.payload for hit in matcher.scan("I want a refund")]
+
+        assert payloads == [("return", 1.0), ("complaint", 0.5)]
+
+    def test_matches_whole_tokens_only(self):
+        matcher = PhraseMatcher()
+        matcher.add("ship")
+
+        assert matcher.scan("shipping") == []
+        assert len(matcher.scan("we ship fast")) == 1
+
+    def test_recompile_after_scan_does_not_duplicate_hits(self):
+        matcher = PhraseMatcher()
+        matcher.add("b")
+        matcher.add("a b")
+        assert phrases_found(matcher.scan("a b")) == [(0, 2, "a b"), (1, 2, "b")]
+
+        matcher.add("c")
+        matcher.scan("c")
+        matcher.add("d")
+        matcher.compile()
+
+        assert phrases_found(matcher.scan("a b")) == [(0, 2, "a b"), (1, 2, "b")]
+
+    def test_matches_regex_alternation(self):
+        phrases = ["price", "price drop", "drop"]
+        text = "Price drop alert: price drop on drop shipping"
+        matcher = PhraseMatcher()
+        matcher.add_many(phrases, "intent")
+        pattern = re.compile(
+            r"\b(?:" + "|".join(map(re.escape, phrases)) + r")\b", re.IGNORECASE
+        )
+
+        selected = select_non_overlapping(
+            matcher.scan(text), priority={p: i for i, p in enumerate(phrases)}
+        )
+
+        assert [hit.phrase for hit in selected] == [
+            match.lower() for match in pattern.findall(text)
+        ]
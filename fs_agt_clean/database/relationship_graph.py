@@ -229,6 +229,311 @@ class Entity:
         return f"{self.name} ({self.entity_type.value})"
 
 
+class _CSRAdjacency:
+    """
+    Compressed sparse row adjacency of the relationship graph.
+
+    Outgoing and incoming edges are stored as offset/index arrays with a
+    parallel strength array, so strength-filtered traversals read slices of
+    the arrays instead of materializing a filtered copy of the graph.
+    """
+
+    def __init__(
+        self,
+        node_ids: List[str],
+        relationships: Dict[str, Dict[str, Relationship]],
+    ):
+        self.node_ids = node_ids
+        self.index = {node_id: i for i, node_id in enumerate(node_ids)}
+
+        edge_count = sum(len(targets) for targets in relationships.values())
+        sources = np.empty(edge_count, dtype=np.int64)
+        targets = np.empty(edge_count, dtype=np.int64)
+        strengths = np.empty(edge_count, dtype=np.float64)
+
+        position = 0
+        for source_id, outgoing in relationships.items():
+            source = self.index[source_id]
+            for target_id, relationship in outgoing.items():
+                sources[position] = source
+                targets[position] = self.index[target_id]
+                strengths[position] = relationship.strength
+                position += 1
+
+        # Stable sorts keep insertion order of edges within each row
+        self.indptr, self.indices, self.strengths = self._compress(
+            sources, targets, strengths, len(node_ids)
+        )
+        self.in_indptr, self.in_indices, self.in_strengths = self._compress(
+            targets, sources, strengths, len(node_ids)
+        )
+
+    @staticmethod
+    def _compress(
+        rows: np.ndarray, columns: np.ndarray, values: np.ndarray, size: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        order = np.argsort(rows, kind="stable")
+        indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=size), out=indptr[1:])
+        return indptr, columns[order], values[order]
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_ids)
+
+    def successors(self, node: int, min_strength: float = 0.0) -> List[int]:
+        """Outgoing neighbors of a node with at least the given strength."""
+        return self._row(
+            self.indptr, self.indices, self.strengths, node, min_strength
+        )
+
+    def predecessors(self, node: int, min_strength: float = 0.0) -> List[int]:
+        """Incoming neighbors of a node with at least the given strength."""
+        return self._row(
+            self.in_indptr, self.in_indices, self.in_strengths, node, min_strength
+        )
+
+    @staticmethod
+    def _row(
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        strengths: np.ndarray,
+        node: int,
+        min_strength: float,
+    ) -> List[int]:
+        start, end = indptr[node], indptr[node + 1]
+        if start == end:
+            return []
+        row = indices[start:end]
+        if min_strength > 0.0:
+            row = row[strengths[start:end] >= min_strength]
+        return row.tolist()
+
+    def distances(
+        self, node: int, max_depth: int, min_strength: float, reverse: bool = False
+    ) -> Dict[int, int]:
+        """
+        Breadth-first hop distances from a node, bounded by depth.
+
+        Args:
+            node: Start node index
+            max_depth: Maximum number of hops to explore
+            min_strength: Minimum edge strength to traverse
+            reverse: Follow incoming instead of outgoing edges
+
+        Returns:
+            Dictionary mapping reached node indices to their hop distance
+        """
+        neighbors = self.predecessors if reverse else self.successors
+        distances = {node: 0}
+        frontier = [node]
+
+        for depth in range(1, max_depth + 1):
+            next_frontier = []
+            for current in frontier:
+                for neighbor in neighbors(current, min_strength):
+                    if neighbor not in distances:
+                        distances[neighbor] = depth
+                        next_frontier.append(neighbor)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+
+        return distances
+
+    def shortest_path(
+        self, source: int, target: int, max_length: int, min_strength: float
+    ) -> Optional[List[int]]:
+        """
+        Bidirectional breadth-first search for a shortest path.
+
+        The smaller frontier is expanded one level at a time from either end,
+        so only the nodes around both endpoints are visited.
+
+        Returns:
+            Node indices from source to target, or None if no path of at most
+            ``max_length`` edges exists
+        """
+        if source == target:
+            return [source]
+
+        forward_parent = {source: -1}
+        backward_parent = {target: -1}
+        forward_frontier = [source]
+        backward_frontier = [target]
+
+        for _ in range(max_length):
+            if not forward_frontier or not backward_frontier:
+                break
+
+            forward = len(forward_frontier) <= len(backward_frontier)
+            if forward:
+                frontier, parents, others = (
+                    forward_frontier,
+                    forward_parent,
+                    backward_parent,
+                )
+                neighbors = self.successors
+            else:
+                frontier, parents, others = (
+                    backward_frontier,
+                    backward_parent,
+                    forward_parent,
+                )
+                neighbors = self.predecessors
+
+            next_frontier = []
+            for current in frontier:
+                for neighbor in neighbors(current, min_strength):
+                    if neighbor in parents:
+                        continue
+                    parents[neighbor] = current
+                    if neighbor in others:
+                        return self._join(forward_parent, backward_parent, neighbor)
+                    next_frontier.append(neighbor)
+
+            if forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+
+        return None
+
+    @staticmethod
+    def _join(
+        forward_parent: Dict[int, int], backward_parent: Dict[int, int], meeting: int
+    ) -> List[int]:
+        path = []
+        node = meeting
+        while node != -1:
+            path.append(node)
+            node = forward_parent[node]
+        path.reverse()
+
+        node = backward_parent[meeting]
+        while node != -1:
+            path.append(node)
+            node = backward_parent[node]
+        return path
+
+    def simple_paths(
+        self, source: int, target: int, max_length: int, min_strength: float
+    ) -> Iterator[List[int]]:
+        """
+        Enumerate simple paths of at most ``max_length`` edges.
+
+        Depth-first search is pruned with the hop distances to the target, so
+        branches that cannot reach it within the remaining budget are never
+        expanded.
+        """
+        if source == target or max_length < 1:
+            return
+
+        to_target = self.distances(target, max_length, min_strength, reverse=True)
+        if source not in to_target:
+            return
+
+        path = [source]
+        on_path = {source}
+        stack = [iter(self.successors(source, min_strength))]
+
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                on_path.discard(path.pop())
+                continue
+
+            if child == target:
+                yield path + [target]
+                continue
+
+            remaining = max_length - len(path)
+            if child in on_path or to_target.get(child, remaining + 1) > remaining:
+                continue
+
+            path.append(child)
+            on_path.add(child)
+            stack.append(iter(self.successors(child, min_strength)))
+
+    def degree_centrality(self) -> np.ndarray:
+        """Total degree per node normalized by the maximum possible degree."""
+        degrees = np.diff(self.indptr) + np.diff(self.in_indptr)
+        if self.node_count <= 1:
+            return np.ones(self.node_count)
+        return degrees / (self.node_count - 1)
+
+    def closeness_centrality(self) -> np.ndarray:
+        """Closeness over incoming distances with Wasserman-Faust scaling."""
+        size = self.node_count
+        centrality = np.zeros(size)
+
+        for node in range(size):
+            distances = self.distances(node, size, 0.0, reverse=True)
+            total = sum(distances.values())
+            reached = len(distances) - 1
+            if total > 0 and size > 1:
+                centrality[node] = (reached / total) * (reached / (size - 1))
+
+        return centrality
+
+    def betweenness_centrality(self) -> np.ndarray:
+        """Normalized shortest-path betweenness (Brandes' algorithm)."""
+        size = self.node_count
+        centrality = np.zeros(size)
+
+        for source in range(size):
+            order = []
+            predecessors: Dict[int, List[int]] = {source: []}
+            paths = {source: 1}
+            distance = {source: 0}
+            frontier = [source]
+
+            while frontier:
+                next_frontier = []
+                for node in frontier:
+                    order.append(node)
+                    for neighbor in self.successors(node):
+                        if neighbor not in distance:
+                            distance[neighbor] = distance[node] + 1
+                            paths[neighbor] = 0
+                            predecessors[neighbor] = []
+                            next_frontier.append(neighbor)
+                        if distance[neighbor] == distance[node] + 1:
+                            paths[neighbor] += paths[node]
+                            predecessors[neighbor].append(node)
+                frontier = next_frontier
+
+            dependency = dict.fromkeys(order, 0.0)
+            for node in reversed(order):
+                coefficient = (1.0 + dependency[node]) / paths[node]
+                for predecessor in predecessors[node]:
+                    dependency[predecessor] += paths[predecessor] * coefficient
+                if node != source:
+                    centrality[node] += dependency[node]
+
+        if size > 2:
+            centrality *= 1.0 / ((size - 1) * (size - 2))
+        return centrality
+
+    def eigenvector_centrality(self) -> np.ndarray:
+        """Eigenvector centrality from the sparse adjacency matrix."""
+        import scipy.sparse
+        import scipy.sparse.linalg
+
+        size = self.node_count
+        adjacency = scipy.sparse.csr_matrix(
+            (np.ones(len(self.indices)), self.indices, self.indptr),
+            shape=(size, size),
+        )
+        _, eigenvector = scipy.sparse.linalg.eigs(
+            adjacency.T.astype(float), k=1, which="LR", maxiter=50 * size, tol=0
+        )
+        largest = eigenvector.flatten().real
+        norm = np.sign(largest.sum()) * np.linalg.norm(largest)
+        return largest / norm
+
+
 class RelationshipGraph:
     """
     Graph-based model for entity relationships.
@@ -243,6 +548,31 @@ class RelationshipGraph:
         self.graph = nx.DiGraph()
         self.entities: Dict[str, Entity] = {}
         self.relationships: Dict[str, Dict[str, Relationship]] = {}
+        # Compact adjacency for traversals, rebuilt lazily after changes
+        self._adjacency: Optional[_CSRAdjacency] = None
+
+    def _get_adjacency(self) -> _CSRAdjacency:
+        """Get the CSR adjacency, rebuilding it if the graph changed."""
+        if self._adjacency is None:
+            self._adjacency = _CSRAdjacency(list(self.entities), self.relationships)
+        return self._adjacency
+
+    def _to_entity_path(
+        self, adjacency: _CSRAdjacency, path: List[int]
+    ) -> List[Tuple[Entity, Relationship]]:
+        """Convert a path of node indices to (entity, relationship) tuples."""
+        result = []
+        for i in range(len(path) - 1):
+            current_id = adjacency.node_ids[path[i]]
+            next_id = adjacency.node_ids[path[i + 1]]
+
+            current_entity = self.entities.get(current_id)
+            relationship = self.relationships[current_id].get(next_id)
+
+            if current_entity and relationship:
+                result.append((current_entity, relationship))
+
+        return result
 
     def add_entity(self, entity: Entity) -> None:
         """
@@ -252,6 +582,8 @@ class RelationshipGraph:
             entity: Entity to add
         """
         # Store the entity
+        if entity.entity_id not in self.entities:
+            self._adjacency = None
         self.entities[entity.entity_id] = entity
 
         # Add to graph with attributes
@@ -290,6 +622,7 @@ class RelationshipGraph:
 
         # Store the relationship
         self.relationships[source_id][target_id] = relationship
+        self._adjacency = None
 
         # Add to graph with attributes
         self.graph.add_edge(
@@ -454,37 +787,18 @@ class RelationshipGraph:
         Returns:
             List of (entity, relationship) tuples representing the path
         """
-        # Create a subgraph with edges meeting the strength threshold
-        subgraph = nx.DiGraph()
-
-        for u, v, data in self.graph.edges(data=True):
-            if data["strength"] >= min_strength:
-                subgraph.add_edge(u, v)
-
-        # Try to find a path
-        try:
-            path = nx.shortest_path(subgraph, source_id, target_id, weight=None)
-
-            # Check if path is within max length
-            if len(path) > max_length + 1:
-                return []
-
-            # Convert path to entity-relationship format
-            result = []
-            for i in range(len(path) - 1):
-                current_id = path[i]
-                next_id = path[i + 1]
-
-                current_entity = self.entities.get(current_id)
-                relationship = self.get_relationship(current_id, next_id)
-
-                if current_entity and relationship:
-                    result.append((current_entity, relationship))
+        adjacency = self._get_adjacency()
+        source = adjacency.index.get(source_id)
+        target = adjacency.index.get(target_id)
+        if source is None or target is None:
+            return []
 
-            return result
-        except nx.NetworkXNoPath:
+        path = adjacency.shortest_path(source, target, max_length, min_strength)
+        if path is None:
             return []
 
+        return self._to_entity_path(adjacency, path)
+
     def find_all_paths(
         self,
         source_id: str,
@@ -504,39 +818,18 @@ class RelationshipGraph:
         Returns:
             List of paths, each a list of (entity, relationship) tuples
         """
-        # Create a subgraph with edges meeting the strength threshold
-        subgraph = nx.DiGraph()
-
-        for u, v, data in self.graph.edges(data=True):
-            if data["strength"] >= min_strength:
-                subgraph.add_edge(u, v)
+        adjacency = self._get_adjacency()
+        source = adjacency.index.get(source_id)
+        target = adjacency.index.get(target_id)
+        if source is None or target is None:
+            return []
 
-        # Try to find all paths
-        try:
-            all_paths = list(
-                nx.all_simple_paths(subgraph, source_id, target_id, cutoff=max_length)
+        return [
+            self._to_entity_path(adjacency, path)
+            for path in adjacency.simple_paths(
+                source, target, max_length, min_strength
             )
-
-            # Convert paths to entity-relationship format
-            result = []
-
-            for path in all_paths:
-                path_result = []
-                for i in range(len(path) - 1):
-                    current_id = path[i]
-                    next_id = path[i + 1]
-
-                    current_entity = self.entities.get(current_id)
-                    relationship = self.get_relationship(current_id, next_id)
-
-                    if current_entity and relationship:
-                        path_result.append((current_entity, relationship))
-
-                result.append(path_result)
-
-            return result
-        except (nx.NetworkXNoPath, nx.NetworkXError):
-            return []
+        ]
 
     def get_entity_neighborhood(
         self, entity_id: str, depth: int = 1, min_strength: float = 0.0
@@ -555,43 +848,43 @@ class RelationshipGraph:
         if entity_id not in self.entities:
             return {"entity_id": entity_id, "found": False}
 
-        # Create a subgraph with edges meeting the strength threshold
-        subgraph = nx.DiGraph()
+        adjacency = self._get_adjacency()
 
-        for u, v, data in self.graph.edges(data=True):
-            if data["strength"] >= min_strength:
-                subgraph.add_edge(u, v)
-
-        # Get neighborhood nodes
-        neighborhood = set()
-        current_nodes = {entity_id}
+        # Breadth-first search over both edge directions
+        neighborhood = {adjacency.index[entity_id]}
+        frontier = list(neighborhood)
 
         for _ in range(depth):
-            next_nodes = set()
-
-            for node in current_nodes:
-                # Add outgoing neighbors
-                next_nodes.update(subgraph.successors(node))
-
-                # Add incoming neighbors
-                next_nodes.update(subgraph.predecessors(node))
-
-            neighborhood.update(current_nodes)
-            current_nodes = next_nodes - neighborhood
+            next_frontier = []
+            for node in frontier:
+                for neighbor in adjacency.successors(node, min_strength):
+                    if neighbor not in neighborhood:
+                        neighborhood.add(neighbor)
+                        next_frontier.append(neighbor)
+                for neighbor in adjacency.predecessors(node, min_strength):
+                    if neighbor not in neighborhood:
+                        neighborhood.add(neighbor)
+                        next_frontier.append(neighbor)
+            if not next_frontier:
+                break
+            frontier = next_frontier
 
         # Convert to entity-relationship structure
         entities = {}
         relationships = []
 
-        for node_id in neighborhood:
-            if node_id in self.entities:
-                entities[node_id] = self.entities[node_id].to_dict()
+        for node in neighborhood:
+            node_id = adjacency.node_ids[node]
+            entities[node_id] = self.entities[node_id].to_dict()
 
-        for source_id in neighborhood:
-            for target_id in neighborhood:
-                relationship = self.get_relationship(source_id, target_id)
-                if relationship and relationship.strength >= min_strength:
-                    relationships.append(relationship.to_dict())
+        for node in neighborhood:
+            source_id = adjacency.node_ids[node]
+            for neighbor in adjacency.successors(node, min_strength):
+                if neighbor in neighborhood:
+                    target_id = adjacency.node_ids[neighbor]
+                    relationships.append(
+                        self.relationships[source_id][target_id].to_dict()
+                    )
 
         return {
             "entity_id": entity_id,
@@ -611,18 +904,20 @@ class RelationshipGraph:
         Returns:
             Dictionary mapping entity IDs to centrality values
         """
+        adjacency = self._get_adjacency()
+
         if centrality_type == "degree":
-            centrality = nx.degree_centrality(self.graph)
+            values = adjacency.degree_centrality()
         elif centrality_type == "betweenness":
-            centrality = nx.betweenness_centrality(self.graph)
+            values = adjacency.betweenness_centrality()
         elif centrality_type == "closeness":
-            centrality = nx.closeness_centrality(self.graph)
+            values = adjacency.closeness_centrality()
         elif centrality_type == "eigenvector":
-            centrality = nx.eigenvector_centrality_numpy(self.graph)
+            values = adjacency.eigenvector_centrality()
         else:
             raise ValueError(f"Unsupported centrality type: {centrality_type}")
 
-        return centrality
+        return dict(zip(adjacency.node_ids, values.tolist()))
 
     def find_communities(self, algorithm: str = "louvain") -> List[Set[str]]:
         """
@@ -9,7 +9,7 @@ import uuid
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import desc, func, select, text
+from sqlalchemy import and_, desc, func, or_, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -190,6 +190,45 @@ class ChatRepository(BaseRepository):
         result = await session.execute(query)
         return result.scalars().all()
 
+    async def get_messages_since(
+        self,
+        session: AsyncSession,
+        conversation_id: str,
+        after_message_id: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Message]:
+        """Get the latest messages of a conversation newer than a given message.
+
+        Args:
+            session: Database session
+            conversation_id: ID of the conversation
+            after_message_id: Only return messages after this one (optional)
+            limit: Maximum number of messages to return
+
+        Returns:
+            Up to ``limit`` most recent matching messages, oldest first
+        """
+        query = select(Message).where(
+            Message.conversation_id == uuid.UUID(conversation_id)
+        )
+        if after_message_id:
+            after_id = uuid.UUID(after_message_id)
+            after_timestamp = (
+                select(Message.timestamp)
+                .where(Message.id == after_id)
+                .scalar_subquery()
+            )
+            query = query.where(
+                or_(
+                    Message.timestamp > after_timestamp,
+                    and_(Message.timestamp == after_timestamp, Message.id > after_id),
+                )
+            )
+        query = query.order_by(desc(Message.timestamp), desc(Message.id)).limit(limit)
+
+        result = await session.execute(query)
+        return list(reversed(result.scalars().all()))
+
     async def get_message(
         self, session: AsyncSession, message_id: str
     ) -> Optional[Message]:
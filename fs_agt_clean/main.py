@@ -9,6 +9,8 @@ import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from fs_agt_clean.core.ai.image_pipeline import shutdown_image_pool
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -49,6 +51,7 @@ async def shutdown_event() -> None:
     """Clean up resources on shutdown."""
     logger.info("Shutting down FlipSync API")
     # Clean up resources here
+    shutdown_image_pool()
 
 
 if __name__ == "__main__":
@@ -30,6 +30,10 @@ from fs_agt_clean.agents.content.content_agent import ContentUnifiedAgent
 from fs_agt_clean.agents.executive.executive_agent import ExecutiveUnifiedAgent
 from fs_agt_clean.agents.logistics.logistics_agent import LogisticsUnifiedAgent
 from fs_agt_clean.agents.market.market_agent import MarketUnifiedAgent
+from fs_agt_clean.core.coordination.coordinator.consensus_engine import (
+    CandidateBatch,
+    ConsensusEngine,
+)
 from fs_agt_clean.core.websocket.manager import websocket_manager
 from fs_agt_clean.database.repositories.ai_analysis_repository import (
     UnifiedAgentCoordinationRepository,
@@ -297,6 +301,7 @@ class UnifiedAgentOrchestrationService:
         self.active_workflows: Dict[str, UnifiedAgentWorkflow] = {}
         self.active_handoffs: Dict[str, UnifiedAgentHandoff] = {}
         self.agent_registry: Dict[str, BaseConversationalUnifiedAgent] = {}
+        self.consensus_engine = ConsensusEngine()
         self.workflow_templates: Dict[str, WorkflowTemplate] = {}
         self._coordination_repository = None
         self._persistence_manager = None
@@ -1964,29 +1969,21 @@ class UnifiedAgentOrchestrationService:
                     "reasoning": "No agent decisions available",
                 }
 
-            # Count decisions and calculate weighted scores
-            decision_counts = {}
-            total_confidence = 0
-            weighted_decisions = {}
-
-            for agent_type, decision_data in agent_decisions.items():
-                decision = decision_data.get("decision", "abstain")
-                confidence = decision_data.get("confidence", 0.0)
-
-                if decision not in decision_counts:
-                    decision_counts[decision] = 0
-                    weighted_decisions[decision] = 0
-
-                decision_counts[decision] += 1
-                weighted_decisions[decision] += confidence
-                total_confidence += confidence
+            # Confidence-weighted vote over the decisions
+            decisions = list(agent_decisions.values())
+            vote = self.consensus_engine.resolve_batch(
+                CandidateBatch.from_values(
+                    [[d.get("decision", "abstain") for d in decisions]],
+                    [[d.get("confidence", 0.0) for d in decisions]],
+                )
+            )[0]
+            decision_counts = vote.counts
+            weighted_decisions = vote.votes
 
             # Find the decision with highest weighted score
-            if total_confidence > 0:
-                best_decision = max(
-                    weighted_decisions.keys(), key=lambda k: weighted_decisions[k]
-                )
-                consensus_score = weighted_decisions[best_decision] / total_confidence
+            if vote.total_weight > 0:
+                best_decision = vote.winner
+                consensus_score = vote.consensus_score
             else:
                 best_decision = "no_consensus"
                 consensus_score = 0.0
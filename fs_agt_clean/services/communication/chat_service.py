@@ -8,7 +8,10 @@ agent routing, and conversation persistence using the database layer.
 
 import json
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 import tiktoken
@@ -54,6 +57,9 @@ from fs_agt_clean.services.chatbot.agent_connectivity_service import (
     UnifiedAgentConnectivityService,
 )
 from fs_agt_clean.services.communication.agent_router import UnifiedAgentRouter, UnifiedAgentType
+from fs_agt_clean.services.communication.conversation_window import (
+    ConversationWindowManager,
+)
 
 # FlipSync AI components
 from fs_agt_clean.services.communication.intent_recognizer import IntentRecognizer
@@ -66,6 +72,15 @@ from fs_agt_clean.services.communication.intent_recognizer import IntentRecogniz
 
 logger = logging.getLogger(__name__)
 
+# Model whose tokenizer measures conversation context windows
+CONTEXT_MODEL = "gpt-4o-mini"
+
+
+@lru_cache(maxsize=4096)
+def _encoded_length(encoder: tiktoken.Encoding, text: str) -> int:
+    """Token count of a text, cached for repeated texts."""
+    return len(encoder.encode(text))
+
 
 class EnhancedChatService:
     """Enhanced chat service with AI routing and database persistence."""
@@ -119,6 +134,16 @@ class EnhancedChatService:
         self.encoders = {}  # Cache for tiktoken encoders
         self.token_usage = {}  # Track token usage per user
 
+        # Per-user session state above is evicted LRU + TTL
+        self.user_activity: "OrderedDict[str, float]" = OrderedDict()
+        self.max_active_users = 1000
+        self.user_idle_ttl = 3600.0
+
+        # Token-budgeted conversation history windows
+        self.context_windows = ConversationWindowManager(
+            token_counter=lambda text: self._count_tokens(text, CONTEXT_MODEL)
+        )
+
         logger.info(
             "Enhanced ChatService initialized with AI routing and approval integration"
         )
@@ -291,8 +316,27 @@ class EnhancedChatService:
 
     def _count_tokens(self, text: str, model: str) -> int:
         """Count tokens in text for specific model."""
-        encoder = self._get_encoder(model)
-        return len(encoder.encode(text))
+        return _encoded_length(self._get_encoder(model), text)
+
+    def _touch_user(self, user_id: str) -> None:
+        """Mark a user active and evict idle or least recently active users."""
+        now = time.monotonic()
+        self.user_activity[user_id] = now
+        self.user_activity.move_to_end(user_id)
+
+        cutoff = now - self.user_idle_ttl
+        while self.user_activity:
+            oldest, last_seen = next(iter(self.user_activity.items()))
+            within_limit = len(self.user_activity) <= self.max_active_users
+            if within_limit and last_seen >= cutoff:
+                break
+            self._evict_user(oldest)
+
+    def _evict_user(self, user_id: str) -> None:
+        """Drop the in-memory session state of a user."""
+        self.user_activity.pop(user_id, None)
+        for store in (self.memories, self.chains, self.token_usage, self.user_contexts):
+            store.pop(user_id, None)
 
     def _update_token_usage(
         self,
@@ -550,6 +594,7 @@ class EnhancedChatService:
         """Handle incoming chat messages with enhanced Langchain memory management."""
         try:
             # Initialize or get Langchain components
+            self._touch_user(user_id)
             self._initialize_user_memory(user_id, app_context)
 
             # Count input tokens
@@ -712,61 +757,75 @@ UnifiedUser Message: {message}"""
 
     # Enhanced chat service helper methods
 
+    @staticmethod
+    def _message_to_dict(msg) -> Dict[str, Any]:
+        """Convert a stored message to a conversation history entry."""
+        return {
+            "id": str(msg.id),
+            "content": msg.content,
+            "sender": msg.sender,
+            "agent_type": msg.agent_type,
+            "timestamp": msg.timestamp.isoformat(),
+            "metadata": msg.extra_metadata,
+            "conversation_id": str(msg.conversation_id),  # Include for verification
+        }
+
     async def _get_conversation_history(self, conversation_id: str) -> List[Dict]:
-        """Get conversation history from database with strict conversation isolation."""
-        try:
-            if not self.database:
-                logger.warning("Database not available for conversation history")
-                return []
+        """
+        Get conversation history with strict conversation isolation.
 
+        History is served from the conversation's context window; only
+        messages newer than the last one in the window are read from the
+        database.
+        """
+        try:
             # CRITICAL: Validate conversation_id to prevent contamination
             if not conversation_id or not isinstance(conversation_id, str):
                 logger.error(f"Invalid conversation_id: {conversation_id}")
                 return []
 
-            logger.info(
-                f"🔍 Getting conversation history for EXACT conversation_id: {conversation_id}"
-            )
+            window = self.context_windows.get(conversation_id)
+
+            if not self.database:
+                logger.warning("Database not available for conversation history")
+                return self.context_windows.history(conversation_id)
 
             async with self.database.get_session() as session:
                 # CRITICAL: Use exact conversation_id match to prevent cross-contamination
-                messages = await self.chat_repository.get_conversation_messages(
+                messages = await self.chat_repository.get_messages_since(
                     session,
                     conversation_id,
-                    limit=10,  # Reduced limit to prevent context pollution
+                    after_message_id=window.last_message_id if window else None,
+                    limit=self.context_windows.max_messages,
                 )
 
-                # CRITICAL: Double-check that all messages belong to the correct conversation
-                filtered_messages = []
-                for msg in messages:
-                    if str(msg.conversation_id) == str(conversation_id):
-                        filtered_messages.append(
-                            {
-                                "id": str(msg.id),
-                                "content": msg.content,
-                                "sender": msg.sender,
-                                "agent_type": msg.agent_type,
-                                "timestamp": msg.timestamp.isoformat(),
-                                "metadata": msg.extra_metadata,
-                                "conversation_id": str(
-                                    msg.conversation_id
-                                ),  # Include for verification
-                            }
-                        )
-                    else:
-                        logger.error(
-                            f"🚨 CONVERSATION CONTAMINATION DETECTED: Message {msg.id} belongs to conversation {msg.conversation_id} but was retrieved for {conversation_id}"
-                        )
+            # CRITICAL: Double-check that all messages belong to the correct conversation
+            new_messages = []
+            for msg in messages:
+                if str(msg.conversation_id) == str(conversation_id):
+                    new_messages.append(self._message_to_dict(msg))
+                else:
+                    logger.error(
+                        f"🚨 CONVERSATION CONTAMINATION DETECTED: Message {msg.id} belongs to conversation {msg.conversation_id} but was retrieved for {conversation_id}"
+                    )
 
-                logger.info(
-                    f"🔍 Retrieved {len(filtered_messages)} messages for conversation {conversation_id}"
-                )
-                return filtered_messages
+            self.context_windows.append(conversation_id, new_messages)
+            history = self.context_windows.history(conversation_id)
+            logger.debug(
+                f"🔍 Conversation {conversation_id}: {len(new_messages)} new, "
+                f"{len(history)} in context window"
+            )
+            return history
 
         except Exception as e:
             logger.error(f"Error getting conversation history: {e}")
             return []
 
+    def _get_conversation_summary(self, conversation_id: str) -> str:
+        """Rolling summary of messages older than the context window."""
+        window = self.context_windows.get(conversation_id)
+        return window.summary if window else ""
+
     async def _generate_agent_response(
         self,
         message: str,
@@ -815,6 +874,9 @@ UnifiedUser Message: {message}"""
                         "user_id": user_id,
                         "conversation_id": conversation_id,
                         "conversation_history": conversation_history,
+                        "conversation_summary": self._get_conversation_summary(
+                            conversation_id
+                        ),
                     }
 
                     # Generate response using the real agent with correct method signature
@@ -1008,7 +1070,7 @@ UnifiedUser Message: {message}"""
 
             async with self.database.get_session() as session:
                 # Store user message
-                await self.chat_repository.create_message(
+                stored_user_message = await self.chat_repository.create_message(
                     session=session,
                     conversation_id=conversation_id,
                     content=user_message,
@@ -1023,7 +1085,7 @@ UnifiedUser Message: {message}"""
                 )
 
                 # Store agent response
-                await self.chat_repository.create_message(
+                stored_agent_message = await self.chat_repository.create_message(
                     session=session,
                     conversation_id=conversation_id,
                     content=agent_response,
@@ -1037,6 +1099,16 @@ UnifiedUser Message: {message}"""
                     },
                 )
 
+            # Extend the context window so the next turn reads nothing back
+            if self.context_windows.get(conversation_id) is not None:
+                self.context_windows.append(
+                    conversation_id,
+                    [
+                        self._message_to_dict(stored_user_message),
+                        self._message_to_dict(stored_agent_message),
+                    ],
+                )
+
         except Exception as e:
             logger.error(f"Error storing conversation messages: {e}")
 
@@ -1093,6 +1165,7 @@ UnifiedUser Message: {message}"""
         """Clear conversation history for session-based chat clearing."""
         try:
             logger.info(f"🧹 Clearing conversation history for: {conversation_id}")
+            self.context_windows.discard(conversation_id)
 
             if not self.database:
                 logger.warning(
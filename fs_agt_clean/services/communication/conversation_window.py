@@ -0,0 +1,196 @@
+"""
+Conversation context windows for the chat service.
+
+Keeps a rolling window of recent messages per conversation under a token
+budget. Token counts are computed once per message when it enters the
+window. Messages that fall out of the window are folded into a short
+rolling summary. Windows are refreshed incrementally: only messages newer
+than the last one seen are read from the database. Idle conversations are
+evicted with LRU + TTL.
+"""
+
+import logging
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Characters of an evicted message kept in its summary line
+SUMMARY_LINE_CHARS = 160
+
+
+@dataclass
+class ConversationWindow:
+    """Recent messages and rolling summary of one conversation."""
+
+    conversation_id: str
+    messages: Deque[Dict[str, Any]] = field(default_factory=deque)
+    message_tokens: int = 0
+    summary_lines: Deque[str] = field(default_factory=deque)
+    summary_line_tokens: Deque[int] = field(default_factory=deque)
+    summary_tokens: int = 0
+    last_message_id: Optional[str] = None
+    last_access: float = field(default_factory=time.monotonic)
+
+    @property
+    def summary(self) -> str:
+        """Rolling summary of messages that left the window."""
+        return "\n".join(self.summary_lines)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.message_tokens + self.summary_tokens
+
+
+class ConversationWindowManager:
+    """
+    Token-budgeted, LRU + TTL bounded conversation windows.
+
+    Messages are the history dictionaries produced by the chat service
+    (``id``, ``content``, ``sender``, ...). Each message gets a cached
+    ``token_count`` when it enters a window.
+    """
+
+    def __init__(
+        self,
+        token_counter: Callable[[str], int],
+        token_budget: int = 2000,
+        summary_budget: int = 500,
+        max_messages: int = 10,
+        max_conversations: int = 1000,
+        idle_ttl: float = 1800.0,
+    ):
+        """Initialize the window manager.
+
+        Args:
+            token_counter: Function counting the tokens of a text
+            token_budget: Maximum tokens of the messages in a window
+            summary_budget: Maximum tokens of a window's rolling summary
+            max_messages: Maximum messages in a window
+            max_conversations: Maximum windows kept in memory
+            idle_ttl: Seconds after which an unused window is evicted
+        """
+        self.token_counter = token_counter
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self.max_messages = max_messages
+        self.max_conversations = max_conversations
+        self.idle_ttl = idle_ttl
+
+        self._windows: "OrderedDict[str, ConversationWindow]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.tokens_counted = 0
+
+    def get(self, conversation_id: str) -> Optional[ConversationWindow]:
+        """Get a conversation window, or None if it is not cached or expired."""
+        window = self._windows.get(conversation_id)
+        now = time.monotonic()
+        if window is None or now - window.last_access > self.idle_ttl:
+            if window is not None:
+                self.discard(conversation_id)
+                self.evictions += 1
+            self.misses += 1
+            return None
+
+        window.last_access = now
+        self._windows.move_to_end(conversation_id)
+        self.hits += 1
+        return window
+
+    def create(self, conversation_id: str) -> ConversationWindow:
+        """Create an empty window, evicting idle and least recently used ones."""
+        window = ConversationWindow(conversation_id, last_access=time.monotonic())
+        self._windows[conversation_id] = window
+        self._windows.move_to_end(conversation_id)
+        self.evict_idle()
+        while len(self._windows) > self.max_conversations:
+            self._windows.popitem(last=False)
+            self.evictions += 1
+        return window
+
+    def append(self, conversation_id: str, messages: List[Dict[str, Any]]) -> None:
+        """Add new messages (oldest first) to a window and enforce its budget."""
+        window = self._windows.get(conversation_id) or self.create(conversation_id)
+        seen = {message.get("id") for message in window.messages}
+
+        for message in messages:
+            if message.get("id") is not None:
+                if message["id"] in seen:
+                    continue
+                seen.add(message["id"])
+            if "token_count" not in message:
+                content = message.get("content") or ""
+                message["token_count"] = self.token_counter(content)
+                self.tokens_counted += 1
+            window.messages.append(message)
+            window.message_tokens += message["token_count"]
+            if message.get("id") is not None:
+                window.last_message_id = message["id"]
+
+        # Keep at least the latest message even if it alone exceeds the budget
+        while len(window.messages) > 1 and (
+            len(window.messages) > self.max_messages
+            or window.message_tokens > self.token_budget
+        ):
+            evicted = window.messages.popleft()
+            window.message_tokens -= evicted["token_count"]
+            self._summarize(window, evicted)
+
+    def _summarize(self, window: ConversationWindow, message: Dict[str, Any]) -> None:
+        """Fold a message that left the window into the rolling summary."""
+        content = " ".join((message.get("content") or "").split())
+        if len(content) > SUMMARY_LINE_CHARS:
+            content = content[: SUMMARY_LINE_CHARS - 3] + "..."
+        line = f"{message.get('sender', 'unknown')}: {content}"
+        tokens = self.token_counter(line)
+        self.tokens_counted += 1
+
+        window.summary_lines.append(line)
+        window.summary_line_tokens.append(tokens)
+        window.summary_tokens += tokens
+        while window.summary_tokens > self.summary_budget and window.summary_lines:
+            window.summary_lines.popleft()
+            window.summary_tokens -= window.summary_line_tokens.popleft()
+
+    def history(self, conversation_id: str) -> List[Dict[str, Any]]:
+        """Messages currently in a window, oldest first."""
+        window = self._windows.get(conversation_id)
+        return list(window.messages) if window else []
+
+    def discard(self, conversation_id: str) -> None:
+        """Drop a conversation window."""
+        self._windows.pop(conversation_id, None)
+
+    def evict_idle(self) -> int:
+        """Evict windows unused for longer than the idle TTL."""
+        cutoff = time.monotonic() - self.idle_ttl
+        evicted = 0
+        # Windows are kept in access order, so idle ones are at the front
+        while self._windows:
+            window = next(iter(self._windows.values()))
+            if window.last_access >= cutoff:
+                break
+            self._windows.popitem(last=False)
+            evicted += 1
+        self.evictions += evicted
+        return evicted
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get window cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "conversations": len(self._windows),
+            "max_conversations": self.max_conversations,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate_percentage": round(
+                (self.hits / lookups) * 100 if lookups else 0.0, 2
+            ),
+            "evictions": self.evictions,
+            "tokens_counted": self.tokens_counted,
+            "token_budget": self.token_budget,
+        }
@@ -11,7 +11,13 @@ import re
 from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fs_agt_clean.core.utils.phrase_matcher import (
+    PhraseHit,
+    PhraseMatcher,
+    select_non_overlapping,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -351,6 +357,43 @@ CONTEXT_MODIFIERS = {
     "quantitative": ["how much", "how many", "percentage", "rate", "ratio", "number"],
 }
 
+# Keyword cues for entity extraction, matched in the same scan as intents
+ENTITY_CUES = {
+    "time_references": ["today", "tomorrow", "yesterday"]
+    + [
+        f"{relative} {period}"
+        for relative in ("this", "next", "last")
+        for period in ("week", "month", "quarter", "year")
+    ],
+    "metrics": ["revenue", "profit", "sales", "conversion", "ctr", "roi"],
+}
+
+# Abbreviations expanded during preprocessing
+ABBREVIATIONS = {
+    "roi": "return on investment",
+    "seo": "search engine optimization",
+    "ctr": "click through rate",
+    "kpi": "key performance indicator",
+    "asin": "amazon standard identification number",
+    "sku": "stock keeping unit",
+}
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_ABBREVIATION_PATTERN = re.compile(
+    r"\b(?:" + "|".join(re.escape(abbr) for abbr in ABBREVIATIONS) + r")\b"
+)
+_NUMBER_PATTERN = re.compile(r"\b\d+(?:\.\d+)?\b")
+_CURRENCY_PATTERN = re.compile(r"\$\d+(?:\.\d+)?")
+_DATE_PATTERN = re.compile(r"\b\d{1,2}\/\d{1,2}\/\d{2,4}\b")
+_ASIN_PATTERN = re.compile(r"\b[A-Z0-9]{10}\b")
+
+# Weight multipliers for different keyword categories
+WEIGHT_MULTIPLIERS = {
+    "high_weight": 3.0,
+    "medium_weight": 1.5,
+    "low_weight": 1.0,
+}
+
 
 @dataclass
 class IntentResult:
@@ -366,6 +409,15 @@ class IntentResult:
     suggested_agent: Optional[str] = None
 
 
+@dataclass
+class MessageScan:
+    """Every keyword hit of a message, grouped by what it signals."""
+
+    intent_hits: Dict[Tuple[str, str], List[PhraseHit]]
+    context_modifiers: List[str]
+    entity_hits: Dict[str, List[str]]
+
+
 class IntentRecognizer:
     """Advanced intent recognition system with rule-based and contextual analysis."""
 
@@ -374,18 +426,28 @@ class IntentRecognizer:
         self.intent_patterns = INTENT_PATTERNS
         self.context_modifiers = CONTEXT_MODIFIERS
 
-        # Compile regex patterns for efficiency with weights
-        self.compiled_patterns = {}
+        self.entity_cues = ENTITY_CUES
+
+        # Compile every keyword, modifier and entity cue into one automaton so
+        # a message is matched against the whole vocabulary in a single scan
+        self.matcher = PhraseMatcher()
+        self._keyword_priority: Dict[Tuple[str, str], Dict[str, int]] = {}
         for intent, weight_groups in self.intent_patterns.items():
-            self.compiled_patterns[intent] = {}
             for weight, keywords in weight_groups.items():
-                if keywords:  # Only compile if keywords exist
-                    pattern = (
-                        r"\b(?:" + "|".join(re.escape(kw) for kw in keywords) + r")\b"
-                    )
-                    self.compiled_patterns[intent][weight] = re.compile(
-                        pattern, re.IGNORECASE
-                    )
+                group = (intent, weight)
+                # Earlier keywords win overlaps, as in a regex alternation
+                priority = self._keyword_priority.setdefault(group, {})
+                for keyword in keywords:
+                    priority.setdefault(keyword.lower(), len(priority))
+                    self.matcher.add(keyword.lower(), ("intent",) + group)
+
+        for modifier_type, keywords in self.context_modifiers.items():
+            self.matcher.add_many(keywords, ("modifier", modifier_type))
+
+        for entity_type, cues in self.entity_cues.items():
+            self.matcher.add_many(cues, ("entity", entity_type))
+
+        self.matcher.compile()
 
         # Track conversation context for better intent detection
         self.conversation_context = defaultdict(list)
@@ -413,76 +475,166 @@ class IntentRecognizer:
             IntentResult with primary intent and analysis
         """
         try:
-            # Preprocess message
+            # Preprocess message and match the full vocabulary once
             processed_message = self._preprocess_message(message)
+            scan = self.scan_message(processed_message)
 
-            # Calculate intent scores using multiple methods
-            rule_based_scores = self._calculate_rule_based_scores(processed_message)
-            context_scores = self._calculate_context_scores(
-                processed_message, conversation_history
+            result = self._analyze_message(
+                processed_message, scan, conversation_history
             )
 
-            # Combine scores with weights
-            combined_scores = self._combine_scores(rule_based_scores, context_scores)
+            # Update conversation context
+            if conversation_id:
+                self._update_conversation_context(
+                    conversation_id,
+                    message,
+                    result.primary_intent,
+                    result.extracted_entities,
+                )
 
-            # Determine primary intent
-            primary_intent, primary_confidence = self._get_primary_intent(
-                combined_scores
-            )
+            return result
 
-            # Get secondary intents
-            secondary_intents = self._get_secondary_intents(
-                combined_scores, primary_intent
-            )
+        except Exception as e:
+            logger.error(f"Error in intent recognition: {e}")
+            return self._fallback_result(e)
 
-            # Extract context modifiers
-            context_modifiers = self._extract_context_modifiers(processed_message)
+    def recognize_intents_batch(
+        self,
+        messages: Sequence[str],
+        conversation_histories: Optional[Sequence[Optional[List[Dict]]]] = None,
+    ) -> List[IntentResult]:
+        """
+        Recognize intents for many messages, e.g. to backfill analytics.
 
-            # Extract entities
-            entities = self._extract_entities(processed_message, primary_intent)
+        Messages without history that normalize to the same text are only
+        analyzed once. Live conversation context is not updated.
 
-            # Generate reasoning
-            reasoning = self._generate_reasoning(
-                primary_intent, primary_confidence, rule_based_scores, context_modifiers
-            )
+        Args:
+            messages: Message texts to classify
+            conversation_histories: Optional per-message conversation history,
+                aligned with ``messages``
 
-            # Determine if handoff is needed
-            requires_handoff = self._requires_agent_handoff(
-                primary_intent, primary_confidence, conversation_history
-            )
+        Returns:
+            One IntentResult per message, in input order
+        """
+        if conversation_histories is not None and len(
+            conversation_histories
+        ) != len(messages):
+            raise ValueError("conversation_histories must align with messages")
 
-            # Suggest appropriate agent
-            suggested_agent = self._suggest_agent(primary_intent, entities)
+        results: List[IntentResult] = []
+        memo: Dict[str, IntentResult] = {}
 
-            # Update conversation context
-            if conversation_id:
-                self._update_conversation_context(
-                    conversation_id, message, primary_intent, entities
+        for index, message in enumerate(messages):
+            history = (
+                conversation_histories[index] if conversation_histories else None
+            )
+            try:
+                processed_message = self._preprocess_message(message)
+                if not history and processed_message in memo:
+                    results.append(memo[processed_message])
+                    continue
+
+                result = self._analyze_message(
+                    processed_message,
+                    self.scan_message(processed_message),
+                    history,
                 )
+                if not history:
+                    memo[processed_message] = result
+                results.append(result)
+
+            except Exception as e:
+                logger.error(f"Error in batch intent recognition: {e}")
+                results.append(self._fallback_result(e))
+
+        return results
+
+    def scan_message(self, message: str) -> MessageScan:
+        """Match intent keywords, context modifiers and entity cues in one pass."""
+        intent_hits: Dict[Tuple[str, str], List[PhraseHit]] = defaultdict(list)
+        modifiers = set()
+        entity_hits: Dict[str, List[str]] = defaultdict(list)
+
+        for hit in self.matcher.scan(message):
+            kind = hit.payload[0]
+            if kind == "intent":
+                intent_hits[hit.payload[1:]].append(hit)
+            elif kind == "modifier":
+                modifiers.add(hit.payload[1])
+            else:
+                entity_hits[hit.payload[1]].append(hit.phrase)
 
-            return IntentResult(
-                primary_intent=primary_intent,
-                confidence=primary_confidence,
-                secondary_intents=secondary_intents,
-                context_modifiers=context_modifiers,
-                extracted_entities=entities,
-                reasoning=reasoning,
-                requires_handoff=requires_handoff,
-                suggested_agent=suggested_agent,
-            )
+        return MessageScan(
+            intent_hits=dict(intent_hits),
+            context_modifiers=[m for m in self.context_modifiers if m in modifiers],
+            entity_hits=dict(entity_hits),
+        )
 
-        except Exception as e:
-            logger.error(f"Error in intent recognition: {e}")
-            return IntentResult(
-                primary_intent="general_query",
-                confidence=0.1,
-                secondary_intents=[],
-                context_modifiers=[],
-                extracted_entities={},
-                reasoning=f"Error in intent recognition: {e}",
-                requires_handoff=False,
-                suggested_agent="assistant",
-            )
+    def _analyze_message(
+        self,
+        processed_message: str,
+        scan: MessageScan,
+        conversation_history: Optional[List[Dict]],
+    ) -> IntentResult:
+        """Score a preprocessed, scanned message and build its IntentResult."""
+        # Calculate intent scores using multiple methods
+        rule_based_scores = self._calculate_rule_based_scores(processed_message, scan)
+        context_scores = self._calculate_context_scores(
+            processed_message, conversation_history
+        )
+
+        # Combine scores with weights
+        combined_scores = self._combine_scores(rule_based_scores, context_scores)
+
+        # Determine primary intent
+        primary_intent, primary_confidence = self._get_primary_intent(combined_scores)
+
+        # Get secondary intents
+        secondary_intents = self._get_secondary_intents(combined_scores, primary_intent)
+
+        # Extract context modifiers
+        context_modifiers = self._extract_context_modifiers(processed_message, scan)
+
+        # Extract entities
+        entities = self._extract_entities(processed_message, primary_intent, scan)
+
+        # Generate reasoning
+        reasoning = self._generate_reasoning(
+            primary_intent, primary_confidence, rule_based_scores, context_modifiers
+        )
+
+        # Determine if handoff is needed
+        requires_handoff = self._requires_agent_handoff(
+            primary_intent, primary_confidence, conversation_history
+        )
+
+        # Suggest appropriate agent
+        suggested_agent = self._suggest_agent(primary_intent, entities)
+
+        return IntentResult(
+            primary_intent=primary_intent,
+            confidence=primary_confidence,
+            secondary_intents=secondary_intents,
+            context_modifiers=context_modifiers,
+            extracted_entities=entities,
+            reasoning=reasoning,
+            requires_handoff=requires_handoff,
+            suggested_agent=suggested_agent,
+        )
+
+    def _fallback_result(self, error: Exception) -> IntentResult:
+        """Result returned when recognition fails."""
+        return IntentResult(
+            primary_intent="general_query",
+            confidence=0.1,
+            secondary_intents=[],
+            context_modifiers=[],
+            extracted_entities={},
+            reasoning=f"Error in intent recognition: {error}",
+            requires_handoff=False,
+            suggested_agent="assistant",
+        )
 
     def _preprocess_message(self, message: str) -> str:
         """Preprocess message for better pattern matching."""
@@ -490,53 +642,47 @@ class IntentRecognizer:
         processed = message.lower().strip()
 
         # Remove extra whitespace
-        processed = re.sub(r"\s+", " ", processed)
-
-        # Handle common abbreviations
-        abbreviations = {
-            "roi": "return on investment",
-            "seo": "search engine optimization",
-            "ctr": "click through rate",
-            "kpi": "key performance indicator",
-            "asin": "amazon standard identification number",
-            "sku": "stock keeping unit",
-        }
+        processed = _WHITESPACE_PATTERN.sub(" ", processed)
 
-        for abbr, full in abbreviations.items():
-            processed = re.sub(r"\b" + abbr + r"\b", full, processed)
-
-        return processed
+        # Handle common abbreviations in a single substitution pass
+        return _ABBREVIATION_PATTERN.sub(
+            lambda match: ABBREVIATIONS[match.group(0)], processed
+        )
 
-    def _calculate_rule_based_scores(self, message: str) -> Dict[str, float]:
+    def _calculate_rule_based_scores(
+        self, message: str, scan: Optional[MessageScan] = None
+    ) -> Dict[str, float]:
         """Calculate intent scores based on weighted keyword pattern matching."""
-        scores = {}
+        if scan is None:
+            scan = self.scan_message(message)
 
-        # Weight multipliers for different keyword categories
-        weight_multipliers = {
-            "high_weight": 3.0,
-            "medium_weight": 1.5,
-            "low_weight": 1.0,
-        }
+        scores = {}
+        message_length = len(message.split())
 
-        for intent, weight_patterns in self.compiled_patterns.items():
+        for intent, weight_groups in self.intent_patterns.items():
             total_score = 0.0
             total_matches = 0
 
-            for weight, pattern in weight_patterns.items():
-                matches = pattern.findall(message)
-                if matches:
-                    match_count = len(matches)
-                    unique_matches = len(set(matches))
-                    multiplier = weight_multipliers.get(weight, 1.0)
+            for weight in weight_groups:
+                group = (intent, weight)
+                hits = scan.intent_hits.get(group)
+                if not hits:
+                    continue
+
+                matches = select_non_overlapping(
+                    hits, priority=self._keyword_priority[group]
+                )
+                match_count = len(matches)
+                unique_matches = len({hit.phrase for hit in matches})
+                multiplier = WEIGHT_MULTIPLIERS.get(weight, 1.0)
 
-                    # Score based on unique matches with weight multiplier
-                    weight_score = unique_matches * multiplier * 0.1
-                    total_score += weight_score
-                    total_matches += match_count
+                # Score based on unique matches with weight multiplier
+                weight_score = unique_matches * multiplier * 0.1
+                total_score += weight_score
+                total_matches += match_count
 
             if total_score > 0:
                 # Normalize by message length but cap the penalty
-                message_length = len(message.split())
                 length_factor = min(
                     message_length / 10.0, 1.0
                 )  # Don't over-penalize long messages
@@ -573,10 +719,11 @@ class IntentRecognizer:
         for msg in recent_messages:
             msg_content = msg.get("content", "").lower()
 
-            # Look for intent patterns in recent context
-            for intent, weight_patterns in self.compiled_patterns.items():
-                for weight, pattern in weight_patterns.items():
-                    if pattern.search(msg_content):
+            # Look for intent patterns in recent context, one scan per message
+            matched_groups = self.scan_message(msg_content).intent_hits
+            for intent, weight_groups in self.intent_patterns.items():
+                for weight in weight_groups:
+                    if (intent, weight) in matched_groups:
                         # Give more weight to high-weight pattern matches in context
                         weight_boost = 0.15 if weight == "high_weight" else 0.1
                         context_scores[intent] += weight_boost
@@ -643,58 +790,50 @@ class IntentRecognizer:
         secondary.sort(key=lambda x: x[1], reverse=True)
         return secondary[:3]
 
-    def _extract_context_modifiers(self, message: str) -> List[str]:
+    def _extract_context_modifiers(
+        self, message: str, scan: Optional[MessageScan] = None
+    ) -> List[str]:
         """Extract context modifiers from the message."""
-        modifiers = []
-
-        for modifier_type, keywords in self.context_modifiers.items():
-            for keyword in keywords:
-                if keyword in message:
-                    modifiers.append(modifier_type)
-                    break
+        if scan is None:
+            scan = self.scan_message(message)
+        return list(scan.context_modifiers)
 
-        return modifiers
-
-    def _extract_entities(self, message: str, intent: str) -> Dict[str, Any]:
+    def _extract_entities(
+        self, message: str, intent: str, scan: Optional[MessageScan] = None
+    ) -> Dict[str, Any]:
         """Extract relevant entities based on intent."""
+        if scan is None:
+            scan = self.scan_message(message)
+
         entities = {}
 
         # Extract numbers and currencies
-        numbers = re.findall(r"\b\d+(?:\.\d+)?\b", message)
+        numbers = _NUMBER_PATTERN.findall(message)
         if numbers:
             entities["numbers"] = [float(n) for n in numbers]
 
-        currencies = re.findall(r"\$\d+(?:\.\d+)?", message)
+        currencies = _CURRENCY_PATTERN.findall(message)
         if currencies:
             entities["currencies"] = currencies
 
         # Extract dates and time references
-        time_patterns = [
-            r"\b(?:today|tomorrow|yesterday)\b",
-            r"\b(?:this|next|last)\s+(?:week|month|quarter|year)\b",
-            r"\b\d{1,2}\/\d{1,2}\/\d{2,4}\b",
-        ]
-
-        for pattern in time_patterns:
-            matches = re.findall(pattern, message, re.IGNORECASE)
-            if matches:
-                entities.setdefault("time_references", []).extend(matches)
+        time_references = list(scan.entity_hits.get("time_references", []))
+        time_references.extend(_DATE_PATTERN.findall(message))
+        if time_references:
+            entities["time_references"] = time_references
 
         # Intent-specific entity extraction
         if intent == "market_query":
             # Extract product identifiers
-            asin_pattern = r"\b[A-Z0-9]{10}\b"
-            asins = re.findall(asin_pattern, message)
+            asins = _ASIN_PATTERN.findall(message)
             if asins:
                 entities["asins"] = asins
 
         elif intent == "analytics_query":
             # Extract metric names
-            metric_patterns = [r"\b(?:revenue|profit|sales|conversion|ctr|roi)\b"]
-            for pattern in metric_patterns:
-                matches = re.findall(pattern, message, re.IGNORECASE)
-                if matches:
-                    entities.setdefault("metrics", []).extend(matches)
+            metrics = scan.entity_hits.get("metrics")
+            if metrics:
+                entities["metrics"] = list(metrics)
 
         return entities
 
@@ -0,0 +1,155 @@
+"""
+Tests for conversation_window.py
+"""
+
+import random
+
+from fs_agt_clean.services.communication import conversation_window
+from fs_agt_clean.services.communication.conversation_window import (
+    ConversationWindowManager,
+)
+
+
+def count_words(text):
+    return len(text.split())
+
+
+def message(index, words=3, sender="user"):
+    return {
+        "id": f"m{index:04d}",
+        "content": " ".join([f"w{index}"] * words),
+        "sender": sender,
+    }
+
+
+def messages_since(stored, after_message_id, limit):
+    """Stand-in for ChatRepository.get_messages_since over a list."""
+    if after_message_id is not None:
+        ids = [m["id"] for m in stored]
+        stored = stored[ids.index(after_message_id) + 1 :]
+    return [dict(m) for m in stored[-limit:]]
+
+
+class Clock:
+    """Controllable stand-in for ``time.monotonic``."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBudget:
+    """Tests for trimming a window to its budgets."""
+
+    def test_token_budget(self):
+        """Oldest messages leave the window once it exceeds the token budget."""
+        windows = ConversationWindowManager(count_words, token_budget=10)
+        windows.append("c", [message(i, words=3) for i in range(5)])
+        window = windows.get("c")
+        assert [m["id"] for m in window.messages] == ["m0002", "m0003", "m0004"]
+        assert window.message_tokens == 9
+        assert window.summary_lines[0].startswith("user: w0")
+
+    def test_max_messages(self):
+        """Windows keep at most max_messages messages."""
+        windows = ConversationWindowManager(count_words, max_messages=2)
+        windows.append("c", [message(i, words=1) for i in range(4)])
+        assert [m["id"] for m in windows.history("c")] == ["m0002", "m0003"]
+
+    def test_latest_message_kept_over_budget(self):
+        """A single message larger than the budget stays in the window."""
+        windows = ConversationWindowManager(count_words, token_budget=5)
+        windows.append("c", [message(0, words=2), message(1, words=20)])
+        assert [m["id"] for m in windows.history("c")] == ["m0001"]
+
+    def test_summary_budget(self):
+        """The rolling summary drops its oldest lines beyond its budget."""
+        windows = ConversationWindowManager(
+            count_words, max_messages=1, summary_budget=8
+        )
+        windows.append("c", [message(i, words=3) for i in range(6)])
+        window = windows.get("c")
+        assert window.summary_tokens <= 8
+        assert window.summary_lines[-1].startswith("user: w4")
+
+    def test_tokens_counted_once(self):
+        """Messages are counted when they enter a window, not again."""
+        windows = ConversationWindowManager(count_words)
+        windows.append("c", [message(0), message(1)])
+        windows.append("c", [message(0), message(1), message(2)])
+        assert windows.tokens_counted == 3
+        assert [m["id"] for m in windows.history("c")] == ["m0000", "m0001", "m0002"]
+
+
+class TestEviction:
+    """Tests for LRU and idle TTL eviction of windows."""
+
+    def test_least_recently_used_evicted(self):
+        """Beyond max_conversations the least recently used window goes."""
+        windows = ConversationWindowManager(count_words, max_conversations=2)
+        windows.append("a", [message(0)])
+        windows.append("b", [message(1)])
+        windows.get("a")
+        windows.append("c", [message(2)])
+        assert windows.get("b") is None
+        assert windows.get("a") is not None
+        assert windows.get_stats()["evictions"] == 1
+
+    def test_idle_windows_expire(self, monkeypatch):
+        """Windows unused for longer than the TTL are evicted."""
+        clock = Clock()
+        monkeypatch.setattr(conversation_window.time, "monotonic", clock)
+        windows = ConversationWindowManager(count_words, idle_ttl=60)
+        windows.append("a", [message(0)])
+        windows.append("b", [message(1)])
+        clock.now += 30
+        windows.get("b")
+        clock.now += 40
+
+        assert windows.get("a") is None
+        assert windows.get("b") is not None
+        clock.now += 61
+        windows.create("c")
+        assert windows.get_stats()["conversations"] == 1
+
+
+class TestIncrementalReload:
+    """Tests for refreshing windows from only the newer stored messages."""
+
+    def test_matches_full_rebuild(self):
+        """Reading only newer messages gives the window a full reload gives."""
+        rng = random.Random(8)
+        stored = []
+        incremental = ConversationWindowManager(
+            count_words, token_budget=40, max_messages=6
+        )
+        for index in range(60):
+            stored.append(message(index, words=rng.randint(1, 12)))
+            if rng.random() < 0.6:
+                continue
+
+            window = incremental.get("c")
+            after = window.last_message_id if window else None
+            incremental.append(
+                "c", messages_since(stored, after, incremental.max_messages)
+            )
+
+            full = ConversationWindowManager(
+                count_words, token_budget=40, max_messages=6
+            )
+            full.append("c", messages_since(stored, None, full.max_messages))
+            assert [m["id"] for m in incremental.history("c")] == [
+                m["id"] for m in full.history("c")
+            ]
+            assert incremental.get("c").last_message_id == stored[-1]["id"]
+
+    def test_overlapping_reload_ignored(self):
+        """Messages already in the window are not added twice."""
+        windows = ConversationWindowManager(count_words)
+        windows.append("c", [message(0), message(1)])
+        windows.append("c", [message(1), message(2)])
+        window = windows.get("c")
+        assert [m["id"] for m in window.messages] == ["m0000", "m0001", "m0002"]
+        assert window.message_tokens == 9
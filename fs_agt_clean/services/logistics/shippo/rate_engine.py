@@ -0,0 +1,295 @@
+"""Async rate engine for the Shippo service.
+
+The Shippo SDK is synchronous. The rate engine runs SDK calls in a bounded
+thread pool so they never block the event loop, caches rate quotes by
+shipping zone and parcel bucket, coalesces concurrent identical quotes and
+polls long running Shippo jobs (such as label batches) with backoff.
+"""
+
+import asyncio
+import functools
+import logging
+import math
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from fs_agt_clean.core.cache.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Conversion factors to ounces and inches
+MASS_TO_OZ = {"oz": 1.0, "lb": 16.0, "g": 0.035274, "kg": 35.274}
+DISTANCE_TO_IN = {
+    "in": 1.0,
+    "ft": 12.0,
+    "yd": 36.0,
+    "cm": 0.393701,
+    "mm": 0.0393701,
+    "m": 39.3701,
+}
+
+
+def shipping_zone(address: Dict[str, str]) -> str:
+    """
+    Zone of an address for quote caching.
+
+    Carrier zone charts are keyed by the 3-digit ZIP prefix (sectional
+    center facility), so addresses sharing it are quoted alike.
+    """
+    country = (address.get("country") or "US").upper()
+    postal_code = "".join((address.get("zip") or "").split()).upper()
+    if postal_code:
+        return f"{country}:{postal_code[:3]}"
+    return f"{country}:{(address.get('city') or '').strip().lower()}"
+
+
+def weight_bucket(weight: float, mass_unit: str = "lb") -> int:
+    """Billable weight in ounces: whole ounces below 1 lb, whole pounds above."""
+    ounces = weight * MASS_TO_OZ.get(mass_unit.lower(), 16.0)
+    if ounces <= 16:
+        return max(1, math.ceil(ounces))
+    return math.ceil(ounces / 16) * 16
+
+
+def dimension_bucket(
+    length: float, width: float, height: float, distance_unit: str = "in"
+) -> Tuple[int, int, int]:
+    """Parcel dimensions rounded up to whole inches, longest side first."""
+    factor = DISTANCE_TO_IN.get(distance_unit.lower(), 1.0)
+    inches = (math.ceil(dim * factor) for dim in (length, width, height))
+    return tuple(sorted(inches, reverse=True))
+
+
+class RateEngineMetrics:
+    """Rate engine metrics tracking."""
+
+    def __init__(self):
+        self.quote_requests = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.sdk_calls = 0
+        self.sdk_errors = 0
+        self.total_sdk_time = 0.0
+        self.polls = 0
+
+    def record_sdk_call(self, duration: float, success: bool) -> None:
+        self.sdk_calls += 1
+        self.total_sdk_time += duration
+        if not success:
+            self.sdk_errors += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get rate engine statistics."""
+        return {
+            "quote_requests": self.quote_requests,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_rate_percentage": round(
+                (self.cache_hits / self.quote_requests) * 100
+                if self.quote_requests
+                else 0.0,
+                2,
+            ),
+            "sdk_calls": self.sdk_calls,
+            "sdk_errors": self.sdk_errors,
+            "average_sdk_time_ms": round(
+                (self.total_sdk_time / self.sdk_calls) * 1000
+                if self.sdk_calls
+                else 0.0,
+                2,
+            ),
+            "polls": self.polls,
+        }
+
+
+class ShippoRateEngine:
+    """Bounded executor, quote cache and job polling for Shippo SDK calls."""
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        quote_ttl: float = 900.0,
+        max_cached_quotes: int = 10000,
+    ):
+        """Initialize the rate engine.
+
+        Args:
+            max_workers: Maximum concurrent Shippo SDK calls
+            quote_ttl: Seconds a rate quote stays valid
+            max_cached_quotes: Maximum number of cached quotes
+        """
+        self.max_workers = max_workers
+        self.quote_ttl = quote_ttl
+        self.max_cached_quotes = max_cached_quotes
+        self.metrics = RateEngineMetrics()
+        self.single_flight = SingleFlight("shippo_rates")
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="shippo"
+        )
+        self._quotes: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    async def run_sdk(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking SDK call in the bounded executor."""
+        loop = asyncio.get_running_loop()
+        start_time = time.time()
+        try:
+            result = await loop.run_in_executor(
+                self._executor, functools.partial(fn, *args, **kwargs)
+            )
+        except Exception:
+            self.metrics.record_sdk_call(time.time() - start_time, success=False)
+            raise
+        self.metrics.record_sdk_call(time.time() - start_time, success=True)
+        return result
+
+    def _get_cached_quote(self, key: Hashable) -> Optional[Any]:
+        cached = self._quotes.get(key)
+        if cached is None:
+            return None
+        expires_at, rates = cached
+        if expires_at < time.monotonic():
+            del self._quotes[key]
+            return None
+        self._quotes.move_to_end(key)
+        return rates
+
+    def _store_quote(self, key: Hashable, rates: Any) -> None:
+        self._quotes[key] = (time.monotonic() + self.quote_ttl, rates)
+        self._quotes.move_to_end(key)
+        while len(self._quotes) > self.max_cached_quotes:
+            self._quotes.popitem(last=False)
+
+    async def get_quote(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        use_cache: bool = True,
+    ) -> Any:
+        """
+        Get a rate quote from the cache or fetch it.
+
+        Concurrent requests for the same key share one fetch. Failed fetches
+        are not cached.
+
+        Args:
+            key: Quote cache key (see ``quote_key``)
+            fetch: Coroutine function fetching fresh rates
+            use_cache: Skip the cache lookup (the fresh result is still cached)
+        """
+        self.metrics.quote_requests += 1
+
+        if use_cache:
+            rates = self._get_cached_quote(key)
+            if rates is not None:
+                self.metrics.cache_hits += 1
+                return rates
+
+        self.metrics.cache_misses += 1
+
+        async def fetch_and_store() -> Any:
+            rates = await fetch()
+            self._store_quote(key, rates)
+            return rates
+
+        return await self.single_flight.do(key, fetch_and_store)
+
+    def invalidate_quotes(self) -> None:
+        """Drop all cached quotes."""
+        self._quotes.clear()
+
+    async def poll(
+        self,
+        retrieve: Callable[[], Awaitable[Any]],
+        is_done: Callable[[Any], bool],
+        initial: Any = None,
+        initial_delay: float = 0.5,
+        max_delay: float = 10.0,
+        backoff: float = 2.0,
+        timeout: float = 600.0,
+    ) -> Any:
+        """
+        Poll a Shippo job with exponential backoff until it is done.
+
+        Args:
+            retrieve: Coroutine function returning the current job state
+            is_done: Predicate telling whether the job finished
+            initial: Job state already known (skips the first retrieve)
+            initial_delay: First delay between polls in seconds
+            max_delay: Maximum delay between polls in seconds
+            backoff: Delay multiplier after every poll
+            timeout: Give up after this many seconds
+
+        Returns:
+            The final job state
+
+        Raises:
+            TimeoutError: If the job is still running after ``timeout``
+        """
+        deadline = time.monotonic() + timeout
+        delay = initial_delay
+        state = initial if initial is not None else await retrieve()
+
+        while not is_done(state):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Shippo job not finished after {timeout}s")
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * backoff, max_delay)
+            self.metrics.polls += 1
+            state = await retrieve()
+
+        return state
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get engine statistics including cache size and coalescing."""
+        stats = self.metrics.get_stats()
+        stats.update(
+            {
+                "cached_quotes": len(self._quotes),
+                "max_workers": self.max_workers,
+                "coalescing": self.single_flight.get_stats(),
+            }
+        )
+        return stats
+
+    def shutdown(self) -> None:
+        """Shut down the SDK executor."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def quote_key(
+    from_address: Dict[str, str],
+    to_address: Dict[str, str],
+    length: float,
+    width: float,
+    height: float,
+    weight: float,
+    distance_unit: str = "in",
+    mass_unit: str = "lb",
+    insurance_amount: Optional[float] = None,
+    signature_required: bool = False,
+) -> Tuple:
+    """Cache key for a rate quote: zones, parcel buckets and options."""
+    return (
+        shipping_zone(from_address),
+        shipping_zone(to_address),
+        weight_bucket(weight, mass_unit),
+        dimension_bucket(length, width, height, distance_unit),
+        round(insurance_amount, 2) if insurance_amount else None,
+        bool(signature_required),
+    )
+
+
+# Global rate engine instance, shared by all ShippoService instances
+_rate_engine: Optional[ShippoRateEngine] = None
+
+
+def get_rate_engine() -> ShippoRateEngine:
+    """Get the global Shippo rate engine."""
+    global _rate_engine
+    if _rate_engine is None:
+        _rate_engine = ShippoRateEngine()
+    return _rate_engine
@@ -1,5 +1,6 @@
 """Shippo shipping service implementation."""
 
+import asyncio
 import logging
 import time
 from datetime import datetime, timezone
@@ -20,6 +21,11 @@ from fs_agt_clean.core.monitoring.exporters.prometheus import (
     REQUEST_COUNT as API_REQUEST_COUNT,
     REQUEST_LATENCY as API_REQUEST_DURATION,
 )
+from fs_agt_clean.services.logistics.shippo.rate_engine import (
+    ShippoRateEngine,
+    get_rate_engine,
+    quote_key,
+)
 from fs_agt_clean.services.metrics.service import MetricsService
 from fs_agt_clean.services.notifications.service import (
     NotificationCategory,
@@ -50,6 +56,14 @@ class ShippingRate(BaseModel):
     arrives_by: Optional[datetime] = None
 
 
+class RateQuoteRequest(BaseModel):
+    dimensions: ShippingDimensions
+    from_address: Dict[str, str]
+    to_address: Dict[str, str]
+    insurance_amount: Optional[float] = None
+    signature_required: bool = False
+
+
 class ShippoService:
     def __init__(
         self,
@@ -57,6 +71,7 @@ class ShippoService:
         metrics_service: Optional[MetricsService] = None,
         notification_service: Optional[NotificationService] = None,
         test_mode: bool = False,
+        rate_engine: Optional[ShippoRateEngine] = None,
     ):
         """Initialize Shippo service.
 
@@ -65,12 +80,16 @@ class ShippoService:
             metrics_service: Optional metrics service for tracking
             notification_service: Optional notification service
             test_mode: Whether to use test mode
+            rate_engine: Optional rate engine (defaults to the shared engine)
         """
         self.metrics_service = metrics_service
         self.notification_service = notification_service
         self.test_mode = test_mode
         self.logger = logging.getLogger(__name__)
 
+        # SDK executor and quote cache are shared across service instances
+        self.rate_engine = rate_engine or get_rate_engine()
+
         # Initialize modern Shippo SDK v3.9.0 client
         self.client = shippo.Shippo(api_key_header=api_key)
 
@@ -128,72 +147,49 @@ class ShippoService:
         to_address: Dict[str, str],
         insurance_amount: Optional[float] = None,
         signature_required: bool = False,
+        use_cache: bool = True,
     ) -> List[ShippingRate]:
-        """Calculate shipping rates based on dimensions and addresses."""
+        """Calculate shipping rates based on dimensions and addresses.
+
+        Quotes are cached by origin and destination zone, parcel weight and
+        dimension bucket and options, so repeated lookups for equivalent
+        parcels do not call Shippo again until the quote expires.
+        """
         try:
             API_REQUEST_COUNT.labels(
                 endpoint="shipping_rates", method="POST", client_id="shippo"
             ).inc()
-            start_time = time.time()
 
             # Validate and format addresses for Shippo API
             validated_from_address = self._validate_shippo_address(from_address)
             validated_to_address = self._validate_shippo_address(to_address)
 
-            parcel = {
-                "length": dimensions.length,
-                "width": dimensions.width,
-                "height": dimensions.height,
-                "distance_unit": dimensions.distance_unit,
-                "weight": dimensions.weight,
-                "mass_unit": dimensions.mass_unit,
-            }
-
-            try:
-                # Use modern Shippo SDK v3.9.0 client with validated addresses
-                shipment_request = {
-                    "address_from": validated_from_address,
-                    "address_to": validated_to_address,
-                    "parcels": [parcel],
-                    "async": False,
-                }
-
-                if insurance_amount:
-                    shipment_request["insurance_amount"] = str(insurance_amount)
-                    shipment_request["insurance_currency"] = "USD"
-
-                if signature_required:
-                    shipment_request["extra"] = {"signature_confirmation": True}
-
-                # Use legacy API for better compatibility with test environment
-                # Modern client can be enabled for production deployment
-                shipment = shippo.Shipment.create(**shipment_request)
-
-            except Exception as e:
-                raise ValueError(f"Failed to create shipment: {str(e)}")
-
-            API_REQUEST_DURATION.labels(
-                endpoint="shipping_rates", method="POST"
-            ).observe(time.time() - start_time)
+            cache_key = quote_key(
+                validated_from_address,
+                validated_to_address,
+                length=dimensions.length,
+                width=dimensions.width,
+                height=dimensions.height,
+                weight=dimensions.weight,
+                distance_unit=dimensions.distance_unit,
+                mass_unit=dimensions.mass_unit,
+                insurance_amount=insurance_amount,
+                signature_required=signature_required,
+            )
 
-            if not shipment.rates:
-                raise ValueError("No shipping rates available for the given parameters")
-
-            rates = []
-            for rate in shipment.rates:
-                shipping_rate = ShippingRate(
-                    provider=rate.provider,
-                    service=rate.servicelevel.name,
-                    amount=float(rate.amount),
-                    currency=rate.currency,
-                    days=rate.days,
-                    trackable=rate.attributes and "TRACKING" in rate.attributes,
-                    insurance_amount=insurance_amount,
-                    provider_image=rate.provider_image_75,
-                    estimated_days=rate.estimated_days,
-                    arrives_by=rate.arrives_by if hasattr(rate, "arrives_by") else None,
-                )
-                rates.append(shipping_rate)
+            cached_rates = await self.rate_engine.get_quote(
+                cache_key,
+                lambda: self._fetch_shipping_rates(
+                    dimensions,
+                    validated_from_address,
+                    validated_to_address,
+                    insurance_amount,
+                    signature_required,
+                ),
+                use_cache=use_cache,
+            )
+            # Hand out copies so callers cannot modify cached quotes
+            rates = [rate.model_copy() for rate in cached_rates]
 
             if self.metrics_service:
                 await self.metrics_service.record_metric(
@@ -243,6 +239,148 @@ class ShippoService:
 
             raise
 
+    async def _fetch_shipping_rates(
+        self,
+        dimensions: ShippingDimensions,
+        from_address: Dict[str, str],
+        to_address: Dict[str, str],
+        insurance_amount: Optional[float],
+        signature_required: bool,
+    ) -> List[ShippingRate]:
+        """Request fresh rates from Shippo without blocking the event loop."""
+        start_time = time.time()
+
+        parcel = {
+            "length": dimensions.length,
+            "width": dimensions.width,
+            "height": dimensions.height,
+            "distance_unit": dimensions.distance_unit,
+            "weight": dimensions.weight,
+            "mass_unit": dimensions.mass_unit,
+        }
+
+        try:
+            shipment_request = {
+                "address_from": from_address,
+                "address_to": to_address,
+                "parcels": [parcel],
+                "async": False,
+            }
+
+            if insurance_amount:
+                shipment_request["insurance_amount"] = str(insurance_amount)
+                shipment_request["insurance_currency"] = "USD"
+
+            if signature_required:
+                shipment_request["extra"] = {"signature_confirmation": True}
+
+            # Use legacy API for better compatibility with test environment
+            # Modern client can be enabled for production deployment
+            shipment = await self.rate_engine.run_sdk(
+                shippo.Shipment.create, **shipment_request
+            )
+
+        except Exception as e:
+            raise ValueError(f"Failed to create shipment: {str(e)}")
+
+        API_REQUEST_DURATION.labels(endpoint="shipping_rates", method="POST").observe(
+            time.time() - start_time
+        )
+
+        if not shipment.rates:
+            raise ValueError("No shipping rates available for the given parameters")
+
+        rates = []
+        for rate in shipment.rates:
+            shipping_rate = ShippingRate(
+                provider=rate.provider,
+                service=rate.servicelevel.name,
+                amount=float(rate.amount),
+                currency=rate.currency,
+                days=rate.days,
+                trackable=rate.attributes and "TRACKING" in rate.attributes,
+                insurance_amount=insurance_amount,
+                provider_image=rate.provider_image_75,
+                estimated_days=rate.estimated_days,
+                arrives_by=rate.arrives_by if hasattr(rate, "arrives_by") else None,
+            )
+            rates.append(shipping_rate)
+
+        return rates
+
+    async def quote_many(
+        self,
+        requests: List[RateQuoteRequest],
+        max_concurrency: int = 10,
+    ) -> List[Union[List[ShippingRate], Exception]]:
+        """
+        Quote many parcels at once.
+
+        Requests that map to the same quote (same zones, parcel buckets and
+        options) are fetched once; distinct quotes are fetched concurrently.
+
+        Args:
+            requests: Parcels to quote
+            max_concurrency: Maximum concurrent distinct quotes
+
+        Returns:
+            Rates for each request in input order, or the exception raised
+            for that request
+        """
+        groups: Dict[Any, List[int]] = {}
+        for index, request in enumerate(requests):
+            key = quote_key(
+                self._validate_shippo_address(request.from_address),
+                self._validate_shippo_address(request.to_address),
+                length=request.dimensions.length,
+                width=request.dimensions.width,
+                height=request.dimensions.height,
+                weight=request.dimensions.weight,
+                distance_unit=request.dimensions.distance_unit,
+                mass_unit=request.dimensions.mass_unit,
+                insurance_amount=request.insurance_amount,
+                signature_required=request.signature_required,
+            )
+            groups.setdefault(key, []).append(index)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def quote(request: RateQuoteRequest) -> List[ShippingRate]:
+            async with semaphore:
+                return await self.calculate_shipping_rates(
+                    dimensions=request.dimensions,
+                    from_address=request.from_address,
+                    to_address=request.to_address,
+                    insurance_amount=request.insurance_amount,
+                    signature_required=request.signature_required,
+                )
+
+        unique_indices = [indices[0] for indices in groups.values()]
+        quotes = await asyncio.gather(
+            *(quote(requests[index]) for index in unique_indices),
+            return_exceptions=True,
+        )
+
+        results: List[Union[List[ShippingRate], Exception]] = [None] * len(requests)
+        for indices, result in zip(groups.values(), quotes):
+            for index in indices:
+                results[index] = (
+                    result
+                    if isinstance(result, Exception)
+                    else [rate.model_copy() for rate in result]
+                )
+
+        self.logger.info(
+            "Quoted %d parcels with %d distinct Shippo quotes",
+            len(requests),
+            len(unique_indices),
+        )
+        return results
+
+    def get_rate_engine_stats(self) -> Dict[str, Any]:
+        """Get quote cache, coalescing and SDK call statistics."""
+        return self.rate_engine.get_stats()
+
     async def compare_with_ebay_rates(
         self,
         dimensions: ShippingDimensions,
@@ -315,7 +453,9 @@ class ShippoService:
             start_time = time.time()
 
             try:
-                validation = shippo.Address.validate(address)
+                validation = await self.rate_engine.run_sdk(
+                    shippo.Address.validate, address
+                )
             except Exception as e:
                 raise ValueError(f"Failed to validate address: {str(e)}")
 
@@ -391,7 +531,8 @@ class ShippoService:
             start_time = time.time()
 
             try:
-                transaction = shippo.Transaction.create(
+                transaction = await self.rate_engine.run_sdk(
+                    shippo.Transaction.create,
                     rate=rate_id,
                     label_file_type="PDF",
                     async_=False,
@@ -469,7 +610,9 @@ class ShippoService:
             ).inc()
             start_time = time.time()
 
-            tracking = shippo.Track.get_status(tracking_number)
+            tracking = await self.rate_engine.run_sdk(
+                shippo.Track.get_status, tracking_number
+            )
 
             API_REQUEST_DURATION.labels(
                 endpoint="track_shipment", method="GET"
@@ -544,7 +687,9 @@ class ShippoService:
             ).inc()
             start_time = time.time()
 
-            webhook = shippo.Webhook.create(url=callback_url, event_types=event_types)
+            webhook = await self.rate_engine.run_sdk(
+                shippo.Webhook.create, url=callback_url, event_types=event_types
+            )
 
             API_REQUEST_DURATION.labels(
                 endpoint="register_webhook", method="POST"
@@ -662,19 +807,28 @@ class ShippoService:
             raise
 
     async def create_batch_labels(
-        self, shipments: List[Dict[str, any]]
+        self, shipments: List[Dict[str, any]], timeout: float = 600.0
     ) -> List[Dict[str, any]]:
         """
         Create shipping labels for multiple shipments in batch.
+
+        The batch status is polled with exponential backoff until Shippo
+        finishes validating and processing it, or ``timeout`` seconds pass.
         """
         try:
-            batch = shippo.Batch.create(
+            batch = await self.rate_engine.run_sdk(
+                shippo.Batch.create,
                 default_carrier_account=self.carrier_account,
                 default_servicelevel_token="usps_priority",
                 batch_shipments=shipments,
             )
-            while batch.status in ["VALIDATING", "PROCESSING"]:
-                batch = shippo.Batch.retrieve(batch.id)
+            batch_id = batch.id
+            batch = await self.rate_engine.poll(
+                lambda: self.rate_engine.run_sdk(shippo.Batch.retrieve, batch_id),
+                lambda current: current.status not in ["VALIDATING", "PROCESSING"],
+                initial=batch,
+                timeout=timeout,
+            )
             if batch.status == "ERROR":
                 raise Exception(f"Batch processing failed: {batch.messages}")
             results = []
@@ -708,7 +862,8 @@ class ShippoService:
         Create a return shipping label.
         """
         try:
-            return_shipment = shippo.Shipment.create(
+            return_shipment = await self.rate_engine.run_sdk(
+                shippo.Shipment.create,
                 address_from=from_address,
                 address_to=to_address,
                 parcels=[parcel],
@@ -716,8 +871,11 @@ class ShippoService:
                 async_=False,
             )
             return_rate = min(return_shipment.rates, key=lambda x: float(x.amount))
-            return_label = shippo.Transaction.create(
-                rate=return_rate.id, label_file_type="PDF", async_=False
+            return_label = await self.rate_engine.run_sdk(
+                shippo.Transaction.create,
+                rate=return_rate.id,
+                label_file_type="PDF",
+                async_=False,
             )
             if return_label.status == "SUCCESS":
                 return {
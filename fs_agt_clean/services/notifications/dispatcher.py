@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+Notification Dispatcher Implementation
+Features:
+1. Durable local queue (SQLite) surviving restarts
+2. Batched email delivery over pooled SMTP connections
+3. Batched push delivery through multicast
+4. Per-channel rate limits
+5. Retries with exponential backoff and dead-lettering
+6. Queue depth and delivery latency metrics
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Union
+
+from fs_agt_clean.core.ai.rate_limiter import TokenBucket
+from fs_agt_clean.services.notifications.email_service import EmailService
+from fs_agt_clean.services.notifications.push_service import (
+    MAX_MULTICAST_TOKENS,
+    PushService,
+)
+
+logger = logging.getLogger(__name__)
+
+EMAIL_CHANNEL = "email"
+PUSH_CHANNEL = "push"
+
+
+class NotificationQueue:
+    """Durable notification queue backed by a local SQLite database.
+
+    Items move from ``pending`` to ``inflight`` when claimed and are deleted
+    when acknowledged. Items still in flight when the process stopped are
+    returned to ``pending`` on open, so delivery is at-least-once. Items that
+    exhaust their attempts are kept with status ``failed``.
+
+    All database work runs on a single dedicated thread.
+    """
+
+    def __init__(self, path: Union[str, Path] = "data/notification_queue.db"):
+        """Initialize the queue.
+
+        Args:
+            path: SQLite database path (``":memory:"`` for a volatile queue)
+        """
+        self.path = str(path)
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="notification_queue"
+        )
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS notification_queue (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    channel TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    available_at REAL NOT NULL,
+                    enqueued_at REAL NOT NULL,
+                    last_error TEXT
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_notification_queue_claim "
+                "ON notification_queue (channel, status, available_at)"
+            )
+            # Recover items claimed by a previous process
+            conn.execute(
+                "UPDATE notification_queue SET status = 'pending' "
+                "WHERE status = 'inflight'"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    def _enqueue_many(self, channel: str, payloads: List[Dict[str, Any]]) -> List[int]:
+        conn = self._connect()
+        now = time.time()
+        ids = []
+        with conn:
+            for payload in payloads:
+                cursor = conn.execute(
+                    "INSERT INTO notification_queue "
+                    "(channel, payload, available_at, enqueued_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (channel, json.dumps(payload, default=str), now, now),
+                )
+                ids.append(cursor.lastrowid)
+        return ids
+
+    async def enqueue_many(
+        self, channel: str, payloads: List[Dict[str, Any]]
+    ) -> List[int]:
+        """Durably enqueue payloads for a channel in one transaction.
+
+        Returns:
+            Queue item IDs
+        """
+        return await self._run(self._enqueue_many, channel, payloads)
+
+    def _claim(self, channel: str, limit: int) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        with conn:
+            rows = conn.execute(
+                "SELECT id, payload, attempts, enqueued_at FROM notification_queue "
+                "WHERE channel = ? AND status = 'pending' AND available_at <= ? "
+                "ORDER BY id LIMIT ?",
+                (channel, time.time(), limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE notification_queue SET status = 'inflight' WHERE id = ?",
+                [(row[0],) for row in rows],
+            )
+        return [
+            {
+                "id": row[0],
+                "payload": json.loads(row[1]),
+                "attempts": row[2],
+                "enqueued_at": row[3],
+            }
+            for row in rows
+        ]
+
+    async def claim(self, channel: str, limit: int) -> List[Dict[str, Any]]:
+        """Claim up to ``limit`` due items of a channel, oldest first."""
+        return await self._run(self._claim, channel, limit)
+
+    def _ack(self, ids: List[int]) -> None:
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "DELETE FROM notification_queue WHERE id = ?", [(i,) for i in ids]
+            )
+
+    async def ack(self, ids: List[int]) -> None:
+        """Remove delivered items."""
+        if ids:
+            await self._run(self._ack, ids)
+
+    def _retry(self, retries: List[tuple]) -> None:
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "UPDATE notification_queue SET status = 'pending', "
+                "attempts = attempts + 1, available_at = ?, last_error = ? "
+                "WHERE id = ?",
+                retries,
+            )
+
+    async def retry(self, item_id: int, delay: float, error: str) -> None:
+        """Return an item to the queue, available after ``delay`` seconds."""
+        await self._run(self._retry, [(time.time() + delay, error, item_id)])
+
+    def _fail(self, item_id: int, error: str) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "UPDATE notification_queue SET status = 'failed', "
+                "attempts = attempts + 1, last_error = ? WHERE id = ?",
+                (error, item_id),
+            )
+
+    async def fail(self, item_id: int, error: str) -> None:
+        """Dead-letter an item."""
+        await self._run(self._fail, item_id, error)
+
+    def _depth(self) -> Dict[str, Dict[str, int]]:
+        conn = self._connect()
+        depth: Dict[str, Dict[str, int]] = {}
+        for channel, status, count in conn.execute(
+            "SELECT channel, status, COUNT(*) FROM notification_queue "
+            "GROUP BY channel, status"
+        ):
+            depth.setdefault(channel, {})[status] = count
+        return depth
+
+    async def depth(self) -> Dict[str, Dict[str, int]]:
+        """Item counts by channel and status."""
+        return await self._run(self._depth)
+
+    def _next_available(self, channel: str) -> Optional[float]:
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT MIN(available_at) FROM notification_queue "
+            "WHERE channel = ? AND status = 'pending'",
+            (channel,),
+        ).fetchone()
+        return row[0] if row else None
+
+    async def next_available(self, channel: str) -> Optional[float]:
+        """Time the next pending item of a channel becomes due."""
+        return await self._run(self._next_available, channel)
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def close(self) -> None:
+        """Close the database."""
+        await self._run(self._close)
+        self._executor.shutdown(wait=False)
+
+
+class DispatcherMetrics:
+    """Notification dispatcher metrics tracking."""
+
+    def __init__(self, latency_window: int = 1000):
+        self.enqueued: Dict[str, int] = {}
+        self.delivered: Dict[str, int] = {}
+        self.retried: Dict[str, int] = {}
+        self.failed: Dict[str, int] = {}
+        self.batches: Dict[str, int] = {}
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._latency_window = latency_window
+
+    @staticmethod
+    def _increment(counter: Dict[str, int], channel: str, count: int = 1) -> None:
+        counter[channel] = counter.get(channel, 0) + count
+
+    def record_enqueued(self, channel: str, count: int) -> None:
+        self._increment(self.enqueued, channel, count)
+
+    def record_batch(self, channel: str) -> None:
+        self._increment(self.batches, channel)
+
+    def record_delivery(self, channel: str, latency: float) -> None:
+        self._increment(self.delivered, channel)
+        self._latencies.setdefault(
+            channel, deque(maxlen=self._latency_window)
+        ).append(latency)
+
+    def record_retry(self, channel: str) -> None:
+        self._increment(self.retried, channel)
+
+    def record_failure(self, channel: str) -> None:
+        self._increment(self.failed, channel)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-channel delivery statistics."""
+        stats = {}
+        channels = set(self.enqueued) | set(self.delivered) | set(self.failed)
+        for channel in sorted(channels):
+            latencies = sorted(self._latencies.get(channel, ()))
+            stats[channel] = {
+                "enqueued": self.enqueued.get(channel, 0),
+                "delivered": self.delivered.get(channel, 0),
+                "retried": self.retried.get(channel, 0),
+                "failed": self.failed.get(channel, 0),
+                "batches": self.batches.get(channel, 0),
+                "average_latency_ms": round(
+                    (sum(latencies) / len(latencies)) * 1000 if latencies else 0.0,
+                    2,
+                ),
+                "p95_latency_ms": round(
+                    latencies[int(0.95 * (len(latencies) - 1))] * 1000
+                    if latencies
+                    else 0.0,
+                    2,
+                ),
+            }
+        return stats
+
+
+class NotificationDispatcher:
+    """Queues notifications durably and delivers them in rate-limited batches."""
+
+    def __init__(
+        self,
+        email_service: Optional[EmailService] = None,
+        push_service: Optional[PushService] = None,
+        config: Optional[Dict[str, Any]] = None,
+        queue: Optional[NotificationQueue] = None,
+    ):
+        """Initialize the dispatcher.
+
+        Args:
+            email_service: Email service used for email delivery
+            push_service: Push service used for push delivery
+            config: Optional configuration (queue path, batch sizes, per-channel
+                rates, retry policy)
+            queue: Optional queue (defaults to a SQLite queue at
+                ``config["queue_path"]``)
+        """
+        self.config = config or {}
+        self.email_service = email_service
+        self.push_service = push_service
+        self.queue = queue or NotificationQueue(
+            self.config.get("queue_path", "data/notification_queue.db")
+        )
+        self.metrics = DispatcherMetrics()
+
+        self.max_attempts = self.config.get("max_attempts", 5)
+        self.retry_delay = self.config.get("retry_delay", 5.0)
+        self.max_retry_delay = self.config.get("max_retry_delay", 300.0)
+        self.poll_interval = self.config.get("poll_interval", 1.0)
+
+        self.batch_sizes = {
+            EMAIL_CHANNEL: self.config.get("email_batch_size", 50),
+            PUSH_CHANNEL: self.config.get("push_batch_size", MAX_MULTICAST_TOKENS),
+        }
+        # Per-channel rate limits (sends per second with a burst allowance);
+        # email is limited per message, push per multicast call
+        self.rate_limiters = {
+            EMAIL_CHANNEL: TokenBucket(
+                capacity=self.config.get("email_burst", 20),
+                refill_rate=self.config.get("email_rate", 10.0),
+            ),
+            PUSH_CHANNEL: TokenBucket(
+                capacity=self.config.get("push_burst", 10),
+                refill_rate=self.config.get("push_rate", 5.0),
+            ),
+        }
+
+        self._wakeups = {
+            EMAIL_CHANNEL: asyncio.Event(),
+            PUSH_CHANNEL: asyncio.Event(),
+        }
+        self._workers: Dict[str, asyncio.Task] = {}
+        self._running = False
+
+    async def start(self) -> None:
+        """Start a delivery worker per configured channel."""
+        if self._running:
+            return
+        self._running = True
+        if self.email_service is not None:
+            self._workers[EMAIL_CHANNEL] = asyncio.create_task(
+                self._worker(EMAIL_CHANNEL, self._deliver_email)
+            )
+        if self.push_service is not None:
+            self._workers[PUSH_CHANNEL] = asyncio.create_task(
+                self._worker(PUSH_CHANNEL, self._deliver_push)
+            )
+        logger.info("Notification dispatcher started: %s", list(self._workers))
+
+    async def stop(self) -> None:
+        """Stop the workers; undelivered items stay queued."""
+        self._running = False
+        for event in self._wakeups.values():
+            event.set()
+        if self._workers:
+            await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._workers = {}
+        logger.info("Notification dispatcher stopped")
+
+    async def close(self) -> None:
+        """Stop the workers and release the queue and SMTP connections."""
+        await self.stop()
+        if self.email_service is not None:
+            await self.email_service.close()
+        await self.queue.close()
+
+    async def _enqueue(self, channel: str, payloads: List[Dict[str, Any]]) -> List[int]:
+        ids = await self.queue.enqueue_many(channel, payloads)
+        self.metrics.record_enqueued(channel, len(ids))
+        self._wakeups[channel].set()
+        return ids
+
+    async def enqueue_email(
+        self,
+        template_id: str,
+        to_address: str,
+        data: Dict,
+        user_id: Optional[str] = None,
+    ) -> int:
+        """Queue a templated email.
+
+        Returns:
+            Queue item ID
+        """
+        payload = {
+            "template_id": template_id,
+            "to_address": to_address,
+            "data": data,
+            "user_id": user_id,
+        }
+        return (await self._enqueue(EMAIL_CHANNEL, [payload]))[0]
+
+    async def enqueue_emails(self, messages: List[Dict[str, Any]]) -> List[int]:
+        """Queue many emails (see ``EmailService.send_batch``) in one write."""
+        return await self._enqueue(EMAIL_CHANNEL, messages)
+
+    async def enqueue_push(
+        self,
+        template_id: str,
+        user_id: str,
+        data: Optional[Dict] = None,
+        tokens: Optional[List[str]] = None,
+    ) -> int:
+        """Queue a templated push notification.
+
+        Returns:
+            Queue item ID
+        """
+        payload = {
+            "template_id": template_id,
+            "user_id": user_id,
+            "data": data,
+            "tokens": tokens,
+        }
+        return (await self._enqueue(PUSH_CHANNEL, [payload]))[0]
+
+    async def enqueue_pushes(self, requests: List[Dict[str, Any]]) -> List[int]:
+        """Queue many push notifications (see ``PushService.send_push_batch``)."""
+        return await self._enqueue(PUSH_CHANNEL, requests)
+
+    async def _deliver_email(self, payloads: List[Dict[str, Any]]) -> List[bool]:
+        return await self.email_service.send_batch(
+            payloads, rate_limiter=self.rate_limiters[EMAIL_CHANNEL]
+        )
+
+    async def _deliver_push(self, payloads: List[Dict[str, Any]]) -> List[bool]:
+        return await self.push_service.send_push_batch(
+            payloads, rate_limiter=self.rate_limiters[PUSH_CHANNEL]
+        )
+
+    async def _wait_for_work(self, channel: str) -> None:
+        """Sleep until new items arrive or the next retry is due."""
+        event = self._wakeups[channel]
+        timeout = self.poll_interval
+        next_available = await self.queue.next_available(channel)
+        if next_available is not None:
+            timeout = min(timeout, max(0.0, next_available - time.time()))
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        event.clear()
+
+    async def _worker(
+        self,
+        channel: str,
+        deliver: Callable[[List[Dict[str, Any]]], Any],
+    ) -> None:
+        """Claim and deliver batches of a channel until stopped."""
+        while self._running:
+            try:
+                items = await self.queue.claim(channel, self.batch_sizes[channel])
+                if not items:
+                    await self._wait_for_work(channel)
+                    continue
+
+                self.metrics.record_batch(channel)
+                try:
+                    results = await deliver([item["payload"] for item in items])
+                    error = "delivery failed"
+                except Exception as e:
+                    logger.error("Error delivering %s batch: %s", channel, e)
+                    results = [False] * len(items)
+                    error = str(e)
+
+                now = time.time()
+                delivered = []
+                for item, success in zip(items, results):
+                    if success:
+                        delivered.append(item["id"])
+                        self.metrics.record_delivery(
+                            channel, now - item["enqueued_at"]
+                        )
+                    elif item["attempts"] + 1 >= self.max_attempts:
+                        await self.queue.fail(item["id"], error)
+                        self.metrics.record_failure(channel)
+                    else:
+                        delay = min(
+                            self.retry_delay * (2 ** item["attempts"]),
+                            self.max_retry_delay,
+                        )
+                        await self.queue.retry(item["id"], delay, error)
+                        self.metrics.record_retry(channel)
+                await self.queue.ack(delivered)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Notification %s worker error: %s", channel, e)
+                await asyncio.sleep(self.poll_interval)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, delivery and latency statistics."""
+        stats: Dict[str, Any] = {
+            "running": self._running,
+            "queue_depth": await self.queue.depth(),
+            "channels": self.metrics.get_stats(),
+        }
+        if self.email_service is not None:
+            stats["smtp_pool"] = self.email_service.smtp_pool.get_stats()
+        return stats
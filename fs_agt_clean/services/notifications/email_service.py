@@ -7,13 +7,17 @@ Features:
 3. Template-based emails
 4. Attachment support
 5. Retry logic
+6. Pooled persistent SMTP connections and batched sending
 """
 
 # Standard library imports
+import asyncio
+import json
 import logging
+import time
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 # Optional email dependencies
 try:
@@ -42,6 +46,17 @@ except ImportError:
 
     aiosmtplib = type("MockModule", (), {"SMTP": MockSMTP})()
 
+# Errors after which a pooled connection is reopened and the send retried
+SMTP_DISCONNECT_ERRORS: Tuple[type, ...] = (ConnectionError,)
+# Server replies rejecting a message; the connection itself stays usable
+SMTP_RESPONSE_ERRORS: Tuple[type, ...] = ()
+if AIOSMTPLIB_AVAILABLE:
+    SMTP_DISCONNECT_ERRORS += (aiosmtplib.SMTPServerDisconnected,)
+    SMTP_RESPONSE_ERRORS += (
+        aiosmtplib.SMTPResponseException,
+        aiosmtplib.SMTPRecipientsRefused,
+    )
+
 try:
     from jinja2 import Environment, PackageLoader, select_autoescape
 
@@ -111,6 +126,134 @@ class EmailTemplate:
         self.text_template = text_template
 
 
+class SMTPConnectionPool:
+    """Pool of persistent, logged-in SMTP connections.
+
+    Connections are reused across messages instead of paying a connect,
+    TLS and login handshake per email. Idle connections past
+    ``idle_timeout`` are replaced, since servers drop them eventually.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = True,
+        size: int = 4,
+        idle_timeout: float = 60.0,
+    ):
+        """Initialize the connection pool.
+
+        Args:
+            hostname: SMTP server host
+            port: SMTP server port
+            username: Optional login user
+            password: Optional login password
+            use_tls: Whether to use TLS
+            size: Maximum number of open connections
+            idle_timeout: Seconds after which an idle connection is replaced
+        """
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.size = size
+        self.idle_timeout = idle_timeout
+
+        self._semaphore = asyncio.Semaphore(size)
+        self._idle: List[Tuple[Any, float]] = []
+
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self.reconnects = 0
+        self.messages_sent = 0
+
+    async def _open(self) -> Any:
+        smtp = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            use_tls=self.use_tls,
+        )
+        await smtp.connect()
+        if self.username and self.password:
+            await smtp.login(self.username, self.password)
+        self.connections_opened += 1
+        return smtp
+
+    async def _close(self, smtp: Any) -> None:
+        try:
+            await smtp.quit()
+        except Exception:
+            # Connection is already gone
+            pass
+
+    async def _acquire(self) -> Tuple[Any, bool]:
+        """Get an idle connection or open a new one.
+
+        Returns:
+            Tuple of (connection, whether it was reused)
+        """
+        now = time.monotonic()
+        while self._idle:
+            smtp, last_used = self._idle.pop()
+            if now - last_used <= self.idle_timeout and getattr(
+                smtp, "is_connected", True
+            ):
+                self.connections_reused += 1
+                return smtp, True
+            await self._close(smtp)
+        return await self._open(), False
+
+    async def send_message(self, message: MIMEMultipart) -> None:
+        """Send a message over a pooled connection.
+
+        Raises:
+            Exception: If the message could not be sent
+        """
+        async with self._semaphore:
+            smtp, reused = await self._acquire()
+            try:
+                try:
+                    await smtp.send_message(message)
+                except SMTP_DISCONNECT_ERRORS:
+                    # Server dropped a reused connection, retry on a new one
+                    await self._close(smtp)
+                    if not reused:
+                        raise
+                    self.reconnects += 1
+                    smtp = await self._open()
+                    await smtp.send_message(message)
+            except SMTP_RESPONSE_ERRORS:
+                self._idle.append((smtp, time.monotonic()))
+                raise
+            except Exception:
+                await self._close(smtp)
+                raise
+
+            self.messages_sent += 1
+            self._idle.append((smtp, time.monotonic()))
+
+    async def close(self) -> None:
+        """Close all idle connections."""
+        idle, self._idle = self._idle, []
+        for smtp, _ in idle:
+            await self._close(smtp)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection pool statistics."""
+        return {
+            "size": self.size,
+            "idle_connections": len(self._idle),
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+            "reconnects": self.reconnects,
+            "messages_sent": self.messages_sent,
+        }
+
+
 class EmailService:
     """Handles email notification delivery."""
 
@@ -122,6 +265,8 @@ class EmailService:
         """
         self.config = config_manager
         self._templates: Dict[str, EmailTemplate] = {}
+        # Compiled (subject, text, html) templates by template ID
+        self._compiled: Dict[str, Tuple[Any, Any, Any]] = {}
 
         # Initialize Jinja environment
         try:
@@ -142,6 +287,15 @@ class EmailService:
         self.smtp_password = smtp_config.get("password")
         self.from_address = smtp_config.get("from_address")
         self.use_tls = smtp_config.get("use_tls", True)
+        self.smtp_pool = SMTPConnectionPool(
+            hostname=self.smtp_host,
+            port=self.smtp_port,
+            username=self.smtp_user,
+            password=self.smtp_password,
+            use_tls=self.use_tls,
+            size=smtp_config.get("pool_size", 4),
+            idle_timeout=smtp_config.get("idle_timeout", 60.0),
+        )
 
         logger.info("EmailService initialized")
 
@@ -166,8 +320,59 @@ class EmailService:
             html_template=html_template,
             text_template=text_template,
         )
+        self._compiled.pop(template_id, None)
         logger.info("Added email template: %s", template_id)
 
+    def render_template(self, template_id: str, data: Dict) -> Tuple[str, str, str]:
+        """Render a template's subject, text and HTML bodies.
+
+        Jinja templates are compiled once per template and reused.
+
+        Args:
+            template_id: Email template ID
+            data: Template data
+
+        Returns:
+            Tuple of (subject, text content, HTML content)
+
+        Raises:
+            KeyError: If the template does not exist
+        """
+        template = self._templates[template_id]
+        if not self.jinja_env:
+            # Simple string formatting fallback
+            return (
+                template.subject_template.format(**data),
+                template.text_template.format(**data),
+                template.html_template.format(**data),
+            )
+
+        compiled = self._compiled.get(template_id)
+        if compiled is None:
+            compiled = tuple(
+                self.jinja_env.from_string(source)
+                for source in (
+                    template.subject_template,
+                    template.text_template,
+                    template.html_template,
+                )
+            )
+            self._compiled[template_id] = compiled
+        return tuple(part.render(**data) for part in compiled)
+
+    def _build_message(
+        self, rendered: Tuple[str, str, str], to_address: str
+    ) -> MIMEMultipart:
+        """Build a MIME message from rendered template parts."""
+        subject, text_content, html_content = rendered
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = subject
+        msg["From"] = self.from_address
+        msg["To"] = to_address
+        msg.attach(MIMEText(text_content, "plain"))
+        msg.attach(MIMEText(html_content, "html"))
+        return msg
+
     async def send_email(
         self,
         template_id: str,
@@ -193,40 +398,9 @@ class EmailService:
                 logger.error("Email template not found: %s", template_id)
                 return False
 
-            # Create message
-            msg = MIMEMultipart("alternative")
-
-            # Set subject
-            if self.jinja_env:
-                subject_template = self.jinja_env.from_string(template.subject_template)
-                msg["Subject"] = subject_template.render(**data)
-            else:
-                # Simple string formatting fallback
-                msg["Subject"] = template.subject_template.format(**data)
-
-            # Set sender and recipient
-            msg["From"] = self.from_address
-            msg["To"] = to_address
-
-            # Create text part
-            if self.jinja_env:
-                text_template = self.jinja_env.from_string(template.text_template)
-                text_content = text_template.render(**data)
-            else:
-                # Simple string formatting fallback
-                text_content = template.text_template.format(**data)
-            text_part = MIMEText(text_content, "plain")
-            msg.attach(text_part)
-
-            # Create HTML part
-            if self.jinja_env:
-                html_template = self.jinja_env.from_string(template.html_template)
-                html_content = html_template.render(**data)
-            else:
-                # Simple string formatting fallback
-                html_content = template.html_template.format(**data)
-            html_part = MIMEText(html_content, "html")
-            msg.attach(html_part)
+            msg = self._build_message(
+                self.render_template(template_id, data), to_address
+            )
 
             # Send email
             user_info = f" for user {user_id}" if user_id else ""
@@ -242,17 +416,8 @@ class EmailService:
                 logger.debug("Email content: %s", msg.as_string())
                 return True
 
-            # In production mode, actually send the email
-            smtp = aiosmtplib.SMTP(
-                hostname=self.smtp_host,
-                port=self.smtp_port,
-                use_tls=self.use_tls,
-            )
-            await smtp.connect()
-            if self.smtp_user and self.smtp_password:
-                await smtp.login(self.smtp_user, self.smtp_password)
-            await smtp.send_message(msg)
-            await smtp.quit()
+            # In production mode, send over a pooled connection
+            await self.smtp_pool.send_message(msg)
 
             logger.info(
                 "Sent email to %s using template %s%s",
@@ -265,6 +430,78 @@ class EmailService:
             logger.error("Failed to send email: %s", e)
             return False
 
+    async def send_batch(
+        self,
+        messages: List[Dict[str, Any]],
+        rate_limiter: Optional[Any] = None,
+    ) -> List[bool]:
+        """Send many templated emails.
+
+        Each template is rendered once per distinct data payload, and messages
+        are sent concurrently over the connection pool.
+
+        Args:
+            messages: Dicts with ``template_id``, ``to_address``, ``data`` and
+                optional ``user_id``
+            rate_limiter: Optional token bucket to wait on before each send;
+                messages whose wait times out are not sent
+
+        Returns:
+            Whether each message was sent, in input order
+        """
+        rendered: Dict[Tuple[str, str], Optional[Tuple[str, str, str]]] = {}
+        prepared: List[Optional[MIMEMultipart]] = []
+        for message in messages:
+            template_id = message["template_id"]
+            data = message.get("data") or {}
+            key = (template_id, json.dumps(data, sort_keys=True, default=str))
+            if key not in rendered:
+                try:
+                    rendered[key] = self.render_template(template_id, data)
+                except KeyError:
+                    logger.error("Email template not found: %s", template_id)
+                    rendered[key] = None
+                except Exception as e:
+                    logger.error("Failed to render email %s: %s", template_id, e)
+                    rendered[key] = None
+            prepared.append(
+                self._build_message(rendered[key], message["to_address"])
+                if rendered[key] is not None
+                else None
+            )
+
+        development_mode = self.config.get("development_mode", False)
+
+        async def send(msg: Optional[MIMEMultipart]) -> bool:
+            if msg is None:
+                return False
+            if development_mode:
+                logger.info("[DEV MODE] Would send email to %s", msg["To"])
+                return True
+            if rate_limiter is not None and not await rate_limiter.wait_for_tokens():
+                # Over the rate limit; report unsent so the caller requeues it
+                logger.warning("Email rate limit wait timed out for %s", msg["To"])
+                return False
+            try:
+                await self.smtp_pool.send_message(msg)
+                return True
+            except Exception as e:
+                logger.error("Failed to send email to %s: %s", msg["To"], e)
+                return False
+
+        results = await asyncio.gather(*(send(msg) for msg in prepared))
+        logger.info(
+            "Sent %d/%d emails using %d rendered templates",
+            sum(results),
+            len(messages),
+            len(rendered),
+        )
+        return list(results)
+
+    async def close(self) -> None:
+        """Close pooled SMTP connections."""
+        await self.smtp_pool.close()
+
     def get_template(self, template_id: str) -> Optional[EmailTemplate]:
         """Get an email template.
 
@@ -287,6 +524,7 @@ class EmailService:
         """
         if template_id in self._templates:
             del self._templates[template_id]
+            self._compiled.pop(template_id, None)
             logger.info("Removed email template: %s", template_id)
             return True
         return False
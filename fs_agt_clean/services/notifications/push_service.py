@@ -7,12 +7,13 @@ Features:
 3. Topic-based messaging
 4. Token management
 5. Delivery tracking
+6. Batched multicast delivery
 """
 
 import asyncio
 import json
 import logging
-from typing import Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 # Optional dependencies
 try:
@@ -83,6 +84,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# FCM accepts at most 500 tokens per multicast message
+MAX_MULTICAST_TOKENS = 500
+
 
 class PushTemplate:
     """Push notification template."""
@@ -107,6 +111,26 @@ class PushTemplate:
         self.body_template = body_template
         self.data_template = data_template or {}
 
+    def render(self, context: Dict) -> Tuple[str, str, Optional[Dict[str, str]]]:
+        """Render title, body and data payload.
+
+        Args:
+            context: Template data
+
+        Returns:
+            Tuple of (title, body, data payload)
+        """
+        data = (
+            {k: str(v).format(**context) for k, v in self.data_template.items()}
+            if self.data_template
+            else None
+        )
+        return (
+            self.title_template.format(**context),
+            self.body_template.format(**context),
+            data,
+        )
+
 
 class PushService:
     """Handles push notification delivery."""
@@ -246,25 +270,15 @@ class PushService:
                 return False
 
             # Prepare message
-            context = data or {}
+            title, body, payload = template.render(data or {})
             message = messaging.MulticastMessage(
-                notification=messaging.Notification(
-                    title=template.title_template.format(**context),
-                    body=template.body_template.format(**context),
-                ),
-                data=(
-                    {
-                        k: str(v).format(**context)
-                        for k, v in template.data_template.items()
-                    }
-                    if template.data_template
-                    else None
-                ),
+                notification=messaging.Notification(title=title, body=body),
+                data=payload,
                 tokens=tokens,
             )
 
             # Send message
-            response = messaging.send_multicast(message, app=self.app)
+            response = await asyncio.to_thread(self._send_multicast, message)
 
             # Handle response
             if response.failure_count > 0:
@@ -290,6 +304,118 @@ class PushService:
             logger.error("Failed to send push notification: %s", e)
             return False
 
+    def _send_multicast(self, message: Any) -> Any:
+        """Send a multicast message (blocking Firebase call)."""
+        send_each = getattr(messaging, "send_each_for_multicast", None)
+        if send_each is not None:
+            return send_each(message, app=self.app)
+        return messaging.send_multicast(message, app=self.app)
+
+    async def send_push_batch(
+        self,
+        requests: List[Dict[str, Any]],
+        rate_limiter: Optional[Any] = None,
+    ) -> List[bool]:
+        """Send many templated push notifications through multicast.
+
+        Requests sharing a template and data payload are rendered once and
+        their device tokens combined into multicast messages of up to
+        ``MAX_MULTICAST_TOKENS`` tokens. Firebase calls run in a worker
+        thread. Tokens that fail are removed, as in ``send_push``.
+
+        Args:
+            requests: Dicts with ``template_id``, ``user_id`` and optional
+                ``data`` and ``tokens``
+            rate_limiter: Optional token bucket to wait on before each
+                multicast call; the batch stops when a wait times out
+
+        Returns:
+            Whether each request reached at least one device, in input order
+        """
+        results = [False] * len(requests)
+
+        # (template_id, data) -> rendered message and (request, user, token)s
+        groups: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for index, request in enumerate(requests):
+            template_id = request["template_id"]
+            user_id = request["user_id"]
+            template = self._templates.get(template_id)
+            if not template:
+                logger.error("Template not found: %s", template_id)
+                continue
+
+            tokens = request.get("tokens") or list(
+                self._user_tokens.get(user_id, set())
+            )
+            if not tokens:
+                logger.warning("No tokens found for user %s", user_id)
+                continue
+
+            context = request.get("data") or {}
+            key = (template_id, json.dumps(context, sort_keys=True, default=str))
+            group = groups.get(key)
+            if group is None:
+                try:
+                    rendered = template.render(context)
+                except Exception as e:
+                    logger.error("Failed to render push %s: %s", template_id, e)
+                    continue
+                group = groups[key] = {"rendered": rendered, "targets": []}
+            group["targets"].extend((index, user_id, token) for token in tokens)
+
+        multicasts = 0
+        limited = False
+        for group in groups.values():
+            if limited:
+                break
+            title, body, payload = group["rendered"]
+            targets = group["targets"]
+            for start in range(0, len(targets), MAX_MULTICAST_TOKENS):
+                chunk = targets[start : start + MAX_MULTICAST_TOKENS]
+                message = messaging.MulticastMessage(
+                    notification=messaging.Notification(title=title, body=body),
+                    data=payload,
+                    tokens=[token for _, _, token in chunk],
+                )
+                if rate_limiter is not None and not (
+                    await rate_limiter.wait_for_tokens()
+                ):
+                    # Over the rate limit; leave the rest unsent for requeueing
+                    logger.warning("Push rate limit wait timed out, stopping batch")
+                    limited = True
+                    break
+                try:
+                    response = await asyncio.to_thread(self._send_multicast, message)
+                except Exception as e:
+                    logger.error("Failed to send push multicast: %s", e)
+                    continue
+                multicasts += 1
+
+                responses = list(getattr(response, "responses", None) or [])
+                if not responses:
+                    # No per-token detail, attribute overall success to all
+                    if response.success_count > 0:
+                        for index, _, _ in chunk:
+                            results[index] = True
+                    continue
+
+                for (index, user_id, token), result in zip(chunk, responses):
+                    if result.success:
+                        results[index] = True
+                    else:
+                        self.remove_token(user_id, token)
+                        logger.warning(
+                            "Failed to send to token %s: %s", token, result.exception
+                        )
+
+        logger.info(
+            "Sent %d/%d push notifications in %d multicast messages",
+            sum(results),
+            len(requests),
+            multicasts,
+        )
+        return results
+
     def add_token(self, user_id: str, token: str) -> None:
         """Add a device token for a user.
 
@@ -359,20 +485,10 @@ class PushService:
                 return False
 
             # Prepare message
-            context = data or {}
+            title, body, payload = template.render(data or {})
             message = messaging.Message(
-                notification=messaging.Notification(
-                    title=template.title_template.format(**context),
-                    body=template.body_template.format(**context),
-                ),
-                data=(
-                    {
-                        k: str(v).format(**context)
-                        for k, v in template.data_template.items()
-                    }
-                    if template.data_template
-                    else None
-                ),
+                notification=messaging.Notification(title=title, body=body),
+                data=payload,
                 topic=topic,
             )
 
@@ -26,6 +26,7 @@ from fs_agt_clean.database.repositories.notification_repository import (
     NotificationRepository,
 )
 from fs_agt_clean.services.metrics.service import MetricsService
+from fs_agt_clean.services.notifications.dispatcher import NotificationDispatcher
 from fs_agt_clean.services.notifications.email_service import EmailService
 from fs_agt_clean.services.notifications.push_service import PushService
 from fs_agt_clean.services.notifications.templates.base import NotificationTemplate
@@ -70,6 +71,7 @@ class NotificationService:
         max_retries: int = 3,
         retry_delay: int = 5,
         config: Optional[Dict[str, Any]] = None,
+        dispatcher: Optional[NotificationDispatcher] = None,
     ):
         """Initialize notification service.
 
@@ -79,7 +81,10 @@ class NotificationService:
             metrics_service: Optional metrics service for tracking
             max_retries: Maximum number of delivery attempts
             retry_delay: Delay between retry attempts in seconds
-            config: Optional additional configuration
+            config: Optional additional configuration; ``queued_delivery``
+                creates a dispatcher configured by ``dispatcher``
+            dispatcher: Optional dispatcher that queues push and email
+                deliveries instead of sending them inline
         """
         self.config = config_manager
         self.database = database
@@ -116,6 +121,14 @@ class NotificationService:
         self.push_service = PushService(config_manager)
         self.device_manager = DeviceManager()
 
+        # Queued delivery through the notification dispatcher
+        options = config or {}
+        if dispatcher is None and options.get("queued_delivery"):
+            dispatcher = NotificationDispatcher(
+                self.email_service, self.push_service, options.get("dispatcher")
+            )
+        self.dispatcher = dispatcher
+
         # Track notification states
         self._pending: Dict[str, Dict] = {}
         self._failed: Dict[str, Dict] = {}
@@ -126,6 +139,16 @@ class NotificationService:
 
         logger.info("NotificationService initialized")
 
+    async def start(self) -> None:
+        """Start the delivery workers of the dispatcher, if any."""
+        if self.dispatcher is not None:
+            await self.dispatcher.start()
+
+    async def close(self) -> None:
+        """Stop the dispatcher, if any; queued deliveries stay queued."""
+        if self.dispatcher is not None:
+            await self.dispatcher.close()
+
     def _register_default_templates(self):
         """Register default notification templates."""
         try:
@@ -273,6 +296,9 @@ class NotificationService:
     async def _deliver_notification(self, notification_id: str) -> bool:
         """Attempt to deliver a notification.
 
+        With a dispatcher, push and email count as delivered once they are
+        durably queued; the dispatcher retries and dead-letters them.
+
         Args:
             notification_id: ID of notification to deliver
 
@@ -301,8 +327,13 @@ class NotificationService:
                 ]
 
                 if eligible_devices:
+                    send_push = (
+                        self.dispatcher.enqueue_push
+                        if self.dispatcher is not None
+                        else self.push_service.send_push
+                    )
                     tasks.append(
-                        self.push_service.send_push(
+                        send_push(
                             template_id=notification["template_id"],
                             user_id=notification["user_id"],
                             data=notification["data"],
@@ -310,13 +341,23 @@ class NotificationService:
                     )
 
             if "email" in notification["delivery_methods"]:
-                tasks.append(
-                    self.email_service.send_email(
-                        template_id=notification["template_id"],
-                        user_id=notification["user_id"],
-                        data=notification["data"],
+                if self.dispatcher is not None:
+                    tasks.append(
+                        self.dispatcher.enqueue_email(
+                            template_id=notification["template_id"],
+                            to_address=notification["data"].get("email"),
+                            data=notification["data"],
+                            user_id=notification["user_id"],
+                        )
+                    )
+                else:
+                    tasks.append(
+                        self.email_service.send_email(
+                            template_id=notification["template_id"],
+                            user_id=notification["user_id"],
+                            data=notification["data"],
+                        )
                     )
-                )
 
             results = await asyncio.gather(*tasks, return_exceptions=True)
 
@@ -0,0 +1,168 @@
+"""
+Tests for dispatcher.py
+"""
+
+import asyncio
+
+import pytest
+
+from fs_agt_clean.services.notifications.dispatcher import (
+    EMAIL_CHANNEL,
+    PUSH_CHANNEL,
+    NotificationDispatcher,
+    NotificationQueue,
+)
+
+
+class FakeEmailService:
+    """Email service stand-in returning scripted batch results."""
+
+    def __init__(self, results=None):
+        self.results = list(results or [])
+        self.batches = []
+        self.closed = False
+
+    async def send_batch(self, messages, rate_limiter=None):
+        self.batches.append([m["to_address"] for m in messages])
+        if self.results:
+            outcome = self.results.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        return [True] * len(messages)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakePushService:
+    """Push service stand-in that accepts every request."""
+
+    def __init__(self):
+        self.batches = []
+
+    async def send_push_batch(self, requests, rate_limiter=None):
+        self.batches.append([r["user_id"] for r in requests])
+        return [True] * len(requests)
+
+
+def dispatcher(email=None, push=None, **config):
+    return NotificationDispatcher(
+        email_service=email,
+        push_service=push,
+        config={"poll_interval": 0.01, "retry_delay": 0.0, **config},
+        queue=NotificationQueue(":memory:"),
+    )
+
+
+async def wait_until(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+
+class TestNotificationQueue:
+    """Tests for NotificationQueue."""
+
+    @pytest.mark.asyncio
+    async def test_claim_ack_retry_fail(self):
+        """Items move between pending, in flight, retried and failed."""
+        queue = NotificationQueue(":memory:")
+        ids = await queue.enqueue_many(EMAIL_CHANNEL, [{"n": i} for i in range(3)])
+
+        claimed = await queue.claim(EMAIL_CHANNEL, 2)
+        assert [item["payload"] for item in claimed] == [{"n": 0}, {"n": 1}]
+        assert await queue.claim(PUSH_CHANNEL, 10) == []
+
+        await queue.ack([ids[0]])
+        await queue.retry(ids[1], 60.0, "later")
+        await queue.fail(ids[2], "broken")
+        assert await queue.depth() == {EMAIL_CHANNEL: {"failed": 1, "pending": 1}}
+        assert await queue.claim(EMAIL_CHANNEL, 10) == []
+        await queue.close()
+
+    @pytest.mark.asyncio
+    async def test_inflight_recovered_on_open(self, tmp_path):
+        """Items claimed by a stopped process are pending again on reopen."""
+        path = tmp_path / "queue.db"
+        queue = NotificationQueue(path)
+        await queue.enqueue_many(PUSH_CHANNEL, [{"user_id": "u1"}])
+        assert len(await queue.claim(PUSH_CHANNEL, 10)) == 1
+        await queue.close()
+
+        reopened = NotificationQueue(path)
+        claimed = await reopened.claim(PUSH_CHANNEL, 10)
+        assert [item["payload"] for item in claimed] == [{"user_id": "u1"}]
+        await reopened.close()
+
+
+class TestNotificationDispatcher:
+    """Tests for NotificationDispatcher delivery."""
+
+    @pytest.mark.asyncio
+    async def test_delivers_in_batches(self):
+        """Queued items are delivered per channel in batches."""
+        email, push = FakeEmailService(), FakePushService()
+        notifications = dispatcher(email, push, email_batch_size=2)
+        await notifications.enqueue_emails(
+            [
+                {"template_id": "t", "to_address": f"u{i}@example.com", "data": {}}
+                for i in range(3)
+            ]
+        )
+        await notifications.enqueue_push("t", "u1")
+        await notifications.start()
+        await wait_until(lambda: sum(map(len, email.batches)) == 3 and push.batches)
+        await notifications.close()
+
+        assert [len(batch) for batch in email.batches] == [2, 1]
+        assert push.batches == [["u1"]]
+        assert email.closed
+        stats = notifications.metrics.get_stats()
+        assert stats[EMAIL_CHANNEL]["delivered"] == 3
+        assert stats[EMAIL_CHANNEL]["batches"] == 2
+        assert stats[PUSH_CHANNEL]["delivered"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_item_retried(self):
+        """Only the items a batch did not deliver are sent again."""
+        email = FakeEmailService(results=[[True, False]])
+        notifications = dispatcher(email)
+        for address in ("a@example.com", "b@example.com"):
+            await notifications.enqueue_email("t", address, {})
+        await notifications.start()
+        delivered = notifications.metrics.delivered
+        await wait_until(lambda: delivered.get(EMAIL_CHANNEL) == 2)
+        await notifications.stop()
+
+        assert email.batches[1] == ["b@example.com"]
+        stats = notifications.metrics.get_stats()[EMAIL_CHANNEL]
+        assert stats["delivered"] == 2
+        assert stats["retried"] == 1
+        await notifications.queue.close()
+
+    @pytest.mark.asyncio
+    async def test_dead_letter_after_max_attempts(self):
+        """An item failing every attempt is kept as failed."""
+        email = FakeEmailService(results=[RuntimeError("smtp down")] * 2)
+        notifications = dispatcher(email, max_attempts=2)
+        await notifications.enqueue_email("t", "a@example.com", {})
+        await notifications.start()
+        await wait_until(lambda: notifications.metrics.failed.get(EMAIL_CHANNEL))
+        await notifications.stop()
+
+        assert len(email.batches) == 2
+        depth = await notifications.queue.depth()
+        assert depth == {EMAIL_CHANNEL: {"failed": 1}}
+        await notifications.queue.close()
+
+    @pytest.mark.asyncio
+    async def test_stop_keeps_undelivered(self):
+        """Items queued while stopped stay queued for the next start."""
+        notifications = dispatcher(FakeEmailService())
+        await notifications.enqueue_email("t", "a@example.com", {})
+        await notifications.stop()
+        depth = await notifications.queue.depth()
+        assert depth == {EMAIL_CHANNEL: {"pending": 1}}
+        await notifications.queue.close()
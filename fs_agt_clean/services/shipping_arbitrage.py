@@ -6,15 +6,18 @@ This service provides shipping cost optimization and arbitrage calculations:
 - Route optimization
 - Cost savings tracking
 - Revenue generation through shipping optimization
+- Vectorized batch arbitrage over compiled carrier rate cards
 """
 
 import asyncio
 import logging
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 
+import numpy as np
+
 from fs_agt_clean.database.repositories.ai_analysis_repository import (
     RevenueCalculationRepository,
 )
@@ -23,6 +26,33 @@ from fs_agt_clean.core.monitoring.cost_tracker import CostCategory, record_ai_co
 
 logger = logging.getLogger(__name__)
 
+# Rate multipliers by package type; unknown types are charged as standard
+PACKAGE_TYPE_MULTIPLIERS = {"standard": 1.0, "express": 1.5, "overnight": 2.5}
+
+# Transit days by carrier and package type, plus extra days by zone
+DELIVERY_BASE_DAYS = {
+    "usps": {"standard": 3, "express": 2, "overnight": 1},
+    "ups": {"standard": 3, "express": 2, "overnight": 1},
+    "fedex": {"standard": 2, "express": 1, "overnight": 1},
+    "dhl": {"standard": 4, "express": 2, "overnight": 1},
+}
+DEFAULT_DELIVERY_DAYS = 3
+
+ZONE_DELIVERY_ADJUSTMENTS = {
+    "zone_1": 0,
+    "zone_2": 0,
+    "zone_3": 1,
+    "zone_4": 1,
+    "zone_5": 2,
+    "zone_6": 2,
+    "zone_7": 3,
+    "zone_8": 4,
+}
+DEFAULT_ZONE_ADJUSTMENT = 1
+
+DEFAULT_ZONE = "zone_4"
+DISTANT_ZONES = ("zone_7", "zone_8")
+
 
 class ShippingCarrier:
     """Represents a shipping carrier with rate calculation capabilities."""
@@ -47,14 +77,85 @@ class ShippingCarrier:
         zone_multiplier = self.zone_multipliers.get(zone, 1.0)
 
         # Apply package type adjustments
-        if package_type == "express":
-            base_cost *= 1.5
-        elif package_type == "overnight":
-            base_cost *= 2.5
+        base_cost *= PACKAGE_TYPE_MULTIPLIERS.get(package_type, 1.0)
 
         return base_cost * zone_multiplier
 
 
+class CarrierRateCard:
+    """
+    Carrier rate cards compiled into NumPy lookup arrays.
+
+    Rates are linear in weight, so each carrier's card is stored as base and
+    per-pound arrays indexed by zone and package type. Rates for thousands of
+    shipments across every carrier are then a single broadcast expression.
+    The last package type column holds unknown package types.
+    """
+
+    def __init__(self, carriers: Dict[str, ShippingCarrier], zones: Sequence[str]):
+        self.carrier_names = list(carriers)
+        self.zones = list(zones)
+        self.zone_index = {zone: i for i, zone in enumerate(self.zones)}
+        self.package_types = list(PACKAGE_TYPE_MULTIPLIERS)
+        self.package_index = {ptype: i for i, ptype in enumerate(self.package_types)}
+        self.unknown_package = len(self.package_types)
+
+        carrier_list = [carriers[name] for name in self.carrier_names]
+        self.base_rates = np.array([c.base_rate for c in carrier_list])
+        self.per_pound_rates = np.array([c.per_pound_rate for c in carrier_list])
+        self.package_multipliers = np.array(
+            [PACKAGE_TYPE_MULTIPLIERS[ptype] for ptype in self.package_types] + [1.0]
+        )
+        # (zone, carrier)
+        self.zone_multipliers = np.array(
+            [
+                [carrier.zone_multipliers.get(zone, 1.0) for carrier in carrier_list]
+                for zone in zones
+            ]
+        )
+        # (zone, package type, carrier)
+        self.delivery_days = np.array(
+            [
+                [
+                    [
+                        DELIVERY_BASE_DAYS.get(name, {}).get(
+                            ptype, DEFAULT_DELIVERY_DAYS
+                        )
+                        + ZONE_DELIVERY_ADJUSTMENTS.get(zone, DEFAULT_ZONE_ADJUSTMENT)
+                        for name in self.carrier_names
+                    ]
+                    for ptype in self.package_types + [None]
+                ]
+                for zone in zones
+            ],
+            dtype=np.int64,
+        )
+
+    def index_packages(self, package_types: Sequence[str]) -> np.ndarray:
+        """Map package type names to card indices."""
+        return np.fromiter(
+            (self.package_index.get(p, self.unknown_package) for p in package_types),
+            dtype=np.int64,
+            count=len(package_types),
+        )
+
+    def rates(
+        self, weights: np.ndarray, zone_idx: np.ndarray, package_idx: np.ndarray
+    ) -> np.ndarray:
+        """Rates of every carrier for every shipment, shape (shipments, carriers).
+
+        Evaluated in the same order as ``ShippingCarrier.calculate_rate`` so
+        results match it exactly.
+        """
+        base_cost = self.base_rates + weights[:, None] * self.per_pound_rates
+        base_cost *= self.package_multipliers[package_idx][:, None]
+        return base_cost * self.zone_multipliers[zone_idx]
+
+    def transit_days(self, zone_idx: np.ndarray, package_idx: np.ndarray) -> np.ndarray:
+        """Estimated transit days, shape (shipments, carriers)."""
+        return self.delivery_days[zone_idx, package_idx]
+
+
 class ShippingArbitrageService:
     """Service for shipping cost optimization and arbitrage calculations."""
 
@@ -64,6 +165,7 @@ class ShippingArbitrageService:
         self._shippo_service = None
         self.carriers = self._initialize_carriers()
         self.zone_mapping = self._initialize_zone_mapping()
+        self.rate_card = self.compile_rate_card()
 
         logger.info("Shipping Arbitrage Service initialized")
 
@@ -198,11 +300,19 @@ class ShippingArbitrageService:
             "99503": "zone_8",
         }
 
+    def compile_rate_card(self) -> CarrierRateCard:
+        """Compile carrier rate cards; call again after changing ``carriers``."""
+        zones = set(self.zone_mapping.values()) | {DEFAULT_ZONE}
+        for carrier in self.carriers.values():
+            zones.update(carrier.zone_multipliers)
+        self.rate_card = CarrierRateCard(self.carriers, sorted(zones))
+        return self.rate_card
+
     def _get_zone_from_zip(self, zip_code: str) -> str:
         """Get shipping zone from ZIP code."""
         # Remove any non-numeric characters and take first 5 digits
         clean_zip = "".join(filter(str.isdigit, zip_code))[:5]
-        return self.zone_mapping.get(clean_zip, "zone_4")  # Default to zone 4
+        return self.zone_mapping.get(clean_zip, DEFAULT_ZONE)
 
     async def calculate_real_shippo_arbitrage(
         self,
@@ -356,70 +466,225 @@ class ShippingArbitrageService:
     ) -> Dict[str, Any]:
         """Calculate shipping arbitrage opportunities."""
         try:
-            # Determine shipping zone
-            zone = self._get_zone_from_zip(destination_zip)
-
-            # Calculate rates for all carriers
-            carrier_rates = {}
-            for carrier_name, carrier in self.carriers.items():
-                rate = carrier.calculate_rate(weight, zone, package_type)
-                carrier_rates[carrier_name] = {
-                    "rate": round(rate, 2),
-                    "carrier": carrier_name.upper(),
-                    "estimated_delivery": self._get_estimated_delivery(
-                        carrier_name, zone, package_type
-                    ),
-                }
+            return self._calculate_arbitrage_batch(
+                [
+                    {
+                        "origin_zip": origin_zip,
+                        "destination_zip": destination_zip,
+                        "weight": weight,
+                        "package_type": package_type,
+                        "current_rate": current_rate,
+                    }
+                ],
+                raise_errors=True,
+            )[0]
 
-            # Find optimal carrier
-            optimal_carrier = min(carrier_rates.items(), key=lambda x: x[1]["rate"])
-            optimal_rate = optimal_carrier[1]["rate"]
+        except Exception as e:
+            logger.error(f"Error calculating shipping arbitrage: {e}")
+            return {
+                "error": str(e),
+                "calculated_at": datetime.now(timezone.utc).isoformat(),
+            }
 
-            # Calculate savings if current rate provided
-            savings_data = {}
-            if current_rate:
-                savings_amount = current_rate - optimal_rate
-                savings_percentage = (
-                    (savings_amount / current_rate) * 100 if current_rate > 0 else 0
+    async def calculate_arbitrage_batch(
+        self, shipments: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Calculate shipping arbitrage for many shipments in one vectorized pass.
+
+        Args:
+            shipments: Shipments with ``origin_zip``, ``destination_zip``,
+                ``weight``, ``package_type`` and optional ``current_rate``
+
+        Returns:
+            One result per shipment, in input order, with the same structure
+            as ``calculate_arbitrage`` (an ``error`` entry for invalid input)
+        """
+        return self._calculate_arbitrage_batch(shipments)
+
+    def _calculate_arbitrage_batch(
+        self, shipments: List[Dict[str, Any]], raise_errors: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Vectorized arbitrage over the compiled rate card."""
+        calculated_at = datetime.now(timezone.utc).isoformat()
+        card = self.rate_card
+
+        # Parse input; shipments with invalid fields get an error result
+        count = len(shipments)
+        weights = np.empty(count)
+        current_rates = np.full(count, np.nan)
+        zones: List[Optional[str]] = [None] * count
+        zone_cache: Dict[str, str] = {}
+        errors: Dict[int, str] = {}
+
+        for i, shipment in enumerate(shipments):
+            try:
+                weights[i] = float(shipment.get("weight", 1.0))
+                current_rate = shipment.get("current_rate")
+                if current_rate:
+                    current_rates[i] = float(current_rate)
+                destination_zip = shipment.get("destination_zip", "10001")
+                zone = zone_cache.get(destination_zip)
+                if zone is None:
+                    zone = zone_cache[destination_zip] = self._get_zone_from_zip(
+                        destination_zip
+                    )
+                zones[i] = zone
+            except Exception as e:
+                if raise_errors:
+                    raise
+                logger.error(f"Error calculating shipping arbitrage: {e}")
+                errors[i] = str(e)
+                weights[i] = 0.0
+                zones[i] = DEFAULT_ZONE
+
+        package_types = [s.get("package_type", "standard") for s in shipments]
+        zone_idx = np.fromiter(
+            (card.zone_index[zone] for zone in zones), dtype=np.int64, count=count
+        )
+        package_idx = card.index_packages(package_types)
+
+        # Rates for every (shipment, carrier), rounded like the per-shipment
+        # path (np.round differs from round() on half cents)
+        rate_rows = [
+            [round(rate, 2) for rate in row]
+            for row in card.rates(weights, zone_idx, package_idx).tolist()
+        ]
+        rates = np.array(rate_rows).reshape(count, len(card.carrier_names))
+        transit_days = card.transit_days(zone_idx, package_idx)
+
+        # Optimum per shipment (stable sort keeps carrier order on ties)
+        order = np.argsort(rates, axis=1, kind="stable")
+        optimal_idx = order[:, 0]
+        optimal_rates = np.take_along_axis(rates, order[:, :1], axis=1)[:, 0]
+        savings_amounts = current_rates - optimal_rates
+        with np.errstate(divide="ignore", invalid="ignore"):
+            savings_percentages = np.where(
+                current_rates > 0, savings_amounts / current_rates * 100, 0.0
+            )
+
+        # Recommendation flags
+        if rates.shape[1] > 1:
+            runner_up_idx = order[:, 1]
+            price_diffs = (
+                np.take_along_axis(rates, order[:, 1:2], axis=1)[:, 0] - optimal_rates
+            )
+            suggest_runner_up = (package_idx == card.package_index["standard"]) & (
+                price_diffs < 2.00
+            )
+        else:
+            runner_up_idx = optimal_idx
+            price_diffs = np.zeros(count)
+            suggest_runner_up = np.zeros(count, dtype=bool)
+        heavy = weights > 5.0
+        distant = np.isin(
+            zone_idx,
+            [card.zone_index[z] for z in DISTANT_ZONES if z in card.zone_index],
+        )
+
+        # Build per-shipment results from plain Python values
+        carrier_names = card.carrier_names
+        carrier_labels = [name.upper() for name in carrier_names]
+        delivery_labels = {
+            days: f"{days} business days" for days in np.unique(transit_days).tolist()
+        }
+
+        results = []
+        for i, row in enumerate(
+            zip(
+                shipments,
+                rate_rows,
+                transit_days.tolist(),
+                optimal_idx.tolist(),
+                runner_up_idx.tolist(),
+                price_diffs.tolist(),
+                current_rates.tolist(),
+                savings_amounts.tolist(),
+                savings_percentages.tolist(),
+                suggest_runner_up.tolist(),
+                heavy.tolist(),
+                distant.tolist(),
+            )
+        ):
+            if i in errors:
+                results.append({"error": errors[i], "calculated_at": calculated_at})
+                continue
+
+            (
+                shipment,
+                rate_row,
+                days_row,
+                optimal,
+                runner_up,
+                price_diff,
+                current_rate,
+                savings_amount,
+                savings_percentage,
+                suggest,
+                is_heavy,
+                is_distant,
+            ) = row
+
+            carrier_rates = {
+                name: {
+                    "rate": rate,
+                    "carrier": label,
+                    "estimated_delivery": delivery_labels[days],
+                }
+                for name, label, rate, days in zip(
+                    carrier_names, carrier_labels, rate_row, days_row
                 )
+            }
 
+            savings_data = {}
+            if current_rate == current_rate:  # not NaN
                 savings_data = {
                     "original_rate": current_rate,
-                    "optimized_rate": optimal_rate,
+                    "optimized_rate": rate_row[optimal],
                     "savings_amount": round(savings_amount, 2),
                     "savings_percentage": round(savings_percentage, 2),
                 }
 
-            # Generate recommendations
-            recommendations = self._generate_shipping_recommendations(
-                carrier_rates, zone, weight, package_type
-            )
+            recommendations = [
+                f"Use {carrier_labels[optimal]} for lowest cost "
+                f"(${rate_row[optimal]:.2f})"
+            ]
+            if suggest:
+                recommendations.append(
+                    f"Consider {carrier_labels[runner_up]} for only "
+                    f"${price_diff:.2f} more"
+                )
+            if is_heavy:
+                recommendations.append(
+                    "Consider consolidating shipments to reduce per-pound costs"
+                )
+            if is_distant:
+                recommendations.append(
+                    "Consider regional fulfillment centers for distant zones"
+                )
 
-            return {
-                "arbitrage_analysis": {
-                    "origin_zip": origin_zip,
-                    "destination_zip": destination_zip,
-                    "shipping_zone": zone,
-                    "package_weight": weight,
-                    "package_type": package_type,
-                },
-                "carrier_rates": carrier_rates,
-                "optimal_carrier": {
-                    "name": optimal_carrier[0].upper(),
-                    "rate": optimal_rate,
-                    "estimated_delivery": optimal_carrier[1]["estimated_delivery"],
-                },
-                "savings": savings_data,
-                "recommendations": recommendations,
-                "calculated_at": datetime.now(timezone.utc).isoformat(),
-            }
+            results.append(
+                {
+                    "arbitrage_analysis": {
+                        "origin_zip": shipment.get("origin_zip", "90210"),
+                        "destination_zip": shipment.get("destination_zip", "10001"),
+                        "shipping_zone": zones[i],
+                        "package_weight": shipment.get("weight", 1.0),
+                        "package_type": package_types[i],
+                    },
+                    "carrier_rates": carrier_rates,
+                    "optimal_carrier": {
+                        "name": carrier_labels[optimal],
+                        "rate": rate_row[optimal],
+                        "estimated_delivery": delivery_labels[days_row[optimal]],
+                    },
+                    "savings": savings_data,
+                    "recommendations": recommendations,
+                    "calculated_at": calculated_at,
+                }
+            )
 
-        except Exception as e:
-            logger.error(f"Error calculating shipping arbitrage: {e}")
-            return {
-                "error": str(e),
-                "calculated_at": datetime.now(timezone.utc).isoformat(),
-            }
+        return results
 
     async def optimize_shipping(
         self, shipments: List[Dict[str, Any]], optimization_criteria: str = "cost"
@@ -430,16 +695,10 @@ class ShippingArbitrageService:
             total_original_cost = 0
             total_optimized_cost = 0
 
-            for shipment in shipments:
-                # Calculate arbitrage for each shipment
-                arbitrage_result = await self.calculate_arbitrage(
-                    origin_zip=shipment.get("origin_zip", "90210"),
-                    destination_zip=shipment.get("destination_zip", "10001"),
-                    weight=shipment.get("weight", 1.0),
-                    package_type=shipment.get("package_type", "standard"),
-                    current_rate=shipment.get("current_rate"),
-                )
+            # Calculate arbitrage for all shipments in one pass
+            arbitrage_results = self._calculate_arbitrage_batch(shipments)
 
+            for shipment, arbitrage_result in zip(shipments, arbitrage_results):
                 if "error" not in arbitrage_result:
                     optimized_shipments.append(
                         {
@@ -536,72 +795,6 @@ class ShippingArbitrageService:
                 "tracked_at": datetime.now(timezone.utc).isoformat(),
             }
 
-    def _get_estimated_delivery(
-        self, carrier: str, zone: str, package_type: str
-    ) -> str:
-        """Get estimated delivery time for carrier and zone."""
-        base_days = {
-            "usps": {"standard": 3, "express": 2, "overnight": 1},
-            "ups": {"standard": 3, "express": 2, "overnight": 1},
-            "fedex": {"standard": 2, "express": 1, "overnight": 1},
-            "dhl": {"standard": 4, "express": 2, "overnight": 1},
-        }
-
-        zone_adjustments = {
-            "zone_1": 0,
-            "zone_2": 0,
-            "zone_3": 1,
-            "zone_4": 1,
-            "zone_5": 2,
-            "zone_6": 2,
-            "zone_7": 3,
-            "zone_8": 4,
-        }
-
-        base = base_days.get(carrier, {}).get(package_type, 3)
-        adjustment = zone_adjustments.get(zone, 1)
-        total_days = base + adjustment
-
-        return f"{total_days} business days"
-
-    def _generate_shipping_recommendations(
-        self, carrier_rates: Dict[str, Any], zone: str, weight: float, package_type: str
-    ) -> List[str]:
-        """Generate shipping optimization recommendations."""
-        recommendations = []
-
-        # Sort carriers by rate
-        sorted_carriers = sorted(carrier_rates.items(), key=lambda x: x[1]["rate"])
-
-        # Cost optimization recommendation
-        cheapest = sorted_carriers[0]
-        recommendations.append(
-            f"Use {cheapest[0].upper()} for lowest cost (${cheapest[1]['rate']:.2f})"
-        )
-
-        # Speed vs cost recommendation
-        if package_type == "standard" and len(sorted_carriers) > 1:
-            second_cheapest = sorted_carriers[1]
-            price_diff = second_cheapest[1]["rate"] - cheapest[1]["rate"]
-            if price_diff < 2.00:
-                recommendations.append(
-                    f"Consider {second_cheapest[0].upper()} for only ${price_diff:.2f} more"
-                )
-
-        # Weight-based recommendations
-        if weight > 5.0:
-            recommendations.append(
-                "Consider consolidating shipments to reduce per-pound costs"
-            )
-
-        # Zone-based recommendations
-        if zone in ["zone_7", "zone_8"]:
-            recommendations.append(
-                "Consider regional fulfillment centers for distant zones"
-            )
-
-        return recommendations
-
 
 # Global shipping arbitrage service instance
 shipping_arbitrage_service = ShippingArbitrageService()
@@ -0,0 +1,198 @@
+"""
+Tests for shipping_arbitrage.py
+"""
+
+import random
+
+import pytest
+
+from fs_agt_clean.services.shipping_arbitrage import (
+    DELIVERY_BASE_DAYS,
+    ZONE_DELIVERY_ADJUSTMENTS,
+    ShippingArbitrageService,
+    ShippingCarrier,
+)
+
+WEIGHTS = [0.0, 0.1, 0.5, 1.0, 2.5, 4.99, 5.0, 5.01, 10.0, 31.7, 70.0]
+PACKAGE_TYPES = ["standard", "express", "overnight", "freight"]
+UNKNOWN_ZIPS = ["00000", "123", "abc"]
+
+
+def per_shipment_reference(service, shipment):
+    """Arbitrage for one shipment, carrier by carrier."""
+    weight = shipment["weight"]
+    package_type = shipment["package_type"]
+    current_rate = shipment.get("current_rate")
+    zone = service._get_zone_from_zip(shipment["destination_zip"])
+
+    carrier_rates = {}
+    for name, carrier in service.carriers.items():
+        days = DELIVERY_BASE_DAYS.get(name, {}).get(package_type, 3)
+        days += ZONE_DELIVERY_ADJUSTMENTS.get(zone, 1)
+        carrier_rates[name] = {
+            "rate": round(carrier.calculate_rate(weight, zone, package_type), 2),
+            "carrier": name.upper(),
+            "estimated_delivery": f"{days} business days",
+        }
+    ranked = sorted(carrier_rates.items(), key=lambda item: item[1]["rate"])
+    optimal_name, optimal = ranked[0]
+
+    savings = {}
+    if current_rate:
+        amount = current_rate - optimal["rate"]
+        savings = {
+            "original_rate": current_rate,
+            "optimized_rate": optimal["rate"],
+            "savings_amount": round(amount, 2),
+            "savings_percentage": round(amount / current_rate * 100, 2),
+        }
+
+    recommendations = [
+        f"Use {optimal_name.upper()} for lowest cost (${optimal['rate']:.2f})"
+    ]
+    if package_type == "standard" and len(ranked) > 1:
+        price_diff = ranked[1][1]["rate"] - optimal["rate"]
+        if price_diff < 2.00:
+            recommendations.append(
+                f"Consider {ranked[1][0].upper()} for only ${price_diff:.2f} more"
+            )
+    if weight > 5.0:
+        recommendations.append(
+            "Consider consolidating shipments to reduce per-pound costs"
+        )
+    if zone in ("zone_7", "zone_8"):
+        recommendations.append(
+            "Consider regional fulfillment centers for distant zones"
+        )
+
+    return {
+        "zone": zone,
+        "carrier_rates": carrier_rates,
+        "optimal_carrier": {
+            "name": optimal_name.upper(),
+            "rate": optimal["rate"],
+            "estimated_delivery": optimal["estimated_delivery"],
+        },
+        "savings": savings,
+        "recommendations": recommendations,
+    }
+
+
+def assert_matches_reference(result, expected):
+    assert result["arbitrage_analysis"]["shipping_zone"] == expected["zone"]
+    for key in ("carrier_rates", "optimal_carrier", "savings", "recommendations"):
+        assert result[key] == expected[key]
+
+
+def shipment_grid(service, rng):
+    """Every weight break, zone and package type, with varied current rates."""
+    zips = {}
+    for zip_code, zone in service.zone_mapping.items():
+        zips.setdefault(zone, zip_code)
+    destinations = list(zips.values()) + UNKNOWN_ZIPS
+    return [
+        {
+            "origin_zip": "90210",
+            "destination_zip": destination,
+            "weight": weight,
+            "package_type": package_type,
+            "current_rate": rng.choice([None, 0, 8.0, round(rng.uniform(5, 80), 2)]),
+        }
+        for destination in destinations
+        for weight in WEIGHTS
+        for package_type in PACKAGE_TYPES
+    ]
+
+
+class TestArbitrageBatch:
+    """Tests for batch arbitrage against single-shipment results."""
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_single_and_reference(self):
+        """Batch, single and per-carrier results agree for every shipment."""
+        service = ShippingArbitrageService()
+        shipments = shipment_grid(service, random.Random(21))
+        batch = await service.calculate_arbitrage_batch(shipments)
+        assert len(batch) == len(shipments)
+
+        for shipment, result in zip(shipments, batch):
+            single = await service.calculate_arbitrage(**shipment)
+            result = dict(result, calculated_at=None)
+            assert dict(single, calculated_at=None) == result
+            assert_matches_reference(result, per_shipment_reference(service, shipment))
+
+    @pytest.mark.asyncio
+    async def test_carrier_ties_and_single_carrier(self):
+        """Tied rates pick the first carrier; one carrier never suggests another."""
+        service = ShippingArbitrageService()
+        zones = {"zone_1": 1.0, "zone_4": 1.3}
+        service.carriers = {
+            "alpha": ShippingCarrier("Alpha", 5.0, 1.0, zones),
+            "beta": ShippingCarrier("Beta", 5.0, 1.0, zones),
+        }
+        service.compile_rate_card()
+        shipment = {
+            "origin_zip": "90210",
+            "destination_zip": "60601",
+            "weight": 2.0,
+            "package_type": "standard",
+        }
+        (result,) = await service.calculate_arbitrage_batch([shipment])
+        assert_matches_reference(result, per_shipment_reference(service, shipment))
+        assert result["optimal_carrier"]["name"] == "ALPHA"
+
+        service.carriers = {"alpha": service.carriers["alpha"]}
+        service.compile_rate_card()
+        (result,) = await service.calculate_arbitrage_batch([shipment])
+        assert_matches_reference(result, per_shipment_reference(service, shipment))
+        assert len(result["recommendations"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_invalid_shipment_isolated(self):
+        """An invalid shipment gets an error result without failing the batch."""
+        service = ShippingArbitrageService()
+        good = {"destination_zip": "98101", "weight": 3.0, "package_type": "express"}
+        bad = {"destination_zip": "98101", "weight": "heavy"}
+        results = await service.calculate_arbitrage_batch([good, bad, good])
+        assert "error" in results[1]
+        assert results[0]["carrier_rates"] == results[2]["carrier_rates"]
+        single = await service.calculate_arbitrage("90210", "98101", "heavy")
+        assert "error" in single
+
+
+class TestOptimizeShipping:
+    """Tests for optimize_shipping over the batch path."""
+
+    @pytest.mark.asyncio
+    async def test_totals_match_single_results(self):
+        """Summary totals equal summing calculate_arbitrage per shipment."""
+        service = ShippingArbitrageService()
+        shipments = shipment_grid(service, random.Random(22))
+        shipments.insert(5, {"destination_zip": "10001", "weight": "n/a"})
+        optimized = await service.optimize_shipping(shipments)
+
+        original = optimized_total = 0
+        kept = []
+        for shipment in shipments:
+            single = await service.calculate_arbitrage(
+                shipment.get("origin_zip", "90210"),
+                shipment["destination_zip"],
+                shipment["weight"],
+                shipment.get("package_type", "standard"),
+                current_rate=shipment.get("current_rate"),
+            )
+            if "error" in single:
+                continue
+            kept.append(single)
+            if single["savings"]:
+                original += single["savings"]["original_rate"]
+                optimized_total += single["savings"]["optimized_rate"]
+
+        summary = optimized["optimization_summary"]
+        assert summary["total_shipments"] == len(shipments)
+        assert summary["optimized_shipments"] == len(kept)
+        assert summary["total_original_cost"] == round(original, 2)
+        assert summary["total_optimized_cost"] == round(optimized_total, 2)
+        for entry, single in zip(optimized["optimized_shipments"], kept):
+            assert entry["optimization"]["carrier_rates"] == single["carrier_rates"]
+            assert entry["optimization"]["savings"] == single["savings"]
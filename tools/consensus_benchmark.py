@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+FlipSync Consensus Benchmark
+Measures conflicts/sec of weighted voting and robust numeric consensus over
+pricing proposals, per conflict in pure Python versus batched in the
+vectorized consensus engine
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fs_agt_clean.core.coordination.coordinator.consensus_engine import (  # noqa: E402
+    ConsensusEngine,
+)
+
+
+def make_conflicts(conflicts: int, candidates: int, seed: int = 0) -> List[List[Dict]]:
+    """Pricing proposals around a reference price, with a few outliers"""
+    rng = random.Random(seed)
+    result = []
+    for _ in range(conflicts):
+        reference = rng.uniform(5, 500)
+        entities = []
+        for j in range(candidates):
+            price = round(reference * rng.gauss(1.0, 0.05), 2)
+            if rng.random() < 0.05:
+                price *= 10
+            entities.append(
+                {
+                    "value": price,
+                    "confidence": rng.random(),
+                    "agent_id": f"agent_{j % 8}",
+                }
+            )
+        result.append(entities)
+    return result
+
+
+def resolve_python(entities: List[Dict], threshold: float, trim: float) -> Dict:
+    """Per-item reference: weighted vote, median, trimmed mean and MAD outliers"""
+    votes: Dict[str, float] = {}
+    for entity in entities:
+        key = str(entity["value"])
+        votes[key] = votes.get(key, 0.0) + entity["confidence"]
+    winner = max(votes, key=lambda k: votes[k])
+
+    values = [entity["value"] for entity in entities]
+    median = statistics.median(values)
+    deviations = [abs(v - median) for v in values]
+    mad = statistics.median(deviations)
+    scale = mad / 0.6745 if mad > 0 else 1.253314 * statistics.fmean(deviations)
+    inliers = [
+        entity
+        for entity, deviation in zip(entities, deviations)
+        if scale <= 0 or deviation / scale <= threshold
+    ]
+    weight = sum(entity["confidence"] for entity in inliers)
+    mean = sum(entity["value"] * entity["confidence"] for entity in inliers) / weight
+
+    ordered = sorted(values)
+    cut = int(len(ordered) * trim)
+    trimmed = statistics.fmean(ordered[cut : len(ordered) - cut])
+    return {"winner": winner, "value": mean, "median": median, "trimmed": trimmed}
+
+
+def run(conflicts: int, candidates: int, repeat: int) -> Dict:
+    """Resolve the same conflicts both ways and return best-of throughput"""
+    data = make_conflicts(conflicts, candidates)
+    engine = ConsensusEngine()
+
+    python_elapsed = engine_elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for entities in data:
+            resolve_python(entities, engine.outlier_threshold, engine.trim_fraction)
+        python_elapsed = min(python_elapsed, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        engine.resolve_batch(engine.prepare(data))
+        engine_elapsed = min(engine_elapsed, time.perf_counter() - start)
+
+    return {
+        "conflicts": conflicts,
+        "candidates": candidates,
+        "python_per_sec": conflicts / python_elapsed,
+        "engine_per_sec": conflicts / engine_elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Conflict consensus benchmark")
+    parser.add_argument(
+        "--conflicts",
+        type=int,
+        nargs="+",
+        default=[100, 10_000],
+        help="Conflicts resolved per run",
+    )
+    parser.add_argument(
+        "--candidates",
+        type=int,
+        nargs="+",
+        default=[5, 50],
+        help="Candidate results per conflict",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per timing")
+    args = parser.parse_args()
+
+    print(
+        f"{'conflicts':>10} {'candidates':>10} {'python/s':>12} "
+        f"{'engine/s':>12} {'speedup':>8}"
+    )
+    for conflicts in args.conflicts:
+        for candidates in args.candidates:
+            stats = run(conflicts, candidates, args.repeat)
+            print(
+                f"{stats['conflicts']:>10} {stats['candidates']:>10} "
+                f"{stats['python_per_sec']:>12.1f} {stats['engine_per_sec']:>12.1f} "
+                f"{stats['engine_per_sec'] / stats['python_per_sec']:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+FlipSync Q-Learning Benchmark
+Measures training episodes/sec of the pricing Q-learning agent at different
+Q-table sizes, with per-step and batched updates
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fs_agt_clean.agents.executive.reinforcement_learning_agent import (  # noqa: E402
+    Action,
+    Environment,
+    QLearningUnifiedAgent,
+    State,
+)
+
+
+class PricingEnvironment(Environment):
+    """Synthetic repricing environment: states are price buckets"""
+
+    def __init__(self, num_states: int, num_actions: int, seed: int = 0):
+        self.num_states = num_states
+        self.rng = random.Random(seed)
+        self.actions = [Action(f"price_step_{j}") for j in range(num_actions)]
+        self.states = [State(f"bucket_{i}", {}) for i in range(num_states)]
+
+    def reset(self) -> State:
+        return self.states[self.rng.randrange(self.num_states)]
+
+    def step(self, state: State, action: Action) -> Tuple[State, float, bool, Dict]:
+        bucket = int(state.state_id.rsplit("_", 1)[1])
+        step = int(action.action_id.rsplit("_", 1)[1])
+        next_bucket = (bucket * 31 + step * 7 + self.rng.randrange(5)) % self.num_states
+        reward = ((bucket + step) % 7) - 3.0
+        done = self.rng.random() < 0.02
+        return self.states[next_bucket], reward, done, {}
+
+    def get_valid_actions(self, state: State) -> List[Action]:
+        return self.actions
+
+
+def prefill(agent: QLearningUnifiedAgent, env: PricingEnvironment) -> None:
+    """Populate every state-action pair of the Q-table"""
+    table = agent.q_table
+    rows = np.array([table.intern_state(s.state_id) for s in env.states])
+    cols = np.array([table.intern_action(a.action_id) for a in env.actions])
+    all_rows = np.repeat(rows, len(cols))
+    all_cols = np.tile(cols, len(rows))
+    deltas = np.random.default_rng(0).normal(size=len(all_rows))
+    table.add_batch(all_rows, all_cols, deltas)
+
+
+def run(pairs: int, actions: int, episodes: int, steps: int, batch: int) -> Dict:
+    """Train on a prefilled table and return throughput figures"""
+    env = PricingEnvironment(max(1, pairs // actions), actions)
+    agent = QLearningUnifiedAgent({"update_batch_size": batch})
+    prefill(agent, env)
+
+    start = time.perf_counter()
+    result = agent.train(env, episodes=episodes, max_steps=steps)
+    elapsed = time.perf_counter() - start
+
+    total_steps = sum(result["episode_lengths"])
+    return {
+        "pairs": len(agent.q_table),
+        "batch": batch,
+        "episodes_per_sec": episodes / elapsed,
+        "steps_per_sec": total_steps / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Q-learning agent benchmark")
+    parser.add_argument(
+        "--pairs",
+        type=int,
+        nargs="+",
+        default=[10_000, 1_000_000],
+        help="Q-table sizes (state-action pairs)",
+    )
+    parser.add_argument("--actions", type=int, default=10, help="Actions per state")
+    parser.add_argument("--episodes", type=int, default=500, help="Episodes per run")
+    parser.add_argument("--steps", type=int, default=50, help="Max steps per episode")
+    parser.add_argument(
+        "--batch", type=int, nargs="+", default=[1, 32], help="Update batch sizes"
+    )
+    args = parser.parse_args()
+
+    print(f"{'pairs':>10} {'batch':>6} {'episodes/s':>12} {'steps/s':>12}")
+    for pairs in args.pairs:
+        for batch in args.batch:
+            stats = run(pairs, args.actions, args.episodes, args.steps, batch)
+            print(
+                f"{stats['pairs']:>10} {stats['batch']:>6} "
+                f"{stats['episodes_per_sec']:>12.1f} {stats['steps_per_sec']:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()